@@ -31,6 +31,19 @@ def create_app():
     # Configurar rutas
     configure_routes(app)
     
+    # Configurar compresión de respuestas
+    configure_compression(app)
+    
+    # Configurar el listener de eventos de pedidos
+    configure_order_events()
+    configure_report_snapshots()
+    configure_heavy_hitters()
+    configure_background_threads(app)
+    
+    # Registrar comandos de línea de comandos (flask rollups ...)
+    from .commands import register_commands
+    register_commands(app)
+    
     return app
 
 
@@ -38,24 +51,34 @@ def configure_routes(app):
     """Configura las rutas de la aplicación"""
     from .controllers.health_controller import HealthCheckView
     from .controllers.order_controller import OrderController, OrderDeleteAllController
-    from .controllers.order_create_controller import OrderCreateController
+    from .controllers.order_create_controller import OrderCreateController, OrderCreateBatchController
     from .controllers.order_truck_controller import OrderTruckController
-    from .controllers.order_report_controller import OrderMonthlyReportController, OrderTopClientsController, OrderTopProductsController
-    from .controllers.order_informes_controller import OrderSellerStatusSummaryController, OrderSellerClientsSummaryController, OrderSellerMonthlyController
+    from .controllers.order_changes_controller import OrderChangesController
+    from .controllers.order_events_controller import OrderEventsController
+    from .controllers.order_report_controller import OrderMonthlyReportController, OrderTimeSeriesReportController, OrderTopClientsController, OrderTopProductsController
+    from .controllers.order_informes_controller import OrderSellerStatusSummaryController, OrderSellerClientsSummaryController, OrderSellerMonthlyController, OrderSellerActiveClientsController, OrderSellersBatchController, OrderSellerDashboardController
+    
+    from .config.settings import get_config
+    from .utils.json_encoder import make_output_json
     
     api = Api(app)
+    api.representation('application/json')(make_output_json(get_config().JSON_BACKEND))
     
     # Health check endpoint
     api.add_resource(HealthCheckView, '/orders/ping')
     
     # Order endpoints
     api.add_resource(OrderCreateController, '/orders/create')
+    api.add_resource(OrderCreateBatchController, '/orders/create-batch')
     api.add_resource(OrderController, '/orders')
     api.add_resource(OrderDeleteAllController, '/orders/delete-all')
     api.add_resource(OrderTruckController, '/orders/by-truck')
+    api.add_resource(OrderChangesController, '/orders/changes')
+    api.add_resource(OrderEventsController, '/orders/events')
     
     # Report endpoints
     api.add_resource(OrderMonthlyReportController, '/orders/reports/monthly')
+    api.add_resource(OrderTimeSeriesReportController, '/orders/reports/time-series')
     api.add_resource(OrderTopClientsController, '/orders/reports/top-clients')
     api.add_resource(OrderTopProductsController, '/orders/reports/top-products')
     
@@ -63,3 +86,96 @@ def configure_routes(app):
     api.add_resource(OrderSellerStatusSummaryController, '/orders/informes/seller/status-summary')
     api.add_resource(OrderSellerClientsSummaryController, '/orders/informes/seller/clients-summary')
     api.add_resource(OrderSellerMonthlyController, '/orders/informes/seller/monthly')
+    api.add_resource(OrderSellerActiveClientsController, '/orders/informes/seller/active-clients')
+    api.add_resource(OrderSellersBatchController, '/orders/informes/seller/batch')
+    api.add_resource(OrderSellerDashboardController, '/orders/informes/seller/dashboard')
+
+
+def configure_compression(app):
+    """Registra la compresión gzip/brotli de respuestas para todos los endpoints"""
+    from .config.settings import get_config
+    from .utils.compression import ResponseCompressor
+    
+    config = get_config()
+    if not config.COMPRESSION_ENABLED:
+        return
+    
+    ResponseCompressor(
+        min_size=config.COMPRESSION_MIN_SIZE,
+        gzip_level=config.COMPRESSION_GZIP_LEVEL,
+        brotli_quality=config.COMPRESSION_BROTLI_QUALITY
+    ).init_app(app)
+
+
+def configure_order_events():
+    """
+    Configura el listener de eventos de pedidos del proceso
+    
+    En PostgreSQL los eventos llegan por LISTEN/NOTIFY con una sola conexión por
+    proceso, que se abre con la primera petición del worker (ver
+    configure_background_threads). En otros motores los eventos se publican en el
+    mismo proceso y no se necesita listener.
+    """
+    from .config import database
+    from .utils.order_events import order_event_hub, PostgresEventListener
+    
+    if database.engine.dialect.name == 'postgresql':
+        order_event_hub.listener_factory = lambda hub: PostgresEventListener(database.engine, hub)
+
+
+def configure_report_snapshots():
+    """
+    Configura el recálculo periódico de instantáneas de reportes del proceso
+    
+    Solo en PostgreSQL: todos los workers lo inician con su primera petición (ver
+    configure_background_threads) y un advisory lock elige al único
+    que recalcula. En otros motores los reportes consultan los pedidos directamente
+    (o la instantánea calculada con `flask snapshots refresh`).
+    """
+    from .config import database
+    from .config.settings import get_config
+    from .repositories.report_snapshots import snapshot_scheduler, SnapshotRefresher
+    
+    config = get_config()
+    if config.TOP_CLIENTS_SNAPSHOT_ENABLED and database.engine.dialect.name == 'postgresql':
+        snapshot_scheduler.refresher_factory = lambda: SnapshotRefresher(
+            database.engine,
+            database.SessionLocal,
+            config.TOP_CLIENTS_SNAPSHOT_REFRESH_SECONDS
+        )
+
+
+def configure_heavy_hitters():
+    """
+    Configura la escritura de los resúmenes de top aproximado del proceso
+    
+    Cada worker los escribe desde un hilo (ver configure_background_threads) y
+    escribe lo pendiente al terminar.
+    """
+    import atexit
+    from .config import database
+    from .repositories.heavy_hitters import heavy_hitters
+    
+    if heavy_hitters.enabled and heavy_hitters.session_factory is None:
+        heavy_hitters.session_factory = database.SessionLocal
+        atexit.register(heavy_hitters.flush_at_exit)
+
+
+def configure_background_threads(app):
+    """
+    Inicia los hilos de fondo del proceso con su primera petición
+    
+    Con servidores que cargan la aplicación antes de hacer fork (gunicorn --preload)
+    los hilos iniciados en create_app quedarían en el proceso maestro, y un hilo
+    iniciado en el hook de fork abriría conexiones antes de que el hijo descarte las
+    heredadas. Cada worker inicia los suyos al atender, y los reinicia si murieron.
+    """
+    from .utils.order_events import order_event_hub
+    from .repositories.report_snapshots import snapshot_scheduler
+    from .repositories.heavy_hitters import heavy_hitters
+    
+    @app.before_request
+    def ensure_background_threads():
+        order_event_hub.ensure_listener()
+        snapshot_scheduler.ensure_running()
+        heavy_hitters.ensure_flusher()
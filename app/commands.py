@@ -0,0 +1,62 @@
+"""
+Comandos de línea de comandos (flask <comando>) del sistema de pedidos
+"""
+import click
+from flask.cli import AppGroup
+
+rollups_cli = AppGroup('rollups', help='Mantenimiento de las tablas rollup de pedidos')
+snapshots_cli = AppGroup('snapshots', help='Instantáneas de reportes')
+
+
+@rollups_cli.command('rebuild')
+@click.option(
+    '--rollup', 'names', multiple=True,
+    help='Rollup a reconstruir (se puede repetir); por defecto todos'
+)
+def rebuild_rollups_command(names):
+    """Recalcula las tablas rollup desde los pedidos (backfill o corrección)"""
+    from .config.database import SessionLocal
+    from .repositories.order_rollups import ROLLUPS, rebuild_rollup
+    
+    unknown = [name for name in names if name not in ROLLUPS]
+    if unknown:
+        raise click.BadParameter(
+            f"Rollups desconocidos: {', '.join(unknown)}. Disponibles: {', '.join(ROLLUPS)}",
+            param_hint='--rollup'
+        )
+    
+    session = SessionLocal()
+    try:
+        for name in names or ROLLUPS:
+            rows = rebuild_rollup(session, ROLLUPS[name])
+            session.commit()
+            click.echo(f"Rollup '{name}' reconstruido: {rows} filas")
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+
+
+@snapshots_cli.command('refresh')
+def refresh_snapshots_command():
+    """Recalcula la instantánea del reporte de top clientes"""
+    from .config.database import SessionLocal
+    from .repositories.report_snapshots import TOP_CLIENTS_SNAPSHOT, refresh_top_clients_snapshot
+    
+    session = SessionLocal()
+    try:
+        clients = refresh_top_clients_snapshot(session)
+        session.commit()
+        click.echo(f"Instantánea '{TOP_CLIENTS_SNAPSHOT}' recalculada: {clients} clientes")
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+
+
+def register_commands(app):
+    """Registra los comandos de la aplicación"""
+    app.cli.add_command(rollups_cli)
+    app.cli.add_command(snapshots_cli)
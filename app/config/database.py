@@ -3,8 +3,10 @@ Configuración de base de datos
 """
 import os
 import logging
+from typing import List
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
+from werkzeug.wrappers import Response
 from .settings import get_config
 
 logger = logging.getLogger(__name__)
@@ -20,6 +22,18 @@ engine = create_engine(DATABASE_URL, echo=config.DEBUG)
 # Crear session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+def _dispose_engine_after_fork():
+    """
+    Descarta en el proceso hijo las conexiones heredadas del padre
+    
+    close=False: los sockets siguen siendo del padre, cerrarlos desde el hijo
+    terminaría sus sesiones. El hijo abre conexiones nuevas al usar el pool.
+    """
+    engine.dispose(close=False)
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_dispose_engine_after_fork)
+
 def get_db_session():
     """Obtiene una sesión de base de datos"""
     db = SessionLocal()
@@ -29,9 +43,56 @@ def get_db_session():
         db.close()
 
 def create_tables():
-    """Crea las tablas en la base de datos"""
+    """
+    Crea las tablas en la base de datos
+    
+    En tablas que ya existían se crean los índices declarados que les falten. Los
+    rollups cuyas tablas se crean sobre una base con pedidos se pueblan en el
+    momento: los reportes los leen en lugar de la tabla de pedidos.
+    """
+    from sqlalchemy import inspect
     from ..models.db_models import Base
+    existing_tables = set(inspect(engine).get_table_names())
     Base.metadata.create_all(bind=engine)
+    if existing_tables:
+        create_missing_indexes(existing_tables)
+    if 'orders' in existing_tables:
+        from ..repositories.order_rollups import backfill_new_rollups
+        backfill_new_rollups(SessionLocal, existing_tables)
+
+def create_missing_indexes(existing_tables) -> List[str]:
+    """
+    Crea los índices de los modelos que faltan en tablas que ya existían
+    
+    create_all no modifica tablas existentes: un índice agregado a un modelo después
+    de crear su tabla solo se crea aquí. Si un índice no se puede crear se registra
+    y se continúa con los demás.
+    
+    Args:
+        existing_tables: Tablas que existían antes de create_all
+        
+    Returns:
+        Nombres de los índices creados
+    """
+    from sqlalchemy import inspect
+    from ..models.db_models import Base
+    
+    inspector = inspect(engine)
+    created = []
+    for table in Base.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        present = {index['name'] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name in present:
+                continue
+            try:
+                index.create(bind=engine)
+                created.append(index.name)
+                logger.info(f"Índice '{index.name}' creado en la tabla existente '{table.name}'")
+            except Exception as e:
+                logger.warning(f"No se pudo crear el índice '{index.name}' en '{table.name}': {str(e)}")
+    return created
 
 def auto_close_session(func):
     """Decorador que automáticamente cierra la sesión después de ejecutar el método"""
@@ -54,6 +115,7 @@ def auto_close_session(func):
                 logger.warning(f"Error cerrando sesion existente: {e}")
 
         session = SessionLocal()
+        deferred_close = False
         try:
             from ..repositories.order_repository import OrderRepository
             from ..services.order_service import OrderService
@@ -63,12 +125,22 @@ def auto_close_session(func):
             
             logger.debug("Nueva sesion creada en decorador")
 
-            return func(self, *args, **kwargs)
+            result = func(self, *args, **kwargs)
+            
+            # Las respuestas en streaming siguen leyendo de la sesión después de retornar:
+            # se cierra cuando el servidor termina de enviar la respuesta
+            if isinstance(result, Response) and result.is_streamed:
+                result.call_on_close(session.close)
+                deferred_close = True
+                logger.debug("Cierre de sesion diferido hasta el fin de la respuesta en streaming")
+            
+            return result
         finally:
-            try:
-                session.close()
-                logger.debug("Sesion cerrada en finally del decorador")
-            except Exception as e:
-                logger.warning(f"Error cerrando sesion en finally: {e}")
+            if not deferred_close:
+                try:
+                    session.close()
+                    logger.debug("Sesion cerrada en finally del decorador")
+                except Exception as e:
+                    logger.warning(f"Error cerrando sesion en finally: {e}")
     
     return wrapper
@@ -16,6 +16,58 @@ class Config:
     # Configuración de la aplicación
     APP_NAME = 'MediSupply Orders Backend'
     APP_VERSION = '1.0.0'
+    
+    # Configuración de idempotencia para creación de pedidos
+    IDEMPOTENCY_TTL_SECONDS = int(os.getenv('IDEMPOTENCY_TTL_SECONDS', '86400'))
+    IDEMPOTENCY_WAIT_TIMEOUT_SECONDS = float(os.getenv('IDEMPOTENCY_WAIT_TIMEOUT_SECONDS', '30'))
+    
+    # Tamaño máximo de lote para creación masiva de pedidos
+    ORDER_BATCH_MAX_SIZE = int(os.getenv('ORDER_BATCH_MAX_SIZE', '100'))
+    
+    # Backend de serialización JSON de las respuestas ('orjson' o 'json')
+    JSON_BACKEND = os.getenv('JSON_BACKEND', 'orjson')
+    
+    # Compresión de respuestas (gzip/brotli según Accept-Encoding)
+    COMPRESSION_ENABLED = os.getenv('COMPRESSION_ENABLED', 'True').lower() == 'true'
+    COMPRESSION_MIN_SIZE = int(os.getenv('COMPRESSION_MIN_SIZE', '1024'))
+    COMPRESSION_GZIP_LEVEL = int(os.getenv('COMPRESSION_GZIP_LEVEL', '6'))
+    COMPRESSION_BROTLI_QUALITY = int(os.getenv('COMPRESSION_BROTLI_QUALITY', '4'))
+    
+    # Pedidos por fragmento en los listados en streaming (?stream=true)
+    ORDER_STREAM_CHUNK_SIZE = int(os.getenv('ORDER_STREAM_CHUNK_SIZE', '500'))
+    
+    # Feed de cambios de pedidos (/orders/changes)
+    ORDER_CHANGES_DEFAULT_LIMIT = int(os.getenv('ORDER_CHANGES_DEFAULT_LIMIT', '100'))
+    ORDER_CHANGES_MAX_LIMIT = int(os.getenv('ORDER_CHANGES_MAX_LIMIT', '500'))
+    # Los cambios más recientes que este margen no se entregan todavía: una transacción
+    # en curso puede confirmar después un updated_at anterior al cursor ya entregado
+    ORDER_CHANGES_SETTLE_SECONDS = float(os.getenv('ORDER_CHANGES_SETTLE_SECONDS', '2'))
+    
+    # Eventos de cambios de estado de pedidos (SSE en /orders/events)
+    ORDER_EVENTS_MAX_SUBSCRIBERS = int(os.getenv('ORDER_EVENTS_MAX_SUBSCRIBERS', '100'))
+    ORDER_EVENTS_QUEUE_SIZE = int(os.getenv('ORDER_EVENTS_QUEUE_SIZE', '100'))
+    ORDER_EVENTS_HEARTBEAT_SECONDS = float(os.getenv('ORDER_EVENTS_HEARTBEAT_SECONDS', '15'))
+    
+    # Cache de resultados de consultas de reportes en el repositorio (por proceso)
+    QUERY_CACHE_ENABLED = os.getenv('QUERY_CACHE_ENABLED', 'True').lower() == 'true'
+    QUERY_CACHE_TTL_SECONDS = float(os.getenv('QUERY_CACHE_TTL_SECONDS', '60'))
+    QUERY_CACHE_MAX_ENTRIES = int(os.getenv('QUERY_CACHE_MAX_ENTRIES', '2048'))
+    
+    # Cache de reportes armados en OrderService (por proceso)
+    REPORT_CACHE_ENABLED = os.getenv('REPORT_CACHE_ENABLED', 'True').lower() == 'true'
+    REPORT_CACHE_TTL_SECONDS = float(os.getenv('REPORT_CACHE_TTL_SECONDS', '60'))
+    REPORT_CACHE_MAX_ENTRIES = int(os.getenv('REPORT_CACHE_MAX_ENTRIES', '256'))
+    
+    # Instantánea del reporte de top clientes: la recalcula un solo worker (PostgreSQL)
+    TOP_CLIENTS_SNAPSHOT_ENABLED = os.getenv('TOP_CLIENTS_SNAPSHOT_ENABLED', 'True').lower() == 'true'
+    TOP_CLIENTS_SNAPSHOT_REFRESH_SECONDS = float(os.getenv('TOP_CLIENTS_SNAPSHOT_REFRESH_SECONDS', '300'))
+    
+    # Top aproximado de productos y clientes (mode=approx): resúmenes Space-Saving por worker
+    HEAVY_HITTERS_ENABLED = os.getenv('HEAVY_HITTERS_ENABLED', 'True').lower() == 'true'
+    HEAVY_HITTERS_CAPACITY = int(os.getenv('HEAVY_HITTERS_CAPACITY', '256'))
+    HEAVY_HITTERS_FLUSH_SECONDS = float(os.getenv('HEAVY_HITTERS_FLUSH_SECONDS', '30'))
+    HEAVY_HITTERS_RETENTION_MONTHS = int(os.getenv('HEAVY_HITTERS_RETENTION_MONTHS', '13'))
+    HEAVY_HITTERS_STALE_SECONDS = float(os.getenv('HEAVY_HITTERS_STALE_SECONDS', '3600'))
 
 
 class DevelopmentConfig(Config):
@@ -1,8 +1,10 @@
 """
 Controlador base para todos los controladores
 """
-from typing import Any, Dict, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from flask import Response
 from flask_restful import Resource
+from ..utils.json_stream import stream_list_response
 
 
 class BaseController(Resource):
@@ -37,3 +39,55 @@ class BaseController(Resource):
         if data is not None:
             response["data"] = data
         return response, 201
+    
+    def is_stream_requested(self) -> bool:
+        """Indica si la petición pidió la respuesta en streaming (?stream=true)"""
+        from flask import request
+        stream = request.args.get('stream', type=str) or ''
+        return stream.lower() in ('true', '1')
+    
+    def get_list_arg(self, name: str) -> Optional[List[str]]:
+        """Lee un parámetro de query separado por comas; None si no se envió"""
+        from flask import request
+        value = request.args.get(name, type=str)
+        if value is None:
+            return None
+        return [part.strip() for part in value.split(',') if part.strip()]
+    
+    def listing_variant(self) -> str:
+        """Parámetros de query que cambian la representación de un listado (para el ETag)"""
+        from flask import request
+        return f"{request.args.get('fields', type=str) or ''}|{request.args.get('include', type=str) or ''}"
+    
+    def projected_list_response(self, chunks: Iterator[List[dict]], message: str, empty_message: str):
+        """
+        Respuesta de un listado ya proyectado a diccionarios
+        
+        Con ?stream=true se envía en streaming; en caso contrario se arma la lista completa.
+        """
+        if self.is_stream_requested():
+            return stream_list_response(chunks, message, empty_message, serializer=list)
+        data = [projection for chunk in chunks for projection in chunk]
+        return self.success_response(data=data, message=message if data else empty_message)
+    
+    def not_modified_response(self, etag: str) -> Optional[Response]:
+        """
+        Resuelve una petición condicional (If-None-Match) contra el ETag del recurso
+        
+        Si el cliente ya tiene esa versión devuelve una respuesta 304 sin cuerpo; en
+        caso contrario retorna None y agrega el header ETag a la respuesta 200.
+        El ETag es débil porque el cuerpo puede viajar comprimido o en streaming.
+        """
+        from flask import request, after_this_request
+        if request.if_none_match.contains_weak(etag):
+            response = Response(status=304)
+            response.set_etag(etag, weak=True)
+            return response
+        
+        @after_this_request
+        def add_etag(response):
+            if response.status_code == 200:
+                response.set_etag(etag, weak=True)
+            return response
+        
+        return None
@@ -0,0 +1,94 @@
+"""
+Controlador para el feed incremental de cambios de pedidos
+"""
+import uuid
+from flask import request
+from ..services.order_service import OrderService
+from ..repositories.order_repository import OrderRepository
+from ..exceptions.custom_exceptions import OrderValidationError, OrderBusinessLogicError
+from .base_controller import BaseController
+from ..config.database import auto_close_session
+from ..models.order import serialize_orders
+from ..config.settings import get_config
+
+
+class OrderChangesController(BaseController):
+    """Controlador para los cambios de pedidos desde un cursor"""
+    
+    def __init__(self):
+        from ..config.database import SessionLocal
+        session = SessionLocal()
+        self.order_repository = OrderRepository(session)
+        self.order_service = OrderService(self.order_repository)
+    
+    @auto_close_session
+    def get(self):
+        """
+        Obtiene los pedidos creados o modificados después de un cursor
+        
+        Query params:
+            client_id, vendor_id o assigned_truck (requerido uno): Filtro del feed
+            cursor (opcional): next_cursor de la respuesta anterior; sin cursor se empieza desde el principio
+            limit (opcional): Pedidos por página (default: ORDER_CHANGES_DEFAULT_LIMIT)
+        
+        Returns:
+            JSON con los pedidos, next_cursor y has_more
+        """
+        config = get_config()
+        client_id = request.args.get('client_id', type=str)
+        vendor_id = request.args.get('vendor_id', type=str)
+        assigned_truck = request.args.get('assigned_truck', type=str)
+        cursor = request.args.get('cursor', type=str)
+        limit = request.args.get('limit', config.ORDER_CHANGES_DEFAULT_LIMIT, type=int)
+        
+        try:
+            filters = [value for value in (client_id, vendor_id, assigned_truck) if value]
+            if len(filters) != 1:
+                return self.error_response(
+                    "Error de validación",
+                    "Debe proporcionar solo uno de client_id, vendor_id o assigned_truck",
+                    400
+                )
+            
+            for name, value in (('client_id', client_id), ('vendor_id', vendor_id)):
+                if value:
+                    try:
+                        uuid.UUID(value)
+                    except ValueError:
+                        return self.error_response(
+                            "Error de validación",
+                            f"El {name} debe ser un UUID válido",
+                            400
+                        )
+            
+            if limit < 1 or limit > config.ORDER_CHANGES_MAX_LIMIT:
+                return self.error_response(
+                    "Error de validación",
+                    f"El parámetro 'limit' debe estar entre 1 y {config.ORDER_CHANGES_MAX_LIMIT}",
+                    400
+                )
+            
+            changes = self.order_service.get_order_changes(
+                cursor=cursor,
+                limit=limit,
+                client_id=client_id,
+                vendor_id=vendor_id,
+                assigned_truck=assigned_truck,
+                settle_seconds=config.ORDER_CHANGES_SETTLE_SECONDS
+            )
+            
+            return self.success_response(
+                data={
+                    'orders': serialize_orders(changes['orders']),
+                    'next_cursor': changes['next_cursor'],
+                    'has_more': changes['has_more']
+                },
+                message="Cambios de pedidos obtenidos exitosamente" if changes['orders'] else "No hay cambios de pedidos"
+            )
+        
+        except OrderValidationError as e:
+            return self.error_response("Error de validación", str(e), 400)
+        except OrderBusinessLogicError as e:
+            return self.error_response("Error de lógica de negocio", str(e), 500)
+        except Exception as e:
+            return self.error_response("Error interno del servidor", str(e), 500)
@@ -9,6 +9,9 @@ from ..repositories.order_repository import OrderRepository
 from ..exceptions.custom_exceptions import OrderNotFoundError, OrderValidationError, OrderBusinessLogicError
 from .base_controller import BaseController
 from ..config.database import auto_close_session
+from ..models.order import serialize_orders
+from ..config.settings import get_config
+from ..utils.json_stream import stream_list_response
 
 
 class OrderController(BaseController):
@@ -59,6 +62,42 @@ class OrderController(BaseController):
                         400
                     )
             
+            # Si el cliente ya tiene la versión actual del listado no se leen ni enriquecen los pedidos
+            etag = self.order_service.get_listing_etag(
+                client_id=client_id,
+                vendor_id=None if client_id else vendor_id,
+                variant=self.listing_variant()
+            )
+            not_modified = self.not_modified_response(etag)
+            if not_modified is not None:
+                return not_modified
+            
+            fields = self.get_list_arg('fields')
+            if fields is not None:
+                return self.projected_list_response(
+                    self.order_service.iter_order_projections(
+                        fields,
+                        self.get_list_arg('include'),
+                        client_id=client_id,
+                        vendor_id=None if client_id else vendor_id,
+                        chunk_size=get_config().ORDER_STREAM_CHUNK_SIZE
+                    ),
+                    message="Pedidos obtenidos exitosamente",
+                    empty_message="No tienes entregas programadas en este momento"
+                )
+            
+            if self.is_stream_requested():
+                return stream_list_response(
+                    self.order_service.iter_enriched_orders(
+                        client_id=client_id,
+                        vendor_id=None if client_id else vendor_id,
+                        chunk_size=get_config().ORDER_STREAM_CHUNK_SIZE
+                    ),
+                    message="Pedidos obtenidos exitosamente",
+                    empty_message="No tienes entregas programadas en este momento",
+                    serializer=serialize_orders
+                )
+            
             # Obtener pedidos según el tipo de usuario
             if client_id:
                 orders = self.order_service.get_orders_by_client(client_id)
@@ -80,7 +119,7 @@ class OrderController(BaseController):
                 )
             
             return self.success_response(
-                data=[order.to_dict() for order in enriched_orders],
+                data=serialize_orders(enriched_orders),
                 message="Pedidos obtenidos exitosamente"
             )
             
@@ -7,9 +7,12 @@ from flask import request
 from typing import Dict, Any, Tuple
 from ..services.order_service import OrderService
 from ..repositories.order_repository import OrderRepository
-from ..exceptions.custom_exceptions import OrderValidationError, OrderBusinessLogicError
+from ..exceptions.custom_exceptions import OrderValidationError, OrderBusinessLogicError, OrderIdempotencyConflictError
 from .base_controller import BaseController
 from ..config.database import auto_close_session
+from ..config.settings import get_config
+from ..utils.idempotency import idempotency_store
+from ..schemas.order_schemas import load_create_order_command
 
 logger = logging.getLogger(__name__)
 
@@ -25,9 +28,32 @@ class OrderCreateController(BaseController, Resource):
         self.order_service = OrderService(self.order_repository)
     
     @auto_close_session
-    def post(self) -> Tuple[Dict[str, Any], int]:
+    def post(self):
         """POST /orders - Crear un nuevo pedido"""
         logger.info("POST /orders/create - Iniciando creacion de pedido")
+        idempotency_key = request.headers.get('Idempotency-Key')
+        if idempotency_key is None:
+            return self._create_order()
+        
+        idempotency_key = idempotency_key.strip()
+        if not idempotency_key or len(idempotency_key) > 255:
+            return self.error_response("Error de validación", "El header 'Idempotency-Key' debe tener entre 1 y 255 caracteres", 422)
+        
+        try:
+            fingerprint = idempotency_store.fingerprint(request.get_data())
+            (response, status_code), replayed = idempotency_store.execute(
+                idempotency_key, fingerprint, self._create_order
+            )
+        except OrderIdempotencyConflictError as e:
+            return self.error_response("Conflicto de idempotencia", str(e), 409)
+        
+        return response, status_code, {
+            'Idempotency-Key': idempotency_key,
+            'Idempotent-Replayed': 'true' if replayed else 'false'
+        }
+    
+    def _create_order(self) -> Tuple[Dict[str, Any], int]:
+        """Valida el cuerpo de la petición y crea el pedido"""
         try:
             try:
                 data = request.get_json()
@@ -37,46 +63,95 @@ class OrderCreateController(BaseController, Resource):
             if not data:
                 return self.error_response("Error de validación", "Se requiere un cuerpo JSON", 422)
 
-            if not data.get('client_id') and not data.get('vendor_id'):
-                return self.error_response("Error de validación", "Debe proporcionar al menos 'client_id' o 'vendor_id'", 422)
+            command = load_create_order_command(data)
+
+            logger.debug("Invocando order_service.create_order")
+            order = self.order_service.create_order(command)
+            
+            return self.created_response(
+                data=order.to_dict(),
+                message="Pedido creado exitosamente"
+            )
+            
+        except OrderValidationError as e:
+            return self.error_response("Error de validación", str(e), 422)
+        except OrderBusinessLogicError as e:
+            return self.error_response("Error de lógica de negocio", str(e), 422)
+        except Exception as e:
+            return self.error_response("Error interno del servidor", str(e), 500)
+
+
+class OrderCreateBatchController(BaseController, Resource):
+    """Controlador para creación masiva de pedidos"""
+    
+    def __init__(self):
+        from ..config.database import SessionLocal
+        session = SessionLocal()
+        self.order_repository = OrderRepository(session)
+        self.order_service = OrderService(self.order_repository)
+    
+    @auto_close_session
+    def post(self) -> Tuple[Dict[str, Any], int]:
+        """
+        POST /orders/create-batch - Crea varios pedidos en una sola operación
+        
+        Body:
+            orders (requerido): Lista de pedidos con el mismo formato de /orders/create
             
-            if 'items' not in data:
-                return self.error_response("Error de validación", "El campo 'items' es obligatorio", 422)
+        Returns:
+            JSON con el resultado de cada pedido en el mismo orden de entrada
+        """
+        logger.info("POST /orders/create-batch - Iniciando creacion masiva de pedidos")
+        try:
+            try:
+                data = request.get_json()
+            except Exception:
+                return self.error_response("Error de validación", "Se requiere un cuerpo JSON válido", 422)
             
-            if not isinstance(data['items'], list) or len(data['items']) == 0:
-                return self.error_response("Error de validación", "El pedido debe tener al menos un item", 422)
+            if not data or not isinstance(data, dict):
+                return self.error_response("Error de validación", "Se requiere un cuerpo JSON", 422)
             
-            if not data.get('total_amount'):
-                return self.error_response("Error de validación", "El campo 'total_amount' es obligatorio", 422)
+            orders_data = data.get('orders')
+            if not isinstance(orders_data, list) or len(orders_data) == 0:
+                return self.error_response("Error de validación", "El campo 'orders' debe ser una lista con al menos un pedido", 422)
             
-            if not isinstance(data['total_amount'], (int, float)) or data['total_amount'] <= 0:
-                return self.error_response("Error de validación", "El 'total_amount' debe ser un número mayor a 0", 422)
+            max_size = get_config().ORDER_BATCH_MAX_SIZE
+            if len(orders_data) > max_size:
+                return self.error_response("Error de validación", f"El lote no puede tener más de {max_size} pedidos", 422)
             
-            if not data.get('scheduled_delivery_date'):
-                return self.error_response("Error de validación", "El campo 'scheduled_delivery_date' es obligatorio", 422)
-
-            try:
-                from datetime import datetime
-                scheduled_date = datetime.fromisoformat(data['scheduled_delivery_date'].replace('Z', '+00:00'))
-
-                if scheduled_date < datetime.now(scheduled_date.tzinfo):
-                    return self.error_response("Error de validación", "La fecha programada no puede ser en el pasado", 422)
-            except (ValueError, AttributeError):
-                return self.error_response("Error de validación", "El 'scheduled_delivery_date' debe tener formato ISO 8601 válido", 422)
-
-            for i, item in enumerate(data['items']):
-                if not item.get('product_id'):
-                    return self.error_response("Error de validación", f"El item {i+1} debe tener un 'product_id'", 422)
-                
-                if not item.get('quantity') or not isinstance(item['quantity'], (int, float)) or item['quantity'] <= 0:
-                    return self.error_response("Error de validación", f"El item {i+1} debe tener una 'quantity' válida mayor a 0", 422)
-
-            logger.debug("Invocando order_service.create_order")
-            order = self.order_service.create_order(data)
+            results = self.order_service.create_orders_batch(orders_data)
+            
+            serialized_results = []
+            for result in results:
+                if result['success']:
+                    serialized_results.append({
+                        'index': result['index'],
+                        'success': True,
+                        'data': result['order'].to_dict()
+                    })
+                else:
+                    serialized_results.append(result)
+            
+            created = sum(1 for result in results if result['success'])
+            batch_data = {
+                'summary': {
+                    'total': len(results),
+                    'created': created,
+                    'failed': len(results) - created
+                },
+                'results': serialized_results
+            }
+            
+            if created == 0:
+                response, status_code = self.error_response(
+                    "Error de validación", "Ningún pedido del lote es válido", 422
+                )
+                response['data'] = batch_data
+                return response, status_code
             
             return self.created_response(
-                data=order.to_dict(),
-                message="Pedido creado exitosamente"
+                data=batch_data,
+                message=f"{created} de {len(results)} pedidos creados exitosamente"
             )
             
         except OrderValidationError as e:
@@ -0,0 +1,107 @@
+"""
+Controlador para el stream de eventos (SSE) de cambios de estado de pedidos
+"""
+import json
+import logging
+import uuid
+from typing import Iterator
+from flask import Response, request
+from .base_controller import BaseController
+from ..config.settings import get_config
+from ..exceptions.custom_exceptions import OrderEventsUnavailableError
+from ..utils.order_events import OrderEventSubscription, order_event_hub
+
+logger = logging.getLogger(__name__)
+
+# Tipos de evento que se envían a los clientes: altas y cambios de estado
+STATUS_EVENT_TYPES = ('created', 'updated', 'deleted', 'resync', 'deleted_all')
+
+
+class OrderEventsController(BaseController):
+    """
+    Controlador para los eventos de estado de pedidos en Server-Sent Events
+    
+    No usa la base de datos: las conexiones se suscriben al hub de eventos del
+    proceso, que recibe los cambios por un único listener compartido.
+    """
+    
+    def get(self):
+        """
+        Abre un stream text/event-stream con los cambios de estado de los pedidos
+        
+        Query params:
+            client_id, vendor_id o assigned_truck (requerido uno): Pedidos a seguir
+        
+        Returns:
+            Respuesta en streaming con un evento 'order_status' por cada cambio
+        """
+        client_id = request.args.get('client_id', type=str)
+        vendor_id = request.args.get('vendor_id', type=str)
+        assigned_truck = request.args.get('assigned_truck', type=str)
+        
+        filters = [value for value in (client_id, vendor_id, assigned_truck) if value]
+        if len(filters) != 1:
+            return self.error_response(
+                "Error de validación",
+                "Debe proporcionar solo uno de client_id, vendor_id o assigned_truck",
+                400
+            )
+        
+        for name, value in (('client_id', client_id), ('vendor_id', vendor_id)):
+            if value:
+                try:
+                    uuid.UUID(value)
+                except ValueError:
+                    return self.error_response(
+                        "Error de validación",
+                        f"El {name} debe ser un UUID válido",
+                        400
+                    )
+        
+        try:
+            subscription = order_event_hub.subscribe(
+                client_id=client_id,
+                vendor_id=vendor_id,
+                assigned_truck=assigned_truck
+            )
+        except OrderEventsUnavailableError as e:
+            return self.error_response("Servicio no disponible", str(e), 503)
+        
+        response = Response(
+            self._stream(subscription, get_config().ORDER_EVENTS_HEARTBEAT_SECONDS),
+            status=200,
+            mimetype='text/event-stream'
+        )
+        response.headers['Cache-Control'] = 'no-cache'
+        # Evita que un proxy (nginx) acumule los eventos antes de enviarlos
+        response.headers['X-Accel-Buffering'] = 'no'
+        return response
+    
+    @staticmethod
+    def _stream(subscription: OrderEventSubscription, heartbeat_seconds: float) -> Iterator[str]:
+        """Genera los eventos SSE; la suscripción se libera cuando el cliente se desconecta"""
+        try:
+            yield "retry: 5000\n\n"
+            while True:
+                event = subscription.get(timeout=heartbeat_seconds)
+                if event is None:
+                    # Comentario SSE: mantiene viva la conexión y detecta clientes desconectados
+                    yield ": keep-alive\n\n"
+                    continue
+                if not OrderEventsController._is_status_event(event):
+                    continue
+                yield f"event: order_status\ndata: {json.dumps(event)}\n\n"
+        finally:
+            order_event_hub.unsubscribe(subscription)
+            if subscription.dropped:
+                logger.warning(f"Suscripción de eventos cerrada con {subscription.dropped} eventos descartados")
+    
+    @staticmethod
+    def _is_status_event(event: dict) -> bool:
+        """Solo se envían altas, bajas y modificaciones que cambian el estado (o la asignación) del pedido"""
+        if event.get('type') not in STATUS_EVENT_TYPES:
+            return False
+        if event.get('type') != 'updated':
+            return True
+        previous = event.get('previous') or {}
+        return any(event.get(name) != previous.get(name) for name in ('status', 'client_id', 'vendor_id', 'assigned_truck'))
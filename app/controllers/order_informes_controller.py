@@ -191,4 +191,177 @@ class OrderSellerMonthlyController(BaseController):
             return self.error_response("Error interno del servidor", str(e), 500)
 
 
+class OrderSellerActiveClientsController(BaseController):
+    """Controlador para informe de clientes activos por vendedor"""
+    
+    def __init__(self):
+        from ..config.database import SessionLocal
+        session = SessionLocal()
+        self.order_repository = OrderRepository(session)
+        self.order_service = OrderService(self.order_repository)
+    
+    @auto_close_session
+    def get(self):
+        """
+        Obtiene los clientes asignados a un vendedor con pedidos en cada mes y en todo el rango
+        
+        Query params:
+            seller_id (requerido): UUID del vendedor
+            start_month (opcional): Mes inicial YYYY-MM (default: hace 11 meses)
+            end_month (opcional): Mes final YYYY-MM (default: mes actual)
+            
+        Returns:
+            JSON con clientes activos estimados por mes y del rango
+        """
+        try:
+            seller_id = request.args.get('seller_id', type=str)
+            start_month = request.args.get('start_month', type=str)
+            end_month = request.args.get('end_month', type=str)
+            
+            if not seller_id:
+                return self.error_response(
+                    "Error de validación",
+                    "El parámetro 'seller_id' es obligatorio",
+                    400
+                )
+            
+            try:
+                uuid.UUID(seller_id)
+            except ValueError:
+                return self.error_response(
+                    "Error de validación",
+                    "El 'seller_id' debe ser un UUID válido",
+                    400
+                )
+            
+            report_data = self.order_service.get_seller_active_clients(seller_id, start_month, end_month)
+            
+            return self.success_response(
+                data=report_data,
+                message="Informe de clientes activos generado exitosamente"
+            )
+            
+        except OrderValidationError as e:
+            return self.error_response("Error de validación", str(e), 400)
+        except OrderBusinessLogicError as e:
+            return self.error_response("Error de lógica de negocio", str(e), 500)
+        except Exception as e:
+            return self.error_response("Error interno del servidor", str(e), 500)
 
+
+class OrderSellersBatchController(BaseController):
+    """Controlador para informes de estados y mensual de varios vendedores"""
+    
+    def __init__(self):
+        from ..config.database import SessionLocal
+        session = SessionLocal()
+        self.order_repository = OrderRepository(session)
+        self.order_service = OrderService(self.order_repository)
+    
+    @auto_close_session
+    def get(self):
+        """
+        Obtiene el informe de estados y el informe mensual de varios vendedores
+        
+        Query params:
+            seller_ids (requerido): UUIDs de los vendedores separados por comas
+            
+        Returns:
+            JSON con los informes de cada vendedor, indexados por seller_id
+        """
+        try:
+            seller_ids = self.get_list_arg('seller_ids')
+            
+            if not seller_ids:
+                return self.error_response(
+                    "Error de validación",
+                    "El parámetro 'seller_ids' es obligatorio",
+                    400
+                )
+            
+            for seller_id in seller_ids:
+                try:
+                    uuid.UUID(seller_id)
+                except ValueError:
+                    return self.error_response(
+                        "Error de validación",
+                        f"El seller_id '{seller_id}' debe ser un UUID válido",
+                        400
+                    )
+            
+            report_data = self.order_service.get_sellers_batch_informes(seller_ids)
+            
+            return self.success_response(
+                data=report_data,
+                message="Informes de vendedores generados exitosamente"
+            )
+            
+        except OrderValidationError as e:
+            return self.error_response("Error de validación", str(e), 400)
+        except OrderBusinessLogicError as e:
+            return self.error_response("Error de lógica de negocio", str(e), 500)
+        except Exception as e:
+            return self.error_response("Error interno del servidor", str(e), 500)
+
+
+class OrderSellerDashboardController(BaseController):
+    """Controlador para el tablero de informes de un vendedor"""
+    
+    def __init__(self):
+        from ..config.database import SessionLocal
+        session = SessionLocal()
+        self.order_repository = OrderRepository(session)
+        self.order_service = OrderService(self.order_repository)
+    
+    @auto_close_session
+    def get(self):
+        """
+        Obtiene el informe de estados, el informe mensual y la primera página de clientes de un vendedor
+        
+        Query params:
+            seller_id (requerido): UUID del vendedor
+            per_page (opcional): Clientes de la primera página (default: 10, max: 100)
+            
+        Returns:
+            JSON con los bloques status, monthly y clients del vendedor
+        """
+        try:
+            seller_id = request.args.get('seller_id', type=str)
+            per_page = request.args.get('per_page', 10, type=int)
+            
+            if not seller_id:
+                return self.error_response(
+                    "Error de validación",
+                    "El parámetro 'seller_id' es obligatorio",
+                    400
+                )
+            
+            try:
+                uuid.UUID(seller_id)
+            except ValueError:
+                return self.error_response(
+                    "Error de validación",
+                    "El 'seller_id' debe ser un UUID válido",
+                    400
+                )
+            
+            if per_page < 1 or per_page > 100:
+                return self.error_response(
+                    "Error de validación",
+                    "El parámetro 'per_page' debe estar entre 1 y 100",
+                    400
+                )
+            
+            report_data = self.order_service.get_seller_dashboard(seller_id, per_page)
+            
+            return self.success_response(
+                data=report_data,
+                message="Tablero de vendedor generado exitosamente"
+            )
+            
+        except OrderValidationError as e:
+            return self.error_response("Error de validación", str(e), 400)
+        except OrderBusinessLogicError as e:
+            return self.error_response("Error de lógica de negocio", str(e), 500)
+        except Exception as e:
+            return self.error_response("Error interno del servidor", str(e), 500)
@@ -52,6 +52,61 @@ class OrderMonthlyReportController(BaseController):
             return self.error_response("Error interno del servidor", str(e), 500)
 
 
+class OrderTimeSeriesReportController(BaseController):
+    """Controlador para la serie de pedidos por día, semana, mes o trimestre"""
+    
+    def __init__(self):
+        from ..config.database import SessionLocal
+        session = SessionLocal()
+        self.order_repository = OrderRepository(session)
+        self.order_service = OrderService(self.order_repository)
+    
+    @auto_close_session
+    def get(self):
+        """
+        Obtiene la cantidad de pedidos y el monto total por intervalo de tiempo
+        
+        Query params:
+            start_date (opcional): Fecha inicial YYYY-MM-DD (default: primer día del mes de hace 11 meses)
+            end_date (opcional): Fecha final YYYY-MM-DD (default: hoy)
+            granularity (opcional): day, week, month o quarter (default: month)
+            client_ids (opcional): IDs de clientes separados por comas
+            status (opcional): Estados separados por comas
+            assigned_truck (opcional): Camión asignado
+        
+        Returns:
+            JSON con granularity, period, filters, summary y buckets (todos los
+            intervalos del rango, con cero los que no tienen pedidos)
+        """
+        try:
+            report_data = self.order_service.get_orders_time_series(
+                start_date=request.args.get('start_date', type=str),
+                end_date=request.args.get('end_date', type=str),
+                granularity=request.args.get('granularity', 'month', type=str),
+                client_ids=self.get_list_arg('client_ids'),
+                statuses=self.get_list_arg('status'),
+                assigned_truck=request.args.get('assigned_truck', type=str)
+            )
+            
+            if not report_data['summary']['total_orders']:
+                return self.success_response(
+                    data=report_data,
+                    message="No hay pedidos en el período"
+                )
+            
+            return self.success_response(
+                data=report_data,
+                message="Serie de pedidos generada exitosamente"
+            )
+            
+        except OrderValidationError as e:
+            return self.error_response("Error de validación", str(e), 400)
+        except OrderBusinessLogicError as e:
+            return self.error_response("Error de lógica de negocio", str(e), 500)
+        except Exception as e:
+            return self.error_response("Error interno del servidor", str(e), 500)
+
+
 class OrderTopClientsController(BaseController):
     """Controlador para reporte de top clientes"""
     
@@ -66,13 +121,19 @@ class OrderTopClientsController(BaseController):
         """
         Obtiene los top 5 clientes con más pedidos en el último trimestre
         
+        Query params:
+            mode (opcional): exact o approx (default: exact)
+        
         Returns:
             JSON con:
+                - mode: modo del reporte
                 - period: rango de fechas del trimestre
+                - approximation: total resumido, cota de error y capacidad (solo en modo approx)
                 - top_clients: lista con client_id, orders_count y client_name
         """
         try:
-            report_data = self.order_service.get_top_clients_report()
+            mode = request.args.get('mode', 'exact', type=str)
+            report_data = self.order_service.get_top_clients_report(mode=mode)
             
             if not report_data['top_clients']:
                 return self.success_response(
@@ -107,12 +168,22 @@ class OrderTopProductsController(BaseController):
         """
         Obtiene los top 10 productos más vendidos
         
+        Query params:
+            window (opcional): Ventana de días: 30d, 90d, 365d o all (default: all)
+            mode (opcional): exact o approx (default: exact)
+        
         Returns:
             JSON con:
+                - window: ventana consultada
+                - mode: modo del reporte
+                - period: primer y último día de la ventana
+                - approximation: total resumido, cota de error y capacidad (solo en modo approx)
                 - top_products: lista con product_id, total_sold y product_name
         """
         try:
-            report_data = self.order_service.get_top_products_report()
+            window = request.args.get('window', 'all', type=str)
+            mode = request.args.get('mode', 'exact', type=str)
+            report_data = self.order_service.get_top_products_report(window, mode=mode)
             
             if not report_data['top_products']:
                 return self.success_response(
@@ -5,6 +5,9 @@ from ..repositories.order_repository import OrderRepository
 from ..exceptions.custom_exceptions import OrderValidationError, OrderBusinessLogicError
 from .base_controller import BaseController
 from ..config.database import auto_close_session
+from ..models.order import serialize_orders
+from ..config.settings import get_config
+from ..utils.json_stream import stream_list_response
 
 
 class OrderTruckController(BaseController):
@@ -19,7 +22,58 @@ class OrderTruckController(BaseController):
         assigned_truck = request.args.get('assigned_truck', type=str, default=None)
         scheduled_delivery_date = request.args.get('scheduled_delivery_date', type=str, default=None)
         
+        filter_msg = []
+        if assigned_truck:
+            filter_msg.append(f"camión {assigned_truck}")
+        if scheduled_delivery_date:
+            filter_msg.append(f"fecha {scheduled_delivery_date}")
+        
+        empty_message = "No hay pedidos"
+        if filter_msg:
+            empty_message += f" para {' y '.join(filter_msg)}"
+        else:
+            empty_message += " en el sistema"
+        
+        message = "Pedidos obtenidos exitosamente"
+        if filter_msg:
+            message += f" (filtrados por: {', '.join(filter_msg)})"
+        
         try:
+            etag = self.order_service.get_listing_etag(
+                assigned_truck=assigned_truck,
+                scheduled_delivery_date=scheduled_delivery_date,
+                variant=self.listing_variant()
+            )
+            not_modified = self.not_modified_response(etag)
+            if not_modified is not None:
+                return not_modified
+            
+            fields = self.get_list_arg('fields')
+            if fields is not None:
+                return self.projected_list_response(
+                    self.order_service.iter_order_projections(
+                        fields,
+                        self.get_list_arg('include'),
+                        assigned_truck=assigned_truck,
+                        scheduled_delivery_date=scheduled_delivery_date,
+                        chunk_size=get_config().ORDER_STREAM_CHUNK_SIZE
+                    ),
+                    message=message,
+                    empty_message=empty_message
+                )
+            
+            if self.is_stream_requested():
+                return stream_list_response(
+                    self.order_service.iter_enriched_orders(
+                        assigned_truck=assigned_truck,
+                        scheduled_delivery_date=scheduled_delivery_date,
+                        chunk_size=get_config().ORDER_STREAM_CHUNK_SIZE
+                    ),
+                    message=message,
+                    empty_message=empty_message,
+                    serializer=serialize_orders
+                )
+            
             orders = self.order_service.get_orders_by_truck_and_date(assigned_truck, scheduled_delivery_date)
             
             enriched_orders = []
@@ -28,34 +82,13 @@ class OrderTruckController(BaseController):
                 enriched_orders.append(enriched_order)
             
             if not enriched_orders:
-                filter_msg = []
-                if assigned_truck:
-                    filter_msg.append(f"camión {assigned_truck}")
-                if scheduled_delivery_date:
-                    filter_msg.append(f"fecha {scheduled_delivery_date}")
-                
-                message = "No hay pedidos"
-                if filter_msg:
-                    message += f" para {' y '.join(filter_msg)}"
-                else:
-                    message += " en el sistema"
-                
                 return self.success_response(
                     data=[],
-                    message=message
+                    message=empty_message
                 )
             
-            message = "Pedidos obtenidos exitosamente"
-            if assigned_truck or scheduled_delivery_date:
-                filter_msg = []
-                if assigned_truck:
-                    filter_msg.append(f"camión {assigned_truck}")
-                if scheduled_delivery_date:
-                    filter_msg.append(f"fecha {scheduled_delivery_date}")
-                message += f" (filtrados por: {', '.join(filter_msg)})"
-            
             return self.success_response(
-                data=[order.to_dict() for order in enriched_orders],
+                data=serialize_orders(enriched_orders),
                 message=message
             )
             
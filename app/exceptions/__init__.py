@@ -1,6 +1,6 @@
 """
 Excepciones personalizadas de la aplicación
 """
-from .custom_exceptions import OrdersException, OrderNotFoundError, OrderValidationError, OrderBusinessLogicError
+from .custom_exceptions import OrdersException, OrderNotFoundError, OrderValidationError, OrderBusinessLogicError, OrderIdempotencyConflictError
 
-__all__ = ['OrdersException', 'OrderNotFoundError', 'OrderValidationError', 'OrderBusinessLogicError']
+__all__ = ['OrdersException', 'OrderNotFoundError', 'OrderValidationError', 'OrderBusinessLogicError', 'OrderIdempotencyConflictError']
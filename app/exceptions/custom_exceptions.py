@@ -21,3 +21,18 @@ class OrderValidationError(OrdersException):
 class OrderBusinessLogicError(OrdersException):
     """Excepción de lógica de negocio de pedidos"""
     pass
+
+
+class OrderIdempotencyConflictError(OrdersException):
+    """Excepción cuando una Idempotency-Key se reutiliza con otra petición o sigue en curso"""
+    pass
+
+
+class OrderNumberConflictError(OrdersException):
+    """Excepción cuando el número de pedido asignado ya existe en la base de datos"""
+    pass
+
+
+class OrderEventsUnavailableError(OrdersException):
+    """Excepción cuando no se pueden abrir más suscripciones a eventos de pedidos"""
+    pass
@@ -2,6 +2,7 @@
 Integración con el microservicio de Autenticación
 """
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict
 
 logger = logging.getLogger(__name__)
@@ -10,6 +11,9 @@ logger = logging.getLogger(__name__)
 class AuthIntegration:
     """Integración para operaciones con el microservicio de Autenticación"""
     
+    # Consultas simultáneas de clientes asignados en get_assigned_clients_batch
+    ASSIGNMENTS_MAX_WORKERS = 8
+    
     def __init__(self, auth_service):
         self.auth_service = auth_service
     
@@ -39,4 +43,20 @@ class AuthIntegration:
         """
         logger.info(f"Obteniendo clientes asignados para vendedor {seller_id}")
         return self.auth_service.get_assigned_clients(seller_id)
-
+    
+    def get_assigned_clients_batch(self, seller_ids: List[str]) -> Dict[str, List[str]]:
+        """
+        Obtiene los client_id asignados a varios vendedores con consultas simultáneas
+        
+        Args:
+            seller_ids: Lista de IDs de vendedores
+            
+        Returns:
+            Diccionario {seller_id: lista de client_id asignados}, en el orden de seller_ids
+        """
+        if not seller_ids:
+            return {}
+        logger.info(f"Obteniendo clientes asignados para {len(seller_ids)} vendedores")
+        with ThreadPoolExecutor(max_workers=min(self.ASSIGNMENTS_MAX_WORKERS, len(seller_ids))) as executor:
+            assigned_clients = list(executor.map(self.auth_service.get_assigned_clients, seller_ids))
+        return dict(zip(seller_ids, assigned_clients))
@@ -66,25 +66,36 @@ class InventoryIntegration:
             logger.error(f"Error actualizando stock: {str(e)}")
             logger.info(f"Iniciando compensación para {len(successfully_updated_items)} productos")
             
-            for item in successfully_updated_items:
-                try:
-                    logger.info(f"Compensando producto {item['product_id']} con cantidad {item['quantity']}")
-                    self.inventory_service._make_request(
-                        "PUT", 
-                        f"/products/{item['product_id']}/stock", 
-                        json={
-                            "operation": "add",
-                            "quantity": item['quantity'],
-                            "reason": "compensation"
-                        }
-                    )
-                    logger.info(f"Producto {item['product_id']} compensado exitosamente")
-                except Exception as compensation_error:
-                    logger.error(f"Error compensando producto {item['product_id']}: {compensation_error}")
+            self.compensate_products_stock(successfully_updated_items)
             
             logger.error(f"Compensación completada. Re-lanzando error original: {str(e)}")
             raise e
     
+    def compensate_products_stock(self, items: List[Dict[str, Any]]) -> None:
+        """
+        Devuelve al inventario el stock descontado de los productos
+        
+        Los errores se registran por producto y no interrumpen la compensación de los demás.
+        
+        Args:
+            items: Lista de items con product_id y quantity ya descontados
+        """
+        for item in items:
+            try:
+                logger.info(f"Compensando producto {item['product_id']} con cantidad {item['quantity']}")
+                self.inventory_service._make_request(
+                    "PUT", 
+                    f"/products/{item['product_id']}/stock", 
+                    json={
+                        "operation": "add",
+                        "quantity": item['quantity'],
+                        "reason": "compensation"
+                    }
+                )
+                logger.info(f"Producto {item['product_id']} compensado exitosamente")
+            except Exception as compensation_error:
+                logger.error(f"Error compensando producto {item['product_id']}: {compensation_error}")
+    
     def get_product_names(self, product_ids: List[int]) -> Dict[int, str]:
         """
         Obtiene los nombres de múltiples productos por sus IDs
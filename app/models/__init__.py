@@ -1,8 +1,8 @@
 """
 Modelos de la aplicación
 """
-from .order import Order
+from .order import Order, serialize_orders
 from .order_item import OrderItem
 from .db_models import OrderDB, OrderItemDB
 
-__all__ = ['Order', 'OrderItem', 'OrderDB', 'OrderItemDB']
+__all__ = ['Order', 'serialize_orders', 'OrderItem', 'OrderDB', 'OrderItemDB']
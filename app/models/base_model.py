@@ -8,6 +8,9 @@ from typing import Dict, Any
 class BaseModel(ABC):
     """Modelo base con métodos comunes"""
     
+    # Sin __dict__ para que las subclases con __slots__ sean realmente compactas
+    __slots__ = ()
+    
     @abstractmethod
     def to_dict(self) -> Dict[str, Any]:
         """Convierte el modelo a diccionario"""
@@ -1,7 +1,7 @@
 """
 Modelos de base de datos para pedidos
 """
-from sqlalchemy import Column, Integer, String, DateTime, Float, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, Date, DateTime, Float, ForeignKey, Text, Sequence, Index
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -9,6 +9,16 @@ import enum
 
 Base = declarative_base()
 
+# La secuencia avanza por bloques: cada nextval reserva ORDER_NUMBER_BLOCK_SIZE
+# números de pedido que el proceso reparte en memoria (ver OrderNumberAllocator)
+ORDER_NUMBER_BLOCK_SIZE = 100
+order_number_sequence = Sequence(
+    'order_number_seq',
+    start=1,
+    increment=ORDER_NUMBER_BLOCK_SIZE,
+    metadata=Base.metadata
+)
+
 
 class OrderStatus(enum.Enum):
     """Estados válidos para un pedido"""
@@ -45,6 +55,15 @@ class OrderDB(Base):
     
     # Relación con items del pedido
     items = relationship("OrderItemDB", back_populates="order", cascade="all, delete-orphan")
+    
+    # Índices de los listados: resuelven el filtro y la versión (max(updated_at)) del ETag
+    __table_args__ = (
+        Index('ix_orders_client_id_updated_at', 'client_id', 'updated_at'),
+        Index('ix_orders_vendor_id_updated_at', 'vendor_id', 'updated_at'),
+        Index('ix_orders_truck_delivery_date', 'assigned_truck', 'scheduled_delivery_date'),
+        # Feed de cambios (/orders/changes): recorrido por cursor (updated_at, id)
+        Index('ix_orders_updated_at_id', 'updated_at', 'id'),
+    )
 
 
 class OrderItemDB(Base):
@@ -58,3 +77,101 @@ class OrderItemDB(Base):
     
     # Relación con el pedido
     order = relationship("OrderDB", back_populates="items")
+
+
+class OrderMonthlyStatsDB(Base):
+    """
+    Rollup mensual de pedidos por estado (mes de creación)
+    
+    Lo mantiene OrderRepository en la misma transacción que escribe los pedidos
+    (ver order_rollups); se reconstruye con `flask rollups rebuild`.
+    """
+    __tablename__ = 'order_monthly_stats'
+    
+    year = Column(Integer, primary_key=True)
+    month = Column(Integer, primary_key=True)
+    status = Column(String(50), primary_key=True)
+    orders_count = Column(Integer, nullable=False, default=0)
+    total_amount = Column(Float, nullable=False, default=0.0)
+
+
+class ClientDailyStatsDB(Base):
+    """
+    Rollup diario de pedidos por cliente y estado (día de creación)
+    
+    Alimenta los informes de vendedor; se mantiene igual que order_monthly_stats.
+    """
+    __tablename__ = 'client_daily_stats'
+    
+    client_id = Column(String(36), primary_key=True)
+    day = Column(Date, primary_key=True)
+    status = Column(String(50), primary_key=True)
+    orders_count = Column(Integer, nullable=False, default=0)
+    total_amount = Column(Float, nullable=False, default=0.0)
+
+
+class ProductDailyStatsDB(Base):
+    """
+    Rollup diario de unidades vendidas por producto (día de creación del pedido)
+    
+    Alimenta el reporte de top productos por ventana de días.
+    """
+    __tablename__ = 'product_daily_stats'
+    
+    product_id = Column(Integer, primary_key=True)
+    day = Column(Date, primary_key=True)
+    quantity_sold = Column(Integer, nullable=False, default=0)
+
+
+class ClientMonthlyStatsDB(Base):
+    """
+    Rollup mensual de pedidos por cliente (mes de creación)
+    
+    Una fila por cliente y mes con pedidos; los clientes activos de una cartera se
+    cuentan con COUNT(DISTINCT client_id) sobre estas filas.
+    """
+    __tablename__ = 'client_monthly_stats'
+    
+    client_id = Column(String(36), primary_key=True)
+    year = Column(Integer, primary_key=True)
+    month = Column(Integer, primary_key=True)
+    orders_count = Column(Integer, nullable=False, default=0)
+
+
+class ClientQuarterStatsDB(Base):
+    """
+    Instantánea de pedidos por cliente del último trimestre (reporte de top clientes)
+    
+    La recalcula periódicamente un solo worker (ver report_snapshots); el período y
+    la fecha de cálculo se guardan en report_snapshots.
+    """
+    __tablename__ = 'client_quarter_stats'
+    
+    client_id = Column(String(36), primary_key=True)
+    orders_count = Column(Integer, nullable=False, default=0)
+
+
+class ReportSnapshotDB(Base):
+    """Período y fecha de cálculo de cada instantánea de reporte"""
+    __tablename__ = 'report_snapshots'
+    
+    name = Column(String(50), primary_key=True)
+    window_start = Column(DateTime, nullable=False)
+    window_end = Column(DateTime, nullable=False)
+    refreshed_at = Column(DateTime, nullable=False)
+
+
+class HeavyHitterSketchDB(Base):
+    """
+    Resumen Space-Saving persistido por worker (ver heavy_hitters)
+    
+    period es el mes de creación de los pedidos (AAAA-MM) o 'all' para el histórico.
+    """
+    __tablename__ = 'heavy_hitter_sketches'
+    
+    name = Column(String(50), primary_key=True)
+    period = Column(String(7), primary_key=True)
+    worker_id = Column(String(100), primary_key=True)
+    total = Column(Integer, nullable=False, default=0)
+    counters = Column(Text, nullable=False)
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow)
@@ -12,6 +12,11 @@ import random
 class Order(BaseModel):
     """Modelo de Pedido"""
     
+    __slots__ = (
+        'id', 'order_number', 'client_id', 'vendor_id', 'status', 'total_amount',
+        'scheduled_delivery_date', 'assigned_truck', 'created_at', 'updated_at', 'items'
+    )
+    
     def __init__(
         self,
         order_number: str,
@@ -62,9 +67,9 @@ class Order(BaseModel):
         except ValueError:
             raise ValueError("La fecha en el número de pedido debe ser válida (YYYYMMDD)")
         
-        # Validar secuencia de 5 dígitos
-        if not parts[2].isdigit() or len(parts[2]) != 5:
-            raise ValueError("La secuencia del pedido debe ser de 5 dígitos")
+        # Validar secuencia de 5 dígitos o más (el valor completo de la secuencia)
+        if not parts[2].isdigit() or len(parts[2]) < 5:
+            raise ValueError("La secuencia del pedido debe ser de 5 dígitos o más")
     
     def _validate_client_and_vendor(self) -> None:
         """Valida que tenga al menos cliente o vendedor"""
@@ -104,26 +109,61 @@ class Order(BaseModel):
     
     def to_dict(self) -> dict:
         """Convierte el pedido a diccionario"""
+        scheduled = self.scheduled_delivery_date
+        return self._as_dict(scheduled.isoformat() if scheduled else None)
+    
+    def _as_dict(self, scheduled_delivery_date: Optional[str]) -> dict:
+        """Diccionario del pedido con la fecha de entrega ya formateada (ver serialize_orders)"""
+        created_at = self.created_at
+        updated_at = self.updated_at
         return {
-            'id': getattr(self, 'id', None),
+            'id': self.id,
             'order_number': self.order_number,
             'client_id': self.client_id,
             'vendor_id': self.vendor_id,
             'status': self.status,
             'total_amount': self.total_amount,
-            'scheduled_delivery_date': self.scheduled_delivery_date.isoformat() if self.scheduled_delivery_date else None,
+            'scheduled_delivery_date': scheduled_delivery_date,
             'assigned_truck': self.assigned_truck,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
+            'created_at': created_at.isoformat() if created_at else None,
+            'updated_at': updated_at.isoformat() if updated_at else None,
             'items': [item.to_dict() for item in self.items] if self.items else []
         }
     
     @staticmethod
-    def generate_order_number() -> str:
-        """Genera un número de pedido único"""
-        now = datetime.now()
-        date_str = now.strftime("%Y%m%d")
-        seconds_since_midnight = now.hour * 3600 + now.minute * 60 + now.second
-        microseconds = now.microsecond // 1000
-        sequence = str(seconds_since_midnight * 1000 + microseconds)[-5:]
-        return f"PED-{date_str}-{sequence}"
+    def generate_order_number(sequence: int, now: Optional[datetime] = None) -> str:
+        """
+        Genera el número de pedido PED-YYYYMMDD-XXXXX
+        
+        El sufijo es el valor completo de la secuencia (al menos 5 dígitos): como la
+        secuencia nunca repite valores, el número es único aunque cambie la fecha.
+        
+        Args:
+            sequence: Valor de la secuencia de base de datos asignado al pedido
+            now: Fecha del pedido (default: fecha actual)
+        """
+        now = now or datetime.now()
+        return f"PED-{now.strftime('%Y%m%d')}-{sequence:05d}"
+
+
+def serialize_orders(orders: List[Order]) -> List[dict]:
+    """
+    Serializa una lista de pedidos con sus items
+
+    Produce el mismo resultado que [order.to_dict() for order in orders] reutilizando
+    el isoformat() de las fechas de entrega repetidas (los listados por camión o por
+    cliente comparten pocas fechas).
+    """
+    dates: dict = {}
+    result = []
+    append = result.append
+    for order in orders:
+        scheduled = order.scheduled_delivery_date
+        if scheduled is None:
+            scheduled_iso = None
+        else:
+            scheduled_iso = dates.get(scheduled)
+            if scheduled_iso is None:
+                scheduled_iso = dates[scheduled] = scheduled.isoformat()
+        append(order._as_dict(scheduled_iso))
+    return result
@@ -8,6 +8,11 @@ from .base_model import BaseModel
 class OrderItem(BaseModel):
     """Modelo de Item del Pedido"""
     
+    __slots__ = (
+        'id', 'product_id', 'quantity', 'order_id',
+        'product_name', 'product_image_url', 'unit_price', 'product_sku'
+    )
+    
     def __init__(
         self,
         product_id: int,
@@ -51,7 +56,7 @@ class OrderItem(BaseModel):
     def to_dict(self) -> dict:
         """Convierte el item del pedido a diccionario"""
         return {
-            'id': getattr(self, 'id', None),
+            'id': self.id,
             'product_id': self.product_id,
             'product_name': self.product_name,
             'product_image_url': self.product_image_url,
@@ -0,0 +1,444 @@
+"""
+Top aproximado de productos y clientes (heavy hitters) alimentado por la creación de pedidos
+
+Cada worker mantiene en memoria un resumen Space-Saving por nombre ('products'
+pondera por cantidad vendida, 'clients' por pedido) y mes de creación, además del
+histórico ('all'). Un hilo HeavyHitterFlusher reemplaza cada
+HEAVY_HITTERS_FLUSH_SECONDS las filas del worker en heavy_hitter_sketches con sus
+resúmenes acumulados, y el proceso escribe lo pendiente al terminar. Una consulta
+combina las filas de los demás workers con los resúmenes locales, por lo que su
+costo depende de la capacidad y de la cantidad de filas, no del volumen de pedidos.
+
+Cada proceso escribe con un worker_id nuevo: las filas que nadie reescribe en
+HEAVY_HITTERS_STALE_SECONDS son de workers terminados y se combinan en una sola
+fila por resumen y período ('compacted'), así que su cantidad no crece con los
+reinicios.
+
+Las estimaciones sobreestiman la frecuencia real como máximo en total / capacidad.
+Los pedidos eliminados o modificados no se descuentan; la eliminación de todos los
+pedidos vacía los resúmenes de todos los workers.
+"""
+import json
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from ..utils.space_saving import SpaceSaving
+
+logger = logging.getLogger(__name__)
+
+# Período del resumen histórico
+ALL_PERIOD = 'all'
+
+# Resumen -> tipo de sus elementos
+HEAVY_HITTER_SKETCHES = {'products': int, 'clients': str}
+
+# worker_id de las filas que combinan los resúmenes de workers terminados
+COMPACTED_WORKER_ID = 'compacted'
+
+# Llave del advisory lock que evita que dos workers combinen filas a la vez
+HEAVY_HITTERS_COMPACT_LOCK_KEY = 7_340_047
+
+
+def _sketch_table():
+    from sqlalchemy import DateTime, Integer, column, table
+    return table(
+        'heavy_hitter_sketches',
+        column('name'),
+        column('period'),
+        column('worker_id'),
+        column('total', Integer()),
+        column('counters'),
+        column('updated_at', DateTime())
+    )
+
+
+def _new_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+def month_periods(since: date, until: date) -> List[str]:
+    """Meses AAAA-MM entre since y until (inclusive)"""
+    periods = []
+    year, month = since.year, since.month
+    while (year, month) <= (until.year, until.month):
+        periods.append(f"{year:04d}-{month:02d}")
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return periods
+
+
+class HeavyHitterTracker:
+    """
+    Resúmenes Space-Saving del proceso y su persistencia en heavy_hitter_sketches
+    
+    Args:
+        enabled: Si es False no se registran pedidos
+        capacity: Contadores de cada resumen
+        flush_seconds: Segundos mínimos entre escrituras de los resúmenes del worker
+        retention_months: Meses que se conservan (además del histórico)
+        stale_seconds: Segundos sin escribir tras los que las filas de un worker se combinan
+    """
+    
+    def __init__(self, enabled: bool = True, capacity: int = 256, flush_seconds: float = 30.0,
+                 retention_months: int = 13, stale_seconds: float = 3600.0):
+        self.enabled = enabled
+        self.capacity = capacity
+        self.flush_seconds = flush_seconds
+        self.retention_months = retention_months
+        self.stale_seconds = stale_seconds
+        self.session_factory: Optional[Callable] = None
+        self.worker_id = _new_worker_id()
+        self._sketches: Dict[Tuple[str, str], SpaceSaving] = {}
+        self._dirty = set()
+        self._last_flush = time.monotonic()
+        self._last_rewrite = time.monotonic()
+        self._flusher: Optional['HeavyHitterFlusher'] = None
+        self._lock = threading.Lock()
+    
+    def record_orders(self, orders: Iterable) -> None:
+        """Registra pedidos creados (después del commit)"""
+        if not self.enabled:
+            return
+        with self._lock:
+            for order in orders:
+                period = (order.created_at or datetime.utcnow()).strftime('%Y-%m')
+                if order.client_id:
+                    self._offer('clients', period, order.client_id, 1)
+                for item in getattr(order, 'items', None) or []:
+                    if item.product_id is not None and item.quantity:
+                        self._offer('products', period, item.product_id, item.quantity)
+    
+    def flush_if_due(self, session) -> None:
+        """
+        Escribe los resúmenes modificados si pasó flush_seconds desde la última escritura
+        
+        Cada stale_seconds / 2 reescribe todos los del worker aunque no cambiaran, para
+        que sus filas no se tomen por las de un worker terminado.
+        """
+        now = time.monotonic()
+        if now - self._last_flush < self.flush_seconds:
+            return
+        if now - self._last_rewrite >= self.stale_seconds / 2:
+            with self._lock:
+                self._dirty.update(self._sketches)
+            self._last_rewrite = now
+        if self._dirty:
+            self.flush(session)
+    
+    def flush(self, session) -> None:
+        """
+        Reemplaza las filas del worker con sus resúmenes modificados y elimina los meses vencidos
+        
+        Los errores se registran y los resúmenes quedan pendientes para la siguiente escritura.
+        """
+        retained = self._retained_periods()
+        with self._lock:
+            for key in [key for key in self._sketches if key[1] not in retained]:
+                del self._sketches[key]
+                self._dirty.discard(key)
+            pending = {key: self._sketches[key].to_payload() for key in self._dirty}
+            self._dirty.clear()
+            self._last_flush = time.monotonic()
+        if not pending:
+            return
+        
+        try:
+            now = datetime.utcnow()
+            self._write_rows(session, [
+                {
+                    'name': name,
+                    'period': period,
+                    'worker_id': self.worker_id,
+                    'total': payload['total'],
+                    'counters': json.dumps(payload['counters']),
+                    'updated_at': now
+                }
+                for (name, period), payload in pending.items()
+            ])
+            table = _sketch_table()
+            session.execute(
+                table.delete().where(table.c.period.not_in(sorted(retained)))
+            )
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            with self._lock:
+                self._dirty.update(key for key in pending if key in self._sketches)
+            logger.error(f"Error al guardar los resúmenes de top aproximado: {str(e)}")
+    
+    def top(self, session, name: str, since: Optional[date] = None, limit: int = 10) -> dict:
+        """
+        Top aproximado combinando los resúmenes de todos los workers
+        
+        Args:
+            session: Sesión de base de datos
+            name: 'products' o 'clients'
+            since: Primer día (se consideran los meses completos desde su mes); None para el histórico
+            limit: Cantidad de elementos
+        
+        Returns:
+            Diccionario con items (key, count, max_error), total (peso del flujo),
+            error_bound (sobreestimación máxima), capacity y start_date (primer día
+            del primer mes, None para el histórico)
+        """
+        from ..models.db_models import HeavyHitterSketchDB
+        
+        periods = [ALL_PERIOD] if since is None else month_periods(since, datetime.utcnow().date())
+        key_type = HEAVY_HITTER_SKETCHES[name]
+        rows = session.query(HeavyHitterSketchDB).filter(
+            HeavyHitterSketchDB.name == name,
+            HeavyHitterSketchDB.period.in_(periods),
+            HeavyHitterSketchDB.worker_id != self.worker_id
+        ).all()
+        summaries = [self._row_summary(row, key_type) for row in rows]
+        with self._lock:
+            # Los resúmenes locales incluyen lo que el worker aún no escribe
+            summaries.extend(
+                self._sketches[(name, period)].copy() for period in periods if (name, period) in self._sketches
+            )
+        merged = SpaceSaving.merge(summaries, self.capacity)
+        
+        return {
+            'items': merged.top(limit),
+            'total': merged.total,
+            'error_bound': merged.error_bound(),
+            'capacity': self.capacity,
+            'start_date': since.replace(day=1) if since is not None else None
+        }
+    
+    def compact_stale_workers(self, session) -> int:
+        """
+        Combina las filas de los workers terminados en una fila por resumen y período
+        
+        Una fila que nadie reescribe en stale_seconds es de un worker terminado: los
+        activos reescriben las suyas cada stale_seconds / 2. Solo se combinan las filas
+        que esta transacción elimina, y en PostgreSQL un advisory lock de transacción
+        evita que dos workers combinen a la vez. Los errores se registran.
+        
+        Returns:
+            Cantidad de filas combinadas
+        """
+        from sqlalchemy import text
+        from ..models.db_models import HeavyHitterSketchDB
+        
+        cutoff = datetime.utcnow() - timedelta(seconds=self.stale_seconds)
+        try:
+            if session.get_bind().dialect.name == 'postgresql':
+                locked = session.execute(
+                    text("SELECT pg_try_advisory_xact_lock(:key)"), {'key': HEAVY_HITTERS_COMPACT_LOCK_KEY}
+                ).scalar()
+                if not locked:
+                    session.rollback()
+                    return 0
+            stale = session.query(HeavyHitterSketchDB).filter(
+                HeavyHitterSketchDB.worker_id != COMPACTED_WORKER_ID,
+                HeavyHitterSketchDB.updated_at < cutoff
+            ).all()
+            
+            summaries: Dict[Tuple[str, str], List[SpaceSaving]] = {}
+            compacted_rows = 0
+            for row in stale:
+                # Una fila reescrita entretanto (updated_at distinto) no se elimina ni se combina
+                deleted = session.query(HeavyHitterSketchDB).filter(
+                    HeavyHitterSketchDB.name == row.name,
+                    HeavyHitterSketchDB.period == row.period,
+                    HeavyHitterSketchDB.worker_id == row.worker_id,
+                    HeavyHitterSketchDB.updated_at == row.updated_at
+                ).delete(synchronize_session=False)
+                if deleted:
+                    summaries.setdefault((row.name, row.period), []).append(
+                        self._row_summary(row, HEAVY_HITTER_SKETCHES[row.name])
+                    )
+                    compacted_rows += 1
+            if not summaries:
+                session.rollback()
+                return 0
+            
+            for row in session.query(HeavyHitterSketchDB).filter(
+                HeavyHitterSketchDB.worker_id == COMPACTED_WORKER_ID
+            ).all():
+                if (row.name, row.period) in summaries:
+                    summaries[(row.name, row.period)].append(
+                        self._row_summary(row, HEAVY_HITTER_SKETCHES[row.name])
+                    )
+            now = datetime.utcnow()
+            rows = []
+            for (name, period), period_summaries in summaries.items():
+                payload = SpaceSaving.merge(period_summaries, self.capacity).to_payload()
+                rows.append({
+                    'name': name,
+                    'period': period,
+                    'worker_id': COMPACTED_WORKER_ID,
+                    'total': payload['total'],
+                    'counters': json.dumps(payload['counters']),
+                    'updated_at': now
+                })
+            self._write_rows(session, rows)
+            session.commit()
+            logger.info(f"Resúmenes de top aproximado de workers terminados combinados: {compacted_rows} filas")
+            return compacted_rows
+        except Exception as e:
+            session.rollback()
+            logger.error(f"Error al combinar los resúmenes de top aproximado: {str(e)}")
+            return 0
+    
+    def ensure_flusher(self) -> None:
+        """Inicia el hilo de escritura del proceso si hay session_factory y no está corriendo"""
+        if not self.enabled or self.session_factory is None:
+            return
+        flusher = self._flusher
+        if flusher is not None and flusher.is_alive():
+            return
+        with self._lock:
+            if self._flusher is not None and self._flusher.is_alive():
+                return
+            self._flusher = HeavyHitterFlusher(self, self.session_factory)
+            self._flusher.start()
+    
+    def flush_at_exit(self) -> None:
+        """Escribe lo pendiente al terminar el proceso (atexit)"""
+        if self._flusher is not None:
+            self._flusher.stop()
+        if not self._dirty or self.session_factory is None:
+            return
+        session = self.session_factory()
+        try:
+            self.flush(session)
+        finally:
+            session.close()
+    
+    def clear(self, session) -> None:
+        """Elimina los resúmenes persistidos en la transacción de la sesión y vacía los del worker"""
+        from ..models.db_models import HeavyHitterSketchDB
+        session.query(HeavyHitterSketchDB).delete()
+        self.reset()
+    
+    def reset(self) -> None:
+        """
+        Vacía los resúmenes del worker
+        
+        Quedan marcados como modificados para que la siguiente escritura reemplace
+        las filas que el worker pudiera haber escrito entretanto.
+        """
+        with self._lock:
+            self._dirty.update(self._sketches)
+            self._sketches = {key: SpaceSaving(self.capacity) for key in self._sketches}
+    
+    def handle_event(self, event: dict) -> None:
+        """Callback del hub de eventos: la eliminación de todos los pedidos vacía los resúmenes"""
+        if event.get('type') == 'deleted_all':
+            self.reset()
+    
+    def _offer(self, name: str, period: str, key, weight: int) -> None:
+        for sketch_period in (period, ALL_PERIOD):
+            sketch = self._sketches.get((name, sketch_period))
+            if sketch is None:
+                sketch = self._sketches[(name, sketch_period)] = SpaceSaving(self.capacity)
+            sketch.offer(key, weight)
+            self._dirty.add((name, sketch_period))
+    
+    def _row_summary(self, row, key_type) -> SpaceSaving:
+        return SpaceSaving.from_payload({
+            'total': row.total,
+            'counters': [[key_type(key), count, error] for key, count, error in json.loads(row.counters)]
+        }, self.capacity)
+    
+    def _retained_periods(self) -> set:
+        """El histórico y los últimos retention_months meses"""
+        today = datetime.utcnow().date()
+        month_index = today.year * 12 + today.month - 1 - (self.retention_months - 1)
+        oldest = date(month_index // 12, month_index % 12 + 1, 1)
+        return {ALL_PERIOD, *month_periods(oldest, today)}
+    
+    def _write_rows(self, session, rows: List[dict]) -> None:
+        table = _sketch_table()
+        dialect_name = session.get_bind().dialect.name
+        if dialect_name in ('postgresql', 'sqlite'):
+            if dialect_name == 'postgresql':
+                from sqlalchemy.dialects.postgresql import insert
+            else:
+                from sqlalchemy.dialects.sqlite import insert
+            statement = insert(table).values(rows)
+            session.execute(statement.on_conflict_do_update(
+                index_elements=['name', 'period', 'worker_id'],
+                set_={column: statement.excluded[column] for column in ('total', 'counters', 'updated_at')}
+            ))
+            return
+        from sqlalchemy import and_, insert
+        for row in rows:
+            result = session.execute(
+                table.update()
+                .where(and_(*(table.c[column] == row[column] for column in ('name', 'period', 'worker_id'))))
+                .values(total=row['total'], counters=row['counters'], updated_at=row['updated_at'])
+            )
+            if result.rowcount == 0:
+                session.execute(insert(table).values(row))
+    
+    def _reset_after_fork(self) -> None:
+        """El proceso hijo es otro worker: nuevo id, resúmenes vacíos y su hilo con la primera petición"""
+        self._lock = threading.Lock()
+        self.worker_id = _new_worker_id()
+        self._sketches = {}
+        self._dirty = set()
+        self._last_flush = time.monotonic()
+        self._last_rewrite = time.monotonic()
+        self._flusher = None
+
+
+class HeavyHitterFlusher(threading.Thread):
+    """
+    Hilo que escribe los resúmenes del worker y combina los de workers terminados
+    
+    Args:
+        tracker: Resúmenes del worker
+        session_factory: Crea las sesiones en que se escribe
+    """
+    
+    def __init__(self, tracker: HeavyHitterTracker, session_factory: Callable):
+        super().__init__(name='heavy-hitters-flusher', daemon=True)
+        self.tracker = tracker
+        self.session_factory = session_factory
+        self._stopped = threading.Event()
+    
+    def stop(self) -> None:
+        self._stopped.set()
+    
+    def run(self) -> None:
+        while not self._stopped.wait(self.tracker.flush_seconds):
+            self.flush_once()
+    
+    def flush_once(self) -> None:
+        """Una escritura en una sesión propia (flush y compact_stale_workers registran sus errores)"""
+        session = self.session_factory()
+        try:
+            self.tracker.flush_if_due(session)
+            self.tracker.compact_stale_workers(session)
+        except Exception as e:
+            logger.error(f"Error al escribir los resúmenes de top aproximado: {str(e)}")
+        finally:
+            session.close()
+
+
+def _create_tracker() -> HeavyHitterTracker:
+    from ..config.settings import get_config
+    from ..utils.order_events import order_event_hub
+    config = get_config()
+    tracker = HeavyHitterTracker(
+        enabled=config.HEAVY_HITTERS_ENABLED,
+        capacity=config.HEAVY_HITTERS_CAPACITY,
+        flush_seconds=config.HEAVY_HITTERS_FLUSH_SECONDS,
+        retention_months=config.HEAVY_HITTERS_RETENTION_MONTHS,
+        stale_seconds=config.HEAVY_HITTERS_STALE_SECONDS
+    )
+    order_event_hub.add_callback(tracker.handle_event)
+    return tracker
+
+
+heavy_hitters = _create_tracker()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=heavy_hitters._reset_after_fork)
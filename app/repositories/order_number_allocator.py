@@ -0,0 +1,67 @@
+"""
+Asignación de secuencias para números de pedido con bloques hi/lo
+"""
+import os
+import threading
+from typing import Callable, List
+from ..models.db_models import ORDER_NUMBER_BLOCK_SIZE
+
+
+class OrderNumberAllocator:
+    """
+    Reparte valores de secuencia por bloques para no consultar la base de datos en cada pedido.
+
+    La secuencia de base de datos avanza de a block_size: cada valor obtenido ("hi")
+    reserva el rango [hi, hi + block_size) para este proceso, que lo reparte en
+    memoria ("lo") hasta agotarlo. Los valores de un bloque que no se usen se
+    pierden, pero nunca se repiten entre procesos.
+    """
+    
+    def __init__(self, block_size: int):
+        if block_size < 1:
+            raise ValueError("El tamaño de bloque debe ser mayor a 0")
+        self.block_size = block_size
+        self._lock = threading.Lock()
+        self._next = 0
+        self._limit = 0
+    
+    def next_values(self, count: int, fetch_block: Callable[[], int]) -> List[int]:
+        """
+        Obtiene count valores de secuencia únicos
+        
+        Args:
+            count: Cantidad de valores requeridos
+            fetch_block: Función que reserva un bloque nuevo y retorna su primer valor
+            
+        Returns:
+            Lista de valores consecutivos dentro de cada bloque
+        """
+        values = []
+        with self._lock:
+            while len(values) < count:
+                if self._next >= self._limit:
+                    hi = max(int(fetch_block()), self._limit)
+                    self._next = hi
+                    self._limit = hi + self.block_size
+                take = min(count - len(values), self._limit - self._next)
+                values.extend(range(self._next, self._next + take))
+                self._next += take
+        return values
+    
+    def reset(self) -> None:
+        """Descarta el bloque actual (por ejemplo, después de un fork)"""
+        with self._lock:
+            self._next = 0
+            self._limit = 0
+    
+    def _reset_after_fork(self) -> None:
+        """Reinicia el estado en el proceso hijo sin depender del lock heredado"""
+        self._lock = threading.Lock()
+        self._next = 0
+        self._limit = 0
+
+
+order_number_allocator = OrderNumberAllocator(ORDER_NUMBER_BLOCK_SIZE)
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=order_number_allocator._reset_after_fork)
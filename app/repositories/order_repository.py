@@ -2,13 +2,28 @@
 Repositorio para manejo de pedidos
 """
 import logging
-from typing import List, Optional
+from typing import Dict, Iterator, List, Optional
 from sqlalchemy.orm import Session
-from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from ..exceptions.custom_exceptions import OrderNumberConflictError
 from ..models.order import Order
 from ..models.order_item import OrderItem
-from ..models.db_models import OrderDB, OrderItemDB
+from ..models.db_models import (
+    OrderDB, OrderItemDB, OrderMonthlyStatsDB, ClientDailyStatsDB, ProductDailyStatsDB, ClientQuarterStatsDB,
+    ReportSnapshotDB, ClientMonthlyStatsDB, order_number_sequence
+)
 from .base_repository import BaseRepository
+from .order_number_allocator import order_number_allocator
+from ..utils.order_events import build_order_event, build_delete_all_event, emit_order_events, order_event_notify_cte
+from .order_rollups import (
+    order_rollup_deltas, order_update_rollup_deltas, stage_rollup_deltas, rollup_upsert_ctes, clear_rollups
+)
+from .report_snapshots import TOP_CLIENTS_SNAPSHOT, clear_snapshots
+from .order_time_buckets import order_time_buckets
+from .seller_informes import seller_dashboard, sellers_summary
+from .heavy_hitters import heavy_hitters
+from ..utils.query_cache import cached_query, month_tags
+from ..utils.cache_invalidation import client_tag, ORDERS_TAG
 
 logger = logging.getLogger(__name__)
 
@@ -16,6 +31,12 @@ logger = logging.getLogger(__name__)
 class OrderRepository(BaseRepository):
     """Repositorio para manejo de pedidos"""
     
+    # Columnas de la tabla orders que se pueden solicitar con fields=
+    ORDER_FIELDS = (
+        'id', 'order_number', 'client_id', 'vendor_id', 'status', 'total_amount',
+        'scheduled_delivery_date', 'assigned_truck', 'created_at', 'updated_at'
+    )
+    
     def __init__(self, session: Session):
         super().__init__(session)
     
@@ -74,37 +95,453 @@ class OrderRepository(BaseRepository):
         except SQLAlchemyError as e:
             raise Exception(f"Error al obtener pedidos por camión y fecha: {str(e)}")
     
-    def create(self, order: Order) -> Order:
-        """Crea un nuevo pedido con sus items"""
+    def iter_orders_with_items(
+        self,
+        client_id: str = None,
+        vendor_id: str = None,
+        assigned_truck: str = None,
+        scheduled_delivery_date = None,
+        chunk_size: int = 500
+    ) -> Iterator[List[Order]]:
+        """
+        Recorre los pedidos con sus items por fragmentos usando un cursor del lado del servidor
+        
+        Cada fragmento carga sus items con una sola consulta. Se leen columnas en lugar
+        de entidades ORM para no acumular objetos en la sesión, de modo que la memoria
+        usada depende del tamaño del fragmento y no del total de pedidos.
+        
+        Args:
+            client_id: Filtra por cliente (opcional)
+            vendor_id: Filtra por vendedor (opcional)
+            assigned_truck: Filtra por camión (opcional)
+            scheduled_delivery_date: Filtra por fecha de entrega (opcional)
+            chunk_size: Pedidos por fragmento
+            
+        Returns:
+            Iterador de listas de pedidos ordenados por ID
+        """
         try:
-            # Crear el pedido principal
-            db_order = OrderDB(
-                order_number=order.order_number,
-                client_id=order.client_id,
-                vendor_id=order.vendor_id,
-                status=order.status,
-                total_amount=order.total_amount,
-                scheduled_delivery_date=order.scheduled_delivery_date,
-                assigned_truck=order.assigned_truck
+            from sqlalchemy import select
+            
+            orders_table = OrderDB.__table__
+            query = self._apply_listing_filters(
+                select(orders_table).order_by(orders_table.c.id),
+                client_id, vendor_id, assigned_truck, scheduled_delivery_date
             )
-            self.session.add(db_order)
-            self.session.flush()
-                        
-            for item in order.items:
-                db_item = OrderItemDB(
-                    order_id=db_order.id,
-                    product_id=item.product_id,
-                    quantity=item.quantity
+            
+            result = self.session.execute(query.execution_options(yield_per=chunk_size))
+            try:
+                for rows in result.partitions():
+                    orders = [self._row_to_model(row) for row in rows]
+                    items_by_order = self._load_items_by_order_id([order.id for order in orders])
+                    for order in orders:
+                        order.items = items_by_order.get(order.id, [])
+                    yield orders
+            finally:
+                result.close()
+        except SQLAlchemyError as e:
+            raise Exception(f"Error al recorrer pedidos: {str(e)}")
+    
+    def iter_order_projections(
+        self,
+        fields: List[str],
+        include_items: bool = False,
+        client_id: str = None,
+        vendor_id: str = None,
+        assigned_truck: str = None,
+        scheduled_delivery_date = None,
+        chunk_size: int = 500
+    ) -> Iterator[List[dict]]:
+        """
+        Recorre los pedidos leyendo solo las columnas solicitadas
+        
+        Los items se consultan únicamente si include_items es verdadero; en ese caso
+        cada diccionario incluye la llave 'items' con la lista de OrderItem.
+        
+        Args:
+            fields: Columnas de la tabla orders a devolver (ver ORDER_FIELDS)
+            include_items: Si se deben cargar los items de cada pedido
+            client_id, vendor_id, assigned_truck, scheduled_delivery_date: Filtros opcionales
+            chunk_size: Pedidos por fragmento
+            
+        Returns:
+            Iterador de listas de diccionarios ordenados por ID del pedido
+        """
+        try:
+            from sqlalchemy import select
+            
+            orders_table = OrderDB.__table__
+            # El ID se lee siempre para ordenar y asociar items; se descarta si no fue solicitado
+            selected = list(dict.fromkeys(['id'] + list(fields)))
+            query = self._apply_listing_filters(
+                select(*[orders_table.c[name] for name in selected]).order_by(orders_table.c.id),
+                client_id, vendor_id, assigned_truck, scheduled_delivery_date
+            )
+            drop_id = 'id' not in fields
+            
+            result = self.session.execute(query.execution_options(yield_per=chunk_size))
+            try:
+                for rows in result.partitions():
+                    projections = [dict(row._mapping) for row in rows]
+                    if include_items:
+                        items_by_order = self._load_items_by_order_id([projection['id'] for projection in projections])
+                        for projection in projections:
+                            projection['items'] = items_by_order.get(projection['id'], [])
+                    if drop_id:
+                        for projection in projections:
+                            del projection['id']
+                    yield projections
+            finally:
+                result.close()
+        except SQLAlchemyError as e:
+            raise Exception(f"Error al recorrer pedidos: {str(e)}")
+    
+    def get_listing_version(
+        self,
+        client_id: str = None,
+        vendor_id: str = None,
+        assigned_truck: str = None,
+        scheduled_delivery_date = None
+    ) -> dict:
+        """
+        Obtiene los datos que identifican la versión de un listado de pedidos
+        
+        Cualquier alta, baja o modificación de un pedido del listado cambia al menos
+        uno de los tres valores: la cantidad, el updated_at más reciente o el ID más alto.
+        La consulta se resuelve con los índices por cliente, vendedor y camión.
+        
+        Returns:
+            Diccionario con count, max_updated_at y max_id
+        """
+        try:
+            from sqlalchemy import select, func
+            
+            orders_table = OrderDB.__table__
+            query = self._apply_listing_filters(
+                select(
+                    func.count().label('order_count'),
+                    func.max(orders_table.c.updated_at).label('max_updated_at'),
+                    func.max(orders_table.c.id).label('max_id')
+                ).select_from(orders_table),
+                client_id, vendor_id, assigned_truck, scheduled_delivery_date
+            )
+            row = self.session.execute(query).one()
+            return {
+                'count': row.order_count,
+                'max_updated_at': row.max_updated_at,
+                'max_id': row.max_id
+            }
+        except SQLAlchemyError as e:
+            raise Exception(f"Error al obtener la versión del listado de pedidos: {str(e)}")
+    
+    def get_orders_changed_since(
+        self,
+        updated_after = None,
+        after_id: int = 0,
+        updated_until = None,
+        limit: int = 100,
+        client_id: str = None,
+        vendor_id: str = None,
+        assigned_truck: str = None
+    ) -> List[Order]:
+        """
+        Obtiene los pedidos creados o modificados después de un cursor (updated_at, id)
+        
+        Los pedidos se ordenan por (updated_at, id), de modo que el último pedido
+        devuelto es el cursor de la siguiente página. La consulta usa los índices
+        que comienzan por updated_at (o por cliente/vendedor y updated_at).
+        
+        Args:
+            updated_after: updated_at del cursor; None para empezar desde el principio
+            after_id: ID del cursor, desempata pedidos con el mismo updated_at
+            updated_until: Límite superior (inclusive) de updated_at; None para no limitar
+            limit: Máximo de pedidos a devolver
+            client_id, vendor_id, assigned_truck: Filtros opcionales
+        
+        Returns:
+            Lista de pedidos con sus items
+        """
+        try:
+            from sqlalchemy import select, tuple_
+            
+            orders_table = OrderDB.__table__
+            query = self._apply_listing_filters(
+                select(orders_table)
+                .order_by(orders_table.c.updated_at, orders_table.c.id)
+                .limit(limit),
+                client_id, vendor_id, assigned_truck
+            )
+            if updated_after is not None:
+                query = query.where(
+                    tuple_(orders_table.c.updated_at, orders_table.c.id) > tuple_(updated_after, after_id)
                 )
-                self.session.add(db_item)
+            if updated_until is not None:
+                query = query.where(orders_table.c.updated_at <= updated_until)
+            
+            orders = [self._row_to_model(row) for row in self.session.execute(query)]
+            items_by_order = self._load_items_by_order_id([order.id for order in orders])
+            for order in orders:
+                order.items = items_by_order.get(order.id, [])
+            return orders
+        except SQLAlchemyError as e:
+            raise Exception(f"Error al obtener cambios de pedidos: {str(e)}")
+    
+    @staticmethod
+    def _apply_listing_filters(query, client_id=None, vendor_id=None, assigned_truck=None, scheduled_delivery_date=None):
+        """Aplica los filtros de los listados de pedidos sobre una consulta de la tabla orders"""
+        orders_table = OrderDB.__table__
+        if client_id:
+            query = query.where(orders_table.c.client_id == client_id)
+        if vendor_id:
+            query = query.where(orders_table.c.vendor_id == vendor_id)
+        if assigned_truck:
+            query = query.where(orders_table.c.assigned_truck == assigned_truck)
+        if scheduled_delivery_date:
+            from datetime import datetime, timedelta
+            if isinstance(scheduled_delivery_date, str):
+                scheduled_delivery_date = datetime.fromisoformat(scheduled_delivery_date.replace('Z', '+00:00')).date()
+            # Rango del día en lugar de date(columna) para que el filtro use el índice por camión y fecha
+            day_start = datetime.combine(scheduled_delivery_date, datetime.min.time())
+            query = query.where(
+                orders_table.c.scheduled_delivery_date >= day_start,
+                orders_table.c.scheduled_delivery_date < day_start + timedelta(days=1)
+            )
+        return query
+    
+    def _load_items_by_order_id(self, order_ids: List[int]) -> dict:
+        """Carga los items de un grupo de pedidos con una sola consulta, agrupados por ID de pedido"""
+        from sqlalchemy import select
+        
+        items_by_order = {}
+        if not order_ids:
+            return items_by_order
+        
+        items_table = OrderItemDB.__table__
+        rows = self.session.execute(
+            select(items_table)
+            .where(items_table.c.order_id.in_(order_ids))
+            .order_by(items_table.c.order_id, items_table.c.id)
+        )
+        for row in rows:
+            items_by_order.setdefault(row.order_id, []).append(OrderItem(
+                id=row.id,
+                product_id=row.product_id,
+                quantity=row.quantity,
+                order_id=row.order_id
+            ))
+        return items_by_order
+    
+    def next_order_sequences(self, count: int = 1) -> List[int]:
+        """
+        Obtiene valores únicos de secuencia para generar números de pedido
+        
+        Los valores salen del bloque hi/lo reservado por este proceso; solo se
+        consulta la base de datos cuando el bloque se agota.
+        
+        Args:
+            count: Cantidad de valores requeridos
+            
+        Returns:
+            Lista de valores de secuencia
+        """
+        try:
+            return order_number_allocator.next_values(count, self._fetch_order_number_block)
+        except SQLAlchemyError as e:
+            raise Exception(f"Error al obtener secuencia de pedidos: {str(e)}")
+    
+    def _fetch_order_number_block(self) -> int:
+        """Reserva un bloque de la secuencia de números de pedido y retorna su primer valor"""
+        from sqlalchemy import select, func
+        
+        if self.session.get_bind().dialect.supports_sequences:
+            return self.session.execute(select(order_number_sequence.next_value())).scalar()
+        
+        # Motores sin secuencias (SQLite en desarrollo): bloque siguiente al mayor id. Dos
+        # procesos pueden leer el mismo máximo; el conflicto se reintenta con otro bloque
+        max_id = self.session.query(func.max(OrderDB.id)).scalar() or 0
+        return max_id + 1
+    
+    def create(self, order: Order) -> Order:
+        """
+        Crea un nuevo pedido con sus items
+        
+        En PostgreSQL el pedido, sus items, el NOTIFY y los rollups se escriben con
+        una sola sentencia (INSERT ... RETURNING encadenados en CTEs) seguida del
+        commit: 2 round trips. En otros motores se usan dos INSERT multi-fila y, antes
+        del commit, un upsert por tabla rollup: 7 round trips en SQLite. El pedido de
+        dominio se completa con los valores retornados sin volver a leerlo.
+        """
+        try:
+            if self._dialect_name() != 'postgresql':
+                self._insert_orders([order])
+                stage_rollup_deltas(self.session, order_rollup_deltas(order, 1))
+                emit_order_events(self.session, [build_order_event('created', order)])
+            else:
+                # Los rollups y el NOTIFY del evento viajan en la misma sentencia que los INSERT
+                self._insert_order_with_items(order)
             
             self.session.commit()
-            self.session.refresh(db_order)
-
-            return self._db_to_model_with_items(db_order)
         except SQLAlchemyError as e:
             self.session.rollback()
+            self._raise_if_order_number_conflict(e)
             raise Exception(f"Error al crear pedido: {str(e)}")
+        self._track_heavy_hitters([order])
+        return order
+    
+    def _insert_order_with_items(self, order: Order) -> None:
+        """Inserta un pedido y sus items en un único round trip (PostgreSQL)"""
+        from datetime import datetime
+        from sqlalchemy import insert, select, values, column, Integer, true
+        
+        now = datetime.utcnow()
+        order_params = self._order_insert_params(order)
+        order_params['created_at'] = now
+        order_params['updated_at'] = now
+        order.created_at = now
+        order.updated_at = now
+        new_order = insert(OrderDB).values(**order_params).returning(OrderDB.id).cte('new_order')
+        notified = order_event_notify_cte(build_order_event('created', order), new_order.c.id)
+        side_effects = new_order.join(notified, true())
+        for rollup_cte in rollup_upsert_ctes(order_rollup_deltas(order, 1)):
+            side_effects = side_effects.join(rollup_cte, true())
+        
+        if order.items:
+            item_values = values(
+                column('item_position', Integer),
+                column('product_id', Integer),
+                column('quantity', Integer),
+                name='item_values'
+            ).data([
+                (position, item.product_id, item.quantity)
+                for position, item in enumerate(order.items)
+            ])
+            new_items = insert(OrderItemDB).from_select(
+                ['order_id', 'product_id', 'quantity'],
+                select(new_order.c.id, item_values.c.product_id, item_values.c.quantity)
+                .order_by(item_values.c.item_position)
+            ).returning(OrderItemDB.id).cte('new_items')
+            statement = select(
+                new_order.c.id, new_items.c.id.label('item_id')
+            ).select_from(
+                side_effects.outerjoin(new_items, true())
+            ).order_by(new_items.c.id)
+        else:
+            statement = select(new_order.c.id).select_from(side_effects)
+        
+        rows = self.session.execute(statement).all()
+        
+        order.id = rows[0].id
+        for item, row in zip(order.items, rows):
+            item.id = row.item_id
+            item.order_id = order.id
+    
+    def _dialect_name(self) -> str:
+        """Nombre del dialecto de la base de datos de la sesión"""
+        try:
+            return self.session.get_bind().dialect.name
+        except Exception:
+            return ''
+    
+    def create_many(self, orders: List[Order]) -> List[Order]:
+        """
+        Crea varios pedidos con sus items en una sola transacción
+        
+        Los pedidos y los items se insertan con INSERT multi-fila y RETURNING, y los
+        pedidos de dominio se completan con los valores retornados sin releerlos.
+        
+        Args:
+            orders: Pedidos de dominio a persistir
+            
+        Returns:
+            Los mismos pedidos con id, created_at, updated_at e ids de items asignados
+        """
+        try:
+            if not orders:
+                return []
+            
+            self._insert_orders(orders)
+            for order in orders:
+                stage_rollup_deltas(self.session, order_rollup_deltas(order, 1))
+            emit_order_events(self.session, [build_order_event('created', order) for order in orders])
+            self.session.commit()
+        except SQLAlchemyError as e:
+            self.session.rollback()
+            self._raise_if_order_number_conflict(e)
+            raise Exception(f"Error al crear lote de pedidos: {str(e)}")
+        self._track_heavy_hitters(orders)
+        return orders
+    
+    @staticmethod
+    def _raise_if_order_number_conflict(error: SQLAlchemyError) -> None:
+        """
+        Convierte la violación del unique de order_number en OrderNumberConflictError
+        
+        Descarta el bloque hi/lo del proceso: en motores sin secuencias otro proceso
+        pudo reservar el mismo bloque.
+        """
+        if isinstance(error, IntegrityError) and 'order_number' in str(getattr(error, 'orig', None) or error):
+            order_number_allocator.reset()
+            raise OrderNumberConflictError(f"El número de pedido ya existe: {str(error)}")
+    
+    def _track_heavy_hitters(self, orders: List[Order]) -> None:
+        """Registra los pedidos creados en el top aproximado (los escribe el hilo de heavy_hitters)"""
+        heavy_hitters.record_orders(orders)
+    
+    def _insert_orders(self, orders: List[Order]) -> None:
+        """
+        Inserta pedidos e items con dos INSERT multi-fila y asigna los valores retornados
+        
+        Las filas retornadas se asocian por order_number (único) y, para los items,
+        por order_id en orden ascendente de id, de modo que no se necesita pedir al
+        motor que conserve el orden de los parámetros (lo que obliga a insertar fila
+        por fila en algunos dialectos).
+        """
+        from sqlalchemy import insert
+        
+        order_rows = self.session.execute(
+            insert(OrderDB).returning(OrderDB.id, OrderDB.order_number, OrderDB.created_at, OrderDB.updated_at),
+            [self._order_insert_params(order) for order in orders]
+        ).all()
+        rows_by_number = {row.order_number: row for row in order_rows}
+        
+        item_params = []
+        for order in orders:
+            row = rows_by_number[order.order_number]
+            order.id = row.id
+            order.created_at = row.created_at
+            order.updated_at = row.updated_at
+            for item in order.items:
+                item.order_id = row.id
+                item_params.append({
+                    'order_id': row.id,
+                    'product_id': item.product_id,
+                    'quantity': item.quantity
+                })
+        
+        if item_params:
+            item_rows = self.session.execute(
+                insert(OrderItemDB).returning(OrderItemDB.id, OrderItemDB.order_id),
+                item_params
+            ).all()
+            item_ids_by_order = {}
+            for row in sorted(item_rows, key=lambda row: row.id):
+                item_ids_by_order.setdefault(row.order_id, []).append(row.id)
+            for order in orders:
+                for item, item_id in zip(order.items, item_ids_by_order.get(order.id, [])):
+                    item.id = item_id
+    
+    @staticmethod
+    def _order_insert_params(order: Order) -> dict:
+        """Columnas de inserción de un pedido"""
+        return {
+            'order_number': order.order_number,
+            'client_id': order.client_id,
+            'vendor_id': order.vendor_id,
+            'status': order.status,
+            'total_amount': order.total_amount,
+            'scheduled_delivery_date': order.scheduled_delivery_date,
+            'assigned_truck': order.assigned_truck
+        }
     
     def get_by_id(self, order_id: int) -> Optional[Order]:
         """Obtiene un pedido por ID"""
@@ -123,6 +560,14 @@ class OrderRepository(BaseRepository):
             if not db_order:
                 raise Exception("Pedido no encontrado")
             
+            previous_total_amount = db_order.total_amount
+            previous = {
+                'status': db_order.status,
+                'client_id': db_order.client_id,
+                'vendor_id': db_order.vendor_id,
+                'assigned_truck': db_order.assigned_truck,
+                'scheduled_delivery_date': db_order.scheduled_delivery_date
+            }
             db_order.order_number = order.order_number
             db_order.client_id = order.client_id
             db_order.vendor_id = order.vendor_id
@@ -131,6 +576,11 @@ class OrderRepository(BaseRepository):
             db_order.scheduled_delivery_date = order.scheduled_delivery_date
             db_order.assigned_truck = order.assigned_truck
             
+            stage_rollup_deltas(
+                self.session,
+                order_update_rollup_deltas(db_order, dict(previous, total_amount=previous_total_amount))
+            )
+            emit_order_events(self.session, [build_order_event('updated', db_order, previous)])
             self.session.commit()
             return self._db_to_model(db_order)
         except SQLAlchemyError as e:
@@ -144,10 +594,13 @@ class OrderRepository(BaseRepository):
             if not db_order:
                 return False
             
+            # Los deltas se calculan antes de eliminar los items (rollup de productos)
+            stage_rollup_deltas(self.session, order_rollup_deltas(db_order, -1))
             # Eliminar items primero
             self.session.query(OrderItemDB).filter(OrderItemDB.order_id == order_id).delete()
             # Eliminar pedido
             self.session.delete(db_order)
+            emit_order_events(self.session, [build_order_event('deleted', db_order)])
             self.session.commit()
             return True
         except SQLAlchemyError as e:
@@ -161,16 +614,24 @@ class OrderRepository(BaseRepository):
             count = self.session.query(OrderDB).count()
             self.session.query(OrderItemDB).delete()
             self.session.query(OrderDB).delete()
+            clear_rollups(self.session)
+            clear_snapshots(self.session)
+            heavy_hitters.clear(self.session)
+            emit_order_events(self.session, [build_delete_all_event()])
             self.session.commit()
             return count
         except SQLAlchemyError as e:
             self.session.rollback()
             raise Exception(f"Error al eliminar todos los pedidos: {str(e)}")
     
+    @cached_query(entities=lambda start_date, end_date: month_tags(start_date, end_date))
     def get_monthly_summary(self, start_date, end_date) -> List[dict]:
         """
         Obtiene un resumen de pedidos agrupados por mes en un rango de fechas
         
+        Se lee del rollup order_monthly_stats (una fila por mes y estado), por lo que
+        cada mes del rango se considera completo.
+        
         Args:
             start_date: Fecha inicial del rango
             end_date: Fecha final del rango
@@ -179,23 +640,25 @@ class OrderRepository(BaseRepository):
             Lista de diccionarios con año, mes, cantidad de pedidos y monto total
         """
         try:
-            from sqlalchemy import func, extract
+            from sqlalchemy import func
             
-            # Consultar pedidos agrupados por año y mes
+            month_index = OrderMonthlyStatsDB.year * 12 + OrderMonthlyStatsDB.month
             results = self.session.query(
-                extract('year', OrderDB.created_at).label('year'),
-                extract('month', OrderDB.created_at).label('month'),
-                func.count(OrderDB.id).label('orders_count'),
-                func.sum(OrderDB.total_amount).label('total_amount')
+                OrderMonthlyStatsDB.year.label('year'),
+                OrderMonthlyStatsDB.month.label('month'),
+                func.sum(OrderMonthlyStatsDB.orders_count).label('orders_count'),
+                func.sum(OrderMonthlyStatsDB.total_amount).label('total_amount')
             ).filter(
-                OrderDB.created_at >= start_date,
-                OrderDB.created_at <= end_date
+                month_index >= start_date.year * 12 + start_date.month,
+                month_index <= end_date.year * 12 + end_date.month
             ).group_by(
-                extract('year', OrderDB.created_at),
-                extract('month', OrderDB.created_at)
+                OrderMonthlyStatsDB.year,
+                OrderMonthlyStatsDB.month
+            ).having(
+                func.sum(OrderMonthlyStatsDB.orders_count) > 0
             ).order_by(
-                extract('year', OrderDB.created_at),
-                extract('month', OrderDB.created_at)
+                OrderMonthlyStatsDB.year,
+                OrderMonthlyStatsDB.month
             ).all()
             
             monthly_data = []
@@ -203,14 +666,100 @@ class OrderRepository(BaseRepository):
                 monthly_data.append({
                     'year': int(result.year),
                     'month': int(result.month),
-                    'orders_count': result.orders_count or 0,
-                    'total_amount': float(result.total_amount or 0)
+                    'orders_count': int(result.orders_count or 0),
+                    'total_amount': round(float(result.total_amount or 0), 2)
                 })
             
             return monthly_data
         except SQLAlchemyError as e:
             raise Exception(f"Error al obtener resumen mensual de pedidos: {str(e)}")
     
+    @cached_query(
+        entities=lambda start_date, end_date, granularity, client_ids=None, statuses=None, assigned_truck=None:
+            month_tags(start_date, end_date)
+    )
+    def get_order_time_buckets(self, start_date, end_date, granularity: str, client_ids: Optional[List[str]] = None,
+                               statuses: Optional[List[str]] = None, assigned_truck: Optional[str] = None) -> List[dict]:
+        """
+        Obtiene la cantidad de pedidos y el monto total por intervalo de tiempo
+        
+        Incluye todos los intervalos del rango, también los que no tienen pedidos
+        (ver order_time_buckets).
+        
+        Args:
+            start_date: Fecha inicial del rango
+            end_date: Fecha final del rango
+            granularity: 'day', 'week', 'month' o 'quarter'
+            client_ids: Solo pedidos de estos clientes (None: todos)
+            statuses: Solo pedidos en estos estados (None: todos)
+            assigned_truck: Solo pedidos asignados a este camión (None: todos)
+            
+        Returns:
+            Lista ordenada con bucket_start, orders_count y total_amount de cada intervalo
+        """
+        try:
+            return order_time_buckets(
+                self.session, self._dialect_name(), start_date, end_date, granularity,
+                client_ids=client_ids, statuses=statuses, assigned_truck=assigned_truck
+            )
+        except SQLAlchemyError as e:
+            raise Exception(f"Error al obtener pedidos por intervalo: {str(e)}")
+    
+    def get_heavy_hitters(self, name: str, since=None, limit: int = 10) -> dict:
+        """
+        Obtiene el top aproximado de productos o clientes (resúmenes Space-Saving de todos los workers)
+        
+        Args:
+            name: 'products' (por cantidad vendida) o 'clients' (por pedidos)
+            since: Primer día; se consideran los meses completos desde su mes (None: histórico)
+            limit: Cantidad de elementos
+            
+        Returns:
+            Diccionario con items (key, count, max_error), total, error_bound, capacity y start_date
+        """
+        try:
+            return heavy_hitters.top(self.session, name, since=since, limit=limit)
+        except SQLAlchemyError as e:
+            raise Exception(f"Error al obtener top aproximado: {str(e)}")
+    
+    def get_top_clients_snapshot(self, limit: int = 5) -> Optional[dict]:
+        """
+        Obtiene los clientes con más pedidos desde la instantánea del último trimestre
+        
+        Args:
+            limit: Número máximo de clientes a retornar (default: 5)
+            
+        Returns:
+            Diccionario con window_start, window_end, refreshed_at y top_clients
+            (client_id y orders_count), o None si la instantánea no se ha calculado
+        """
+        try:
+            snapshot = self.session.query(ReportSnapshotDB).filter(
+                ReportSnapshotDB.name == TOP_CLIENTS_SNAPSHOT
+            ).first()
+            if snapshot is None:
+                return None
+            
+            results = self.session.query(
+                ClientQuarterStatsDB.client_id,
+                ClientQuarterStatsDB.orders_count
+            ).order_by(
+                ClientQuarterStatsDB.orders_count.desc(),
+                ClientQuarterStatsDB.client_id
+            ).limit(limit).all()
+            
+            return {
+                'window_start': snapshot.window_start,
+                'window_end': snapshot.window_end,
+                'refreshed_at': snapshot.refreshed_at,
+                'top_clients': [
+                    {'client_id': result.client_id, 'orders_count': result.orders_count or 0}
+                    for result in results
+                ]
+            }
+        except SQLAlchemyError as e:
+            raise Exception(f"Error al obtener instantánea de top clientes: {str(e)}")
+    
     def get_top_clients_last_quarter(self, start_date, end_date, limit: int = 5) -> List[dict]:
         """
         Obtiene los clientes con más pedidos en un rango de fechas
@@ -250,12 +799,17 @@ class OrderRepository(BaseRepository):
         except SQLAlchemyError as e:
             raise Exception(f"Error al obtener top clientes: {str(e)}")
     
-    def get_top_products_sold(self, limit: int = 10) -> List[dict]:
+    @cached_query(entities=lambda limit, since=None: (ORDERS_TAG,))
+    def get_top_products_sold(self, limit: int = 10, since=None) -> List[dict]:
         """
         Obtiene los productos más vendidos
         
+        Se lee del rollup product_daily_stats (una fila por producto y día), por lo
+        que no recorre order_items.
+        
         Args:
             limit: Número máximo de productos a retornar (default: 10)
+            since: Primer día (date) de la ventana; None para todo el histórico
             
         Returns:
             Lista de diccionarios con product_id y total_sold (cantidad total vendida)
@@ -263,30 +817,41 @@ class OrderRepository(BaseRepository):
         try:
             from sqlalchemy import func
             
+            filters = [ProductDailyStatsDB.quantity_sold != 0]
+            if since is not None:
+                filters.append(ProductDailyStatsDB.day >= since)
+            
+            total_sold = func.sum(ProductDailyStatsDB.quantity_sold)
             results = self.session.query(
-                OrderItemDB.product_id.label('product_id'),
-                func.sum(OrderItemDB.quantity).label('total_sold')
+                ProductDailyStatsDB.product_id.label('product_id'),
+                total_sold.label('total_sold')
+            ).filter(
+                *filters
             ).group_by(
-                OrderItemDB.product_id
+                ProductDailyStatsDB.product_id
             ).order_by(
-                func.sum(OrderItemDB.quantity).desc()
+                total_sold.desc(),
+                ProductDailyStatsDB.product_id
             ).limit(limit).all()
             
             top_products = []
             for result in results:
                 top_products.append({
                     'product_id': result.product_id,
-                    'total_sold': result.total_sold or 0
+                    'total_sold': int(result.total_sold or 0)
                 })
             
             return top_products
         except SQLAlchemyError as e:
             raise Exception(f"Error al obtener top productos: {str(e)}")
     
+    @cached_query(entities=lambda client_ids: [client_tag(client_id) for client_id in client_ids])
     def get_orders_status_summary_by_client_ids(self, client_ids: List[str]) -> List[dict]:
         """
         Obtiene resumen de pedidos por estado para múltiples clientes
         
+        Se lee del rollup client_daily_stats (una fila por cliente, día y estado).
+        
         Args:
             client_ids: Lista de IDs de clientes
             
@@ -303,13 +868,14 @@ class OrderRepository(BaseRepository):
             
             logger.info(f"[get_orders_status_summary_by_client_ids] Consultando pedidos para {len(client_ids)} clientes: {client_ids}")
             results = self.session.query(
-                OrderDB.status.label('status'),
-                func.count(OrderDB.id).label('count'),
-                func.sum(OrderDB.total_amount).label('total_amount')
+                ClientDailyStatsDB.status.label('status'),
+                func.sum(ClientDailyStatsDB.orders_count).label('count'),
+                func.sum(ClientDailyStatsDB.total_amount).label('total_amount')
             ).filter(
-                OrderDB.client_id.in_(client_ids)
+                ClientDailyStatsDB.client_id.in_(client_ids),
+                ClientDailyStatsDB.orders_count != 0
             ).group_by(
-                OrderDB.status
+                ClientDailyStatsDB.status
             ).all()
             logger.info(f"[get_orders_status_summary_by_client_ids] Resultados obtenidos: {len(results)} grupos")
             
@@ -329,6 +895,9 @@ class OrderRepository(BaseRepository):
         """
         Obtiene resumen mensual de pedidos para múltiples clientes
         
+        Se lee del rollup client_daily_stats, por lo que el rango se aplica por días
+        completos.
+        
         Args:
             client_ids: Lista de IDs de clientes
             start_date: Fecha inicial
@@ -343,21 +912,23 @@ class OrderRepository(BaseRepository):
             if not client_ids:
                 return []
             
+            year = extract('year', ClientDailyStatsDB.day)
+            month = extract('month', ClientDailyStatsDB.day)
             results = self.session.query(
-                extract('year', OrderDB.created_at).label('year'),
-                extract('month', OrderDB.created_at).label('month'),
-                func.count(OrderDB.id).label('orders_count'),
-                func.sum(OrderDB.total_amount).label('total_amount')
+                year.label('year'),
+                month.label('month'),
+                func.sum(ClientDailyStatsDB.orders_count).label('orders_count'),
+                func.sum(ClientDailyStatsDB.total_amount).label('total_amount')
             ).filter(
-                OrderDB.client_id.in_(client_ids),
-                OrderDB.created_at >= start_date,
-                OrderDB.created_at <= end_date
+                ClientDailyStatsDB.client_id.in_(client_ids),
+                ClientDailyStatsDB.day.between(self._as_date(start_date), self._as_date(end_date)),
+                ClientDailyStatsDB.orders_count != 0
             ).group_by(
-                extract('year', OrderDB.created_at),
-                extract('month', OrderDB.created_at)
+                year,
+                month
             ).order_by(
-                extract('year', OrderDB.created_at),
-                extract('month', OrderDB.created_at)
+                year,
+                month
             ).all()
             
             monthly_data = []
@@ -365,7 +936,7 @@ class OrderRepository(BaseRepository):
                 monthly_data.append({
                     'year': int(result.year),
                     'month': int(result.month),
-                    'orders_count': result.orders_count or 0,
+                    'orders_count': int(result.orders_count or 0),
                     'total_amount': float(result.total_amount or 0)
                 })
             
@@ -373,10 +944,111 @@ class OrderRepository(BaseRepository):
         except SQLAlchemyError as e:
             raise Exception(f"Error al obtener resumen mensual: {str(e)}")
     
+    @cached_query(
+        entities=lambda assignments, start_date: [
+            client_tag(client_id) for client_ids in assignments.values() for client_id in client_ids
+        ]
+    )
+    def get_sellers_informes_summary(self, assignments: Dict[str, List[str]], start_date) -> Dict[str, dict]:
+        """
+        Obtiene el resumen por estado y mensual de varios vendedores en una sola consulta
+        
+        Se lee del rollup client_daily_stats uniendo la cartera de cada vendedor (ver
+        seller_informes); el resumen mensual se aplica por días completos.
+        
+        Args:
+            assignments: Diccionario {seller_id: lista de client_id asignados}
+            start_date: Primer día del resumen mensual (el resumen por estado incluye todo el histórico)
+            
+        Returns:
+            Diccionario {seller_id: {'status_summary': [...], 'monthly_summary': [...]}} con el
+            formato de get_orders_status_summary_by_client_ids y get_orders_monthly_summary_by_client_ids
+        """
+        try:
+            return sellers_summary(self.session, self._dialect_name(), assignments, start_date)
+        except SQLAlchemyError as e:
+            raise Exception(f"Error al obtener resumen de vendedores: {str(e)}")
+    
+    @cached_query(entities=lambda client_ids, start_date, per_page: [client_tag(client_id) for client_id in client_ids])
+    def get_seller_dashboard_summary(self, client_ids: List[str], start_date, per_page: int) -> dict:
+        """
+        Obtiene el resumen por estado, el resumen mensual y la primera página de clientes
+        de una cartera en una sola consulta
+        
+        Se lee del rollup client_daily_stats (ver seller_informes.seller_dashboard); el
+        resumen mensual se aplica por días completos.
+        
+        Args:
+            client_ids: Lista de IDs de clientes
+            start_date: Primer día del resumen mensual (estados y clientes incluyen todo el histórico)
+            per_page: Clientes de la primera página
+            
+        Returns:
+            Diccionario con status_summary, monthly_summary, clients y total_clients con el
+            formato de get_orders_status_summary_by_client_ids, get_orders_monthly_summary_by_client_ids
+            y get_clients_summary_by_client_ids
+        """
+        try:
+            return seller_dashboard(self.session, self._dialect_name(), client_ids, start_date, per_page)
+        except SQLAlchemyError as e:
+            raise Exception(f"Error al obtener tablero de vendedor: {str(e)}")
+    
+    @cached_query(entities=lambda client_ids, start_date, end_date: month_tags(start_date, end_date))
+    def get_active_clients_by_month(self, client_ids: List[str], start_date, end_date) -> dict:
+        """
+        Obtiene la cantidad de clientes con pedidos de cada mes y de todo el rango
+        
+        Se lee del rollup client_monthly_stats (una fila por cliente y mes con pedidos),
+        por lo que los conteos son exactos y el total del rango no cuenta dos veces a un
+        cliente activo en varios meses.
+        
+        Args:
+            client_ids: Lista de IDs de clientes
+            start_date: Fecha inicial (se consideran meses completos)
+            end_date: Fecha final (se consideran meses completos)
+            
+        Returns:
+            Diccionario con monthly ((año, mes) -> clientes activos, solo meses con pedidos)
+            y total (clientes activos del rango)
+        """
+        try:
+            from sqlalchemy import func
+            
+            if not client_ids:
+                return {'monthly': {}, 'total': 0}
+            
+            stats = ClientMonthlyStatsDB
+            month_index = stats.year * 12 + stats.month
+            filters = (
+                stats.client_id.in_(client_ids),
+                month_index.between(start_date.year * 12 + start_date.month, end_date.year * 12 + end_date.month),
+                stats.orders_count != 0
+            )
+            active_clients = func.count(func.distinct(stats.client_id))
+            results = self.session.query(
+                stats.year.label('year'),
+                stats.month.label('month'),
+                active_clients.label('active_clients')
+            ).filter(*filters).group_by(
+                stats.year,
+                stats.month
+            ).all()
+            total = self.session.query(active_clients).filter(*filters).scalar() or 0
+            
+            return {
+                'monthly': {(int(result.year), int(result.month)): int(result.active_clients) for result in results},
+                'total': int(total)
+            }
+        except SQLAlchemyError as e:
+            raise Exception(f"Error al obtener clientes activos: {str(e)}")
+    
     def get_clients_summary_by_client_ids(self, client_ids: List[str], limit: int, offset: int) -> tuple:
         """
         Obtiene resumen de pedidos por cliente con paginación
         
+        Se lee del rollup client_daily_stats; el promedio por pedido es el monto total
+        dividido por la cantidad de pedidos del cliente.
+        
         Args:
             client_ids: Lista de IDs de clientes
             limit: Límite de resultados
@@ -392,38 +1064,50 @@ class OrderRepository(BaseRepository):
                 return [], 0
             
             total_query = self.session.query(
-                func.count(func.distinct(OrderDB.client_id))
+                func.count(func.distinct(ClientDailyStatsDB.client_id))
             ).filter(
-                OrderDB.client_id.in_(client_ids)
+                ClientDailyStatsDB.client_id.in_(client_ids),
+                ClientDailyStatsDB.orders_count != 0
             )
             total = total_query.scalar() or 0
             
+            orders_count = func.sum(ClientDailyStatsDB.orders_count)
+            total_amount = func.sum(ClientDailyStatsDB.total_amount)
             results = self.session.query(
-                OrderDB.client_id.label('client_id'),
-                func.count(OrderDB.id).label('orders_count'),
-                func.sum(OrderDB.total_amount).label('total_amount'),
-                func.avg(OrderDB.total_amount).label('average_order_amount')
+                ClientDailyStatsDB.client_id.label('client_id'),
+                orders_count.label('orders_count'),
+                total_amount.label('total_amount')
             ).filter(
-                OrderDB.client_id.in_(client_ids)
+                ClientDailyStatsDB.client_id.in_(client_ids),
+                ClientDailyStatsDB.orders_count != 0
             ).group_by(
-                OrderDB.client_id
+                ClientDailyStatsDB.client_id
             ).order_by(
-                func.sum(OrderDB.total_amount).desc()
+                total_amount.desc(),
+                ClientDailyStatsDB.client_id
             ).offset(offset).limit(limit).all()
             
             clients_summary = []
             for result in results:
+                client_orders = int(result.orders_count or 0)
+                client_amount = float(result.total_amount or 0)
                 clients_summary.append({
                     'client_id': result.client_id,
-                    'orders_count': result.orders_count or 0,
-                    'total_amount': float(result.total_amount or 0),
-                    'average_order_amount': float(result.average_order_amount or 0)
+                    'orders_count': client_orders,
+                    'total_amount': client_amount,
+                    'average_order_amount': client_amount / client_orders if client_orders else 0.0
                 })
             
             return clients_summary, total
         except SQLAlchemyError as e:
             raise Exception(f"Error al obtener resumen por clientes: {str(e)}")
     
+    @staticmethod
+    def _as_date(value):
+        """Fecha de un datetime (los rollups diarios se filtran por día)"""
+        from datetime import datetime
+        return value.date() if isinstance(value, datetime) else value
+    
     def _db_to_model(self, db_order: OrderDB) -> Order:
         """Convierte modelo de BD a modelo de dominio"""
         order = Order(
@@ -440,6 +1124,22 @@ class OrderRepository(BaseRepository):
         )
         return order
     
+    @staticmethod
+    def _row_to_model(row) -> Order:
+        """Convierte una fila de la tabla orders a modelo de dominio"""
+        return Order(
+            id=row.id,
+            order_number=row.order_number,
+            client_id=row.client_id,
+            vendor_id=row.vendor_id,
+            status=row.status.value if hasattr(row.status, 'value') else str(row.status),
+            total_amount=row.total_amount,
+            scheduled_delivery_date=row.scheduled_delivery_date,
+            assigned_truck=row.assigned_truck,
+            created_at=row.created_at,
+            updated_at=row.updated_at
+        )
+    
     def _db_to_model_with_items(self, db_order: OrderDB) -> Order:
         """Convierte modelo de BD a modelo de dominio con items"""
         order = self._db_to_model(db_order)
@@ -0,0 +1,458 @@
+"""
+Tablas rollup de pedidos mantenidas en la misma transacción que los escribe
+
+OrderRepository calcula los deltas de cada pedido creado, modificado o eliminado
+(order_rollup_deltas) y los deja pendientes en la sesión (stage_rollup_deltas).
+Antes del commit se suman por llave y se aplican con un upsert por tabla
+(INSERT ... ON CONFLICT DO UPDATE), de modo que el rollup confirma o revierte
+junto con los pedidos. En PostgreSQL los upserts de todas las tablas van como
+CTEs de una sola sentencia (rollup_upsert_ctes); la creación de un pedido los
+incluye en la misma sentencia del INSERT. SQLite no admite escrituras en CTEs y
+ejecuta un upsert por tabla con deltas.
+
+rebuild_rollup recalcula una tabla desde los pedidos (backfill o corrección);
+create_tables la usa para poblar los rollups cuyas tablas se acaban de crear
+(backfill_new_rollups).
+"""
+import logging
+from abc import ABC, abstractmethod
+from types import SimpleNamespace
+from typing import Dict, Iterable, List, Optional, Tuple
+from ..utils.order_events import build_cache_reset_event, emit_order_events
+
+logger = logging.getLogger(__name__)
+
+# Llave de session.info donde se acumulan los deltas hasta el commit
+_PENDING_ROLLUPS_KEY = 'pending_order_rollups'
+
+
+class RollupTable(ABC):
+    """
+    Tabla rollup con columnas llave y columnas de medida acumulables
+    
+    Las sentencias de escritura usan una tabla liviana (sqlalchemy.table) con las
+    columnas del rollup; el modelo se usa para crear la tabla y para las lecturas.
+    Los rollups con affected_by_updates = False solo cambian al crear o eliminar
+    pedidos (p. ej. los que dependen de los items).
+    
+    Args:
+        name: Nombre del rollup (comando de reconstrucción)
+        model: Modelo de la tabla
+        table_name: Nombre de la tabla
+        key_columns: Columnas de la llave primaria
+        measure_columns: Columnas que se suman con cada delta
+        column_types: Tipos de las columnas que los necesitan al enlazar valores (p. ej. Date)
+    """
+    
+    affected_by_updates = True
+    
+    def __init__(
+        self, name: str, model, table_name: str, key_columns: Tuple[str, ...], measure_columns: Tuple[str, ...],
+        column_types: Optional[dict] = None
+    ):
+        from sqlalchemy import column, table
+        self.name = name
+        self.model = model
+        self.table_name = table_name
+        self.key_columns = key_columns
+        self.measure_columns = measure_columns
+        self.column_types = column_types or {}
+        self.table = table(
+            table_name,
+            *(column(name, self.column_types.get(name)) for name in key_columns + measure_columns)
+        )
+    
+    @abstractmethod
+    def deltas(self, order, sign: int) -> List[dict]:
+        """Filas (llave y medidas) que suma (sign=1) o resta (sign=-1) un pedido"""
+        pass
+    
+    @abstractmethod
+    def rebuild_select(self):
+        """SELECT con las filas del rollup calculadas desde los pedidos (columnas llave y de medida)"""
+        pass
+    
+    def merge(self, deltas: Iterable[dict]) -> List[dict]:
+        """Suma los deltas con la misma llave y descarta los que quedan en cero"""
+        merged: Dict[tuple, dict] = {}
+        for delta in deltas:
+            key = tuple(delta[column] for column in self.key_columns)
+            row = merged.get(key)
+            if row is None:
+                merged[key] = dict(delta)
+            else:
+                for column in self.measure_columns:
+                    row[column] += delta[column]
+        return [
+            row for row in merged.values()
+            if any(row[column] for column in self.measure_columns)
+        ]
+    
+    def upsert_statement(self, rows: List[dict], dialect_name: str):
+        """INSERT ... ON CONFLICT DO UPDATE que suma las medidas (PostgreSQL y SQLite)"""
+        from sqlalchemy import literal
+        if dialect_name == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+        # Parámetros anónimos: varios upserts de rollups pueden ir como CTEs de una misma sentencia
+        statement = insert(self.table).values([
+            {name: literal(value, self.column_types.get(name)) for name, value in row.items()}
+            for row in rows
+        ])
+        return statement.on_conflict_do_update(
+            index_elements=list(self.key_columns),
+            set_={
+                column: self.table.c[column] + statement.excluded[column]
+                for column in self.measure_columns
+            }
+        )
+    
+    def apply(self, session, deltas: Iterable[dict]) -> None:
+        """Aplica los deltas sumados a la tabla"""
+        rows = self.merge(deltas)
+        if not rows:
+            return
+        dialect_name = _dialect_name(session)
+        if dialect_name in ('postgresql', 'sqlite'):
+            session.execute(self.upsert_statement(rows, dialect_name))
+            return
+        # Otros motores: UPDATE por llave y INSERT si la fila no existía
+        from sqlalchemy import and_, insert, update
+        for row in rows:
+            result = session.execute(
+                update(self.table)
+                .where(and_(*(self.table.c[column] == row[column] for column in self.key_columns)))
+                .values({column: self.table.c[column] + row[column] for column in self.measure_columns})
+            )
+            if result.rowcount == 0:
+                session.execute(insert(self.table).values(row))
+
+
+class OrderMonthlyRollup(RollupTable):
+    """Pedidos y monto por mes de creación y estado (order_monthly_stats)"""
+    
+    def __init__(self):
+        from ..models.db_models import OrderMonthlyStatsDB
+        super().__init__(
+            'monthly',
+            OrderMonthlyStatsDB,
+            'order_monthly_stats',
+            ('year', 'month', 'status'),
+            ('orders_count', 'total_amount')
+        )
+    
+    def deltas(self, order, sign: int) -> List[dict]:
+        created_at = order.created_at
+        if created_at is None:
+            return []
+        return [{
+            'year': created_at.year,
+            'month': created_at.month,
+            'status': _status_value(order.status),
+            'orders_count': sign,
+            'total_amount': sign * float(order.total_amount or 0)
+        }]
+    
+    def rebuild_select(self):
+        from sqlalchemy import Integer, cast, extract, func, select
+        from ..models.db_models import OrderDB
+        year = cast(extract('year', OrderDB.created_at), Integer)
+        month = cast(extract('month', OrderDB.created_at), Integer)
+        return select(
+            year, month, OrderDB.status, func.count(OrderDB.id), func.coalesce(func.sum(OrderDB.total_amount), 0.0)
+        ).where(
+            OrderDB.created_at.isnot(None)
+        ).group_by(year, month, OrderDB.status)
+
+
+class ClientDailyRollup(RollupTable):
+    """Pedidos y monto por cliente, día de creación y estado (client_daily_stats)"""
+    
+    def __init__(self):
+        from sqlalchemy import Date
+        from ..models.db_models import ClientDailyStatsDB
+        super().__init__(
+            'client_daily',
+            ClientDailyStatsDB,
+            'client_daily_stats',
+            ('client_id', 'day', 'status'),
+            ('orders_count', 'total_amount'),
+            column_types={'day': Date()}
+        )
+    
+    def deltas(self, order, sign: int) -> List[dict]:
+        if order.client_id is None or order.created_at is None:
+            return []
+        return [{
+            'client_id': order.client_id,
+            'day': order.created_at.date(),
+            'status': _status_value(order.status),
+            'orders_count': sign,
+            'total_amount': sign * float(order.total_amount or 0)
+        }]
+    
+    def rebuild_select(self):
+        from sqlalchemy import func, select
+        from ..models.db_models import OrderDB
+        day = func.date(OrderDB.created_at)
+        return select(
+            OrderDB.client_id, day, OrderDB.status, func.count(OrderDB.id),
+            func.coalesce(func.sum(OrderDB.total_amount), 0.0)
+        ).where(
+            OrderDB.client_id.isnot(None),
+            OrderDB.created_at.isnot(None)
+        ).group_by(OrderDB.client_id, day, OrderDB.status)
+
+
+class ProductDailyRollup(RollupTable):
+    """Unidades vendidas por producto y día de creación del pedido (product_daily_stats)"""
+    
+    # Los items de un pedido no cambian al modificarlo
+    affected_by_updates = False
+    
+    def __init__(self):
+        from sqlalchemy import Date
+        from ..models.db_models import ProductDailyStatsDB
+        super().__init__(
+            'product_daily',
+            ProductDailyStatsDB,
+            'product_daily_stats',
+            ('product_id', 'day'),
+            ('quantity_sold',),
+            column_types={'day': Date()}
+        )
+    
+    def deltas(self, order, sign: int) -> List[dict]:
+        if order.created_at is None:
+            return []
+        day = order.created_at.date()
+        return [
+            {'product_id': item.product_id, 'day': day, 'quantity_sold': sign * item.quantity}
+            for item in getattr(order, 'items', None) or []
+        ]
+    
+    def rebuild_select(self):
+        from sqlalchemy import func, select
+        from ..models.db_models import OrderDB, OrderItemDB
+        day = func.date(OrderDB.created_at)
+        return select(
+            OrderItemDB.product_id, day, func.coalesce(func.sum(OrderItemDB.quantity), 0)
+        ).join(
+            OrderDB, OrderItemDB.order_id == OrderDB.id
+        ).where(
+            OrderDB.created_at.isnot(None)
+        ).group_by(OrderItemDB.product_id, day)
+
+
+class ClientMonthlyRollup(RollupTable):
+    """Pedidos por cliente y mes de creación (client_monthly_stats), para contar clientes activos"""
+    
+    def __init__(self):
+        from ..models.db_models import ClientMonthlyStatsDB
+        super().__init__(
+            'client_monthly',
+            ClientMonthlyStatsDB,
+            'client_monthly_stats',
+            ('client_id', 'year', 'month'),
+            ('orders_count',)
+        )
+    
+    def deltas(self, order, sign: int) -> List[dict]:
+        if order.client_id is None or order.created_at is None:
+            return []
+        return [{
+            'client_id': order.client_id,
+            'year': order.created_at.year,
+            'month': order.created_at.month,
+            'orders_count': sign
+        }]
+    
+    def rebuild_select(self):
+        from sqlalchemy import Integer, cast, extract, func, select
+        from ..models.db_models import OrderDB
+        year = cast(extract('year', OrderDB.created_at), Integer)
+        month = cast(extract('month', OrderDB.created_at), Integer)
+        return select(
+            OrderDB.client_id, year, month, func.count(OrderDB.id)
+        ).where(
+            OrderDB.client_id.isnot(None),
+            OrderDB.created_at.isnot(None)
+        ).group_by(OrderDB.client_id, year, month)
+
+
+order_monthly_rollup = OrderMonthlyRollup()
+client_daily_rollup = ClientDailyRollup()
+product_daily_rollup = ProductDailyRollup()
+client_monthly_rollup = ClientMonthlyRollup()
+
+ROLLUPS = {
+    rollup.name: rollup
+    for rollup in (order_monthly_rollup, client_daily_rollup, product_daily_rollup, client_monthly_rollup)
+}
+
+
+def order_rollup_deltas(order, sign: int) -> Dict[str, List[dict]]:
+    """
+    Deltas de todos los rollups para un pedido que se suma (sign=1) o se resta (sign=-1)
+    
+    Args:
+        order: Pedido de dominio u OrderDB con created_at e items asignados
+        sign: 1 al crear, -1 al eliminar
+    """
+    return {name: rollup.deltas(order, sign) for name, rollup in ROLLUPS.items()}
+
+
+def order_update_rollup_deltas(db_order, previous: dict) -> Dict[str, List[dict]]:
+    """
+    Deltas de una modificación: se resta el pedido con sus valores anteriores y se suma con los nuevos
+    
+    Args:
+        db_order: OrderDB con los valores nuevos
+        previous: Valores anteriores de status, client_id y total_amount
+    """
+    previous_order = SimpleNamespace(
+        created_at=db_order.created_at,
+        status=previous['status'],
+        client_id=previous['client_id'],
+        total_amount=previous['total_amount']
+    )
+    return {
+        name: rollup.deltas(previous_order, -1) + rollup.deltas(db_order, 1)
+        for name, rollup in ROLLUPS.items()
+        if rollup.affected_by_updates
+    }
+
+
+def stage_rollup_deltas(session, deltas_by_rollup: Dict[str, List[dict]]) -> None:
+    """Deja los deltas pendientes en la sesión; se aplican antes del commit"""
+    pending = session.info.setdefault(_PENDING_ROLLUPS_KEY, {})
+    for name, deltas in deltas_by_rollup.items():
+        pending.setdefault(name, []).extend(deltas)
+
+
+def rollup_upsert_ctes(deltas_by_rollup: Dict[str, List[dict]]) -> list:
+    """
+    CTEs de PostgreSQL que aplican los deltas dentro de otra sentencia
+    
+    Cada CTE retorna una fila (count de filas afectadas) para que la sentencia
+    principal haga join con ella y se incluya en el mismo round trip.
+    """
+    from sqlalchemy import func, literal_column, select
+    ctes = []
+    for name, deltas in deltas_by_rollup.items():
+        rollup = ROLLUPS[name]
+        rows = rollup.merge(deltas)
+        if not rows:
+            continue
+        upsert = rollup.upsert_statement(rows, 'postgresql').returning(literal_column('1').label('applied'))
+        applied = upsert.cte(f"{name}_rollup")
+        ctes.append(select(func.count().label('applied')).select_from(applied).cte(f"{name}_rollup_applied"))
+    return ctes
+
+
+def clear_rollups(session) -> None:
+    """Vacía todas las tablas rollup (eliminación de todos los pedidos)"""
+    session.info.pop(_PENDING_ROLLUPS_KEY, None)
+    for rollup in ROLLUPS.values():
+        session.query(rollup.model).delete()
+
+
+def rebuild_rollup(session, rollup: RollupTable) -> int:
+    """
+    Recalcula una tabla rollup desde los pedidos en la transacción de la sesión
+    
+    En PostgreSQL bloquea las escrituras de pedidos (LOCK TABLE ... IN SHARE MODE)
+    mientras se recalcula, para que ningún delta se aplique sobre filas borradas.
+    
+    Returns:
+        Cantidad de filas del rollup
+    """
+    from sqlalchemy import delete, func, insert, select, text
+    if _dialect_name(session) == 'postgresql':
+        session.execute(text("LOCK TABLE orders IN SHARE MODE"))
+    session.execute(delete(rollup.table))
+    session.execute(
+        insert(rollup.table).from_select(list(rollup.key_columns + rollup.measure_columns), rollup.rebuild_select())
+    )
+    # Los caches de todos los procesos se calcularon con el rollup anterior
+    emit_order_events(session, [build_cache_reset_event()])
+    return session.execute(select(func.count()).select_from(rollup.table)).scalar() or 0
+
+
+def backfill_new_rollups(session_factory, existing_tables: Iterable[str]) -> List[str]:
+    """
+    Reconstruye los rollups cuyas tablas no estaban en existing_tables
+    
+    Una tabla rollup recién creada está vacía aunque ya haya pedidos. Si otro
+    proceso la está poblando al mismo tiempo, el rebuild de este falla (llave
+    duplicada) y se descarta: el del otro proceso deja la tabla completa.
+    
+    Args:
+        session_factory: Fábrica de sesiones (una transacción por rollup)
+        existing_tables: Tablas que existían antes de crear las nuevas
+        
+    Returns:
+        Nombres de los rollups reconstruidos
+    """
+    existing_tables = set(existing_tables)
+    rebuilt = []
+    for name, rollup in ROLLUPS.items():
+        if rollup.table_name in existing_tables:
+            continue
+        session = session_factory()
+        try:
+            rows = rebuild_rollup(session, rollup)
+            session.commit()
+            rebuilt.append(name)
+            logger.info(f"Rollup '{name}' creado y poblado desde los pedidos: {rows} filas")
+        except Exception as e:
+            session.rollback()
+            logger.warning(f"No se pudo poblar el rollup '{name}' (ejecute 'flask rollups rebuild --rollup {name}'): {str(e)}")
+        finally:
+            session.close()
+    return rebuilt
+
+
+def _apply_pending_rollups(session) -> None:
+    pending = session.info.pop(_PENDING_ROLLUPS_KEY, None)
+    if not pending:
+        return
+    if _dialect_name(session) == 'postgresql':
+        from sqlalchemy import select, true
+        ctes = rollup_upsert_ctes(pending)
+        if not ctes:
+            return
+        # Un solo round trip: cada CTE retorna una fila y el SELECT las une
+        applied = ctes[0]
+        for cte in ctes[1:]:
+            applied = applied.join(cte, true())
+        session.execute(select(*(cte.c.applied for cte in ctes)).select_from(applied))
+        return
+    for name, deltas in pending.items():
+        ROLLUPS[name].apply(session, deltas)
+
+
+def _discard_pending_rollups(session, *args) -> None:
+    session.info.pop(_PENDING_ROLLUPS_KEY, None)
+
+
+def _status_value(status) -> str:
+    return getattr(status, 'value', status)
+
+
+def _dialect_name(session) -> str:
+    try:
+        return session.get_bind().dialect.name
+    except Exception:
+        return ''
+
+
+def _register_session_hooks() -> None:
+    from sqlalchemy import event
+    from sqlalchemy.orm import Session
+    event.listen(Session, 'before_commit', _apply_pending_rollups)
+    event.listen(Session, 'after_soft_rollback', _discard_pending_rollups)
+
+
+_register_session_hooks()
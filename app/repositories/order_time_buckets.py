@@ -0,0 +1,210 @@
+"""
+Agregación de pedidos por intervalos de tiempo (día, semana, mes o trimestre)
+
+order_time_buckets lee la tabla más pequeña que cubre los filtros pedidos:
+order_monthly_stats para meses o trimestres sin filtros de cliente ni camión,
+client_daily_stats cuando se filtra por clientes, y orders en los demás casos
+(filtro por camión, o días y semanas de todos los pedidos; client_daily_stats no
+incluye los pedidos sin cliente). Los rollups se filtran por mes o día completo.
+
+En PostgreSQL los intervalos se calculan en una sola sentencia: date_trunc agrupa
+los pedidos y generate_series genera todos los intervalos del rango, de modo que
+los que no tienen pedidos llegan con cero. En otros motores se agrupa por la fecha
+de la tabla y los intervalos se completan aquí con time_buckets.
+"""
+from datetime import date, datetime
+from typing import List, Optional
+from ..utils.time_buckets import GRANULARITIES, bucket_start, iter_buckets
+
+
+class BucketSource:
+    """
+    Tabla de la que se leen los intervalos
+    
+    Args:
+        name: Tabla que se lee
+        keys: Columnas por las que se agrupa fuera de PostgreSQL
+        day: Expresión con la fecha de cada fila (date_trunc en PostgreSQL)
+        orders_count: Agregado con la cantidad de pedidos
+        total_amount: Agregado con el monto total
+        filters: Condiciones de la consulta
+        row_day: Fecha de una fila agrupada por keys
+    """
+    
+    def __init__(self, name, keys, day, orders_count, total_amount, filters, row_day):
+        self.name = name
+        self.keys = keys
+        self.day = day
+        self.orders_count = orders_count
+        self.total_amount = total_amount
+        self.filters = filters
+        self.row_day = row_day
+
+
+def _as_date(value) -> date:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])
+
+
+def bucket_source(start_date: datetime, end_date: datetime, granularity: str, client_ids: Optional[List[str]] = None,
+                  statuses: Optional[List[str]] = None, assigned_truck: Optional[str] = None) -> BucketSource:
+    """Elige la tabla y arma los filtros de la consulta"""
+    from sqlalchemy import func
+    from ..models.db_models import OrderDB, OrderMonthlyStatsDB, ClientDailyStatsDB
+    
+    if assigned_truck is None and client_ids is None and granularity in ('month', 'quarter'):
+        stats = OrderMonthlyStatsDB
+        month_index = stats.year * 12 + stats.month
+        filters = [
+            month_index >= start_date.year * 12 + start_date.month,
+            month_index <= end_date.year * 12 + end_date.month
+        ]
+        if statuses:
+            filters.append(stats.status.in_(statuses))
+        return BucketSource(
+            'order_monthly_stats',
+            keys=(stats.year, stats.month),
+            day=func.make_date(stats.year, stats.month, 1),
+            orders_count=func.sum(stats.orders_count),
+            total_amount=func.sum(stats.total_amount),
+            filters=filters,
+            row_day=lambda row: date(int(row[0]), int(row[1]), 1)
+        )
+    
+    if assigned_truck is None and client_ids is not None:
+        stats = ClientDailyStatsDB
+        filters = [
+            stats.client_id.in_(client_ids),
+            stats.day.between(_as_date(start_date), _as_date(end_date))
+        ]
+        if statuses:
+            filters.append(stats.status.in_(statuses))
+        return BucketSource(
+            'client_daily_stats',
+            keys=(stats.day,),
+            day=stats.day,
+            orders_count=func.sum(stats.orders_count),
+            total_amount=func.sum(stats.total_amount),
+            filters=filters,
+            row_day=lambda row: _as_date(row[0])
+        )
+    
+    filters = [OrderDB.created_at.between(start_date, end_date)]
+    if client_ids is not None:
+        filters.append(OrderDB.client_id.in_(client_ids))
+    if statuses:
+        filters.append(OrderDB.status.in_(statuses))
+    if assigned_truck is not None:
+        filters.append(OrderDB.assigned_truck == assigned_truck)
+    return BucketSource(
+        'orders',
+        keys=(func.date(OrderDB.created_at),),
+        day=OrderDB.created_at,
+        orders_count=func.count(OrderDB.id),
+        total_amount=func.sum(OrderDB.total_amount),
+        filters=filters,
+        row_day=lambda row: _as_date(row[0])
+    )
+
+
+def time_buckets_statement(source: BucketSource, start_date: datetime, end_date: datetime, granularity: str):
+    """
+    Sentencia de PostgreSQL con un intervalo por fila (bucket, orders_count, total_amount)
+    
+    Los intervalos sin pedidos se completan con generate_series dentro de la misma sentencia.
+    """
+    from sqlalchemy import DateTime, cast, func, literal, literal_column, select
+    
+    # La granularidad y el intervalo vienen de GRANULARITIES: se escriben en la sentencia
+    # para que date_trunc del SELECT y del GROUP BY sean la misma expresión
+    unit = literal_column(f"'{granularity}'")
+    step = literal_column(f"interval '{GRANULARITIES[granularity]}'")
+    
+    def truncate(value):
+        return func.date_trunc(unit, cast(value, DateTime()))
+    
+    buckets = select(
+        func.generate_series(
+            truncate(literal(start_date, DateTime())),
+            truncate(literal(end_date, DateTime())),
+            step
+        ).label('bucket')
+    ).cte('buckets')
+    bucket = truncate(source.day)
+    totals = select(
+        bucket.label('bucket'),
+        source.orders_count.label('orders_count'),
+        source.total_amount.label('total_amount')
+    ).where(*source.filters).group_by(bucket).cte('totals')
+    
+    return select(
+        buckets.c.bucket,
+        func.coalesce(totals.c.orders_count, 0).label('orders_count'),
+        func.coalesce(totals.c.total_amount, 0).label('total_amount')
+    ).select_from(
+        buckets.outerjoin(totals, totals.c.bucket == buckets.c.bucket)
+    ).order_by(buckets.c.bucket)
+
+
+def order_time_buckets(session, dialect_name: str, start_date: datetime, end_date: datetime, granularity: str,
+                       client_ids: Optional[List[str]] = None, statuses: Optional[List[str]] = None,
+                       assigned_truck: Optional[str] = None) -> List[dict]:
+    """
+    Pedidos y monto total de cada intervalo entre start_date y end_date
+    
+    Args:
+        session: Sesión de base de datos
+        dialect_name: Motor de la sesión ('postgresql' calcula todo en una sentencia)
+        start_date: Fecha inicial (su intervalo es el primero)
+        end_date: Fecha final (su intervalo es el último)
+        granularity: 'day', 'week', 'month' o 'quarter'
+        client_ids: Solo pedidos de estos clientes (None: todos)
+        statuses: Solo pedidos en estos estados (None: todos)
+        assigned_truck: Solo pedidos asignados a este camión (None: todos)
+    
+    Returns:
+        Lista ordenada con bucket_start (date), orders_count y total_amount de cada intervalo,
+        incluidos los intervalos sin pedidos
+    """
+    from sqlalchemy import select
+    
+    if granularity not in GRANULARITIES:
+        raise ValueError(f"Granularidad no válida: {granularity}")
+    if client_ids is not None and not client_ids:
+        return [
+            {'bucket_start': start, 'orders_count': 0, 'total_amount': 0.0}
+            for start in iter_buckets(start_date, end_date, granularity)
+        ]
+    
+    source = bucket_source(start_date, end_date, granularity, client_ids, statuses, assigned_truck)
+    
+    if dialect_name == 'postgresql':
+        rows = session.execute(time_buckets_statement(source, start_date, end_date, granularity)).all()
+        return [
+            {
+                'bucket_start': _as_date(row.bucket),
+                'orders_count': int(row.orders_count or 0),
+                'total_amount': round(float(row.total_amount or 0), 2)
+            }
+            for row in rows
+        ]
+    
+    rows = session.execute(
+        select(*source.keys, source.orders_count, source.total_amount).where(*source.filters).group_by(*source.keys)
+    ).all()
+    totals = {}
+    for row in rows:
+        start = bucket_start(source.row_day(row), granularity)
+        orders_count, total_amount = totals.get(start, (0, 0.0))
+        totals[start] = (orders_count + int(row[-2] or 0), total_amount + float(row[-1] or 0))
+    return [
+        {
+            'bucket_start': start,
+            'orders_count': totals.get(start, (0, 0.0))[0],
+            'total_amount': round(totals.get(start, (0, 0.0))[1], 2)
+        }
+        for start in iter_buckets(start_date, end_date, granularity)
+    ]
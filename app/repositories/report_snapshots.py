@@ -0,0 +1,195 @@
+"""
+Instantáneas de reportes recalculadas periódicamente por un solo worker
+
+client_quarter_stats guarda los pedidos por cliente del último trimestre y
+report_snapshots el período y la fecha de cálculo. refresh_top_clients_snapshot
+reemplaza la instantánea en una sola transacción: las lecturas concurrentes ven la
+anterior hasta el commit, igual que un REFRESH MATERIALIZED VIEW CONCURRENTLY.
+
+En PostgreSQL cada worker corre un SnapshotRefresher que intenta tomar un advisory
+lock de sesión (pg_try_advisory_lock) en una conexión dedicada: el que lo obtiene es
+el líder y recalcula cada intervalo mientras mantenga la conexión; los demás lo
+reintentan cada intervalo, así que si el líder muere otro worker toma su lugar.
+"""
+import logging
+import os
+import threading
+from datetime import datetime
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+TOP_CLIENTS_SNAPSHOT = 'top_clients_quarter'
+
+# Llave del advisory lock que elige al worker que recalcula las instantáneas
+SNAPSHOT_REFRESH_LOCK_KEY = 7_340_044
+
+
+def _tables():
+    from sqlalchemy import DateTime, column, table
+    client_quarter_stats = table('client_quarter_stats', column('client_id'), column('orders_count'))
+    report_snapshots = table(
+        'report_snapshots',
+        column('name'),
+        column('window_start', DateTime()),
+        column('window_end', DateTime()),
+        column('refreshed_at', DateTime())
+    )
+    return client_quarter_stats, report_snapshots
+
+
+def refresh_top_clients_snapshot(session, now: Optional[datetime] = None) -> int:
+    """
+    Recalcula la instantánea de pedidos por cliente del último trimestre en la transacción de la sesión
+    
+    Args:
+        session: Sesión de base de datos (el commit lo hace quien llama)
+        now: Fin del período (default: ahora)
+    
+    Returns:
+        Cantidad de clientes de la instantánea
+    """
+    from dateutil.relativedelta import relativedelta
+    from sqlalchemy import delete, func, insert, select
+    from ..models.db_models import OrderDB
+    
+    client_quarter_stats, report_snapshots = _tables()
+    window_end = now or datetime.now()
+    window_start = window_end - relativedelta(months=3)
+    
+    session.execute(delete(client_quarter_stats))
+    session.execute(
+        insert(client_quarter_stats).from_select(
+            ['client_id', 'orders_count'],
+            select(OrderDB.client_id, func.count(OrderDB.id)).where(
+                OrderDB.created_at >= window_start,
+                OrderDB.created_at <= window_end,
+                OrderDB.client_id.isnot(None)
+            ).group_by(OrderDB.client_id)
+        )
+    )
+    session.execute(delete(report_snapshots).where(report_snapshots.c.name == TOP_CLIENTS_SNAPSHOT))
+    session.execute(
+        insert(report_snapshots).values(
+            name=TOP_CLIENTS_SNAPSHOT,
+            window_start=window_start,
+            window_end=window_end,
+            refreshed_at=window_end
+        )
+    )
+    return session.execute(select(func.count()).select_from(client_quarter_stats)).scalar() or 0
+
+
+def clear_snapshots(session) -> None:
+    """Elimina las instantáneas (eliminación de todos los pedidos); los reportes vuelven a la consulta directa"""
+    from ..models.db_models import ClientQuarterStatsDB, ReportSnapshotDB
+    session.query(ClientQuarterStatsDB).delete()
+    session.query(ReportSnapshotDB).delete()
+
+
+class SnapshotRefresher(threading.Thread):
+    """
+    Hilo que recalcula las instantáneas cuando este worker es el líder
+    
+    Args:
+        engine: Engine de PostgreSQL (conexión dedicada para el advisory lock)
+        session_factory: Crea las sesiones en que se recalcula
+        interval: Segundos entre cálculos (y entre intentos de ser líder)
+        lock_key: Llave del advisory lock
+    """
+    
+    def __init__(self, engine, session_factory: Callable, interval: float, lock_key: int = SNAPSHOT_REFRESH_LOCK_KEY):
+        super().__init__(name='report-snapshots-refresher', daemon=True)
+        self.engine = engine
+        self.session_factory = session_factory
+        self.interval = interval
+        self.lock_key = lock_key
+        self._stopped = threading.Event()
+    
+    def stop(self) -> None:
+        self._stopped.set()
+    
+    def run(self) -> None:
+        while not self._stopped.is_set():
+            connection = None
+            try:
+                connection = self.engine.raw_connection()
+                dbapi_connection = connection.dbapi_connection
+                dbapi_connection.autocommit = True
+                if self._try_lock(dbapi_connection):
+                    logger.info("Este worker recalcula las instantáneas de reportes")
+                    self._lead(dbapi_connection)
+            except Exception as e:
+                logger.error(f"Error en el recálculo de instantáneas de reportes: {str(e)}")
+            finally:
+                if connection is not None:
+                    try:
+                        # Cerrar la conexión libera el advisory lock; no se devuelve al pool
+                        connection.invalidate()
+                    except Exception:
+                        pass
+            self._stopped.wait(self.interval)
+    
+    def refresh_once(self) -> None:
+        """Recalcula las instantáneas en una transacción propia"""
+        session = self.session_factory()
+        try:
+            clients = refresh_top_clients_snapshot(session)
+            session.commit()
+            logger.info(f"Instantánea '{TOP_CLIENTS_SNAPSHOT}' recalculada: {clients} clientes")
+        except Exception as e:
+            session.rollback()
+            logger.error(f"Error al recalcular la instantánea '{TOP_CLIENTS_SNAPSHOT}': {str(e)}")
+        finally:
+            session.close()
+    
+    def _try_lock(self, dbapi_connection) -> bool:
+        with dbapi_connection.cursor() as cursor:
+            cursor.execute("SELECT pg_try_advisory_lock(%s)", (self.lock_key,))
+            return bool(cursor.fetchone()[0])
+    
+    def _lead(self, dbapi_connection) -> None:
+        while not self._stopped.is_set():
+            self.refresh_once()
+            if self._stopped.wait(self.interval):
+                return
+            # Si la conexión del lock se perdió, otro worker pudo tomar el liderazgo
+            with dbapi_connection.cursor() as cursor:
+                cursor.execute("SELECT 1")
+
+
+class SnapshotScheduler:
+    """Mantiene un SnapshotRefresher corriendo en el proceso si hay uno configurado"""
+    
+    def __init__(self):
+        self.refresher_factory: Optional[Callable[[], threading.Thread]] = None
+        self._refresher: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+    
+    def ensure_running(self) -> None:
+        if self.refresher_factory is None:
+            return
+        refresher = self._refresher
+        if refresher is not None and refresher.is_alive():
+            return
+        with self._lock:
+            if self._refresher is not None and self._refresher.is_alive():
+                return
+            self._refresher = self.refresher_factory()
+            self._refresher.start()
+    
+    def _reset_after_fork(self) -> None:
+        """
+        El hilo no sobrevive al fork: el proceso hijo lo inicia con su primera petición
+        
+        No se abre ninguna conexión aquí: el hook corre antes de que el hijo descarte
+        las conexiones heredadas del engine.
+        """
+        self._lock = threading.Lock()
+        self._refresher = None
+
+
+snapshot_scheduler = SnapshotScheduler()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=snapshot_scheduler._reset_after_fork)
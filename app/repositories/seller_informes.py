@@ -0,0 +1,245 @@
+"""
+Resumen de pedidos de varios vendedores en una sola consulta
+
+La cartera de cada vendedor (vendedor -> clientes) viene del servicio de
+autenticación. En PostgreSQL se envía como una lista VALUES (seller_id, client_id)
+que se une con client_daily_stats, y la consulta agrupa por vendedor, estado y
+mes. En otros motores la misma consulta agrupa por cliente y las filas se reparten
+entre los vendedores aquí. Un cliente asignado a varios vendedores suma en cada uno.
+
+Los días anteriores a start_date se agrupan en una sola fila por estado (year y
+month nulos): cuentan para el resumen por estado pero no para el mensual.
+
+El tablero de un vendedor (seller_dashboard) resuelve en una sola sentencia el
+resumen por estado, el mensual y la primera página de clientes: una CTE con las
+filas de su cartera agrupada por cliente, por estado y por mes (GROUPING SETS en
+PostgreSQL, UNION ALL de los tres agrupamientos en otros motores), de la que solo
+se devuelven los clientes de la página.
+"""
+from datetime import date, datetime
+from typing import Dict, List, Union
+
+# Agrupamiento de cada fila del tablero (valor de GROUPING(client_id, status))
+CLIENT_ROWS = 1
+STATUS_ROWS = 2
+MONTH_ROWS = 3
+
+
+def _summary_statement(owner, join_target, filters, start_date: date):
+    """Filas (owner, status, year, month, orders_count, total_amount) de client_daily_stats"""
+    from sqlalchemy import Integer, case, cast, extract, func, select
+    from ..models.db_models import ClientDailyStatsDB
+    
+    stats = ClientDailyStatsDB
+    in_range = stats.day >= start_date
+    rows = select(
+        owner.label('owner'),
+        stats.status.label('status'),
+        case((in_range, cast(extract('year', stats.day), Integer)), else_=None).label('year'),
+        case((in_range, cast(extract('month', stats.day), Integer)), else_=None).label('month'),
+        stats.orders_count.label('orders_count'),
+        stats.total_amount.label('total_amount')
+    ).where(stats.orders_count != 0, *filters)
+    if join_target is not None:
+        rows = rows.select_from(join_target)
+    # El mes se calcula en una subconsulta para agrupar por la columna y no repetir la expresión
+    rows = rows.subquery('seller_stats')
+    
+    return select(
+        rows.c.owner,
+        rows.c.status,
+        rows.c.year,
+        rows.c.month,
+        func.sum(rows.c.orders_count).label('orders_count'),
+        func.sum(rows.c.total_amount).label('total_amount')
+    ).group_by(rows.c.owner, rows.c.status, rows.c.year, rows.c.month)
+
+
+def sellers_summary_statement(assignments: Dict[str, List[str]], start_date: date):
+    """Sentencia de PostgreSQL agrupada por vendedor: la cartera viaja como VALUES"""
+    from sqlalchemy import String, column, values
+    from ..models.db_models import ClientDailyStatsDB
+    
+    portfolio = values(
+        column('seller_id', String()), column('client_id', String()), name='seller_clients'
+    ).data([
+        (seller_id, client_id)
+        for seller_id, client_ids in assignments.items()
+        for client_id in dict.fromkeys(client_ids)
+    ])
+    return _summary_statement(
+        portfolio.c.seller_id,
+        portfolio.join(ClientDailyStatsDB, ClientDailyStatsDB.client_id == portfolio.c.client_id),
+        [],
+        start_date
+    )
+
+
+def clients_summary_statement(client_ids: List[str], start_date: date):
+    """Misma consulta agrupada por cliente (motores sin listas VALUES con nombre de columnas)"""
+    from ..models.db_models import ClientDailyStatsDB
+    return _summary_statement(
+        ClientDailyStatsDB.client_id, None, [ClientDailyStatsDB.client_id.in_(client_ids)], start_date
+    )
+
+
+def sellers_summary(session, dialect_name: str, assignments: Dict[str, List[str]],
+                    start_date: Union[date, datetime]) -> Dict[str, dict]:
+    """
+    Pedidos por estado y por mes de cada vendedor
+    
+    Args:
+        session: Sesión de base de datos
+        dialect_name: Motor de la sesión ('postgresql' agrupa por vendedor en la base de datos)
+        assignments: Diccionario {seller_id: lista de client_id asignados}
+        start_date: Primer día del resumen mensual (el resumen por estado incluye todo el histórico)
+    
+    Returns:
+        Diccionario {seller_id: {'status_summary': [{status, count, total_amount}],
+        'monthly_summary': [{year, month, orders_count, total_amount}] ordenado por mes}}
+    """
+    if isinstance(start_date, datetime):
+        start_date = start_date.date()
+    summaries = {seller_id: ({}, {}) for seller_id in assignments}
+    
+    def add(seller_id, row) -> None:
+        statuses, months = summaries[seller_id]
+        count, amount = int(row.orders_count or 0), float(row.total_amount or 0)
+        status_count, status_amount = statuses.get(row.status, (0, 0.0))
+        statuses[row.status] = (status_count + count, status_amount + amount)
+        if row.year is not None:
+            key = (int(row.year), int(row.month))
+            month_count, month_amount = months.get(key, (0, 0.0))
+            months[key] = (month_count + count, month_amount + amount)
+    
+    if any(assignments.values()):
+        if dialect_name == 'postgresql':
+            for row in session.execute(sellers_summary_statement(assignments, start_date)).all():
+                add(row.owner, row)
+        else:
+            sellers_by_client = {}
+            for seller_id, client_ids in assignments.items():
+                for client_id in set(client_ids):
+                    sellers_by_client.setdefault(client_id, []).append(seller_id)
+            for row in session.execute(clients_summary_statement(list(sellers_by_client), start_date)).all():
+                for seller_id in sellers_by_client.get(row.owner, []):
+                    add(seller_id, row)
+    
+    return {
+        seller_id: {
+            'status_summary': [
+                {'status': status, 'count': count, 'total_amount': amount}
+                for status, (count, amount) in statuses.items()
+                if count
+            ],
+            'monthly_summary': [
+                {'year': year, 'month': month, 'orders_count': count, 'total_amount': amount}
+                for (year, month), (count, amount) in sorted(months.items())
+                if count
+            ]
+        }
+        for seller_id, (statuses, months) in summaries.items()
+    }
+
+
+def dashboard_statement(client_ids: List[str], start_date: date, per_page: int, grouping_sets: bool):
+    """
+    Sentencia del tablero: filas (grouping_id, client_id, status, year, month,
+    orders_count, total_amount, total_clients) con los estados, los meses y los
+    per_page clientes de mayor monto
+    """
+    from sqlalchemy import Integer, case, cast, extract, func, literal, or_, select, tuple_, union_all
+    from ..models.db_models import ClientDailyStatsDB
+    
+    stats = ClientDailyStatsDB
+    in_range = stats.day >= start_date
+    rows = select(
+        stats.client_id.label('client_id'),
+        stats.status.label('status'),
+        case((in_range, cast(extract('year', stats.day), Integer)), else_=None).label('year'),
+        case((in_range, cast(extract('month', stats.day), Integer)), else_=None).label('month'),
+        stats.orders_count.label('orders_count'),
+        stats.total_amount.label('total_amount')
+    ).where(stats.client_id.in_(client_ids), stats.orders_count != 0).cte('seller_stats')
+    
+    orders_count = func.sum(rows.c.orders_count).label('orders_count')
+    total_amount = func.sum(rows.c.total_amount).label('total_amount')
+    if grouping_sets:
+        grouped = select(
+            func.grouping(rows.c.client_id, rows.c.status).label('grouping_id'),
+            rows.c.client_id, rows.c.status, rows.c.year, rows.c.month, orders_count, total_amount
+        ).group_by(func.grouping_sets(
+            tuple_(rows.c.client_id), tuple_(rows.c.status), tuple_(rows.c.year, rows.c.month)
+        ))
+    else:
+        empty = literal(None)
+        grouped = union_all(
+            select(literal(CLIENT_ROWS).label('grouping_id'), rows.c.client_id, empty.label('status'),
+                   empty.label('year'), empty.label('month'), orders_count, total_amount)
+            .group_by(rows.c.client_id),
+            select(literal(STATUS_ROWS), empty, rows.c.status, empty, empty, orders_count, total_amount)
+            .group_by(rows.c.status),
+            select(literal(MONTH_ROWS), empty, empty, rows.c.year, rows.c.month, orders_count, total_amount)
+            .group_by(rows.c.year, rows.c.month)
+        )
+    grouped = grouped.subquery('seller_groups')
+    
+    # Posición de cada cliente por monto (como get_clients_summary_by_client_ids) y total de clientes
+    ranked = select(
+        grouped,
+        func.row_number().over(
+            partition_by=grouped.c.grouping_id,
+            order_by=(grouped.c.total_amount.desc(), grouped.c.client_id)
+        ).label('position'),
+        func.count().over(partition_by=grouped.c.grouping_id).label('total_clients')
+    ).subquery('seller_ranked')
+    
+    return select(ranked).where(or_(
+        ranked.c.grouping_id != CLIENT_ROWS,
+        ranked.c.position.between(1, per_page)
+    )).order_by(ranked.c.grouping_id, ranked.c.position)
+
+
+def seller_dashboard(session, dialect_name: str, client_ids: List[str], start_date: Union[date, datetime],
+                     per_page: int) -> dict:
+    """
+    Resumen por estado, resumen mensual y primera página de clientes de una cartera
+    
+    Args:
+        session: Sesión de base de datos
+        dialect_name: Motor de la sesión ('postgresql' agrupa con GROUPING SETS)
+        client_ids: Clientes asignados al vendedor
+        start_date: Primer día del resumen mensual (los estados y clientes incluyen todo el histórico)
+        per_page: Clientes de la primera página
+    
+    Returns:
+        Diccionario con status_summary, monthly_summary (ordenado por mes), clients y
+        total_clients, con el formato de los métodos por cliente del repositorio
+    """
+    if isinstance(start_date, datetime):
+        start_date = start_date.date()
+    dashboard = {'status_summary': [], 'monthly_summary': [], 'clients': [], 'total_clients': 0}
+    if not client_ids:
+        return dashboard
+    
+    statement = dashboard_statement(list(dict.fromkeys(client_ids)), start_date, per_page, dialect_name == 'postgresql')
+    for row in session.execute(statement).all():
+        count, amount = int(row.orders_count or 0), float(row.total_amount or 0)
+        if row.grouping_id == CLIENT_ROWS:
+            dashboard['total_clients'] = int(row.total_clients)
+            dashboard['clients'].append({
+                'client_id': row.client_id,
+                'orders_count': count,
+                'total_amount': amount,
+                'average_order_amount': amount / count if count else 0.0
+            })
+        elif row.grouping_id == STATUS_ROWS:
+            if count:
+                dashboard['status_summary'].append({'status': row.status, 'count': count, 'total_amount': amount})
+        elif row.year is not None and count:
+            dashboard['monthly_summary'].append({
+                'year': int(row.year), 'month': int(row.month), 'orders_count': count, 'total_amount': amount
+            })
+    
+    dashboard['monthly_summary'].sort(key=lambda item: (item['year'], item['month']))
+    return dashboard
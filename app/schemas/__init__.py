@@ -0,0 +1,16 @@
+"""
+Esquemas de validación de peticiones
+"""
+from .order_schemas import (
+    CreateOrderCommand,
+    OrderItemCommand,
+    CreateOrderSchema,
+    load_create_order_command
+)
+
+__all__ = [
+    'CreateOrderCommand',
+    'OrderItemCommand',
+    'CreateOrderSchema',
+    'load_create_order_command'
+]
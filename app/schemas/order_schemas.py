@@ -0,0 +1,185 @@
+"""
+Esquemas de validación para la creación de pedidos
+
+El cuerpo de la petición se valida y normaliza una sola vez y se convierte en un
+comando tipado que consume el servicio, sin volver a parsear los datos en el
+servicio ni en el modelo.
+"""
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Union
+from ..exceptions.custom_exceptions import OrderValidationError
+
+
+class OrderItemCommand:
+    """Item validado de un pedido a crear"""
+
+    __slots__ = ('product_id', 'quantity')
+
+    def __init__(self, product_id: Any, quantity: Union[int, float]):
+        self.product_id = product_id
+        self.quantity = quantity
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, OrderItemCommand):
+            return NotImplemented
+        return self.product_id == other.product_id and self.quantity == other.quantity
+
+    def __repr__(self) -> str:
+        return f"OrderItemCommand(product_id={self.product_id!r}, quantity={self.quantity!r})"
+
+
+class CreateOrderCommand:
+    """Datos validados y normalizados para crear un pedido"""
+
+    __slots__ = ('client_id', 'vendor_id', 'total_amount', 'scheduled_delivery_date', 'items')
+
+    def __init__(
+        self,
+        client_id: Optional[str],
+        vendor_id: Optional[str],
+        total_amount: float,
+        scheduled_delivery_date: datetime,
+        items: List[OrderItemCommand]
+    ):
+        self.client_id = client_id
+        self.vendor_id = vendor_id
+        self.total_amount = total_amount
+        self.scheduled_delivery_date = scheduled_delivery_date
+        self.items = items
+
+    def inventory_items(self) -> List[Dict[str, int]]:
+        """Retorna los items en el formato que espera la integración de inventario"""
+        return [{'product_id': item.product_id, 'quantity': item.quantity} for item in self.items]
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, CreateOrderCommand):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self) -> str:
+        return (
+            f"CreateOrderCommand(client_id={self.client_id!r}, vendor_id={self.vendor_id!r}, "
+            f"total_amount={self.total_amount!r}, scheduled_delivery_date={self.scheduled_delivery_date!r}, "
+            f"items={self.items!r})"
+        )
+
+
+class CreateOrderSchema:
+    """
+    Esquema del cuerpo de POST /orders/create
+
+    Valida en Python plano, en un solo recorrido y en el orden en que se reportan
+    los errores: el primero encontrado se lanza como OrderValidationError. No usa
+    marshmallow porque su despacho por campo costaba más que los chequeos que
+    reemplazó. Acepta las mismas entradas que la validación anterior: product_id
+    presente y quantity numérica (entera o decimal) mayor a 0.
+    """
+
+    def load(self, data: Any) -> CreateOrderCommand:
+        """
+        Valida el cuerpo y retorna el comando
+
+        Raises:
+            OrderValidationError: Con el primer error encontrado
+        """
+        if not isinstance(data, dict):
+            raise OrderValidationError('Se requiere un cuerpo JSON')
+
+        get = data.get
+        client_id = get('client_id')
+        vendor_id = get('vendor_id')
+        if not client_id and not vendor_id:
+            raise OrderValidationError('Debe proporcionar al menos client_id o vendor_id')
+        client_id = _uuid_or_none(client_id, 'El client_id debe ser un UUID válido')
+        vendor_id = _uuid_or_none(vendor_id, 'El vendor_id debe ser un UUID válido')
+
+        items = get('items')
+        if items is None:
+            raise OrderValidationError("El pedido debe tener al menos un item: el campo 'items' es obligatorio")
+        if not isinstance(items, list) or not items:
+            raise OrderValidationError('El pedido debe tener al menos un item')
+
+        total_amount = get('total_amount')
+        if not total_amount:
+            raise OrderValidationError('El total_amount es obligatorio')
+        if not _is_positive_number(total_amount):
+            raise OrderValidationError('El total_amount debe ser un número mayor a 0')
+
+        scheduled_delivery_date = _future_datetime(get('scheduled_delivery_date'))
+
+        return CreateOrderCommand(
+            client_id=client_id,
+            vendor_id=vendor_id,
+            total_amount=total_amount,
+            scheduled_delivery_date=scheduled_delivery_date,
+            items=[_item_command(item, position) for position, item in enumerate(items, 1)]
+        )
+
+
+def _is_positive_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and value > 0
+
+
+def _uuid_or_none(value: Any, message: str) -> Optional[str]:
+    """UUID recibido como texto; se conserva el valor original y el texto vacío o null cuentan como ausentes"""
+    if value is None or value == '':
+        return None
+    if not isinstance(value, str):
+        raise OrderValidationError(message)
+    try:
+        uuid.UUID(value)
+    except ValueError:
+        raise OrderValidationError(message)
+    return value
+
+
+def _future_datetime(value: Any) -> datetime:
+    """Fecha ISO 8601 (acepta sufijo Z) que no puede estar en el pasado"""
+    if not value:
+        raise OrderValidationError('El scheduled_delivery_date es obligatorio')
+    if not isinstance(value, str):
+        raise OrderValidationError('El scheduled_delivery_date debe tener formato ISO 8601 válido')
+    try:
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        raise OrderValidationError('El scheduled_delivery_date debe tener formato ISO 8601 válido')
+    if parsed < datetime.now(parsed.tzinfo):
+        raise OrderValidationError('La fecha de entrega no puede ser en el pasado')
+    return parsed
+
+
+def _item_command(item: Any, position: int) -> OrderItemCommand:
+    """Item del pedido; los errores indican su posición (desde 1)"""
+    if not isinstance(item, dict):
+        raise OrderValidationError(f'Cada item debe ser un objeto JSON (item {position})')
+    product_id = item.get('product_id')
+    if not product_id:
+        raise OrderValidationError(f'Cada item debe tener un product_id (item {position})')
+    quantity = item.get('quantity')
+    if not _is_positive_number(quantity):
+        raise OrderValidationError(
+            f"Cada item debe tener una cantidad válida mayor a 0 en 'quantity' (item {position})"
+        )
+    if isinstance(quantity, float) and quantity.is_integer():
+        quantity = int(quantity)
+    return OrderItemCommand(product_id=product_id, quantity=quantity)
+
+
+create_order_schema = CreateOrderSchema()
+
+
+def load_create_order_command(data: Any) -> CreateOrderCommand:
+    """
+    Valida y normaliza el cuerpo de creación de pedido en una sola pasada
+
+    Args:
+        data: Cuerpo JSON de la petición
+
+    Returns:
+        CreateOrderCommand: Comando listo para el servicio
+
+    Raises:
+        OrderValidationError: Con el primer error encontrado
+    """
+    return create_order_schema.load(data)
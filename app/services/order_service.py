@@ -1,19 +1,28 @@
 """
 Servicio para lógica de negocio de pedidos
 """
+import base64
+import hashlib
 import logging
-from typing import List, Optional
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Optional, Union
 import requests
 import os
 from ..models.order import Order
 from ..models.order_item import OrderItem
 from ..models.db_models import OrderStatus
 from ..repositories.order_repository import OrderRepository
-from ..exceptions.custom_exceptions import OrderNotFoundError, OrderValidationError, OrderBusinessLogicError
+from ..exceptions.custom_exceptions import (
+    OrderNotFoundError, OrderValidationError, OrderBusinessLogicError, OrderNumberConflictError
+)
+from ..schemas.order_schemas import CreateOrderCommand, load_create_order_command
 from .inventory_service import InventoryService
 from ..integrations.inventory_integration import InventoryIntegration
 from .auth_service import AuthService
 from ..integrations.auth_integration import AuthIntegration
+from ..utils.cache_invalidation import ORDERS_TAG
+from ..utils.query_cache import cached_query, report_cache
+from ..utils.time_buckets import GRANULARITIES, MONTH_NAMES, MONTH_NAMES_SHORT, bucket_label, iter_buckets
 
 logger = logging.getLogger(__name__)
 
@@ -21,6 +30,24 @@ logger = logging.getLogger(__name__)
 class OrderService:
     """Servicio para lógica de negocio de pedidos"""
     
+    # Ventanas del reporte de top productos: días hacia atrás (None = todo el histórico)
+    TOP_PRODUCTS_WINDOWS = {'30d': 30, '90d': 90, '365d': 365, 'all': None}
+    
+    # Modos de los reportes de top productos y top clientes: exacto o aproximado (heavy hitters)
+    TOP_REPORT_MODES = ('exact', 'approx')
+    
+    # Máximo de intervalos de una serie de pedidos (p. ej. algo menos de 3 años por día)
+    MAX_TIME_SERIES_BUCKETS = 1000
+    
+    # Máximo de meses del informe de clientes activos por vendedor
+    MAX_ACTIVE_CLIENTS_MONTHS = 36
+    
+    # Máximo de vendedores del informe por lotes
+    MAX_BATCH_SELLERS = 50
+    
+    # Intentos de persistir pedidos cuyo número de pedido ya existe (con números nuevos)
+    ORDER_NUMBER_ATTEMPTS = 3
+    
     def __init__(self, order_repository: OrderRepository):
         logger.info("=== INICIALIZANDO OrderService ===")
         self.order_repository = order_repository
@@ -81,6 +108,231 @@ class OrderService:
         except Exception as e:
             raise OrderBusinessLogicError(f"Error al obtener pedidos por camión y fecha: {str(e)}")
     
+    def iter_enriched_orders(
+        self,
+        client_id: str = None,
+        vendor_id: str = None,
+        assigned_truck: str = None,
+        scheduled_delivery_date = None,
+        chunk_size: int = 500
+    ) -> Iterator[List[Order]]:
+        """
+        Recorre los pedidos por fragmentos enriqueciendo sus items con información del producto
+        
+        Cada producto se consulta al servicio de inventarios una sola vez por
+        recorrido, sin importar en cuántos pedidos aparezca.
+        
+        Returns:
+            Iterador de listas de pedidos enriquecidos
+            
+        Raises:
+            OrderValidationError: Si los filtros son inválidos
+            OrderBusinessLogicError: Si falla la consulta de pedidos
+        """
+        product_cache: Dict[int, dict] = {}
+        chunks = self.order_repository.iter_orders_with_items(
+            client_id=client_id,
+            vendor_id=vendor_id,
+            assigned_truck=assigned_truck,
+            scheduled_delivery_date=scheduled_delivery_date,
+            chunk_size=chunk_size
+        )
+        try:
+            for orders in chunks:
+                for order in orders:
+                    self._enrich_items_from_cache(order.items, product_cache)
+                yield orders
+        except ValueError as e:
+            raise OrderValidationError(str(e))
+        except Exception as e:
+            raise OrderBusinessLogicError(f"Error al obtener pedidos: {str(e)}")
+        finally:
+            chunks.close()
+    
+    def iter_order_projections(
+        self,
+        fields: List[str],
+        include: Optional[List[str]] = None,
+        client_id: str = None,
+        vendor_id: str = None,
+        assigned_truck: str = None,
+        scheduled_delivery_date = None,
+        chunk_size: int = 500
+    ) -> Iterator[List[dict]]:
+        """
+        Recorre los pedidos devolviendo solo los campos solicitados (fields=)
+        
+        Los items solo se consultan y enriquecen si include contiene 'items'.
+        
+        Args:
+            fields: Campos del pedido a devolver
+            include: Relaciones a incluir; solo se admite 'items'
+            
+        Returns:
+            Iterador de listas de diccionarios listos para serializar
+            
+        Raises:
+            OrderValidationError: Si hay campos o relaciones no válidos
+            OrderBusinessLogicError: Si falla la consulta de pedidos
+        """
+        include = include or []
+        invalid_fields = [name for name in fields if name not in OrderRepository.ORDER_FIELDS]
+        if not fields or invalid_fields:
+            raise OrderValidationError(
+                f"Campos no válidos en fields: {', '.join(invalid_fields) or '(vacío)'}. "
+                f"Campos disponibles: {', '.join(OrderRepository.ORDER_FIELDS)}"
+            )
+        invalid_includes = [name for name in include if name != 'items']
+        if invalid_includes:
+            raise OrderValidationError(f"Valores no válidos en include: {', '.join(invalid_includes)}. Valores disponibles: items")
+        
+        include_items = 'items' in include
+        datetime_fields = [name for name in ('scheduled_delivery_date', 'created_at', 'updated_at') if name in fields]
+        product_cache: Dict[int, dict] = {}
+        chunks = self.order_repository.iter_order_projections(
+            fields,
+            include_items=include_items,
+            client_id=client_id,
+            vendor_id=vendor_id,
+            assigned_truck=assigned_truck,
+            scheduled_delivery_date=scheduled_delivery_date,
+            chunk_size=chunk_size
+        )
+        try:
+            for projections in chunks:
+                for projection in projections:
+                    for name in datetime_fields:
+                        value = projection[name]
+                        projection[name] = value.isoformat() if value else None
+                    if include_items:
+                        projection['items'] = [
+                            item.to_dict() for item in self._enrich_items_from_cache(projection['items'], product_cache)
+                        ]
+                yield projections
+        except ValueError as e:
+            raise OrderValidationError(str(e))
+        except Exception as e:
+            raise OrderBusinessLogicError(f"Error al obtener pedidos: {str(e)}")
+        finally:
+            chunks.close()
+    
+    def get_listing_etag(
+        self,
+        client_id: str = None,
+        vendor_id: str = None,
+        assigned_truck: str = None,
+        scheduled_delivery_date = None,
+        variant: str = ''
+    ) -> str:
+        """
+        Calcula el ETag de un listado de pedidos sin leer los pedidos
+        
+        Args:
+            client_id, vendor_id, assigned_truck, scheduled_delivery_date: Filtros del listado
+            variant: Parámetros que cambian la representación (p. ej. fields e include)
+        
+        Returns:
+            str: Token que cambia cada vez que cambia algún pedido del listado
+        
+        Raises:
+            OrderValidationError: Si los filtros son inválidos
+            OrderBusinessLogicError: Si falla la consulta de la versión
+        """
+        try:
+            version = self.order_repository.get_listing_version(
+                client_id=client_id,
+                vendor_id=vendor_id,
+                assigned_truck=assigned_truck,
+                scheduled_delivery_date=scheduled_delivery_date
+            )
+        except ValueError as e:
+            raise OrderValidationError(str(e))
+        except Exception as e:
+            raise OrderBusinessLogicError(f"Error al obtener la versión del listado: {str(e)}")
+        
+        max_updated_at = version['max_updated_at']
+        token = '|'.join((
+            str(version['count']),
+            max_updated_at.isoformat() if max_updated_at else '',
+            str(version['max_id'] or ''),
+            client_id or '', vendor_id or '', assigned_truck or '', str(scheduled_delivery_date or ''),
+            variant
+        ))
+        return hashlib.sha1(token.encode('utf-8')).hexdigest()
+    
+    def get_order_changes(
+        self,
+        cursor: str = None,
+        limit: int = 100,
+        client_id: str = None,
+        vendor_id: str = None,
+        assigned_truck: str = None,
+        settle_seconds: float = 0.0
+    ) -> dict:
+        """
+        Obtiene los pedidos creados o modificados después de un cursor
+        
+        El cursor codifica el (updated_at, id) del último pedido entregado, de modo
+        que cada sincronización lee solo los cambios y no el historial completo.
+        
+        Args:
+            cursor: Cursor devuelto por la llamada anterior; None para empezar desde el principio
+            limit: Máximo de pedidos a devolver
+            client_id, vendor_id, assigned_truck: Filtros del feed
+            settle_seconds: Los cambios más recientes que este margen se entregan en la siguiente llamada
+        
+        Returns:
+            Diccionario con orders (pedidos enriquecidos), next_cursor y has_more
+        
+        Raises:
+            OrderValidationError: Si el cursor es inválido
+            OrderBusinessLogicError: Si falla la consulta de cambios
+        """
+        updated_after, after_id = self._decode_changes_cursor(cursor) if cursor else (None, 0)
+        updated_until = datetime.utcnow() - timedelta(seconds=settle_seconds) if settle_seconds else None
+        
+        try:
+            # Se pide un pedido extra para saber si quedan cambios sin entregar
+            orders = self.order_repository.get_orders_changed_since(
+                updated_after=updated_after,
+                after_id=after_id,
+                updated_until=updated_until,
+                limit=limit + 1,
+                client_id=client_id,
+                vendor_id=vendor_id,
+                assigned_truck=assigned_truck
+            )
+        except Exception as e:
+            raise OrderBusinessLogicError(f"Error al obtener cambios de pedidos: {str(e)}")
+        
+        has_more = len(orders) > limit
+        orders = orders[:limit]
+        product_cache: Dict[int, dict] = {}
+        for order in orders:
+            self._enrich_items_from_cache(order.items, product_cache)
+        
+        return {
+            'orders': orders,
+            'next_cursor': self._encode_changes_cursor(orders[-1].updated_at, orders[-1].id) if orders else cursor,
+            'has_more': has_more
+        }
+    
+    @staticmethod
+    def _encode_changes_cursor(updated_at: datetime, order_id: int) -> str:
+        """Codifica el cursor del feed de cambios como texto opaco apto para URL"""
+        raw = f"{updated_at.isoformat()}|{order_id}"
+        return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+    
+    @staticmethod
+    def _decode_changes_cursor(cursor: str) -> tuple:
+        """Decodifica un cursor del feed de cambios en (updated_at, id)"""
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            updated_at, order_id = base64.urlsafe_b64decode(padded.encode('ascii')).decode('utf-8').split('|')
+            return datetime.fromisoformat(updated_at), int(order_id)
+        except (ValueError, UnicodeError):
+            raise OrderValidationError("El cursor no es válido")
+    
     def delete_all_orders(self) -> bool:
         """Elimina todos los pedidos"""
         try:
@@ -113,12 +365,49 @@ class OrderService:
         
         return order
     
-    def create_order(self, order_data: dict) -> Order:
+    def _enrich_items_from_cache(self, items: List[OrderItem], product_cache: Dict[int, dict]) -> List[OrderItem]:
+        """Enriquece items con información del producto consultando cada producto una sola vez"""
+        for item in items:
+            product_info = product_cache.get(item.product_id)
+            if product_info is None:
+                try:
+                    product_info = self.inventory_service.get_product_by_id(item.product_id)
+                except Exception as e:
+                    logger.warning(f"Error al enriquecer item {item.product_id}: {str(e)}")
+                    product_info = {}
+                product_cache[item.product_id] = product_info
+            
+            item.product_name = product_info.get('name', '')
+            item.product_image_url = product_info.get('image_url', '')
+            item.unit_price = product_info.get('price', 0.0)
+            item.product_sku = product_info.get('sku', '')
+        
+        return items
+    
+    def _build_order(self, command: CreateOrderCommand, order_number: str) -> Order:
+        """Construye el pedido de dominio a partir del comando ya validado"""
+        order = Order(
+            order_number=order_number,
+            client_id=command.client_id,
+            vendor_id=command.vendor_id,
+            status="En Preparación",
+            total_amount=command.total_amount,
+            scheduled_delivery_date=command.scheduled_delivery_date
+        )
+        for item in command.items:
+            order.items.append(OrderItem(
+                product_id=item.product_id,
+                quantity=item.quantity
+            ))
+        return order
+    
+    def create_order(self, order_data: Union[CreateOrderCommand, dict]) -> Order:
         """
         Crea un nuevo pedido con verificación de stock
         
         Args:
-            order_data: Datos del pedido con items
+            order_data: Comando validado por CreateOrderSchema o el cuerpo JSON
+                sin validar (se valida con el mismo esquema)
             
         Returns:
             Order: Pedido creado
@@ -129,79 +418,29 @@ class OrderService:
         """
         try:
             logger.info("Iniciando create_order")
-            logger.info(f"Creando pedido con {len(order_data.get('items', []))} items")
-            
-            if not order_data.get('client_id') and not order_data.get('vendor_id'):
-                raise OrderValidationError("Debe proporcionar al menos client_id o vendor_id")
-            
-            if not order_data.get('items') or not isinstance(order_data['items'], list):
-                raise OrderValidationError("El pedido debe tener al menos un item")
-            
-            if len(order_data['items']) == 0:
-                raise OrderValidationError("El pedido debe tener al menos un item")
-            
-            if not order_data.get('total_amount'):
-                raise OrderValidationError("El total_amount es obligatorio")
-            
-            if not isinstance(order_data['total_amount'], (int, float)) or order_data['total_amount'] <= 0:
-                raise OrderValidationError("El total_amount debe ser un número mayor a 0")
-            
-            if not order_data.get('scheduled_delivery_date'):
-                raise OrderValidationError("El scheduled_delivery_date es obligatorio")
-            
-            try:
-                from datetime import datetime
-                scheduled_date = datetime.fromisoformat(order_data['scheduled_delivery_date'].replace('Z', '+00:00'))
-                if scheduled_date.date() < datetime.now().date():
-                    raise OrderValidationError("La fecha de entrega no puede ser en el pasado")
-            except (ValueError, AttributeError):
-                raise OrderValidationError("El scheduled_delivery_date debe tener formato ISO 8601 válido")
-            
-            order_items = []
-            for item_data in order_data['items']:
-                if not item_data.get('product_id'):
-                    raise OrderValidationError("Cada item debe tener un product_id")
-                
-                if not item_data.get('quantity') or item_data['quantity'] <= 0:
-                    raise OrderValidationError("Cada item debe tener una cantidad válida mayor a 0")
-                
-                order_items.append({
-                    'product_id': item_data['product_id'],
-                    'quantity': item_data['quantity']
-                })
+            command = order_data if isinstance(order_data, CreateOrderCommand) else load_create_order_command(order_data)
+            order_items = command.inventory_items()
+            logger.info(f"Creando pedido con {len(order_items)} items")
             
             logger.info(f"Validando disponibilidad de stock para {len(order_items)} productos")
-            products_info = self.inventory_integration.verify_products_availability(order_items)
-            
-            order_number = Order.generate_order_number()
-            scheduled_date = datetime.fromisoformat(order_data['scheduled_delivery_date'].replace('Z', '+00:00'))
-            
-            logger.info(f"Creando Order con total_amount: {order_data['total_amount']}")
-            order = Order(
-                order_number=order_number,
-                client_id=order_data.get('client_id'),
-                vendor_id=order_data.get('vendor_id'),
-                status="En Preparación",
-                total_amount=order_data['total_amount'],
-                scheduled_delivery_date=scheduled_date
-            )
-            logger.info(f"Order creado con total_amount: {order.total_amount}")
+            self.inventory_integration.verify_products_availability(order_items)
             
-            for i, item_data in enumerate(order_data['items']):
-                order_item = OrderItem(
-                    product_id=item_data['product_id'],
-                    quantity=item_data['quantity']
-                )
-                
-                order.items.append(order_item)
+            order_number = Order.generate_order_number(self.order_repository.next_order_sequences(1)[0])
             
-            order.validate()
+            logger.info(f"Creando Order con total_amount: {command.total_amount}")
+            order = self._build_order(command, order_number)
             
-            logger.info(f"Iniciando actualización de stock para {len(order_data['items'])} productos")
+            logger.info(f"Iniciando actualización de stock para {len(order_items)} productos")
             self.inventory_integration.update_products_stock_with_compensation(order_items)
             
             logger.info(f"Todos los productos actualizados. Creando pedido {order.order_number}")
-            created_order = self.order_repository.create(order)
+            try:
+                created_order = self._persist_with_order_number_retries(self.order_repository.create, [order])
+            except Exception:
+                # El stock ya se descontó: se devuelve antes de propagar el error
+                logger.error(f"Error persistiendo el pedido; compensando stock de {len(order_items)} productos")
+                self.inventory_integration.compensate_products_stock(order_items)
+                raise
             logger.info(f"Pedido {order.order_number} creado exitosamente con ID {created_order.id}")
             
             return created_order
@@ -213,80 +452,242 @@ class OrderService:
         except Exception as e:
             raise OrderBusinessLogicError(f"Error inesperado al crear pedido: {str(e)}")
     
+    def create_orders_batch(self, orders_data: List[dict]) -> List[dict]:
+        """
+        Crea varios pedidos en un solo paso de inventario y una sola transacción
+        
+        Cada pedido se valida por separado; los inválidos se reportan en su posición
+        sin detener el lote. La demanda de los pedidos válidos se agrega por producto
+        para verificar y descontar stock una sola vez por producto, y luego todos los
+        pedidos se persisten juntos. Si la persistencia falla, el stock descontado se
+        devuelve al inventario.
+        
+        Args:
+            orders_data: Lista de pedidos con el mismo formato que create_order
+            
+        Returns:
+            Lista de resultados en el mismo orden de entrada con index, success y
+            order (si se creó) o error (si fue rechazado)
+            
+        Raises:
+            OrderBusinessLogicError: Si no hay stock suficiente para la demanda
+                agregada o falla la persistencia del lote
+        """
+        try:
+            logger.info(f"Iniciando create_orders_batch con {len(orders_data)} pedidos")
+            
+            results: List[dict] = [None] * len(orders_data)
+            valid_orders = []
+            for index, order_data in enumerate(orders_data):
+                try:
+                    if not isinstance(order_data, dict):
+                        raise OrderValidationError("Cada pedido debe ser un objeto JSON")
+                    valid_orders.append((index, load_create_order_command(order_data)))
+                except OrderValidationError as e:
+                    results[index] = {'index': index, 'success': False, 'error': str(e)}
+            
+            order_numbers = [
+                Order.generate_order_number(sequence)
+                for sequence in self.order_repository.next_order_sequences(len(valid_orders))
+            ] if valid_orders else []
+            orders = [
+                (index, self._build_order(command, order_number))
+                for (index, command), order_number in zip(valid_orders, order_numbers)
+            ]
+            
+            if orders:
+                aggregated_items = self._aggregate_items_by_product([order.items for _, order in orders])
+                
+                logger.info(f"Validando disponibilidad de stock agregada para {len(aggregated_items)} productos")
+                self.inventory_integration.verify_products_availability(aggregated_items)
+                
+                logger.info(f"Actualizando stock agregado para {len(aggregated_items)} productos")
+                self.inventory_integration.update_products_stock_with_compensation(aggregated_items)
+                
+                try:
+                    created_orders = self._persist_with_order_number_retries(
+                        self.order_repository.create_many, [order for _, order in orders], batch=True
+                    )
+                except Exception:
+                    # El stock del lote completo ya se descontó: se devuelve antes de propagar el error
+                    logger.error(f"Error persistiendo el lote; compensando stock de {len(aggregated_items)} productos")
+                    self.inventory_integration.compensate_products_stock(aggregated_items)
+                    raise
+                for (index, _), created_order in zip(orders, created_orders):
+                    results[index] = {'index': index, 'success': True, 'order': created_order}
+            
+            created_count = sum(1 for result in results if result['success'])
+            logger.info(f"Lote procesado: {created_count} pedidos creados, {len(results) - created_count} rechazados")
+            return results
+            
+        except OrderBusinessLogicError:
+            raise
+        except Exception as e:
+            raise OrderBusinessLogicError(f"Error inesperado al crear lote de pedidos: {str(e)}")
+    
+    def _persist_with_order_number_retries(self, persist, orders: List[Order], batch: bool = False):
+        """
+        Persiste los pedidos y, si un número de pedido ya existe, reintenta con números nuevos
+        
+        Un conflicto es posible el día en que se empezó a usar la secuencia (sufijos
+        anteriores derivados de la hora) o en motores sin secuencias con varios procesos.
+        
+        Args:
+            persist: create o create_many del repositorio
+            orders: Pedidos a persistir
+            batch: True si persist recibe la lista de pedidos, False si recibe uno solo
+        """
+        for attempt in range(1, self.ORDER_NUMBER_ATTEMPTS + 1):
+            try:
+                return persist(orders) if batch else persist(orders[0])
+            except OrderNumberConflictError as e:
+                if attempt == self.ORDER_NUMBER_ATTEMPTS:
+                    raise OrderBusinessLogicError(f"No se pudo asignar un número de pedido único: {str(e)}")
+                logger.warning(f"Número de pedido duplicado (intento {attempt}); reintentando con números nuevos")
+                for order, sequence in zip(orders, self.order_repository.next_order_sequences(len(orders))):
+                    order.order_number = Order.generate_order_number(sequence)
+    
+    @staticmethod
+    def _aggregate_items_by_product(items_per_order: List[List[OrderItem]]) -> List[dict]:
+        """Suma las cantidades solicitadas por producto conservando el orden de aparición"""
+        quantities = {}
+        for order_items in items_per_order:
+            for item in order_items:
+                quantities[item.product_id] = quantities.get(item.product_id, 0) + item.quantity
+        return [
+            {'product_id': product_id, 'quantity': quantity}
+            for product_id, quantity in quantities.items()
+        ]
+    
+    def get_orders_time_series(self, start_date: Optional[str] = None, end_date: Optional[str] = None,
+                               granularity: str = 'month', client_ids: Optional[List[str]] = None,
+                               statuses: Optional[List[str]] = None, assigned_truck: Optional[str] = None) -> dict:
+        """
+        Obtiene la cantidad de pedidos y el monto total por día, semana, mes o trimestre
+        
+        Args:
+            start_date: Fecha inicial YYYY-MM-DD (default: primer día del mes de hace 11 meses)
+            end_date: Fecha final YYYY-MM-DD (default: hoy)
+            granularity: 'day', 'week', 'month' o 'quarter' (default: 'month')
+            client_ids: Solo pedidos de estos clientes
+            statuses: Solo pedidos en estos estados
+            assigned_truck: Solo pedidos asignados a este camión
+        
+        Returns:
+            Diccionario con granularity, period, filters, summary y buckets (todos los
+            intervalos del rango, con cero los que no tienen pedidos)
+        """
+        from datetime import date, datetime, time
+        from dateutil.relativedelta import relativedelta
+        
+        if granularity not in GRANULARITIES:
+            raise OrderValidationError(
+                f"Granularidad no válida: {granularity}. Valores disponibles: {', '.join(GRANULARITIES)}"
+            )
+        valid_statuses = [status.value for status in OrderStatus]
+        invalid_statuses = [status for status in statuses or [] if status not in valid_statuses]
+        if invalid_statuses:
+            raise OrderValidationError(
+                f"Estados no válidos: {', '.join(invalid_statuses)}. Valores disponibles: {', '.join(valid_statuses)}"
+            )
+        try:
+            end = date.fromisoformat(end_date) if end_date else date.today()
+            start = date.fromisoformat(start_date) if start_date else (end - relativedelta(months=11)).replace(day=1)
+        except ValueError:
+            raise OrderValidationError("Las fechas deben tener formato YYYY-MM-DD")
+        if start > end:
+            raise OrderValidationError("La fecha inicial no puede ser posterior a la fecha final")
+        if len(iter_buckets(start, end, granularity)) > self.MAX_TIME_SERIES_BUCKETS:
+            raise OrderValidationError(
+                f"El rango supera el máximo de {self.MAX_TIME_SERIES_BUCKETS} intervalos; use una granularidad mayor"
+            )
+        
+        try:
+            buckets = self._time_series(
+                datetime.combine(start, time.min), datetime.combine(end, time.max), granularity,
+                client_ids=client_ids, statuses=statuses, assigned_truck=assigned_truck
+            )
+            total_amount = sum(bucket['total_amount'] for bucket in buckets)
+            
+            return {
+                'granularity': granularity,
+                'period': {
+                    'start_date': start.isoformat(),
+                    'end_date': end.isoformat()
+                },
+                'filters': {
+                    'client_ids': client_ids,
+                    'statuses': statuses,
+                    'assigned_truck': assigned_truck
+                },
+                'summary': {
+                    'total_orders': sum(bucket['orders_count'] for bucket in buckets),
+                    'total_amount': round(total_amount, 2),
+                    'buckets_with_data': sum(1 for bucket in buckets if bucket['orders_count'] > 0)
+                },
+                'buckets': buckets
+            }
+            
+        except Exception as e:
+            logger.error(f"Error al generar serie de pedidos: {str(e)}")
+            raise OrderBusinessLogicError(f"Error al generar serie de pedidos: {str(e)}")
+    
+    def _time_series(self, start_date: datetime, end_date: datetime, granularity: str, client_ids: Optional[List[str]] = None,
+                     statuses: Optional[List[str]] = None, assigned_truck: Optional[str] = None) -> List[dict]:
+        """Intervalos de la agregación del repositorio con sus etiquetas para gráficos"""
+        rows = self.order_repository.get_order_time_buckets(
+            start_date, end_date, granularity,
+            client_ids=client_ids, statuses=statuses, assigned_truck=assigned_truck
+        )
+        return [self._time_bucket_entry(row, granularity) for row in rows]
+    
+    @staticmethod
+    def _time_bucket_entry(row: dict, granularity: str) -> dict:
+        start = row['bucket_start']
+        entry = {'start_date': start.isoformat(), 'year': start.year}
+        if granularity == 'month':
+            entry.update(month=start.month, month_name=MONTH_NAMES[start.month], month_short=MONTH_NAMES_SHORT[start.month])
+        elif granularity == 'quarter':
+            entry['quarter'] = (start.month - 1) // 3 + 1
+        elif granularity == 'week':
+            entry['year'], entry['week'], _ = start.isocalendar()
+        entry['label'] = bucket_label(start, granularity)
+        entry['orders_count'] = row['orders_count']
+        entry['total_amount'] = round(row['total_amount'], 2)
+        return entry
+    
+    @cached_query(entities=lambda: (ORDERS_TAG,), region=report_cache)
     def get_monthly_report(self) -> dict:
         """
         Obtiene el reporte mensual consolidado de pedidos del último año
         
+        El reporte armado se cachea (report_cache) hasta la siguiente escritura de
+        pedidos o el vencimiento del TTL.
+        
         Returns:
             dict: Estructura optimizada para gráficos en Angular con:
+                - generated_at: fecha en que se armó el reporte
                 - period: rango de fechas del reporte
                 - summary: resumen total (pedidos, monto, meses con datos)
                 - monthly_data: array con datos de cada mes
         """
         try:
-            from datetime import datetime, timedelta
+            from datetime import datetime
             from dateutil.relativedelta import relativedelta
-            import calendar
-
+            
             end_date = datetime.now()
-            start_date = end_date - timedelta(days=365)
+            start_date = (end_date - relativedelta(months=11)).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
             
             logger.info(f"Generando reporte mensual desde {start_date.date()} hasta {end_date.date()}")
-
-            monthly_raw_data = self.order_repository.get_monthly_summary(start_date, end_date)
-
-            data_by_month = {}
-            for item in monthly_raw_data:
-                key = f"{item['year']}-{item['month']}"
-                data_by_month[key] = item
-
-            monthly_data = []
-            current_date = end_date.replace(day=1)
-            current_date = current_date - relativedelta(months=11)
-
-            month_names = {
-                1: "enero", 2: "febrero", 3: "marzo", 4: "abril",
-                5: "mayo", 6: "junio", 7: "julio", 8: "agosto",
-                9: "septiembre", 10: "octubre", 11: "noviembre", 12: "diciembre"
-            }
-            month_names_short = {
-                1: "ene", 2: "feb", 3: "mar", 4: "abr",
-                5: "may", 6: "jun", 7: "jul", 8: "ago",
-                9: "sep", 10: "oct", 11: "nov", 12: "dic"
-            }
             
-            for i in range(12):
-                year = current_date.year
-                month = current_date.month
-                key = f"{year}-{month}"
-
-                month_data = data_by_month.get(key, {
-                    'year': year,
-                    'month': month,
-                    'orders_count': 0,
-                    'total_amount': 0.0
-                })
-
-                monthly_data.append({
-                    'year': year,
-                    'month': month,
-                    'month_name': month_names[month],
-                    'month_short': month_names_short[month],
-                    'label': f"{month_names_short[month]}-{year}",
-                    'orders_count': month_data['orders_count'],
-                    'total_amount': month_data['total_amount']
-                })
-
-                if month == 12:
-                    current_date = current_date.replace(year=year+1, month=1)
-                else:
-                    current_date = current_date.replace(month=month+1)
-
+            monthly_data = self._time_series(start_date, end_date, 'month')
+            
             total_orders = sum(m['orders_count'] for m in monthly_data)
             total_amount = sum(m['total_amount'] for m in monthly_data)
             months_with_data = sum(1 for m in monthly_data if m['orders_count'] > 0)
 
             return {
+                'generated_at': datetime.utcnow().isoformat(),
                 'period': {
                     'start_date': start_date.date().isoformat(),
                     'end_date': end_date.date().isoformat(),
@@ -306,25 +707,77 @@ class OrderService:
             logger.error(f"Error al generar reporte mensual: {str(e)}")
             raise OrderBusinessLogicError(f"Error al generar reporte mensual: {str(e)}")
     
-    def get_top_clients_report(self) -> dict:
+    def get_top_clients_report(self, mode: str = 'exact') -> dict:
         """
         Obtiene el reporte de los top 5 clientes con más pedidos en el último trimestre
         
+        En modo exacto se lee de la instantánea client_quarter_stats; si aún no se ha
+        calculado se consultan los pedidos directamente. En modo aproximado se
+        combinan los resúmenes Space-Saving de los meses del trimestre. El reporte
+        armado se cachea; la antigüedad de la instantánea se calcula en cada llamada.
+        
+        Args:
+            mode: 'exact' o 'approx' (default: 'exact')
+        
         Returns:
             Diccionario con:
-                - period: rango de fechas del trimestre
-                - top_clients: lista con client_id, orders_count y client_name
+                - generated_at: fecha en que se armó el reporte
+                - mode: modo del reporte
+                - period: rango de fechas del trimestre (en modo aproximado desde el primer día de su primer mes)
+                - snapshot: fecha de cálculo y antigüedad en segundos de la instantánea
+                  (None si se consultaron los pedidos o en modo aproximado)
+                - approximation: total de pedidos resumidos, cota de error y capacidad (None en modo exacto)
+                - top_clients: lista con client_id, orders_count y client_name (y max_error en modo aproximado)
+                
+        Raises:
+            OrderValidationError: Si el modo no es válido
         """
+        from datetime import datetime
+        
+        self._validate_top_report_mode(mode)
+        report = self._build_top_clients_report(mode)
+        if report['snapshot'] is not None:
+            refreshed_at = report['snapshot']['refreshed_at']
+            report['snapshot'] = {
+                'refreshed_at': refreshed_at.isoformat(),
+                'age_seconds': max(0, int((datetime.now() - refreshed_at).total_seconds()))
+            }
+        return report
+    
+    @cached_query(entities=lambda mode='exact': (ORDERS_TAG,), region=report_cache)
+    def _build_top_clients_report(self, mode: str = 'exact') -> dict:
+        """Arma el reporte de top clientes (sin la antigüedad de la instantánea)"""
         try:
             from datetime import datetime, timedelta
             from dateutil.relativedelta import relativedelta
 
-            end_date = datetime.now()
-            start_date = end_date - relativedelta(months=3)
-            
-            logger.info(f"Generando reporte de top clientes desde {start_date.date()} hasta {end_date.date()}")
-
-            top_clients_data = self.order_repository.get_top_clients_last_quarter(start_date, end_date, limit=5)
+            approximation = None
+            snapshot = self.order_repository.get_top_clients_snapshot(limit=5) if mode == 'exact' else None
+            if mode == 'approx':
+                end_date = datetime.utcnow()
+                heavy_hitters = self.order_repository.get_heavy_hitters(
+                    'clients', since=(end_date - relativedelta(months=3)).date(), limit=5
+                )
+                start_date = datetime.combine(heavy_hitters['start_date'], datetime.min.time())
+                top_clients_data = [
+                    {'client_id': item['key'], 'orders_count': item['count'], 'max_error': item['max_error']}
+                    for item in heavy_hitters['items']
+                ]
+                approximation = self._approximation_info(heavy_hitters)
+                snapshot_info = None
+            elif snapshot is not None:
+                start_date = snapshot['window_start']
+                end_date = snapshot['window_end']
+                top_clients_data = snapshot['top_clients']
+                snapshot_info = {'refreshed_at': snapshot['refreshed_at']}
+            else:
+                end_date = datetime.now()
+                start_date = end_date - relativedelta(months=3)
+                
+                logger.info(f"Generando reporte de top clientes desde {start_date.date()} hasta {end_date.date()}")
+                
+                top_clients_data = self.order_repository.get_top_clients_last_quarter(start_date, end_date, limit=5)
+                snapshot_info = None
 
             client_ids = [client['client_id'] for client in top_clients_data if client.get('client_id')]
             client_names = self.auth_integration.get_client_names(client_ids)
@@ -332,18 +785,18 @@ class OrderService:
             top_clients = []
             for client_data in top_clients_data:
                 client_id = client_data['client_id']
-                top_clients.append({
-                    'client_id': client_id,
-                    'orders_count': client_data['orders_count'],
-                    'client_name': client_names.get(client_id, 'Cliente no disponible')
-                })
+                top_clients.append(dict(client_data, client_name=client_names.get(client_id, 'Cliente no disponible')))
             
             return {
+                'generated_at': datetime.utcnow().isoformat(),
+                'mode': mode,
                 'period': {
                     'start_date': start_date.date().isoformat(),
                     'end_date': end_date.date().isoformat(),
                     'months': 3
                 },
+                'snapshot': snapshot_info,
+                'approximation': approximation,
                 'top_clients': top_clients
             }
             
@@ -351,16 +804,55 @@ class OrderService:
             logger.error(f"Error al generar reporte de top clientes: {str(e)}")
             raise OrderBusinessLogicError(f"Error al generar reporte de top clientes: {str(e)}")
     
-    def get_top_products_report(self) -> dict:
+    @cached_query(entities=lambda window='all', mode='exact': (ORDERS_TAG,), region=report_cache)
+    def get_top_products_report(self, window: str = 'all', mode: str = 'exact') -> dict:
         """
         Obtiene el reporte de los top 10 productos más vendidos
         
+        El reporte armado se cachea por ventana y modo hasta la siguiente escritura de
+        pedidos o el vencimiento del TTL. En modo aproximado se combinan los resúmenes
+        Space-Saving de los meses que cubren la ventana.
+        
+        Args:
+            window: Ventana de días ('30d', '90d', '365d' o 'all', default: 'all')
+            mode: 'exact' o 'approx' (default: 'exact')
+        
         Returns:
             Diccionario con:
-                - top_products: lista con product_id, total_sold y product_name
+                - generated_at: fecha en que se armó el reporte
+                - window: ventana consultada
+                - mode: modo del reporte
+                - period: primer y último día de la ventana (start_date es None para 'all'; en
+                  modo aproximado es el primer día del primer mes)
+                - approximation: total de unidades resumidas, cota de error y capacidad (None en modo exacto)
+                - top_products: lista con product_id, total_sold y product_name (y max_error en modo aproximado)
+                
+        Raises:
+            OrderValidationError: Si la ventana o el modo no son válidos
         """
+        if window not in self.TOP_PRODUCTS_WINDOWS:
+            raise OrderValidationError(
+                f"Ventana no válida: {window}. Valores disponibles: {', '.join(self.TOP_PRODUCTS_WINDOWS)}"
+            )
+        self._validate_top_report_mode(mode)
+        
         try:
-            top_products_data = self.order_repository.get_top_products_sold(limit=10)
+            # Los días del rollup son días UTC de creación del pedido
+            end_date = datetime.utcnow().date()
+            days = self.TOP_PRODUCTS_WINDOWS[window]
+            start_date = end_date - timedelta(days=days - 1) if days else None
+            
+            approximation = None
+            if mode == 'approx':
+                heavy_hitters = self.order_repository.get_heavy_hitters('products', since=start_date, limit=10)
+                start_date = heavy_hitters['start_date']
+                top_products_data = [
+                    {'product_id': item['key'], 'total_sold': item['count'], 'max_error': item['max_error']}
+                    for item in heavy_hitters['items']
+                ]
+                approximation = self._approximation_info(heavy_hitters)
+            else:
+                top_products_data = self.order_repository.get_top_products_sold(limit=10, since=start_date)
             
             product_ids = [product['product_id'] for product in top_products_data if product.get('product_id')]
             product_names = self.inventory_integration.get_product_names(product_ids)
@@ -368,13 +860,17 @@ class OrderService:
             top_products = []
             for product_data in top_products_data:
                 product_id = product_data['product_id']
-                top_products.append({
-                    'product_id': product_id,
-                    'total_sold': product_data['total_sold'],
-                    'product_name': product_names.get(product_id, 'Producto no disponible')
-                })
+                top_products.append(dict(product_data, product_name=product_names.get(product_id, 'Producto no disponible')))
             
             return {
+                'generated_at': datetime.utcnow().isoformat(),
+                'window': window,
+                'mode': mode,
+                'period': {
+                    'start_date': start_date.isoformat() if start_date else None,
+                    'end_date': end_date.isoformat()
+                },
+                'approximation': approximation,
                 'top_products': top_products
             }
             
@@ -382,6 +878,22 @@ class OrderService:
             logger.error(f"Error al generar reporte de top productos: {str(e)}")
             raise OrderBusinessLogicError(f"Error al generar reporte de top productos: {str(e)}")
     
+    def _validate_top_report_mode(self, mode: str) -> None:
+        if mode not in self.TOP_REPORT_MODES:
+            raise OrderValidationError(
+                f"Modo no válido: {mode}. Valores disponibles: {', '.join(self.TOP_REPORT_MODES)}"
+            )
+    
+    @staticmethod
+    def _approximation_info(heavy_hitters: dict) -> dict:
+        """Cota de error del top aproximado: ninguna estimación supera la real en más de error_bound"""
+        return {
+            'algorithm': 'space-saving',
+            'stream_total': heavy_hitters['total'],
+            'error_bound': heavy_hitters['error_bound'],
+            'capacity': heavy_hitters['capacity']
+        }
+    
     def get_seller_status_summary(self, seller_id: str) -> dict:
         """
         Obtiene el resumen de pedidos por estado para los clientes asignados a un vendedor
@@ -420,44 +932,48 @@ class OrderService:
             status_data = self.order_repository.get_orders_status_summary_by_client_ids(client_ids)
             logger.info(f"[get_seller_status_summary] Datos de estado obtenidos: {len(status_data)} estados, datos: {status_data}")
             
-            total_orders = sum(item['count'] for item in status_data)
-            total_amount = sum(item['total_amount'] for item in status_data)
-            
-            status_data_dict = {item['status']: item for item in status_data}
-            
-            status_summary = []
-            for status_enum in OrderStatus:
-                status_value = status_enum.value
-                if status_value in status_data_dict:
-                    item = status_data_dict[status_value]
-                    percentage = (item['count'] / total_orders * 100) if total_orders > 0 else 0.0
-                    status_summary.append({
-                        'status': status_value,
-                        'count': item['count'],
-                        'percentage': round(percentage, 2),
-                        'total_amount': round(item['total_amount'], 2)
-                    })
-                else:
-                    status_summary.append({
-                        'status': status_value,
-                        'count': 0,
-                        'percentage': 0.0,
-                        'total_amount': 0.0
-                    })
-            
-            return {
-                'seller_id': seller_id,
-                'summary': {
-                    'total_orders': total_orders,
-                    'total_amount': round(total_amount, 2)
-                },
-                'status_summary': status_summary
-            }
+            return dict(seller_id=seller_id, **self._seller_status_summary(status_data))
             
         except Exception as e:
             logger.error(f"Error al generar informe de estados por vendedor: {str(e)}")
             raise OrderBusinessLogicError(f"Error al generar informe de estados por vendedor: {str(e)}")
     
+    @staticmethod
+    def _seller_status_summary(status_data: List[dict]) -> dict:
+        """summary y status_summary (todos los estados, con porcentaje) de un resumen por estado"""
+        total_orders = sum(item['count'] for item in status_data)
+        total_amount = sum(item['total_amount'] for item in status_data)
+        
+        status_data_dict = {item['status']: item for item in status_data}
+        
+        status_summary = []
+        for status_enum in OrderStatus:
+            status_value = status_enum.value
+            if status_value in status_data_dict:
+                item = status_data_dict[status_value]
+                percentage = (item['count'] / total_orders * 100) if total_orders > 0 else 0.0
+                status_summary.append({
+                    'status': status_value,
+                    'count': item['count'],
+                    'percentage': round(percentage, 2),
+                    'total_amount': round(item['total_amount'], 2)
+                })
+            else:
+                status_summary.append({
+                    'status': status_value,
+                    'count': 0,
+                    'percentage': 0.0,
+                    'total_amount': 0.0
+                })
+        
+        return {
+            'summary': {
+                'total_orders': total_orders,
+                'total_amount': round(total_amount, 2)
+            },
+            'status_summary': status_summary
+        }
+    
     def get_seller_clients_summary(self, seller_id: str, page: int = 1, per_page: int = 10) -> dict:
         """
         Obtiene el resumen de pedidos por cliente para los clientes asignados a un vendedor
@@ -499,54 +1015,57 @@ class OrderService:
                 client_ids, per_page, offset
             )
             
-            client_ids_list = [client['client_id'] for client in clients_data]
-            client_names = self.auth_integration.get_client_names(client_ids_list)
-            
-            clients = []
-            total_orders = 0
-            total_amount = 0.0
-            
-            for client_data in clients_data:
-                client_id = client_data['client_id']
-                total_orders += client_data['orders_count']
-                total_amount += client_data['total_amount']
-                
-                clients.append({
-                    'client_id': client_id,
-                    'client_name': client_names.get(client_id, 'Cliente no disponible'),
-                    'orders_count': client_data['orders_count'],
-                    'total_amount': round(client_data['total_amount'], 2),
-                    'average_order_amount': round(client_data['average_order_amount'], 2)
-                })
-            
-            total_pages = (total + per_page - 1) // per_page if per_page > 0 else 1
-            has_next = page < total_pages
-            has_prev = page > 1
-            
-            return {
-                'seller_id': seller_id,
-                'summary': {
-                    'total_clients': total,
-                    'total_orders': total_orders,
-                    'total_amount': round(total_amount, 2)
-                },
-                'clients': clients,
-                'pagination': {
-                    'page': page,
-                    'per_page': per_page,
-                    'total': total,
-                    'total_pages': total_pages,
-                    'has_next': has_next,
-                    'has_prev': has_prev,
-                    'next_page': page + 1 if has_next else None,
-                    'prev_page': page - 1 if has_prev else None
-                }
-            }
+            return dict(seller_id=seller_id, **self._seller_clients_page(clients_data, total, page, per_page))
             
         except Exception as e:
             logger.error(f"Error al generar informe de clientes por vendedor: {str(e)}")
             raise OrderBusinessLogicError(f"Error al generar informe de clientes por vendedor: {str(e)}")
     
+    def _seller_clients_page(self, clients_data: List[dict], total: int, page: int, per_page: int) -> dict:
+        """summary, clients (con nombre) y pagination de una página del resumen por cliente"""
+        client_ids_list = [client['client_id'] for client in clients_data]
+        client_names = self.auth_integration.get_client_names(client_ids_list)
+        
+        clients = []
+        total_orders = 0
+        total_amount = 0.0
+        
+        for client_data in clients_data:
+            client_id = client_data['client_id']
+            total_orders += client_data['orders_count']
+            total_amount += client_data['total_amount']
+            
+            clients.append({
+                'client_id': client_id,
+                'client_name': client_names.get(client_id, 'Cliente no disponible'),
+                'orders_count': client_data['orders_count'],
+                'total_amount': round(client_data['total_amount'], 2),
+                'average_order_amount': round(client_data['average_order_amount'], 2)
+            })
+        
+        total_pages = (total + per_page - 1) // per_page if per_page > 0 else 1
+        has_next = page < total_pages
+        has_prev = page > 1
+        
+        return {
+            'summary': {
+                'total_clients': total,
+                'total_orders': total_orders,
+                'total_amount': round(total_amount, 2)
+            },
+            'clients': clients,
+            'pagination': {
+                'page': page,
+                'per_page': per_page,
+                'total': total,
+                'total_pages': total_pages,
+                'has_next': has_next,
+                'has_prev': has_prev,
+                'next_page': page + 1 if has_next else None,
+                'prev_page': page - 1 if has_prev else None
+            }
+        }
+    
     def get_seller_monthly_report(self, seller_id: str) -> dict:
         """
         Obtiene el reporte mensual de pedidos para los clientes asignados a un vendedor
@@ -569,57 +1088,140 @@ class OrderService:
             
             logger.info(f"Generando informe mensual para vendedor {seller_id} desde {start_date.date()} hasta {end_date.date()}")
             
-            monthly_raw_data = []
-            if client_ids:
-                monthly_raw_data = self.order_repository.get_orders_monthly_summary_by_client_ids(
-                    client_ids, start_date, end_date
-                )
+            # Del mes actual hacia atrás
+            monthly_data = list(reversed(self._time_series(start_date, end_date, 'month', client_ids=client_ids or [])))
+            
+            total_orders = sum(m['orders_count'] for m in monthly_data)
+            total_amount = sum(m['total_amount'] for m in monthly_data)
+            
+            return {
+                'seller_id': seller_id,
+                'period': {
+                    'start_date': start_date.date().isoformat(),
+                    'end_date': end_date.date().isoformat(),
+                    'months': 12
+                },
+                'summary': {
+                    'total_orders': total_orders,
+                    'total_amount': round(total_amount, 2)
+                },
+                'monthly_data': monthly_data
+            }
             
-            data_by_month = {}
-            for item in monthly_raw_data:
-                key = f"{item['year']}-{item['month']}"
-                data_by_month[key] = item
+        except Exception as e:
+            logger.error(f"Error al generar informe mensual por vendedor: {str(e)}")
+            raise OrderBusinessLogicError(f"Error al generar informe mensual por vendedor: {str(e)}")
+    
+    def get_sellers_batch_informes(self, seller_ids: List[str]) -> dict:
+        """
+        Obtiene el informe de estados y el informe mensual de varios vendedores
+        
+        Los clientes asignados se consultan al servicio de autenticación en paralelo y
+        los pedidos de todos los vendedores se agregan en una sola consulta (ver
+        OrderRepository.get_sellers_informes_summary). Cada vendedor tiene el mismo
+        contenido que get_seller_status_summary y get_seller_monthly_report.
+        
+        Args:
+            seller_ids: IDs de los vendedores (los repetidos se consultan una vez)
+            
+        Returns:
+            Diccionario con period (últimos 12 meses), summary y sellers
+            {seller_id: {assigned_clients, status, monthly}}
             
-            monthly_data = []
-            current_date = end_date.replace(day=1)
+        Raises:
+            OrderValidationError: Si no hay vendedores o se supera MAX_BATCH_SELLERS
+        """
+        from datetime import datetime, time
+        from dateutil.relativedelta import relativedelta
+        
+        seller_ids = list(dict.fromkeys(seller_ids or []))
+        if not seller_ids:
+            raise OrderValidationError("Debe indicar al menos un vendedor")
+        if len(seller_ids) > self.MAX_BATCH_SELLERS:
+            raise OrderValidationError(f"Se pueden consultar como máximo {self.MAX_BATCH_SELLERS} vendedores")
+        
+        try:
+            end_date = datetime.now()
+            start_date = datetime.combine((end_date - relativedelta(months=11)).date().replace(day=1), time.min)
             
-            month_names = {
-                1: "enero", 2: "febrero", 3: "marzo", 4: "abril",
-                5: "mayo", 6: "junio", 7: "julio", 8: "agosto",
-                9: "septiembre", 10: "octubre", 11: "noviembre", 12: "diciembre"
+            assignments = {
+                seller_id: client_ids or []
+                for seller_id, client_ids in self.auth_integration.get_assigned_clients_batch(seller_ids).items()
             }
-            month_names_short = {
-                1: "ene", 2: "feb", 3: "mar", 4: "abr",
-                5: "may", 6: "jun", 7: "jul", 8: "ago",
-                9: "sep", 10: "oct", 11: "nov", 12: "dic"
+            summaries = self.order_repository.get_sellers_informes_summary(assignments, start_date)
+            
+            sellers = {}
+            for seller_id in seller_ids:
+                summary = summaries.get(seller_id, {'status_summary': [], 'monthly_summary': []})
+                sellers[seller_id] = {
+                    'assigned_clients': len(assignments.get(seller_id, [])),
+                    'status': self._seller_status_summary(summary['status_summary']),
+                    'monthly': self._seller_monthly_summary(summary['monthly_summary'], start_date, end_date)
+                }
+            
+            return {
+                'period': {
+                    'start_date': start_date.date().isoformat(),
+                    'end_date': end_date.date().isoformat(),
+                    'months': 12
+                },
+                'summary': {
+                    'sellers': len(seller_ids),
+                    'sellers_without_clients': sum(1 for seller_id in seller_ids if not assignments.get(seller_id))
+                },
+                'sellers': sellers
             }
             
-            for i in range(12):
-                year = current_date.year
-                month = current_date.month
-                key = f"{year}-{month}"
-                
-                month_data = data_by_month.get(key, {
-                    'year': year,
-                    'month': month,
-                    'orders_count': 0,
-                    'total_amount': 0.0
-                })
-                
-                monthly_data.append({
-                    'year': year,
-                    'month': month,
-                    'month_name': month_names[month],
-                    'month_short': month_names_short[month],
-                    'label': f"{month_names_short[month]}-{year}",
-                    'orders_count': month_data['orders_count'],
-                    'total_amount': round(month_data['total_amount'], 2)
-                })
-                
-                current_date = current_date - relativedelta(months=1)
+        except Exception as e:
+            logger.error(f"Error al generar informes de vendedores: {str(e)}")
+            raise OrderBusinessLogicError(f"Error al generar informes de vendedores: {str(e)}")
+    
+    def _seller_monthly_summary(self, monthly_summary: List[dict], start_date, end_date) -> dict:
+        """summary y monthly_data (del mes actual hacia atrás, con cero los meses sin pedidos) de un resumen mensual"""
+        by_month = {(item['year'], item['month']): item for item in monthly_summary}
+        monthly_data = [
+            self._time_bucket_entry({
+                'bucket_start': month,
+                'orders_count': by_month.get((month.year, month.month), {}).get('orders_count', 0),
+                'total_amount': by_month.get((month.year, month.month), {}).get('total_amount', 0.0)
+            }, 'month')
+            for month in reversed(iter_buckets(start_date, end_date, 'month'))
+        ]
+        return {
+            'summary': {
+                'total_orders': sum(item['orders_count'] for item in monthly_data),
+                'total_amount': round(sum(item['total_amount'] for item in monthly_data), 2)
+            },
+            'monthly_data': monthly_data
+        }
+    
+    def get_seller_dashboard(self, seller_id: str, per_page: int = 10) -> dict:
+        """
+        Obtiene el tablero de un vendedor: informe de estados, informe mensual y primera
+        página del informe por cliente
+        
+        Los clientes asignados se consultan una sola vez y los tres informes salen de una
+        sola consulta (ver OrderRepository.get_seller_dashboard_summary). Cada bloque tiene
+        el mismo contenido que get_seller_status_summary, get_seller_monthly_report y
+        get_seller_clients_summary con page=1.
+        
+        Args:
+            seller_id: ID del vendedor
+            per_page: Clientes de la primera página (default: 10)
             
-            total_orders = sum(m['orders_count'] for m in monthly_data)
-            total_amount = sum(m['total_amount'] for m in monthly_data)
+        Returns:
+            Diccionario con seller_id, period, assigned_clients, status, monthly y clients
+        """
+        try:
+            from datetime import datetime, time
+            from dateutil.relativedelta import relativedelta
+            
+            client_ids = self.auth_integration.get_assigned_clients(seller_id) or []
+            
+            end_date = datetime.now()
+            start_date = datetime.combine((end_date - relativedelta(months=11)).date().replace(day=1), time.min)
+            
+            dashboard = self.order_repository.get_seller_dashboard_summary(client_ids, start_date, per_page)
             
             return {
                 'seller_id': seller_id,
@@ -628,13 +1230,83 @@ class OrderService:
                     'end_date': end_date.date().isoformat(),
                     'months': 12
                 },
+                'assigned_clients': len(client_ids),
+                'status': self._seller_status_summary(dashboard['status_summary']),
+                'monthly': self._seller_monthly_summary(dashboard['monthly_summary'], start_date, end_date),
+                'clients': self._seller_clients_page(dashboard['clients'], dashboard['total_clients'], 1, per_page)
+            }
+            
+        except Exception as e:
+            logger.error(f"Error al generar tablero de vendedor: {str(e)}")
+            raise OrderBusinessLogicError(f"Error al generar tablero de vendedor: {str(e)}")
+    
+    def get_seller_active_clients(self, seller_id: str, start_month: Optional[str] = None,
+                                  end_month: Optional[str] = None) -> dict:
+        """
+        Obtiene los clientes activos (con al menos un pedido) de un vendedor por mes y en todo el rango
+        
+        Los conteos son exactos y se leen del rollup client_monthly_stats; el total del
+        rango no cuenta dos veces a un cliente activo en varios meses.
+        
+        Args:
+            seller_id: ID del vendedor
+            start_month: Mes inicial YYYY-MM (default: hace 11 meses)
+            end_month: Mes final YYYY-MM (default: mes actual)
+            
+        Returns:
+            Diccionario con seller_id, period, summary (assigned_clients, active_clients y
+            active_percentage) y monthly_data (del mes final hacia atrás)
+            
+        Raises:
+            OrderValidationError: Si los meses no son válidos
+        """
+        from datetime import date
+        from dateutil.relativedelta import relativedelta
+        
+        try:
+            end = datetime.strptime(end_month, '%Y-%m').date() if end_month else date.today().replace(day=1)
+            start = datetime.strptime(start_month, '%Y-%m').date() if start_month else end - relativedelta(months=11)
+        except ValueError:
+            raise OrderValidationError("Los meses deben tener formato YYYY-MM")
+        if start > end:
+            raise OrderValidationError("El mes inicial no puede ser posterior al mes final")
+        months = iter_buckets(start, end, 'month')
+        if len(months) > self.MAX_ACTIVE_CLIENTS_MONTHS:
+            raise OrderValidationError(f"El rango supera el máximo de {self.MAX_ACTIVE_CLIENTS_MONTHS} meses")
+        
+        try:
+            client_ids = self.auth_integration.get_assigned_clients(seller_id) or []
+            active = (
+                self.order_repository.get_active_clients_by_month(client_ids, start, end)
+                if client_ids else {'monthly': {}, 'total': 0}
+            )
+            
+            monthly_data = [
+                {
+                    'year': month.year,
+                    'month': month.month,
+                    'month_name': MONTH_NAMES[month.month],
+                    'active_clients': active['monthly'].get((month.year, month.month), 0)
+                }
+                for month in reversed(months)
+            ]
+            active_clients = active['total']
+            
+            return {
+                'seller_id': seller_id,
+                'period': {
+                    'start_month': start.strftime('%Y-%m'),
+                    'end_month': end.strftime('%Y-%m'),
+                    'months': len(months)
+                },
                 'summary': {
-                    'total_orders': total_orders,
-                    'total_amount': round(total_amount, 2)
+                    'assigned_clients': len(client_ids),
+                    'active_clients': active_clients,
+                    'active_percentage': round(active_clients / len(client_ids) * 100, 2) if client_ids else 0.0
                 },
                 'monthly_data': monthly_data
             }
             
         except Exception as e:
-            logger.error(f"Error al generar informe mensual por vendedor: {str(e)}")
-            raise OrderBusinessLogicError(f"Error al generar informe mensual por vendedor: {str(e)}")
\ No newline at end of file
+            logger.error(f"Error al generar informe de clientes activos por vendedor: {str(e)}")
+            raise OrderBusinessLogicError(f"Error al generar informe de clientes activos por vendedor: {str(e)}")
@@ -0,0 +1,116 @@
+"""
+Invalidación de caches de pedidos entre procesos
+
+Los caches de cada proceso (listados, reportes) se registran en el bus de
+invalidación, que escucha los eventos de pedidos del hub (order_events). Cada
+evento se traduce a etiquetas de los datos que pudo cambiar:
+
+- client:<client_id> y vendor:<vendor_id>
+- truck-day:<assigned_truck>:<AAAA-MM-DD> (día de entrega programada)
+- report-month:<AAAA-MM> (mes de creación del pedido, ventana de los reportes)
+- orders (cualquier cambio de pedidos, para reportes sin ventana)
+
+Las etiquetas incluyen los valores actuales y los anteriores del pedido. En
+PostgreSQL los eventos llegan de todos los procesos por LISTEN/NOTIFY; en SQLite
+se publican dentro del proceso al confirmar la transacción. Los eventos
+'resync' (reconexión del listener), 'deleted_all' y 'cache_reset' vacían todos
+los caches.
+"""
+import logging
+import threading
+from typing import List, Set
+from .order_events import OrderEventHub, order_event_hub
+
+logger = logging.getLogger(__name__)
+
+ORDERS_TAG = 'orders'
+
+
+def client_tag(client_id: str) -> str:
+    return f"client:{client_id}"
+
+
+def vendor_tag(vendor_id: str) -> str:
+    return f"vendor:{vendor_id}"
+
+
+def truck_day_tag(assigned_truck: str, day: str) -> str:
+    """day en formato AAAA-MM-DD"""
+    return f"truck-day:{assigned_truck}:{day}"
+
+
+def report_month_tag(year: int, month: int) -> str:
+    return f"report-month:{year:04d}-{month:02d}"
+
+
+def tags_for_event(event: dict) -> Set[str]:
+    """
+    Etiquetas de los datos afectados por un evento de pedido
+
+    Args:
+        event: Evento construido por build_order_event
+
+    Returns:
+        Conjunto de etiquetas; siempre incluye ORDERS_TAG
+    """
+    tags = {ORDERS_TAG}
+    for values in (event, event.get('previous') or {}):
+        if values.get('client_id'):
+            tags.add(client_tag(values['client_id']))
+        if values.get('vendor_id'):
+            tags.add(vendor_tag(values['vendor_id']))
+        if values.get('assigned_truck') and values.get('scheduled_delivery_date'):
+            tags.add(truck_day_tag(values['assigned_truck'], values['scheduled_delivery_date'][:10]))
+    created_at = event.get('created_at') or event.get('occurred_at')
+    if created_at:
+        tags.add(report_month_tag(int(created_at[:4]), int(created_at[5:7])))
+    return tags
+
+
+class CacheInvalidationBus:
+    """
+    Reenvía los eventos de pedidos del hub a los caches registrados
+
+    Un cache registrado debe implementar invalidate_tags(tags) y clear().
+    """
+
+    def __init__(self, hub: OrderEventHub):
+        self.hub = hub
+        self._caches: List = []
+        self._lock = threading.Lock()
+        hub.add_callback(self.handle_event)
+
+    def register(self, cache):
+        """Registra un cache y lo retorna; inicia el listener del proceso si corresponde"""
+        with self._lock:
+            self._caches.append(cache)
+        self.ensure_listening()
+        return cache
+
+    def unregister(self, cache) -> None:
+        with self._lock:
+            if cache in self._caches:
+                self._caches.remove(cache)
+
+    def ensure_listening(self) -> None:
+        """Inicia (o reinicia tras un fork) el listener de eventos del proceso"""
+        self.hub.ensure_listener()
+
+    def handle_event(self, event: dict) -> None:
+        with self._lock:
+            caches = list(self._caches)
+        if event.get('type') in ('resync', 'deleted_all', 'cache_reset'):
+            for cache in caches:
+                cache.clear()
+            logger.info(f"Caches de pedidos vaciados por evento '{event.get('type')}'")
+            return
+        tags = tags_for_event(event)
+        for cache in caches:
+            cache.invalidate_tags(tags)
+
+    def clear_all(self) -> None:
+        """Vacía todos los caches registrados"""
+        self.handle_event({'type': 'resync'})
+
+
+cache_invalidation_bus = CacheInvalidationBus(order_event_hub)
@@ -0,0 +1,130 @@
+"""
+Compresión de respuestas negociada con Accept-Encoding
+
+Se registra como after_request sobre la aplicación, por lo que aplica a todos los
+Resources de configure_routes. Las respuestas en memoria se comprimen si superan
+el umbral configurado; las respuestas en streaming se comprimen por fragmentos a
+medida que se generan, sin acumular el cuerpo completo.
+"""
+import logging
+import zlib
+from typing import Callable, Iterable, Iterator, Optional
+from flask import Flask, Response, request
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - depende del entorno
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+COMPRESSIBLE_MIMETYPES = ('application/json', 'application/x-ndjson', 'text/')
+
+
+class _GzipCompressor:
+    """Compresor gzip incremental con la misma interfaz que brotli.Compressor"""
+
+    __slots__ = ('_compressor',)
+
+    def __init__(self, level: int):
+        # wbits=31 produce el formato gzip (cabecera + CRC) en lugar de zlib crudo
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def process(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+class ResponseCompressor:
+    """
+    Comprime las respuestas con brotli o gzip según el Accept-Encoding del cliente
+
+    Args:
+        min_size: Tamaño mínimo en bytes del cuerpo para comprimirlo
+        gzip_level: Nivel de compresión gzip (1-9)
+        brotli_quality: Calidad de brotli (0-11); valores bajos priorizan CPU
+    """
+
+    def __init__(self, min_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 4):
+        self.min_size = min_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    def init_app(self, app: Flask) -> None:
+        app.after_request(self.compress_response)
+
+    def choose_encoding(self, accept_encodings) -> Optional[str]:
+        """Elige 'br' o 'gzip' según las calidades del header; None si no acepta ninguno"""
+        gzip_quality = accept_encodings.quality('gzip')
+        if brotli is not None:
+            brotli_quality = accept_encodings.quality('br')
+            if brotli_quality > 0 and brotli_quality >= gzip_quality:
+                return 'br'
+        if gzip_quality > 0:
+            return 'gzip'
+        return None
+
+    def _compressor_factory(self, encoding: str) -> Callable[[], object]:
+        if encoding == 'br':
+            return lambda: brotli.Compressor(quality=self.brotli_quality)
+        return lambda: _GzipCompressor(self.gzip_level)
+
+    def compress_response(self, response: Response) -> Response:
+        """after_request: comprime la respuesta si corresponde"""
+        if not self._is_compressible(response):
+            return response
+
+        encoding = self.choose_encoding(request.accept_encodings)
+        response.vary.add('Accept-Encoding')
+        if encoding is None:
+            return response
+
+        new_compressor = self._compressor_factory(encoding)
+        if response.is_streamed:
+            response.response = self._compress_stream(response.response, new_compressor)
+            response.direct_passthrough = False
+            response.headers.pop('Content-Length', None)
+        else:
+            body = response.get_data()
+            if len(body) < self.min_size:
+                return response
+            compressor = new_compressor()
+            response.set_data(compressor.process(body) + compressor.finish())
+
+        response.headers['Content-Encoding'] = encoding
+        return response
+
+    def _is_compressible(self, response: Response) -> bool:
+        if request.method == 'HEAD' or response.status_code < 200 or response.status_code in (204, 304):
+            return False
+        if 'Content-Encoding' in response.headers:
+            return False
+        mimetype = response.mimetype or ''
+        # Los eventos SSE se envían tal cual: algunos proxies y clientes no procesan SSE comprimido
+        if mimetype == 'text/event-stream':
+            return False
+        return mimetype.startswith(COMPRESSIBLE_MIMETYPES)
+
+    @staticmethod
+    def _compress_stream(chunks: Iterable, new_compressor: Callable[[], object]) -> Iterator[bytes]:
+        """Comprime un cuerpo en streaming fragmento a fragmento"""
+        compressor = new_compressor()
+        try:
+            for chunk in chunks:
+                if isinstance(chunk, str):
+                    chunk = chunk.encode('utf-8')
+                data = compressor.process(chunk)
+                # Se vacía el buffer en cada fragmento para que el cliente reciba datos cuanto antes
+                data += compressor.flush()
+                if data:
+                    yield data
+            yield compressor.finish()
+        finally:
+            close = getattr(chunks, 'close', None)
+            if close is not None:
+                close()
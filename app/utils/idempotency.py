@@ -0,0 +1,127 @@
+"""
+Almacén de respuestas idempotentes para la creación de pedidos
+"""
+import hashlib
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+from ..config.settings import get_config
+from ..exceptions.custom_exceptions import OrderIdempotencyConflictError
+
+logger = logging.getLogger(__name__)
+
+
+class _IdempotencyEntry:
+    """Resultado (o ejecución en curso) asociado a una Idempotency-Key"""
+
+    __slots__ = ('fingerprint', 'response', 'expires_at', 'done')
+
+    def __init__(self, fingerprint: str):
+        self.fingerprint = fingerprint
+        self.response: Optional[Tuple[Any, int]] = None
+        self.expires_at: Optional[float] = None
+        self.done = threading.Event()
+
+
+class IdempotencyStore:
+    """
+    Guarda en memoria la respuesta de la primera petición de cada Idempotency-Key.
+
+    Las repeticiones con la misma llave y el mismo cuerpo devuelven la respuesta
+    guardada sin volver a ejecutar la operación; las peticiones concurrentes con la
+    misma llave esperan a que termine la que está en curso. Solo se guardan
+    respuestas con código menor a 500 para que los errores transitorios puedan
+    reintentarse.
+    """
+
+    def __init__(self, ttl_seconds: int = 86400, wait_timeout: float = 30.0, clock: Callable[[], float] = time.monotonic):
+        self.ttl_seconds = ttl_seconds
+        self.wait_timeout = wait_timeout
+        self._clock = clock
+        self._entries: Dict[str, _IdempotencyEntry] = {}
+        self._lock = threading.Lock()
+        self._next_purge = 0.0
+
+    @staticmethod
+    def fingerprint(body: bytes) -> str:
+        """Calcula la huella del cuerpo de la petición"""
+        return hashlib.sha256(body or b'').hexdigest()
+
+    def execute(self, key: str, fingerprint: str, operation: Callable[[], Tuple[Any, int]]) -> Tuple[Tuple[Any, int], bool]:
+        """
+        Ejecuta la operación una sola vez por llave
+
+        Args:
+            key: Valor del header Idempotency-Key
+            fingerprint: Huella del cuerpo de la petición
+            operation: Función que produce la tupla (respuesta, código)
+
+        Returns:
+            Tupla ((respuesta, código), replayed) donde replayed indica si la
+            respuesta proviene del almacén
+
+        Raises:
+            OrderIdempotencyConflictError: Si la llave se usó con otro cuerpo o la
+                petición en curso no terminó a tiempo
+        """
+        deadline = self._clock() + self.wait_timeout
+        while True:
+            with self._lock:
+                self._purge_expired()
+                entry = self._entries.get(key)
+                if entry is None or (entry.expires_at is not None and entry.expires_at <= self._clock()):
+                    entry = _IdempotencyEntry(fingerprint)
+                    self._entries[key] = entry
+                    break
+                if entry.fingerprint != fingerprint:
+                    raise OrderIdempotencyConflictError(
+                        "La Idempotency-Key ya fue utilizada con un cuerpo de petición diferente"
+                    )
+                if entry.response is not None:
+                    logger.info(f"Reutilizando respuesta almacenada para Idempotency-Key {key}")
+                    return entry.response, True
+
+            remaining = deadline - self._clock()
+            if remaining <= 0 or not entry.done.wait(remaining):
+                raise OrderIdempotencyConflictError(
+                    "Ya existe una petición en curso con la misma Idempotency-Key"
+                )
+
+        response = None
+        try:
+            response = operation()
+            return response, False
+        finally:
+            with self._lock:
+                if response is not None and response[1] < 500:
+                    entry.response = response
+                    entry.expires_at = self._clock() + self.ttl_seconds
+                elif self._entries.get(key) is entry:
+                    del self._entries[key]
+            entry.done.set()
+
+    def clear(self) -> None:
+        """Elimina todas las respuestas almacenadas"""
+        with self._lock:
+            self._entries.clear()
+
+    def _purge_expired(self) -> None:
+        """Elimina las entradas vencidas como máximo una vez por minuto (se invoca con el lock tomado)"""
+        now = self._clock()
+        if now < self._next_purge:
+            return
+        self._next_purge = now + 60
+        expired = [
+            key for key, entry in self._entries.items()
+            if entry.expires_at is not None and entry.expires_at <= now
+        ]
+        for key in expired:
+            del self._entries[key]
+
+
+_config = get_config()
+idempotency_store = IdempotencyStore(
+    ttl_seconds=_config.IDEMPOTENCY_TTL_SECONDS,
+    wait_timeout=_config.IDEMPOTENCY_WAIT_TIMEOUT_SECONDS
+)
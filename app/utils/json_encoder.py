@@ -0,0 +1,83 @@
+"""
+Representación JSON de las respuestas de la API
+
+Usa orjson cuando está instalado (serializa datetime, date, UUID y Enum de forma
+nativa y escribe directamente a bytes) y cae al módulo json de la librería
+estándar en caso contrario. Se registra sobre el Api de Flask-RESTful en
+configure_routes.
+"""
+import json
+import logging
+import uuid
+from datetime import date, datetime, time
+from decimal import Decimal
+from enum import Enum
+from typing import Any, Callable, Dict, Optional
+from flask import current_app, make_response
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depende del entorno
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+
+def _default(value: Any) -> Any:
+    """Convierte los tipos que ninguno de los dos backends serializa por sí solo"""
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, Enum):
+        return value.value
+    raise TypeError(f"Tipo no serializable a JSON: {type(value).__name__}")
+
+
+def _orjson_dumps(data: Any, indent: bool = False, newline: bool = True) -> bytes:
+    option = orjson.OPT_NON_STR_KEYS
+    if newline:
+        option |= orjson.OPT_APPEND_NEWLINE
+    if indent:
+        option |= orjson.OPT_INDENT_2
+    return orjson.dumps(data, default=_default, option=option)
+
+
+def _stdlib_dumps(data: Any, indent: bool = False, newline: bool = True) -> bytes:
+    body = json.dumps(data, default=_default, indent=4 if indent else None)
+    return (body + "\n" if newline else body).encode('utf-8')
+
+
+_BACKENDS: Dict[str, Callable[..., bytes]] = {'json': _stdlib_dumps}
+if orjson is not None:
+    _BACKENDS['orjson'] = _orjson_dumps
+
+
+def get_dumps(backend: Optional[str] = None) -> Callable[..., bytes]:
+    """
+    Retorna la función de serialización del backend solicitado
+
+    Args:
+        backend: 'orjson' o 'json'; si no se indica o no está disponible se usa
+            orjson cuando está instalado y json en caso contrario
+    """
+    if backend in _BACKENDS:
+        return _BACKENDS[backend]
+    if backend:
+        logger.warning(f"Backend JSON '{backend}' no disponible, usando el predeterminado")
+    return _BACKENDS.get('orjson', _stdlib_dumps)
+
+
+def make_output_json(backend: Optional[str] = None) -> Callable:
+    """Crea la representación 'application/json' para Flask-RESTful con el backend indicado"""
+    dumps = get_dumps(backend)
+
+    def output_json(data: Any, code: int, headers: Optional[dict] = None):
+        """Serializa la respuesta; con debug activo se indenta igual que Flask-RESTful"""
+        response = make_response(dumps(data, indent=current_app.debug), code)
+        response.headers.extend(headers or {})
+        return response
+
+    return output_json
@@ -0,0 +1,70 @@
+"""
+Respuestas JSON en streaming para listados grandes
+
+Genera el mismo sobre que BaseController.success_response
+({"success": true, "message": ..., "data": [...]}) pero escribiendo el arreglo
+data por fragmentos a medida que el iterador los produce.
+"""
+import logging
+from typing import Any, Callable, Iterator, List
+from flask import Response
+from ..config.settings import get_config
+from .json_encoder import get_dumps
+
+logger = logging.getLogger(__name__)
+
+
+def stream_list_response(
+    chunks: Iterator[List[Any]],
+    message: str,
+    empty_message: str,
+    serializer: Callable[[List[Any]], List[dict]]
+) -> Response:
+    """
+    Crea una respuesta 200 que serializa los fragmentos de forma incremental
+
+    El primer fragmento se obtiene antes de crear la respuesta, de modo que los
+    errores iniciales (validación, conexión a la base de datos) se propagan al
+    controlador y se reportan con su código de error habitual.
+
+    Args:
+        chunks: Iterador de listas de objetos a serializar
+        message: Mensaje cuando hay al menos un elemento
+        empty_message: Mensaje cuando el listado está vacío
+        serializer: Convierte una lista de objetos en una lista de diccionarios
+
+    Returns:
+        Response: Respuesta application/json en streaming
+    """
+    dumps = get_dumps(get_config().JSON_BACKEND)
+    try:
+        first_chunk = next(chunks, None)
+    except Exception:
+        chunks.close()
+        raise
+
+    head = dumps({
+        'success': True,
+        'message': message if first_chunk else empty_message
+    }, newline=False)
+
+    def generate() -> Iterator[bytes]:
+        try:
+            yield head[:-1] + b',"data":['
+            separator = b''
+            chunk = first_chunk
+            while chunk is not None:
+                if chunk:
+                    # Se serializa el fragmento como arreglo y se quitan los corchetes
+                    yield separator + dumps(serializer(chunk), newline=False)[1:-1]
+                    separator = b','
+                chunk = next(chunks, None)
+            yield b']}\n'
+        except Exception as e:
+            # Los encabezados ya se enviaron: se corta la respuesta para que el cliente no la tome como completa
+            logger.error(f"Error durante la respuesta en streaming: {str(e)}")
+            raise
+        finally:
+            chunks.close()
+
+    return Response(generate(), status=200, mimetype='application/json')
@@ -0,0 +1,339 @@
+"""
+Eventos de cambios de pedidos y su distribución dentro del proceso
+
+Los repositorios emiten un evento por cada pedido creado, modificado o eliminado
+dentro de la misma transacción que lo escribe:
+
+- En PostgreSQL el evento viaja con NOTIFY por el canal ORDER_EVENTS_CHANNEL y se
+  entrega al confirmar la transacción. Cada proceso mantiene una sola conexión
+  con LISTEN (PostgresEventListener) que reenvía los eventos al hub local.
+- En otros motores (SQLite en desarrollo y pruebas) el evento se publica
+  directamente en el hub local después del commit.
+
+El hub (OrderEventHub) reparte cada evento entre las suscripciones del proceso
+(conexiones SSE) y los callbacks registrados, de modo que la cantidad de
+conexiones a la base de datos no depende de la cantidad de clientes conectados.
+"""
+import json
+import logging
+import os
+import queue
+import select
+import threading
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+from ..config.settings import get_config
+from ..exceptions.custom_exceptions import OrderEventsUnavailableError
+
+logger = logging.getLogger(__name__)
+
+ORDER_EVENTS_CHANNEL = 'order_events'
+
+# Llave de session.info donde se acumulan los eventos hasta el commit (motores sin NOTIFY)
+_PENDING_EVENTS_KEY = 'pending_order_events'
+
+
+def build_order_event(event_type: str, order, previous: Optional[dict] = None) -> dict:
+    """
+    Construye el evento de un pedido
+
+    Args:
+        event_type: 'created', 'updated' o 'deleted'
+        order: Pedido de dominio u OrderDB con los valores actuales
+        previous: Valores anteriores de status, client_id, vendor_id, assigned_truck y
+            scheduled_delivery_date (solo para 'updated')
+
+    Returns:
+        Diccionario serializable a JSON
+    """
+    event = {
+        'type': event_type,
+        'order_id': order.id,
+        'order_number': order.order_number,
+        'status': order.status,
+        'client_id': order.client_id,
+        'vendor_id': order.vendor_id,
+        'assigned_truck': order.assigned_truck,
+        'scheduled_delivery_date': _isoformat(order.scheduled_delivery_date),
+        'created_at': _isoformat(order.created_at),
+        'occurred_at': datetime.utcnow().isoformat()
+    }
+    if previous is not None:
+        event['previous'] = {
+            name: _isoformat(value) if name == 'scheduled_delivery_date' else value
+            for name, value in previous.items()
+        }
+    return event
+
+
+def build_delete_all_event() -> dict:
+    """Construye el evento de eliminación de todos los pedidos"""
+    return {'type': 'deleted_all', 'occurred_at': datetime.utcnow().isoformat()}
+
+
+def build_cache_reset_event() -> dict:
+    """Construye el evento que vacía los caches de todos los procesos (p. ej. tras reconstruir rollups)"""
+    return {'type': 'cache_reset', 'occurred_at': datetime.utcnow().isoformat()}
+
+
+def _isoformat(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def emit_order_events(session, events: List[dict]) -> None:
+    """
+    Emite eventos dentro de la transacción de la sesión
+
+    Se entregan solo si la transacción se confirma: en PostgreSQL con NOTIFY (una
+    sola sentencia para todos los eventos) y en otros motores publicándolos en el
+    hub local desde el after_commit de la sesión.
+    """
+    if not events:
+        return
+    if _dialect_name(session) == 'postgresql':
+        from sqlalchemy import text
+        session.execute(
+            text("SELECT pg_notify(:channel, payload) FROM unnest(CAST(:payloads AS text[])) AS payload"),
+            {'channel': ORDER_EVENTS_CHANNEL, 'payloads': [json.dumps(event) for event in events]}
+        )
+    else:
+        session.info.setdefault(_PENDING_EVENTS_KEY, []).extend(events)
+
+
+def order_event_notify_cte(event: dict, order_id_column, name: str = 'order_event'):
+    """
+    CTE de PostgreSQL que emite el evento con pg_notify dentro de otra sentencia
+
+    Permite notificar un pedido recién insertado en el mismo round trip del INSERT:
+    el order_id del evento se toma de order_id_column (p. ej. el RETURNING de un CTE).
+    La sentencia principal debe hacer join con el CTE para que se evalúe.
+    """
+    from sqlalchemy import Text, func, literal, select
+
+    arguments = []
+    for key, value in event.items():
+        arguments.append(literal(key))
+        arguments.append(order_id_column if key == 'order_id' else literal(value, Text))
+    payload = func.json_build_object(*arguments)
+    return select(
+        func.pg_notify(ORDER_EVENTS_CHANNEL, payload.cast(Text)).label('notified')
+    ).cte(name)
+
+
+def _dialect_name(session) -> str:
+    try:
+        return session.get_bind().dialect.name
+    except Exception:
+        return ''
+
+
+class OrderEventSubscription:
+    """Cola de eventos de un suscriptor (una conexión SSE) filtrada por cliente, vendedor o camión"""
+
+    __slots__ = ('filters', 'dropped', '_queue')
+
+    def __init__(self, filters: Dict[str, str], queue_size: int):
+        self.filters = filters
+        self.dropped = 0
+        self._queue = queue.Queue(maxsize=queue_size)
+
+    def matches(self, event: dict) -> bool:
+        """Indica si el evento corresponde a los filtros, con los valores actuales o anteriores del pedido"""
+        if event.get('type') in ('resync', 'deleted_all'):
+            return True
+        previous = event.get('previous') or {}
+        return all(
+            event.get(name) == value or previous.get(name) == value
+            for name, value in self.filters.items()
+        )
+
+    def put(self, event: dict) -> None:
+        """Encola el evento sin bloquear; si el suscriptor no consume a tiempo el evento se descarta"""
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            self.dropped += 1
+
+    def get(self, timeout: float) -> Optional[dict]:
+        """Espera el siguiente evento; None si no llegó ninguno en timeout segundos"""
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+
+class OrderEventHub:
+    """
+    Reparte los eventos de pedidos entre las suscripciones y callbacks del proceso
+
+    Args:
+        max_subscribers: Máximo de suscripciones simultáneas por proceso
+        queue_size: Eventos pendientes por suscripción antes de descartar
+    """
+
+    def __init__(self, max_subscribers: int = 100, queue_size: int = 100):
+        self.max_subscribers = max_subscribers
+        self.queue_size = queue_size
+        self.listener_factory: Optional[Callable[['OrderEventHub'], threading.Thread]] = None
+        self._subscriptions: List[OrderEventSubscription] = []
+        self._callbacks: List[Callable[[dict], None]] = []
+        self._listener: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def subscribe(self, **filters) -> OrderEventSubscription:
+        """
+        Crea una suscripción con los filtros indicados (client_id, vendor_id o assigned_truck)
+
+        Raises:
+            OrderEventsUnavailableError: Si se alcanzó el máximo de suscripciones del proceso
+        """
+        self.ensure_listener()
+        subscription = OrderEventSubscription(
+            {name: value for name, value in filters.items() if value},
+            self.queue_size
+        )
+        with self._lock:
+            if len(self._subscriptions) >= self.max_subscribers:
+                raise OrderEventsUnavailableError("Se alcanzó el máximo de suscripciones a eventos de pedidos")
+            self._subscriptions.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: OrderEventSubscription) -> None:
+        with self._lock:
+            if subscription in self._subscriptions:
+                self._subscriptions.remove(subscription)
+
+    def add_callback(self, callback: Callable[[dict], None]) -> None:
+        """Registra una función que recibe todos los eventos del proceso"""
+        with self._lock:
+            self._callbacks.append(callback)
+
+    def publish(self, event: dict) -> None:
+        """Entrega un evento a los callbacks y a las suscripciones que coinciden"""
+        with self._lock:
+            subscriptions = list(self._subscriptions)
+            callbacks = list(self._callbacks)
+        for callback in callbacks:
+            try:
+                callback(event)
+            except Exception as e:
+                logger.error(f"Error procesando evento de pedido: {str(e)}")
+        for subscription in subscriptions:
+            if subscription.matches(event):
+                subscription.put(event)
+
+    def ensure_listener(self) -> None:
+        """Inicia el listener de la base de datos del proceso si hay uno configurado y no está corriendo"""
+        if self.listener_factory is None:
+            return
+        listener = self._listener
+        if listener is not None and listener.is_alive():
+            return
+        with self._lock:
+            if self._listener is not None and self._listener.is_alive():
+                return
+            self._listener = self.listener_factory(self)
+            self._listener.start()
+
+    @property
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return len(self._subscriptions)
+
+    def _reset_after_fork(self) -> None:
+        """
+        El hilo del listener no sobrevive al fork: el proceso hijo lo inicia con su primera petición
+
+        No se abre ninguna conexión aquí: el hook corre antes de que el hijo descarte
+        las conexiones heredadas del engine.
+        """
+        self._lock = threading.Lock()
+        self._listener = None
+        self._subscriptions = []
+
+
+class PostgresEventListener(threading.Thread):
+    """
+    Hilo con una conexión dedicada que escucha el canal de eventos de pedidos (LISTEN)
+
+    Si la conexión se pierde se reconecta y publica un evento 'resync', porque los
+    NOTIFY emitidos mientras tanto no se recuperan.
+    """
+
+    def __init__(self, engine, hub: OrderEventHub, channel: str = ORDER_EVENTS_CHANNEL, reconnect_delay: float = 5.0):
+        super().__init__(name='order-events-listener', daemon=True)
+        self.engine = engine
+        self.hub = hub
+        self.channel = channel
+        self.reconnect_delay = reconnect_delay
+        self._stopped = threading.Event()
+
+    def stop(self) -> None:
+        self._stopped.set()
+
+    def run(self) -> None:
+        connected_before = False
+        while not self._stopped.is_set():
+            connection = None
+            try:
+                connection = self.engine.raw_connection()
+                dbapi_connection = connection.dbapi_connection
+                dbapi_connection.autocommit = True
+                with dbapi_connection.cursor() as cursor:
+                    cursor.execute(f"LISTEN {self.channel}")
+                logger.info(f"Escuchando eventos de pedidos en el canal {self.channel}")
+                if connected_before:
+                    self.hub.publish({'type': 'resync', 'occurred_at': datetime.utcnow().isoformat()})
+                connected_before = True
+                self._listen(dbapi_connection)
+            except Exception as e:
+                logger.error(f"Error en el listener de eventos de pedidos: {str(e)}")
+                self._stopped.wait(self.reconnect_delay)
+            finally:
+                if connection is not None:
+                    try:
+                        # La conexión quedó en autocommit con LISTEN: no se devuelve al pool
+                        connection.invalidate()
+                    except Exception:
+                        pass
+
+    def _listen(self, dbapi_connection) -> None:
+        while not self._stopped.is_set():
+            if select.select([dbapi_connection], [], [], 5.0) == ([], [], []):
+                continue
+            dbapi_connection.poll()
+            while dbapi_connection.notifies:
+                notify = dbapi_connection.notifies.pop(0)
+                try:
+                    event = json.loads(notify.payload)
+                except ValueError:
+                    logger.warning(f"Evento de pedido inválido: {notify.payload[:200]}")
+                    continue
+                self.hub.publish(event)
+
+
+def _publish_pending_events(session) -> None:
+    for event in session.info.pop(_PENDING_EVENTS_KEY, []):
+        order_event_hub.publish(event)
+
+
+def _discard_pending_events(session, *args) -> None:
+    session.info.pop(_PENDING_EVENTS_KEY, None)
+
+
+def _register_session_hooks() -> None:
+    from sqlalchemy import event
+    from sqlalchemy.orm import Session
+    event.listen(Session, 'after_commit', _publish_pending_events)
+    event.listen(Session, 'after_soft_rollback', _discard_pending_events)
+
+
+_config = get_config()
+order_event_hub = OrderEventHub(
+    max_subscribers=_config.ORDER_EVENTS_MAX_SUBSCRIBERS,
+    queue_size=_config.ORDER_EVENTS_QUEUE_SIZE
+)
+_register_session_hooks()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=order_event_hub._reset_after_fork)
@@ -0,0 +1,238 @@
+"""
+Cache de resultados de consultas de repositorio con llaves versionadas
+
+Los métodos de lectura se decoran con @cached_query indicando las entidades de
+las que depende el resultado (etiquetas de cache_invalidation: client:<id>,
+report-month:<AAAA-MM>, orders, ...). La llave de cada resultado incluye la
+versión actual de esas entidades; cada escritura de pedidos incrementa la
+versión de sus entidades (vía el bus de invalidación, en todos los workers), de
+modo que los resultados anteriores dejan de encontrarse sin tener que buscarlos
+y terminan de salir del cache por TTL o por capacidad.
+
+OrderService usa la región report_cache con el mismo decorador para los reportes
+armados.
+
+Si varias peticiones piden la misma llave a la vez solo una ejecuta la consulta
+y las demás esperan su resultado. Los datetime de los argumentos se truncan al
+minuto al construir la llave, para que los reportes calculados con "ahora"
+compartan el resultado dentro del mismo minuto.
+"""
+import copy
+import functools
+import inspect
+import logging
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Dict, Hashable, Iterable, Optional, Tuple
+from .cache_invalidation import cache_invalidation_bus, report_month_tag
+from ..config.settings import get_config
+
+logger = logging.getLogger(__name__)
+
+
+class _Flight:
+    """Carga en curso de una llave; las peticiones concurrentes esperan su resultado"""
+
+    __slots__ = ('done', 'value', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error: Optional[BaseException] = None
+
+
+class QueryCacheRegion:
+    """
+    Región de cache para resultados de consultas
+
+    Args:
+        enabled: Si es False las consultas se ejecutan siempre
+        default_ttl: Vigencia en segundos de los resultados
+        max_entries: Máximo de resultados; al superarlo se descartan los más antiguos
+    """
+
+    def __init__(self, enabled: bool = True, default_ttl: float = 60.0, max_entries: int = 2048):
+        self.enabled = enabled
+        self.default_ttl = default_ttl
+        self.max_entries = max_entries
+        self._entries: Dict[Hashable, Tuple[float, object]] = {}
+        self._versions: Dict[str, int] = {}
+        self._generation = 0
+        self._flights: Dict[Hashable, _Flight] = {}
+        self._stats: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def get_or_load(self, name: str, args_key: Hashable, entities: Iterable[str], loader: Callable[[], object],
+                    ttl: Optional[float] = None):
+        """
+        Retorna el resultado en cache de name/args_key o lo carga con loader
+
+        Args:
+            name: Nombre del método (llave y métricas)
+            args_key: Argumentos normalizados de la consulta
+            entities: Etiquetas de las que depende el resultado
+            loader: Función que ejecuta la consulta
+            ttl: Vigencia del resultado (default_ttl si no se indica)
+
+        Returns:
+            Copia del resultado
+        """
+        if not self.enabled:
+            return loader()
+        with self._lock:
+            key = (name, args_key, self._generation, tuple(
+                (entity, self._versions.get(entity, 0)) for entity in entities
+            ))
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._count(name, 'hits')
+                return copy.deepcopy(entry[1])
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+                self._count(name, 'misses')
+            else:
+                self._count(name, 'coalesced')
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return copy.deepcopy(flight.value)
+
+        try:
+            flight.value = loader()
+        except BaseException as e:
+            flight.error = e
+            raise
+        else:
+            with self._lock:
+                self._store(key, flight.value, self.default_ttl if ttl is None else ttl)
+            return copy.deepcopy(flight.value)
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.done.set()
+
+    def invalidate_tags(self, tags: Iterable[str]) -> int:
+        """Incrementa la versión de las entidades (interfaz del bus de invalidación)"""
+        with self._lock:
+            for tag in tags:
+                self._versions[tag] = self._versions.get(tag, 0) + 1
+        return 0
+
+    def clear(self) -> None:
+        """Descarta todos los resultados, incluidos los que se están cargando"""
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+
+    def reset(self) -> None:
+        """Vacía el cache, las versiones y las métricas"""
+        with self._lock:
+            self._entries.clear()
+            self._versions.clear()
+            self._stats.clear()
+            self._generation += 1
+
+    def stats(self) -> Dict[str, dict]:
+        """
+        Métricas por método: hits, misses, coalesced (esperaron una carga en curso) y hit_rate
+
+        hit_rate considera aciertos los hits y las peticiones que esperaron otra carga.
+        """
+        with self._lock:
+            stats = {}
+            for name, counters in self._stats.items():
+                total = counters['hits'] + counters['misses'] + counters['coalesced']
+                stats[name] = dict(counters)
+                stats[name]['hit_rate'] = round((counters['hits'] + counters['coalesced']) / total, 4) if total else 0.0
+            return stats
+
+    def _count(self, name: str, counter: str) -> None:
+        counters = self._stats.get(name)
+        if counters is None:
+            counters = self._stats[name] = {'hits': 0, 'misses': 0, 'coalesced': 0}
+        counters[counter] += 1
+
+    def _store(self, key: Hashable, value, ttl: float) -> None:
+        now = time.monotonic()
+        self._entries.pop(key, None)
+        if len(self._entries) >= self.max_entries:
+            # Primero se descartan los vencidos; si no alcanza, los más antiguos
+            for expired in [k for k, (expires_at, _) in self._entries.items() if expires_at <= now]:
+                del self._entries[expired]
+            while len(self._entries) >= self.max_entries:
+                del self._entries[next(iter(self._entries))]
+        self._entries[key] = (now + ttl, value)
+
+
+def normalize_cache_arg(value) -> Hashable:
+    """Convierte un argumento en parte de la llave; los datetime se truncan al minuto"""
+    if isinstance(value, datetime):
+        return value.replace(second=0, microsecond=0)
+    if isinstance(value, (list, tuple)):
+        return tuple(normalize_cache_arg(item) for item in value)
+    if isinstance(value, (set, frozenset)):
+        return tuple(sorted((normalize_cache_arg(item) for item in value), key=repr))
+    if isinstance(value, dict):
+        return tuple(sorted((key, normalize_cache_arg(item)) for key, item in value.items()))
+    return value
+
+
+def month_tags(start_date: datetime, end_date: datetime) -> Iterable[str]:
+    """Etiquetas report-month de los meses entre start_date y end_date (inclusive)"""
+    year, month = start_date.year, start_date.month
+    while (year, month) <= (end_date.year, end_date.month):
+        yield report_month_tag(year, month)
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+
+
+def cached_query(entities: Callable[..., Iterable[str]], ttl: Optional[float] = None,
+                 region: Optional[QueryCacheRegion] = None):
+    """
+    Decorador para métodos de repositorio cuyo resultado se puede cachear
+
+    Args:
+        entities: Función que recibe los mismos argumentos del método (sin self) y
+            retorna las etiquetas de las que depende el resultado
+        ttl: Vigencia del resultado en segundos (la de la región si no se indica)
+        region: Región de cache (query_cache si no se indica)
+    """
+    def decorator(method):
+        signature = inspect.signature(method)
+        name = method.__qualname__
+
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            cache = region or query_cache
+            bound = signature.bind(self, *args, **kwargs)
+            bound.apply_defaults()
+            arguments = dict(bound.arguments)
+            arguments.pop('self')
+            return cache.get_or_load(
+                name,
+                normalize_cache_arg(arguments),
+                tuple(entities(**arguments)),
+                lambda: method(self, *args, **kwargs),
+                ttl
+            )
+
+        return wrapper
+    return decorator
+
+
+_config = get_config()
+query_cache = cache_invalidation_bus.register(QueryCacheRegion(
+    enabled=_config.QUERY_CACHE_ENABLED,
+    default_ttl=_config.QUERY_CACHE_TTL_SECONDS,
+    max_entries=_config.QUERY_CACHE_MAX_ENTRIES
+))
+# Reportes ya armados por OrderService (incluyen nombres de clientes y productos)
+report_cache = cache_invalidation_bus.register(QueryCacheRegion(
+    enabled=_config.REPORT_CACHE_ENABLED,
+    default_ttl=_config.REPORT_CACHE_TTL_SECONDS,
+    max_entries=_config.REPORT_CACHE_MAX_ENTRIES
+))
@@ -0,0 +1,114 @@
+"""
+Resumen Space-Saving para estimar los elementos más frecuentes de un flujo
+
+Con capacidad m y peso total N del flujo, cada contador sobreestima la frecuencia
+real del elemento como máximo en su error, y ningún error supera N / m. Todo
+elemento con frecuencia mayor a N / m está en el resumen. Dos resúmenes se pueden
+combinar (merge) manteniendo la misma cota sobre la suma de sus flujos.
+"""
+import heapq
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
+
+
+class SpaceSaving:
+    """
+    Resumen Space-Saving de capacidad fija
+
+    Args:
+        capacity: Máximo de contadores (m)
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.total = 0
+        # Elemento -> [estimación, error máximo]
+        self.counters: Dict[Hashable, List[int]] = {}
+        # (estimación, elemento); puede tener entradas obsoletas que se descartan al buscar el mínimo
+        self._heap: List[Tuple[int, Hashable]] = []
+
+    def offer(self, key: Hashable, weight: int = 1) -> None:
+        """Suma weight a la frecuencia de key; si no hay espacio reemplaza al contador mínimo"""
+        self.total += weight
+        counter = self.counters.get(key)
+        if counter is not None:
+            counter[0] += weight
+        elif len(self.counters) < self.capacity:
+            counter = self.counters[key] = [weight, 0]
+        else:
+            min_count, min_key = self._pop_min()
+            del self.counters[min_key]
+            counter = self.counters[key] = [min_count + weight, min_count]
+        heapq.heappush(self._heap, (counter[0], key))
+        if len(self._heap) > 4 * self.capacity:
+            self._rebuild_heap()
+
+    def min_count(self) -> int:
+        """Estimación mínima si el resumen está lleno (cota de lo no registrado); 0 si no"""
+        if len(self.counters) < self.capacity:
+            return 0
+        return min(counter[0] for counter in self.counters.values())
+
+    def error_bound(self) -> int:
+        """Sobreestimación máxima de cualquier elemento: N / m"""
+        return self.total // self.capacity
+
+    def top(self, limit: int) -> List[dict]:
+        """Los limit elementos con mayor estimación: key, count y max_error"""
+        ranked = heapq.nsmallest(limit, self.counters.items(), key=lambda item: (-item[1][0], str(item[0])))
+        return [{'key': key, 'count': count, 'max_error': error} for key, (count, error) in ranked]
+
+    @classmethod
+    def merge(cls, summaries: Iterable['SpaceSaving'], capacity: int) -> 'SpaceSaving':
+        """
+        Combina resúmenes de flujos distintos
+
+        Un elemento ausente de un resumen lleno pudo tener en ese flujo hasta su
+        estimación mínima, que se suma a su estimación y a su error.
+        """
+        merged = cls(capacity)
+        for summary in summaries:
+            own_min, other_min = merged.min_count(), summary.min_count()
+            counters = {}
+            for key in set(merged.counters) | set(summary.counters):
+                count, error = merged.counters.get(key, (own_min, own_min))
+                other_count, other_error = summary.counters.get(key, (other_min, other_min))
+                counters[key] = [count + other_count, error + other_error]
+            if len(counters) > capacity:
+                counters = dict(heapq.nlargest(capacity, counters.items(), key=lambda item: item[1][0]))
+            merged.counters = counters
+            merged.total += summary.total
+        merged._rebuild_heap()
+        return merged
+
+    def to_payload(self) -> dict:
+        """Representación serializable a JSON (conserva el tipo de los elementos)"""
+        return {
+            'total': self.total,
+            'counters': [[key, count, error] for key, (count, error) in self.counters.items()]
+        }
+
+    @classmethod
+    def from_payload(cls, payload: Optional[dict], capacity: int) -> 'SpaceSaving':
+        summary = cls(capacity)
+        payload = payload or {}
+        summary.total = payload.get('total', 0)
+        summary.counters = {key: [count, error] for key, count, error in payload.get('counters', [])}
+        summary._rebuild_heap()
+        return summary
+
+    def copy(self) -> 'SpaceSaving':
+        return self.from_payload(self.to_payload(), self.capacity)
+
+    def _pop_min(self) -> Tuple[int, Hashable]:
+        while self._heap:
+            count, key = heapq.heappop(self._heap)
+            counter = self.counters.get(key)
+            if counter is not None and counter[0] == count:
+                return count, key
+        # El heap siempre tiene una entrada vigente por contador; se reconstruye por seguridad
+        self._rebuild_heap()
+        return heapq.heappop(self._heap)
+
+    def _rebuild_heap(self) -> None:
+        self._heap = [(counter[0], key) for key, counter in self.counters.items()]
+        heapq.heapify(self._heap)
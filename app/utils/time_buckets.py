@@ -0,0 +1,75 @@
+"""
+Intervalos de tiempo (día, semana, mes o trimestre) para agregar pedidos
+
+Los intervalos comienzan igual que date_trunc de PostgreSQL: las semanas el lunes
+(ISO) y los trimestres en enero, abril, julio y octubre.
+"""
+from datetime import date, datetime, timedelta
+from typing import List, Union
+
+# Granularidad -> intervalo de PostgreSQL entre el inicio de dos intervalos consecutivos
+GRANULARITIES = {
+    'day': '1 day',
+    'week': '1 week',
+    'month': '1 month',
+    'quarter': '3 months'
+}
+
+MONTH_NAMES = {
+    1: "enero", 2: "febrero", 3: "marzo", 4: "abril",
+    5: "mayo", 6: "junio", 7: "julio", 8: "agosto",
+    9: "septiembre", 10: "octubre", 11: "noviembre", 12: "diciembre"
+}
+MONTH_NAMES_SHORT = {
+    1: "ene", 2: "feb", 3: "mar", 4: "abr",
+    5: "may", 6: "jun", 7: "jul", 8: "ago",
+    9: "sep", 10: "oct", 11: "nov", 12: "dic"
+}
+
+
+def bucket_start(value: Union[date, datetime], granularity: str) -> date:
+    """Primer día del intervalo que contiene value"""
+    day = value.date() if isinstance(value, datetime) else value
+    if granularity == 'day':
+        return day
+    if granularity == 'week':
+        return day - timedelta(days=day.weekday())
+    if granularity == 'month':
+        return day.replace(day=1)
+    if granularity == 'quarter':
+        return date(day.year, day.month - (day.month - 1) % 3, 1)
+    raise ValueError(f"Granularidad no válida: {granularity}")
+
+
+def next_bucket(start: date, granularity: str) -> date:
+    """Primer día del intervalo siguiente a start"""
+    if granularity == 'day':
+        return start + timedelta(days=1)
+    if granularity == 'week':
+        return start + timedelta(days=7)
+    months = 1 if granularity == 'month' else 3
+    month_index = start.year * 12 + start.month - 1 + months
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+
+def iter_buckets(start_date: Union[date, datetime], end_date: Union[date, datetime], granularity: str) -> List[date]:
+    """Inicio de cada intervalo entre start_date y end_date (inclusive)"""
+    current = bucket_start(start_date, granularity)
+    last = bucket_start(end_date, granularity)
+    buckets = []
+    while current <= last:
+        buckets.append(current)
+        current = next_bucket(current, granularity)
+    return buckets
+
+
+def bucket_label(start: date, granularity: str) -> str:
+    """Etiqueta del intervalo para gráficos: 2025-01-15, S03-2025, ene-2025 o T1-2025"""
+    if granularity == 'day':
+        return start.isoformat()
+    if granularity == 'week':
+        iso_year, iso_week, _ = start.isocalendar()
+        return f"S{iso_week:02d}-{iso_year}"
+    if granularity == 'month':
+        return f"{MONTH_NAMES_SHORT[start.month]}-{start.year}"
+    return f"T{(start.month - 1) // 3 + 1}-{start.year}"
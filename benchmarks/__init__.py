@@ -0,0 +1,3 @@
+"""
+Micro-benchmarks del servicio de pedidos
+"""
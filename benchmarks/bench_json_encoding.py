@@ -0,0 +1,46 @@
+"""
+Micro-benchmark de serialización JSON de respuestas grandes de /orders
+
+Compara la representación por defecto de Flask-RESTful (json de la librería
+estándar) con la representación de app/utils/json_encoder.py para el mismo
+cuerpo de respuesta.
+
+Uso:
+    python -m benchmarks.bench_json_encoding
+    BENCHMARK_ORDERS=20000 python -m benchmarks.bench_json_encoding
+"""
+import json
+from app.models.order import Order, serialize_orders
+from app.models.order_item import OrderItem
+from app.utils.json_encoder import get_dumps
+from benchmarks.bench_order_serialization import build_orders
+from benchmarks.common import timed
+
+ITERATIONS = 5
+
+
+def run():
+    orders = build_orders(Order, OrderItem)
+    payload = {
+        'success': True,
+        'message': 'Pedidos obtenidos exitosamente',
+        'data': serialize_orders(orders)
+    }
+    print(f"{len(orders)} pedidos, {ITERATIONS} serializaciones por backend\n")
+
+    with timed('json.dumps (Flask-RESTful por defecto)', ITERATIONS):
+        for _ in range(ITERATIONS):
+            stdlib_body = (json.dumps(payload) + "\n").encode('utf-8')
+
+    for backend in ('json', 'orjson'):
+        dumps = get_dumps(backend)
+        with timed(f"json_encoder backend '{backend}'", ITERATIONS):
+            for _ in range(ITERATIONS):
+                body = dumps(payload)
+        assert json.loads(body) == json.loads(stdlib_body)
+
+    print(f"\nTamaño de la respuesta: {len(stdlib_body) / 1024 / 1024:.1f} MB")
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,105 @@
+"""
+Micro-benchmark de round trips de OrderRepository.create
+
+Compara el camino ORM anterior (add + flush + add por item + commit + refresh +
+carga perezosa de items) con la implementación actual basada en INSERT ... RETURNING,
+y falla si la implementación actual no usa los round trips esperados para el dialecto.
+
+Uso:
+    python -m benchmarks.bench_order_create_round_trips
+    BENCHMARK_DATABASE_URL=postgresql+psycopg2://... python -m benchmarks.bench_order_create_round_trips
+"""
+from datetime import datetime, timedelta
+from app.models.db_models import Base, OrderDB, OrderItemDB
+from app.models.order import Order
+from app.models.order_item import OrderItem
+from app.repositories.order_repository import OrderRepository
+from app.repositories.order_rollups import ROLLUPS
+from benchmarks.common import RoundTripCounter, create_benchmark_engine, session_factory, timed
+
+ITERATIONS = 500
+ITEMS_PER_ORDER = 5
+
+
+def build_order(sequence: int) -> Order:
+    order = Order(
+        order_number=f"PED-20990101-{sequence % 100000:05d}",
+        client_id='123e4567-e89b-12d3-a456-426614174000',
+        status='En Preparación',
+        total_amount=100.0,
+        scheduled_delivery_date=datetime.utcnow() + timedelta(days=1)
+    )
+    order.items = [OrderItem(product_id=product_id, quantity=1) for product_id in range(1, ITEMS_PER_ORDER + 1)]
+    return order
+
+
+def expected_create_round_trips(dialect_name: str) -> int:
+    """
+    Round trips de OrderRepository.create por pedido
+
+    PostgreSQL: una sentencia (pedido, items, NOTIFY y rollups) y el commit. Otros
+    motores: INSERT del pedido, INSERT de los items, un upsert por rollup (los
+    pedidos del benchmark tienen cliente e items, así que todos tienen deltas) y el commit.
+    """
+    if dialect_name == 'postgresql':
+        return 2
+    return 2 + len(ROLLUPS) + 1
+
+
+def legacy_create(session, order: Order) -> Order:
+    """Réplica del camino ORM anterior, usada solo como línea base"""
+    db_order = OrderDB(
+        order_number=order.order_number,
+        client_id=order.client_id,
+        vendor_id=order.vendor_id,
+        status=order.status,
+        total_amount=order.total_amount,
+        scheduled_delivery_date=order.scheduled_delivery_date,
+        assigned_truck=order.assigned_truck
+    )
+    session.add(db_order)
+    session.flush()
+    for item in order.items:
+        session.add(OrderItemDB(order_id=db_order.id, product_id=item.product_id, quantity=item.quantity))
+    session.commit()
+    session.refresh(db_order)
+    return OrderRepository(session)._db_to_model_with_items(db_order)
+
+
+def run():
+    engine = create_benchmark_engine()
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    counter = RoundTripCounter(engine)
+    Session = session_factory(engine)
+    print(f"Dialecto: {engine.dialect.name}, {ITERATIONS} pedidos de {ITEMS_PER_ORDER} items\n")
+
+    session = Session()
+    counter.reset()
+    with timed('legacy ORM (add/flush/commit/refresh)', ITERATIONS):
+        for sequence in range(ITERATIONS):
+            legacy_create(session, build_order(sequence))
+    legacy_round_trips = counter.round_trips / ITERATIONS
+    session.close()
+
+    session = Session()
+    repository = OrderRepository(session)
+    counter.reset()
+    with timed('OrderRepository.create (INSERT RETURNING)', ITERATIONS):
+        for sequence in range(ITERATIONS, 2 * ITERATIONS):
+            repository.create(build_order(sequence))
+    current_round_trips = counter.round_trips / ITERATIONS
+    session.close()
+
+    expected_round_trips = expected_create_round_trips(engine.dialect.name)
+    print(
+        f"\nRound trips por pedido: legacy={legacy_round_trips:.1f}  actual={current_round_trips:.1f}"
+        f"  esperado={expected_round_trips}"
+    )
+    assert current_round_trips == expected_round_trips, (
+        f"OrderRepository.create usó {current_round_trips:.1f} round trips por pedido, se esperaban {expected_round_trips}"
+    )
+
+
+if __name__ == '__main__':
+    run()
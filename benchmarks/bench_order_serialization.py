@@ -0,0 +1,136 @@
+"""
+Micro-benchmark de memoria y serialización de listas grandes de pedidos
+
+Compara los modelos de dominio anteriores (clases con __dict__ y to_dict por
+pedido y por item) con los modelos actuales con __slots__ y serialize_orders.
+
+Uso:
+    python -m benchmarks.bench_order_serialization
+    BENCHMARK_ORDERS=20000 python -m benchmarks.bench_order_serialization
+"""
+import gc
+import os
+import tracemalloc
+from datetime import datetime, timedelta
+from app.models.order import Order, serialize_orders
+from app.models.order_item import OrderItem
+from benchmarks.common import timed
+
+ORDERS = int(os.getenv('BENCHMARK_ORDERS', '100000'))
+ITEMS_PER_ORDER = 3
+DELIVERY_DAYS = 30
+
+
+class LegacyOrderItem:
+    """Réplica del OrderItem anterior (con __dict__), usada solo como línea base"""
+
+    def __init__(self, product_id, quantity=1, order_id=None, id=None):
+        self.id = id
+        self.product_id = product_id
+        self.quantity = quantity
+        self.order_id = order_id
+        self.product_name = None
+        self.product_image_url = None
+        self.unit_price = None
+        self.product_sku = None
+
+    def to_dict(self):
+        return {
+            'id': getattr(self, 'id', None),
+            'product_id': self.product_id,
+            'product_name': self.product_name,
+            'product_image_url': self.product_image_url,
+            'product_sku': self.product_sku,
+            'quantity': self.quantity,
+            'unit_price': self.unit_price,
+            'order_id': self.order_id
+        }
+
+
+class LegacyOrder:
+    """Réplica del Order anterior (con __dict__), usada solo como línea base"""
+
+    def __init__(self, order_number, client_id=None, vendor_id=None, status="Recibido", total_amount=0.0,
+                 scheduled_delivery_date=None, assigned_truck=None, created_at=None, updated_at=None, id=None):
+        self.id = id
+        self.order_number = order_number
+        self.client_id = client_id
+        self.vendor_id = vendor_id
+        self.status = status
+        self.total_amount = total_amount
+        self.scheduled_delivery_date = scheduled_delivery_date
+        self.assigned_truck = assigned_truck
+        self.created_at = created_at
+        self.updated_at = updated_at
+        self.items = []
+
+    def to_dict(self):
+        return {
+            'id': getattr(self, 'id', None),
+            'order_number': self.order_number,
+            'client_id': self.client_id,
+            'vendor_id': self.vendor_id,
+            'status': self.status,
+            'total_amount': self.total_amount,
+            'scheduled_delivery_date': self.scheduled_delivery_date.isoformat() if self.scheduled_delivery_date else None,
+            'assigned_truck': self.assigned_truck,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
+            'items': [item.to_dict() for item in self.items] if self.items else []
+        }
+
+
+def build_orders(order_class, item_class):
+    base = datetime(2025, 1, 1, 8, 0)
+    orders = []
+    for index in range(ORDERS):
+        order = order_class(
+            id=index + 1,
+            order_number=f"PED-20250101-{index % 100000:05d}",
+            client_id='123e4567-e89b-12d3-a456-426614174000',
+            status='En Preparación',
+            total_amount=150.0,
+            scheduled_delivery_date=base + timedelta(days=index % DELIVERY_DAYS),
+            assigned_truck='CAM-001',
+            created_at=base + timedelta(seconds=index),
+            updated_at=base + timedelta(seconds=index)
+        )
+        for product_id in range(1, ITEMS_PER_ORDER + 1):
+            item = item_class(id=index * ITEMS_PER_ORDER + product_id, product_id=product_id, quantity=2, order_id=index + 1)
+            item.product_name = f"Producto {product_id}"
+            item.unit_price = 10.0
+            order.items.append(item)
+        orders.append(order)
+    return orders
+
+
+def measure_memory(label, order_class, item_class):
+    gc.collect()
+    tracemalloc.start()
+    orders = build_orders(order_class, item_class)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<45} {current / 1024 / 1024:10.1f} MB  ({current / ORDERS:6.0f} bytes/pedido)")
+    return orders
+
+
+def run():
+    print(f"{ORDERS} pedidos de {ITEMS_PER_ORDER} items, {DELIVERY_DAYS} fechas de entrega distintas\n")
+
+    print("Memoria de la lista de pedidos")
+    legacy_orders = measure_memory('Modelos con __dict__', LegacyOrder, LegacyOrderItem)
+    orders = measure_memory('Modelos con __slots__', Order, OrderItem)
+
+    print("\nSerialización")
+    with timed('to_dict por pedido (modelos anteriores)', ORDERS):
+        legacy_data = [order.to_dict() for order in legacy_orders]
+    with timed('to_dict por pedido (modelos actuales)', ORDERS):
+        [order.to_dict() for order in orders]
+    with timed('serialize_orders', ORDERS):
+        data = serialize_orders(orders)
+
+    assert data == legacy_data
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,88 @@
+"""
+Micro-benchmark de memoria pico y primer byte de GET /orders/by-truck
+
+Compara la respuesta en memoria con la respuesta en streaming (?stream=true)
+sobre la misma base de datos. El servicio de inventarios se reemplaza por una
+función local para medir solo la aplicación.
+
+Uso:
+    python -m benchmarks.bench_order_streaming
+    BENCHMARK_ORDERS=20000 python -m benchmarks.bench_order_streaming
+"""
+import os
+import time
+import tracemalloc
+from datetime import datetime
+from unittest.mock import patch
+import app.config.database as database
+from app.models.db_models import Base
+from app.models.order import Order
+from app.models.order_item import OrderItem
+from app.repositories.order_repository import OrderRepository
+from benchmarks.common import create_benchmark_engine
+
+ORDERS = int(os.getenv('BENCHMARK_ORDERS', '5000'))
+ITEMS_PER_ORDER = 3
+BATCH = 1000
+
+
+def populate(session_factory):
+    repository = OrderRepository(session_factory())
+    for start in range(0, ORDERS, BATCH):
+        count = min(BATCH, ORDERS - start)
+        orders = []
+        for sequence in repository.next_order_sequences(count):
+            order = Order(
+                order_number=f"PED-20990101-{sequence % 100000:05d}",
+                client_id='123e4567-e89b-12d3-a456-426614174000',
+                status='En Preparación',
+                total_amount=100.0,
+                scheduled_delivery_date=datetime(2099, 1, 1, 10, 0),
+                assigned_truck='CAM-001'
+            )
+            order.items = [OrderItem(product_id=product_id, quantity=1) for product_id in range(1, ITEMS_PER_ORDER + 1)]
+            orders.append(order)
+        repository.create_many(orders)
+    repository.session.close()
+
+
+def measure(client, url):
+    tracemalloc.start()
+    start = time.perf_counter()
+    response = client.get(url, buffered=False)
+    body = iter(response.response)
+    size = len(next(body))
+    first_byte = time.perf_counter() - start
+    for chunk in body:
+        size += len(chunk)
+    response.close()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return first_byte, elapsed, peak, size
+
+
+def run():
+    engine = create_benchmark_engine()
+    database.engine = engine
+    database.SessionLocal.configure(bind=engine)
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    populate(database.SessionLocal)
+    print(f"{ORDERS} pedidos de {ITEMS_PER_ORDER} items en el camión CAM-001 ({engine.dialect.name})\n")
+
+    from app import create_app
+    product = {'name': 'Producto', 'price': 10.0, 'sku': 'SKU', 'image_url': 'https://example.com/p.png'}
+    with patch('app.services.inventory_service.InventoryService.get_product_by_id', return_value=product):
+        client = create_app().test_client()
+        for label, url in (
+            ('Respuesta en memoria', '/orders/by-truck?assigned_truck=CAM-001'),
+            ('Respuesta en streaming', '/orders/by-truck?assigned_truck=CAM-001&stream=true'),
+        ):
+            first_byte, elapsed, peak, size = measure(client, url)
+            print(f"{label:<25} primer byte {first_byte * 1000:8.1f} ms  total {elapsed * 1000:8.1f} ms  "
+                  f"memoria pico {peak / 1024 / 1024:7.1f} MB  cuerpo {size / 1024 / 1024:5.1f} MB")
+
+
+if __name__ == '__main__':
+    run()
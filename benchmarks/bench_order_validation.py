@@ -0,0 +1,129 @@
+"""
+Micro-benchmark de validación del cuerpo de POST /orders/create
+
+Compara la validación anterior (chequeos manuales en el controlador, los mismos
+chequeos de nuevo en el servicio y Order.validate) con la carga única de
+CreateOrderSchema hacia CreateOrderCommand, que debe ser más rápida.
+
+Uso:
+    python -m benchmarks.bench_order_validation
+"""
+import time
+import uuid
+from datetime import datetime
+from app.models.order import Order
+from app.models.order_item import OrderItem
+from app.schemas.order_schemas import load_create_order_command
+from benchmarks.common import timed
+
+ITERATIONS = 20000
+ITEMS_PER_ORDER = 5
+
+PAYLOAD = {
+    'client_id': '123e4567-e89b-12d3-a456-426614174000',
+    'vendor_id': '456e7890-e89b-12d3-a456-426614174001',
+    'total_amount': 150.0,
+    'scheduled_delivery_date': '2099-12-25T10:00:00Z',
+    'items': [{'product_id': product_id, 'quantity': 2} for product_id in range(1, ITEMS_PER_ORDER + 1)]
+}
+
+
+def legacy_controller_checks(data: dict) -> None:
+    """Réplica de los chequeos que hacía el controlador"""
+    if not data.get('client_id') and not data.get('vendor_id'):
+        raise ValueError('client_id')
+    if 'items' not in data or not isinstance(data['items'], list) or len(data['items']) == 0:
+        raise ValueError('items')
+    if not data.get('total_amount') or not isinstance(data['total_amount'], (int, float)) or data['total_amount'] <= 0:
+        raise ValueError('total_amount')
+    scheduled_date = datetime.fromisoformat(data['scheduled_delivery_date'].replace('Z', '+00:00'))
+    if scheduled_date < datetime.now(scheduled_date.tzinfo):
+        raise ValueError('scheduled_delivery_date')
+    for item in data['items']:
+        if not item.get('product_id'):
+            raise ValueError('product_id')
+        if not item.get('quantity') or not isinstance(item['quantity'], (int, float)) or item['quantity'] <= 0:
+            raise ValueError('quantity')
+
+
+def legacy_service_validation(data: dict) -> Order:
+    """Réplica de la validación del servicio más Order.validate"""
+    if not data.get('client_id') and not data.get('vendor_id'):
+        raise ValueError('client_id')
+    if not data.get('items') or not isinstance(data['items'], list):
+        raise ValueError('items')
+    if not data.get('total_amount') or not isinstance(data['total_amount'], (int, float)) or data['total_amount'] <= 0:
+        raise ValueError('total_amount')
+    scheduled_date = datetime.fromisoformat(data['scheduled_delivery_date'].replace('Z', '+00:00'))
+    if scheduled_date.date() < datetime.now().date():
+        raise ValueError('scheduled_delivery_date')
+    order_items = []
+    for item in data['items']:
+        if not item.get('product_id') or not item.get('quantity') or item['quantity'] <= 0:
+            raise ValueError('item')
+        order_items.append({'product_id': item['product_id'], 'quantity': item['quantity']})
+
+    order = Order(
+        order_number='PED-20991225-00001',
+        client_id=data.get('client_id'),
+        vendor_id=data.get('vendor_id'),
+        status='En Preparación',
+        total_amount=data['total_amount'],
+        scheduled_delivery_date=scheduled_date
+    )
+    for item in order_items:
+        order.items.append(OrderItem(product_id=item['product_id'], quantity=item['quantity']))
+    order.validate()
+    return order
+
+
+def legacy_path(data: dict) -> Order:
+    legacy_controller_checks(data)
+    return legacy_service_validation(data)
+
+
+def schema_path(data: dict) -> Order:
+    command = load_create_order_command(data)
+    order = Order(
+        order_number='PED-20991225-00001',
+        client_id=command.client_id,
+        vendor_id=command.vendor_id,
+        status='En Preparación',
+        total_amount=command.total_amount,
+        scheduled_delivery_date=command.scheduled_delivery_date
+    )
+    for item in command.items:
+        order.items.append(OrderItem(product_id=item.product_id, quantity=item.quantity))
+    return order
+
+
+def run():
+    print(f"{ITERATIONS} cuerpos de pedido con {ITEMS_PER_ORDER} items\n")
+    # Calentamiento
+    for _ in range(100):
+        legacy_path(PAYLOAD)
+        schema_path(PAYLOAD)
+
+    start = time.perf_counter()
+    with timed('Validación anterior (controlador + servicio)', ITERATIONS):
+        for _ in range(ITERATIONS):
+            legacy_path(PAYLOAD)
+    legacy_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    with timed('CreateOrderSchema -> CreateOrderCommand', ITERATIONS):
+        for _ in range(ITERATIONS):
+            schema_path(PAYLOAD)
+    schema_seconds = time.perf_counter() - start
+
+    print(f"\nCreateOrderSchema / anterior: {schema_seconds / legacy_seconds:.2f}")
+    assert schema_seconds < legacy_seconds, "La validación en una pasada no debe ser más lenta que la anterior"
+
+    # Ambos caminos deben producir el mismo pedido
+    legacy_order, schema_order = legacy_path(PAYLOAD), schema_path(PAYLOAD)
+    assert uuid.UUID(legacy_order.client_id) == uuid.UUID(schema_order.client_id)
+    assert [item.product_id for item in legacy_order.items] == [item.product_id for item in schema_order.items]
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,60 @@
+"""
+Utilidades compartidas por los micro-benchmarks
+"""
+import os
+import time
+from contextlib import contextmanager
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+
+def create_benchmark_engine():
+    """
+    Crea el engine del benchmark
+
+    Usa BENCHMARK_DATABASE_URL si está definida (por ejemplo, un PostgreSQL local);
+    en caso contrario usa SQLite en memoria.
+    """
+    url = os.getenv('BENCHMARK_DATABASE_URL', 'sqlite://')
+    if url.startswith('sqlite'):
+        return create_engine(url, poolclass=StaticPool, connect_args={'check_same_thread': False})
+    return create_engine(url)
+
+
+class RoundTripCounter:
+    """Cuenta las sentencias y commits enviados a la base de datos"""
+
+    def __init__(self, engine):
+        self.statements = 0
+        self.commits = 0
+        event.listen(engine, 'before_cursor_execute', self._on_execute)
+        event.listen(engine, 'commit', self._on_commit)
+
+    def _on_execute(self, *args, **kwargs):
+        self.statements += 1
+
+    def _on_commit(self, *args, **kwargs):
+        self.commits += 1
+
+    @property
+    def round_trips(self) -> int:
+        return self.statements + self.commits
+
+    def reset(self) -> None:
+        self.statements = 0
+        self.commits = 0
+
+
+@contextmanager
+def timed(label: str, iterations: int):
+    """Imprime el tiempo total y por iteración del bloque"""
+    start = time.perf_counter()
+    yield
+    elapsed = time.perf_counter() - start
+    print(f"{label:<45} {elapsed * 1000:10.1f} ms total  {elapsed / iterations * 1e6:10.1f} us/iter")
+
+
+def session_factory(engine):
+    """Session factory con la misma configuración de la aplicación"""
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
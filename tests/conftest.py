@@ -70,3 +70,26 @@ def pytest_configure(config):
     sys.modules['sqlalchemy.orm'] = mock_sqlalchemy.orm
     sys.modules['sqlalchemy.exc'] = mock_sqlalchemy.exc
     sys.modules['sqlalchemy.engine'] = mock_sqlalchemy.engine
+    sys.modules['sqlalchemy.dialects'] = mock_sqlalchemy.dialects
+    sys.modules['sqlalchemy.dialects.postgresql'] = mock_sqlalchemy.dialects.postgresql
+    sys.modules['sqlalchemy.dialects.sqlite'] = mock_sqlalchemy.dialects.sqlite
+
+
+@pytest.fixture(autouse=True)
+def clear_query_cache():
+    """Vacía los caches de consultas y de reportes para que no se compartan resultados entre tests"""
+    from app.utils.query_cache import query_cache, report_cache
+    query_cache.reset()
+    report_cache.reset()
+    yield
+    query_cache.reset()
+    report_cache.reset()
+
+
+@pytest.fixture(autouse=True)
+def reset_heavy_hitters():
+    """Descarta los resúmenes del top aproximado registrados por otros tests"""
+    from app.repositories.heavy_hitters import heavy_hitters
+    heavy_hitters._reset_after_fork()
+    yield
+    heavy_hitters._reset_after_fork()
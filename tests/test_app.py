@@ -2,6 +2,7 @@
 Tests básicos para la aplicación principal - Enfoque simple
 """
 import pytest
+from unittest.mock import patch
 from app import create_app
 
 
@@ -25,6 +26,7 @@ class TestAppCreation:
         # Order routes
         assert '/orders' in rules
         assert '/orders/delete-all' in rules
+        assert '/orders/create-batch' in rules
     
     def test_create_app_config(self):
         """Test: Configuración de la aplicación"""
@@ -119,6 +121,24 @@ class TestAppEndpoints:
             # El endpoint existe pero puede devolver error sin autenticación
             response = client.delete('/orders/delete-all')
             assert response.status_code in [200, 400, 500]  # Cualquier respuesta válida
+    
+    def test_background_threads_start_with_first_request(self):
+        """Test: Los hilos de fondo se inician al atender, no al crear la aplicación"""
+        with patch('app.utils.order_events.order_event_hub') as mock_hub, \
+             patch('app.repositories.report_snapshots.snapshot_scheduler') as mock_scheduler, \
+             patch('app.repositories.heavy_hitters.heavy_hitters') as mock_heavy_hitters:
+            app = create_app()
+            
+            mock_hub.ensure_listener.assert_not_called()
+            mock_scheduler.ensure_running.assert_not_called()
+            mock_heavy_hitters.ensure_flusher.assert_not_called()
+            
+            with app.test_client() as client:
+                client.get('/orders/ping')
+            
+            mock_hub.ensure_listener.assert_called_once()
+            mock_scheduler.ensure_running.assert_called_once()
+            mock_heavy_hitters.ensure_flusher.assert_called_once()
 
 
 class TestAppModules:
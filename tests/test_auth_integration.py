@@ -79,3 +79,16 @@ class TestAuthIntegration:
         assert result == []
         mock_auth_service.get_assigned_clients.assert_called_once_with(seller_id)
 
+    
+    def test_get_assigned_clients_batch(self, auth_integration, mock_auth_service):
+        assignments = {'seller-1': ['client-1'], 'seller-2': [], 'seller-3': ['client-2', 'client-3']}
+        mock_auth_service.get_assigned_clients.side_effect = lambda seller_id: assignments[seller_id]
+        
+        result = auth_integration.get_assigned_clients_batch(['seller-1', 'seller-2', 'seller-3'])
+        
+        assert result == assignments
+        assert mock_auth_service.get_assigned_clients.call_count == 3
+    
+    def test_get_assigned_clients_batch_empty_list(self, auth_integration, mock_auth_service):
+        assert auth_integration.get_assigned_clients_batch([]) == {}
+        mock_auth_service.get_assigned_clients.assert_not_called()
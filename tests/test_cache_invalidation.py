@@ -0,0 +1,136 @@
+"""
+Tests para la invalidación de caches de pedidos
+"""
+import pytest
+from unittest.mock import MagicMock, patch
+from app.utils.cache_invalidation import (
+    CacheInvalidationBus, tags_for_event, client_tag, vendor_tag, truck_day_tag, report_month_tag, ORDERS_TAG
+)
+from app.utils.order_events import OrderEventHub, emit_order_events, _publish_pending_events
+
+CLIENT_ID = '123e4567-e89b-12d3-a456-426614174000'
+OTHER_CLIENT_ID = '223e4567-e89b-12d3-a456-426614174000'
+VENDOR_ID = '323e4567-e89b-12d3-a456-426614174000'
+
+
+class _RecordingCache:
+    """Cache mínimo con la interfaz del bus de invalidación"""
+    
+    def __init__(self):
+        self.invalidated = set()
+        self.clears = 0
+    
+    def invalidate_tags(self, tags):
+        self.invalidated.update(tags)
+        return 0
+    
+    def clear(self):
+        self.clears += 1
+
+
+def _event(**changes):
+    event = {
+        'type': 'updated',
+        'order_id': 1,
+        'status': 'Entregado',
+        'client_id': CLIENT_ID,
+        'vendor_id': VENDOR_ID,
+        'assigned_truck': 'CAM-001',
+        'scheduled_delivery_date': '2025-03-10T00:00:00',
+        'created_at': '2025-03-01T12:00:00',
+        'occurred_at': '2025-03-05T08:00:00'
+    }
+    event.update(changes)
+    return event
+
+
+class TestTagsForEvent:
+    """Tests para tags_for_event"""
+    
+    def test_tags_include_client_vendor_truck_day_and_report_month(self):
+        assert tags_for_event(_event()) == {
+            ORDERS_TAG,
+            client_tag(CLIENT_ID),
+            vendor_tag(VENDOR_ID),
+            truck_day_tag('CAM-001', '2025-03-10'),
+            report_month_tag(2025, 3)
+        }
+    
+    def test_previous_values_are_included(self):
+        event = _event(previous={
+            'client_id': OTHER_CLIENT_ID, 'assigned_truck': 'CAM-002', 'scheduled_delivery_date': '2025-03-09T00:00:00'
+        })
+        
+        tags = tags_for_event(event)
+        
+        assert client_tag(OTHER_CLIENT_ID) in tags
+        assert truck_day_tag('CAM-002', '2025-03-09') in tags
+    
+    def test_missing_created_at_uses_occurred_at(self):
+        tags = tags_for_event(_event(created_at=None, vendor_id=None, scheduled_delivery_date=None))
+        
+        assert report_month_tag(2025, 3) in tags
+        assert not any(tag.startswith(('vendor:', 'truck-day:')) for tag in tags)
+
+
+class TestCacheInvalidationBus:
+    """Tests para CacheInvalidationBus"""
+    
+    @pytest.fixture
+    def hub(self):
+        return OrderEventHub()
+    
+    def test_order_event_invalidates_event_tags(self, hub):
+        bus = CacheInvalidationBus(hub)
+        cache = bus.register(_RecordingCache())
+        
+        hub.publish(_event())
+        
+        assert cache.invalidated == tags_for_event(_event())
+        assert client_tag(OTHER_CLIENT_ID) not in cache.invalidated
+        assert cache.clears == 0
+    
+    @pytest.mark.parametrize('event_type', ['resync', 'deleted_all'])
+    def test_resync_and_delete_all_clear_every_cache(self, hub, event_type):
+        bus = CacheInvalidationBus(hub)
+        caches = [bus.register(_RecordingCache()), bus.register(_RecordingCache())]
+        
+        hub.publish({'type': event_type})
+        
+        assert [cache.clears for cache in caches] == [1, 1]
+        assert all(not cache.invalidated for cache in caches)
+    
+    def test_register_starts_listener(self, hub):
+        hub.listener_factory = MagicMock()
+        bus = CacheInvalidationBus(hub)
+        
+        bus.register(_RecordingCache())
+        
+        hub.listener_factory.assert_called_once_with(hub)
+    
+    def test_listener_waits_for_first_request_after_fork(self, hub):
+        CacheInvalidationBus(hub)
+        hub.listener_factory = MagicMock()
+        
+        hub._reset_after_fork()
+        
+        hub.listener_factory.assert_not_called()
+        assert hub._listener is None
+        
+        hub.ensure_listener()
+        
+        hub.listener_factory.assert_called_once_with(hub)
+    
+    def test_in_process_fallback_invalidates_after_commit(self, hub):
+        bus = CacheInvalidationBus(hub)
+        cache = bus.register(_RecordingCache())
+        session = MagicMock()
+        session.get_bind.return_value.dialect.name = 'sqlite'
+        session.info = {}
+        
+        emit_order_events(session, [_event(type='created')])
+        assert not cache.invalidated
+        
+        with patch('app.utils.order_events.order_event_hub', hub):
+            _publish_pending_events(session)
+        assert client_tag(CLIENT_ID) in cache.invalidated
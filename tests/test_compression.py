@@ -0,0 +1,109 @@
+"""
+Tests para la compresión de respuestas negociada con Accept-Encoding
+"""
+import gzip
+import json
+import pytest
+import brotli
+from flask import Flask, Response
+from flask_restful import Api, Resource
+from app.utils import compression
+from app.utils.compression import ResponseCompressor
+
+
+LARGE_PAYLOAD = {'data': [{'order_number': f'PED-20250101-{i:05d}', 'status': 'En Preparación'} for i in range(200)]}
+
+
+class TestResponseCompressor:
+    """Tests para ResponseCompressor"""
+    
+    @pytest.fixture
+    def app(self):
+        class LargeResource(Resource):
+            def get(self):
+                return LARGE_PAYLOAD, 200
+        
+        class SmallResource(Resource):
+            def get(self):
+                return {'success': True}, 200
+        
+        app = Flask(__name__)
+        api = Api(app)
+        api.add_resource(LargeResource, '/large')
+        api.add_resource(SmallResource, '/small')
+        
+        @app.route('/stream')
+        def stream():
+            def generate():
+                yield '{"data": ['
+                for i in range(500):
+                    yield ('' if i == 0 else ',') + json.dumps({'id': i})
+                yield ']}'
+            return Response(generate(), mimetype='application/json')
+        
+        @app.route('/image')
+        def image():
+            return Response(b'x' * 5000, mimetype='image/png')
+        
+        ResponseCompressor(min_size=1024).init_app(app)
+        return app
+    
+    def test_gzip_when_accepted(self, app):
+        response = app.test_client().get('/large', headers={'Accept-Encoding': 'gzip'})
+        
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert 'Accept-Encoding' in response.headers['Vary']
+        assert json.loads(gzip.decompress(response.data)) == LARGE_PAYLOAD
+        assert int(response.headers['Content-Length']) == len(response.data)
+    
+    def test_brotli_preferred_when_accepted(self, app):
+        response = app.test_client().get('/large', headers={'Accept-Encoding': 'gzip, deflate, br'})
+        
+        assert response.headers['Content-Encoding'] == 'br'
+        assert json.loads(brotli.decompress(response.data)) == LARGE_PAYLOAD
+    
+    def test_quality_values_are_respected(self, app):
+        response = app.test_client().get('/large', headers={'Accept-Encoding': 'br;q=0.5, gzip;q=1.0'})
+        
+        assert response.headers['Content-Encoding'] == 'gzip'
+    
+    def test_gzip_used_when_brotli_unavailable(self, app, monkeypatch):
+        monkeypatch.setattr(compression, 'brotli', None)
+        
+        response = app.test_client().get('/large', headers={'Accept-Encoding': 'br, gzip'})
+        
+        assert response.headers['Content-Encoding'] == 'gzip'
+    
+    def test_no_compression_without_accept_encoding(self, app):
+        response = app.test_client().get('/large', headers={'Accept-Encoding': 'identity'})
+        
+        assert 'Content-Encoding' not in response.headers
+        assert response.get_json() == LARGE_PAYLOAD
+    
+    def test_small_responses_are_not_compressed(self, app):
+        response = app.test_client().get('/small', headers={'Accept-Encoding': 'gzip'})
+        
+        assert 'Content-Encoding' not in response.headers
+        assert response.get_json() == {'success': True}
+    
+    def test_non_text_mimetypes_are_not_compressed(self, app):
+        response = app.test_client().get('/image', headers={'Accept-Encoding': 'gzip'})
+        
+        assert 'Content-Encoding' not in response.headers
+    
+    @pytest.mark.parametrize('encoding, decompress', [('gzip', gzip.decompress), ('br', brotli.decompress)])
+    def test_streamed_responses_are_compressed_incrementally(self, app, encoding, decompress):
+        response = app.test_client().get('/stream', headers={'Accept-Encoding': encoding})
+        
+        assert response.headers['Content-Encoding'] == encoding
+        assert 'Content-Length' not in response.headers
+        assert json.loads(decompress(response.data)) == {'data': [{'id': i} for i in range(500)]}
+    
+    def test_create_app_registers_compression(self):
+        from app import create_app
+        app = create_app()
+        
+        assert any(
+            getattr(function, '__self__', None).__class__ is ResponseCompressor
+            for function in app.after_request_funcs.get(None, [])
+        )
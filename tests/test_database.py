@@ -3,7 +3,9 @@ Tests para database.py
 """
 import pytest
 from unittest.mock import MagicMock, patch
-from app.config.database import get_db_session, create_tables, engine, SessionLocal
+from app.config.database import (
+    get_db_session, create_tables, create_missing_indexes, engine, SessionLocal, _dispose_engine_after_fork
+)
 
 
 class TestDatabase:
@@ -132,6 +134,118 @@ class TestDatabase:
             # Verificar que se llamó create_all
             mock_base.metadata.create_all.assert_called_once_with(bind=mock_engine)
     
+    def test_create_tables_backfills_new_rollups_on_existing_database(self):
+        """Test: Los rollups creados sobre una base con pedidos se pueblan"""
+        with patch('app.config.database.engine'), \
+             patch('app.models.db_models.Base'), \
+             patch('sqlalchemy.inspect') as mock_inspect, \
+             patch('app.repositories.order_rollups.backfill_new_rollups') as mock_backfill:
+            mock_inspect.return_value.get_table_names.return_value = ['orders', 'order_items']
+            
+            create_tables()
+            
+            mock_backfill.assert_called_once_with(SessionLocal, {'orders', 'order_items'})
+    
+    def test_create_tables_skips_backfill_on_new_database(self):
+        """Test: En una base nueva no hay pedidos que llevar a los rollups"""
+        with patch('app.config.database.engine'), \
+             patch('app.models.db_models.Base'), \
+             patch('sqlalchemy.inspect') as mock_inspect, \
+             patch('app.repositories.order_rollups.backfill_new_rollups') as mock_backfill:
+            mock_inspect.return_value.get_table_names.return_value = []
+            
+            create_tables()
+            
+            mock_backfill.assert_not_called()
+    
+    def test_create_tables_creates_missing_indexes_on_existing_tables(self):
+        """Test: create_all no toca tablas existentes; sus índices faltantes se crean aparte"""
+        with patch('app.config.database.engine'), \
+             patch('app.models.db_models.Base'), \
+             patch('sqlalchemy.inspect') as mock_inspect, \
+             patch('app.config.database.create_missing_indexes') as mock_create_indexes, \
+             patch('app.repositories.order_rollups.backfill_new_rollups'):
+            mock_inspect.return_value.get_table_names.return_value = ['orders', 'order_items']
+            
+            create_tables()
+            
+            mock_create_indexes.assert_called_once_with({'orders', 'order_items'})
+    
+    def test_create_missing_indexes_only_creates_absent_ones(self):
+        """Test: Solo se crean los índices que faltan y solo en tablas que ya existían"""
+        present_index, missing_index, new_table_index = MagicMock(), MagicMock(), MagicMock()
+        present_index.name, missing_index.name, new_table_index.name = 'ix_present', 'ix_missing', 'ix_new'
+        existing_table = MagicMock(indexes={present_index, missing_index})
+        existing_table.name = 'orders'
+        new_table = MagicMock(indexes={new_table_index})
+        new_table.name = 'new_table'
+        
+        with patch('app.config.database.engine') as mock_engine, \
+             patch('app.models.db_models.Base') as mock_base, \
+             patch('sqlalchemy.inspect') as mock_inspect:
+            mock_base.metadata.sorted_tables = [existing_table, new_table]
+            mock_inspect.return_value.get_indexes.return_value = [{'name': 'ix_present'}]
+            
+            created = create_missing_indexes({'orders'})
+        
+        assert created == ['ix_missing']
+        missing_index.create.assert_called_once_with(bind=mock_engine)
+        present_index.create.assert_not_called()
+        new_table_index.create.assert_not_called()
+    
+    def test_create_missing_indexes_continues_after_error(self):
+        """Test: Un índice que no se puede crear no impide crear los demás"""
+        failing_index, other_index = MagicMock(), MagicMock()
+        failing_index.name, other_index.name = 'ix_failing', 'ix_other'
+        failing_index.create.side_effect = Exception("permiso denegado")
+        table = MagicMock(indexes=[failing_index, other_index])
+        table.name = 'orders'
+        
+        with patch('app.config.database.engine'), \
+             patch('app.models.db_models.Base') as mock_base, \
+             patch('sqlalchemy.inspect') as mock_inspect:
+            mock_base.metadata.sorted_tables = [table]
+            mock_inspect.return_value.get_indexes.return_value = []
+            
+            assert create_missing_indexes({'orders'}) == ['ix_other']
+    
+    def test_create_tables_creates_changes_feed_index_on_predating_orders_table(self):
+        """Test: Una tabla orders creada antes del feed de cambios recibe el índice (updated_at, id)"""
+        database_indexes = {'orders': {'ix_orders_client_id_updated_at'}}
+        
+        def declared_index(name):
+            index = MagicMock()
+            index.name = name
+            index.create.side_effect = lambda bind: database_indexes['orders'].add(name)
+            return index
+        
+        orders_table = MagicMock(indexes=[
+            declared_index('ix_orders_client_id_updated_at'), declared_index('ix_orders_updated_at_id')
+        ])
+        orders_table.name = 'orders'
+        
+        with patch('app.config.database.engine'), \
+             patch('app.models.db_models.Base') as mock_base, \
+             patch('sqlalchemy.inspect') as mock_inspect, \
+             patch('app.repositories.order_rollups.backfill_new_rollups'):
+            mock_base.metadata.sorted_tables = [orders_table]
+            mock_inspect.return_value.get_table_names.return_value = ['orders']
+            mock_inspect.return_value.get_indexes.side_effect = lambda table: [
+                {'name': name} for name in database_indexes[table]
+            ]
+            
+            create_tables()
+        
+        assert 'ix_orders_updated_at_id' in database_indexes['orders']
+        orders_table.indexes[0].create.assert_not_called()
+    
+    def test_engine_disposed_after_fork_without_closing_parent_connections(self):
+        """Test: El proceso hijo descarta las conexiones heredadas sin cerrarlas"""
+        with patch('app.config.database.engine') as mock_engine:
+            _dispose_engine_after_fork()
+            
+            mock_engine.dispose.assert_called_once_with(close=False)
+    
     def test_create_tables_with_import_error(self):
         """Test: Crear tablas con error de importación"""
         # Mock para simular error de importación en la importación dinámica
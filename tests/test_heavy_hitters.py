@@ -0,0 +1,365 @@
+"""
+Tests para el top aproximado de productos y clientes (Space-Saving)
+"""
+import json
+import pytest
+from collections import Counter
+from datetime import date, datetime
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+from app.exceptions.custom_exceptions import OrderBusinessLogicError, OrderValidationError
+from app.repositories.heavy_hitters import (
+    HeavyHitterTracker, HeavyHitterFlusher, month_periods, COMPACTED_WORKER_ID
+)
+from app.repositories.order_repository import OrderRepository
+from app.services.order_service import OrderService
+from app.utils.space_saving import SpaceSaving
+
+
+def _order(client_id, items, created_at=datetime(2025, 3, 10)):
+    return SimpleNamespace(
+        client_id=client_id,
+        created_at=created_at,
+        items=[SimpleNamespace(product_id=product_id, quantity=quantity) for product_id, quantity in items]
+    )
+
+
+def _sketch_row(name, period, worker_id, total, counters):
+    return SimpleNamespace(
+        name=name,
+        period=period,
+        worker_id=worker_id,
+        total=total,
+        counters=json.dumps(counters),
+        updated_at=datetime(2025, 1, 1)
+    )
+
+
+class TestSpaceSaving:
+    """Tests para el resumen Space-Saving"""
+    
+    def test_counts_are_exact_below_capacity(self):
+        summary = SpaceSaving(8)
+        for key, weight in [('a', 3), ('b', 1), ('a', 2)]:
+            summary.offer(key, weight)
+        
+        assert summary.top(2) == [
+            {'key': 'a', 'count': 5, 'max_error': 0},
+            {'key': 'b', 'count': 1, 'max_error': 0}
+        ]
+        assert summary.error_bound() == 0
+    
+    def test_estimates_respect_error_bound(self):
+        stream = ['hot'] * 40 + ['warm'] * 20 + [f"cold-{i}" for i in range(60)]
+        stream = [stream[(i * 37) % len(stream)] for i in range(len(stream))]
+        summary = SpaceSaving(8)
+        for key in stream:
+            summary.offer(key)
+        
+        real = Counter(stream)
+        assert summary.error_bound() == len(stream) // 8
+        for key, (count, error) in summary.counters.items():
+            assert real[key] <= count <= real[key] + summary.error_bound()
+            assert count - error <= real[key]
+        assert [item['key'] for item in summary.top(2)] == ['hot', 'warm']
+    
+    def test_merge_keeps_heavy_hitters_and_bound(self):
+        first, second = SpaceSaving(3), SpaceSaving(3)
+        for key in ['a'] * 10 + ['b', 'c', 'd']:
+            first.offer(key)
+        for key in ['a'] * 5 + ['e'] * 6 + ['f', 'g']:
+            second.offer(key)
+        
+        merged = SpaceSaving.merge([first, second], 3)
+        
+        assert merged.total == 26
+        assert len(merged.counters) == 3
+        assert merged.top(2)[0] == {'key': 'a', 'count': 15, 'max_error': 0}
+        assert merged.top(2)[1]['key'] == 'e'
+        assert 6 <= merged.top(2)[1]['count'] <= 6 + merged.error_bound()
+    
+    def test_payload_round_trip(self):
+        summary = SpaceSaving(2)
+        for key in [1, 2, 3, 1]:
+            summary.offer(key)
+        
+        restored = SpaceSaving.from_payload(json.loads(json.dumps(summary.to_payload())), 2)
+        
+        assert restored.total == 4
+        assert restored.counters == summary.counters
+
+
+class TestHeavyHitterTracker:
+    """Tests para HeavyHitterTracker"""
+    
+    @pytest.fixture
+    def tracker(self):
+        return HeavyHitterTracker(capacity=4, flush_seconds=30)
+    
+    def test_month_periods(self):
+        assert month_periods(date(2024, 11, 20), date(2025, 2, 1)) == ['2024-11', '2024-12', '2025-01', '2025-02']
+    
+    def test_record_orders_weights_products_by_quantity(self, tracker):
+        tracker.record_orders([_order('client-1', [(1, 5), (2, 1)]), _order('client-1', [(1, 2)]), _order(None, [(3, 1)])])
+        
+        for period in ('2025-03', 'all'):
+            assert tracker._sketches[('products', period)].top(1) == [{'key': 1, 'count': 7, 'max_error': 0}]
+            assert tracker._sketches[('clients', period)].total == 2
+    
+    def test_disabled_tracker_ignores_orders(self):
+        tracker = HeavyHitterTracker(enabled=False)
+        
+        tracker.record_orders([_order('client-1', [(1, 1)])])
+        
+        assert tracker._sketches == {}
+    
+    def test_flush_writes_dirty_sketches_once(self, tracker):
+        session = MagicMock()
+        tracker.record_orders([_order('client-1', [(1, 1)], created_at=datetime.utcnow())])
+        
+        with patch.object(tracker, '_write_rows') as write_rows:
+            tracker.flush(session)
+            tracker.flush(session)
+        
+        rows = write_rows.call_args[0][1]
+        assert write_rows.call_count == 1
+        assert {(row['name'], row['period']) for row in rows} == {
+            ('products', datetime.utcnow().strftime('%Y-%m')), ('products', 'all'),
+            ('clients', datetime.utcnow().strftime('%Y-%m')), ('clients', 'all')
+        }
+        assert all(row['worker_id'] == tracker.worker_id for row in rows)
+        session.commit.assert_called_once()
+    
+    def test_flush_errors_keep_sketches_pending(self, tracker):
+        session = MagicMock()
+        tracker.record_orders([_order('client-1', [(1, 1)], created_at=datetime.utcnow())])
+        
+        with patch.object(tracker, '_write_rows', side_effect=Exception("Database error")):
+            tracker.flush(session)
+        
+        session.rollback.assert_called_once()
+        assert len(tracker._dirty) == 4
+    
+    def test_flush_if_due_waits_for_interval(self, tracker):
+        tracker.record_orders([_order('client-1', [(1, 1)])])
+        
+        with patch.object(tracker, 'flush') as flush:
+            tracker.flush_if_due(MagicMock())
+        
+        flush.assert_not_called()
+    
+    def test_flush_if_due_rewrites_all_sketches_before_they_look_stale(self, tracker):
+        tracker.record_orders([_order('client-1', [(1, 1)])])
+        tracker._dirty.clear()
+        tracker._last_flush -= 60
+        tracker._last_rewrite -= tracker.stale_seconds
+        
+        with patch.object(tracker, 'flush') as flush:
+            tracker.flush_if_due(MagicMock())
+        
+        flush.assert_called_once()
+        assert tracker._dirty == set(tracker._sketches)
+    
+    def test_compact_merges_stale_workers_into_one_row(self, tracker):
+        session = MagicMock()
+        session.get_bind.return_value.dialect.name = 'sqlite'
+        stale = [
+            _sketch_row('products', 'all', 'worker-a', 3, [[1, 2, 0], [2, 1, 0]]),
+            _sketch_row('products', 'all', 'worker-b', 2, [[1, 2, 0]])
+        ]
+        compacted = [_sketch_row('products', 'all', COMPACTED_WORKER_ID, 4, [[3, 4, 0]])]
+        session.query.return_value.filter.return_value.all.side_effect = [stale, compacted]
+        session.query.return_value.filter.return_value.delete.return_value = 1
+        
+        with patch('app.models.db_models.HeavyHitterSketchDB') as sketch_model, \
+             patch.object(tracker, '_write_rows') as write_rows:
+            sketch_model.updated_at.__lt__.return_value = True
+            compacted_rows = tracker.compact_stale_workers(session)
+        
+        assert compacted_rows == 2
+        rows = write_rows.call_args[0][1]
+        assert [(row['name'], row['period'], row['worker_id'], row['total']) for row in rows] == [
+            ('products', 'all', COMPACTED_WORKER_ID, 9)
+        ]
+        assert sorted(json.loads(rows[0]['counters'])) == [[1, 4, 0], [2, 1, 0], [3, 4, 0]]
+        session.commit.assert_called_once()
+    
+    def test_compact_skips_rows_rewritten_meanwhile(self, tracker):
+        session = MagicMock()
+        session.get_bind.return_value.dialect.name = 'sqlite'
+        session.query.return_value.filter.return_value.all.return_value = [
+            _sketch_row('clients', 'all', 'worker-a', 1, [['client-1', 1, 0]])
+        ]
+        session.query.return_value.filter.return_value.delete.return_value = 0
+        
+        with patch('app.models.db_models.HeavyHitterSketchDB') as sketch_model, \
+             patch.object(tracker, '_write_rows') as write_rows:
+            sketch_model.updated_at.__lt__.return_value = True
+            assert tracker.compact_stale_workers(session) == 0
+        
+        write_rows.assert_not_called()
+        session.rollback.assert_called_once()
+    
+    def test_compact_waits_for_advisory_lock_in_postgres(self, tracker):
+        session = MagicMock()
+        session.get_bind.return_value.dialect.name = 'postgresql'
+        session.execute.return_value.scalar.return_value = False
+        
+        with patch('app.models.db_models.HeavyHitterSketchDB') as sketch_model:
+            sketch_model.updated_at.__lt__.return_value = True
+            assert tracker.compact_stale_workers(session) == 0
+        
+        session.query.assert_not_called()
+        session.rollback.assert_called_once()
+    
+    def test_flusher_writes_and_compacts_in_own_session(self, tracker):
+        session = MagicMock()
+        flusher = HeavyHitterFlusher(tracker, MagicMock(return_value=session))
+        
+        with patch.object(tracker, 'flush_if_due') as flush_if_due, \
+             patch.object(tracker, 'compact_stale_workers') as compact:
+            flusher.flush_once()
+        
+        flush_if_due.assert_called_once_with(session)
+        compact.assert_called_once_with(session)
+        session.close.assert_called_once()
+    
+    def test_ensure_flusher_starts_a_single_thread(self, tracker):
+        tracker.session_factory = MagicMock()
+        
+        with patch('app.repositories.heavy_hitters.HeavyHitterFlusher') as flusher_class:
+            flusher_class.return_value.is_alive.return_value = True
+            tracker.ensure_flusher()
+            tracker.ensure_flusher()
+        
+        flusher_class.assert_called_once_with(tracker, tracker.session_factory)
+        flusher_class.return_value.start.assert_called_once()
+    
+    def test_ensure_flusher_without_session_factory_does_nothing(self, tracker):
+        tracker.ensure_flusher()
+        
+        assert tracker._flusher is None
+    
+    def test_flush_at_exit_writes_pending_sketches(self, tracker):
+        session = MagicMock()
+        tracker.session_factory = MagicMock(return_value=session)
+        tracker._flusher = MagicMock()
+        tracker.record_orders([_order('client-1', [(1, 1)])])
+        
+        with patch.object(tracker, 'flush') as flush:
+            tracker.flush_at_exit()
+        
+        tracker._flusher.stop.assert_called_once()
+        flush.assert_called_once_with(session)
+        session.close.assert_called_once()
+    
+    def test_fork_drops_the_parent_flusher(self, tracker):
+        tracker._flusher = MagicMock()
+        
+        tracker._reset_after_fork()
+        
+        assert tracker._flusher is None
+    
+    def test_top_merges_other_workers_with_local_sketches(self, tracker):
+        session = MagicMock()
+        session.query.return_value.filter.return_value.all.return_value = [
+            MagicMock(total=9, counters=json.dumps([[1, 6, 0], [5, 3, 0]]))
+        ]
+        tracker.record_orders([_order('client-1', [(1, 2), (2, 1)])])
+        
+        with patch('app.models.db_models.HeavyHitterSketchDB'):
+            result = tracker.top(session, 'products', limit=2)
+        
+        assert result['items'] == [
+            {'key': 1, 'count': 8, 'max_error': 0},
+            {'key': 5, 'count': 3, 'max_error': 0}
+        ]
+        assert result['total'] == 12
+        assert result['error_bound'] == 3
+        assert result['start_date'] is None
+    
+    def test_top_since_uses_whole_months(self, tracker):
+        session = MagicMock()
+        session.query.return_value.filter.return_value.all.return_value = []
+        
+        with patch('app.models.db_models.HeavyHitterSketchDB') as sketch_model:
+            result = tracker.top(session, 'clients', since=date(2025, 3, 17))
+        
+        assert sketch_model.period.in_.call_args[0][0][0] == '2025-03'
+        assert result['start_date'] == date(2025, 3, 1)
+        assert result['items'] == []
+    
+    def test_deleted_all_event_resets_sketches(self, tracker):
+        tracker.record_orders([_order('client-1', [(1, 1)])])
+        tracker._dirty.clear()
+        
+        tracker.handle_event({'type': 'deleted_all'})
+        
+        assert all(sketch.total == 0 for sketch in tracker._sketches.values())
+        assert tracker._dirty == set(tracker._sketches)
+
+
+class TestOrderServiceApproxReports:
+    """Tests para el modo aproximado de los reportes de top productos y clientes"""
+    
+    @pytest.fixture
+    def mock_order_repository(self):
+        return MagicMock(spec=OrderRepository)
+    
+    @pytest.fixture
+    def order_service(self, mock_order_repository):
+        with patch('app.services.order_service.InventoryService'), \
+                patch('app.services.order_service.InventoryIntegration') as mock_integration_class, \
+                patch('app.services.order_service.AuthService'), \
+                patch('app.services.order_service.AuthIntegration') as mock_auth_integration_class:
+            mock_integration_class.return_value.get_product_names.return_value = {1: 'Producto Uno'}
+            mock_auth_integration_class.return_value.get_client_names.return_value = {'client-1': 'Cliente Uno'}
+            yield OrderService(mock_order_repository)
+    
+    def test_top_products_approx(self, order_service, mock_order_repository):
+        mock_order_repository.get_heavy_hitters.return_value = {
+            'items': [{'key': 1, 'count': 40, 'max_error': 2}],
+            'total': 300, 'error_bound': 1, 'capacity': 256, 'start_date': date(2025, 1, 1)
+        }
+        
+        result = order_service.get_top_products_report(window='30d', mode='approx')
+        
+        assert mock_order_repository.get_heavy_hitters.call_args[0][0] == 'products'
+        mock_order_repository.get_top_products_sold.assert_not_called()
+        assert result['mode'] == 'approx'
+        assert result['period']['start_date'] == '2025-01-01'
+        assert result['approximation'] == {
+            'algorithm': 'space-saving', 'stream_total': 300, 'error_bound': 1, 'capacity': 256
+        }
+        assert result['top_products'] == [
+            {'product_id': 1, 'total_sold': 40, 'max_error': 2, 'product_name': 'Producto Uno'}
+        ]
+    
+    def test_top_clients_approx_skips_snapshot(self, order_service, mock_order_repository):
+        mock_order_repository.get_heavy_hitters.return_value = {
+            'items': [{'key': 'client-1', 'count': 7, 'max_error': 0}],
+            'total': 7, 'error_bound': 0, 'capacity': 256, 'start_date': date(2025, 1, 1)
+        }
+        
+        result = order_service.get_top_clients_report(mode='approx')
+        
+        mock_order_repository.get_top_clients_snapshot.assert_not_called()
+        assert mock_order_repository.get_heavy_hitters.call_args[1]['limit'] == 5
+        assert result['snapshot'] is None
+        assert result['period']['start_date'] == '2025-01-01'
+        assert result['top_clients'] == [
+            {'client_id': 'client-1', 'orders_count': 7, 'max_error': 0, 'client_name': 'Cliente Uno'}
+        ]
+    
+    def test_invalid_mode(self, order_service, mock_order_repository):
+        with pytest.raises(OrderValidationError) as exc_info:
+            order_service.get_top_products_report(mode='fast')
+        
+        assert "Modo no válido: fast" in str(exc_info.value)
+        mock_order_repository.get_heavy_hitters.assert_not_called()
+    
+    def test_repository_errors(self, order_service, mock_order_repository):
+        mock_order_repository.get_heavy_hitters.side_effect = Exception("Database error")
+        
+        with pytest.raises(OrderBusinessLogicError):
+            order_service.get_top_clients_report(mode='approx')
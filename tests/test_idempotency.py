@@ -0,0 +1,169 @@
+"""
+Tests para el almacén de respuestas idempotentes
+"""
+import threading
+import pytest
+from app.utils.idempotency import IdempotencyStore
+from app.exceptions.custom_exceptions import OrderIdempotencyConflictError
+
+
+class FakeClock:
+    """Reloj controlable para simular el paso del tiempo"""
+    
+    def __init__(self):
+        self.now = 0.0
+    
+    def __call__(self):
+        return self.now
+
+
+class TestIdempotencyStore:
+    """Tests para IdempotencyStore"""
+    
+    def test_first_call_executes_operation(self):
+        store = IdempotencyStore()
+        
+        (response, status_code), replayed = store.execute('key-1', 'fp', lambda: ({'id': 1}, 201))
+        
+        assert response == {'id': 1}
+        assert status_code == 201
+        assert replayed is False
+    
+    def test_replay_returns_stored_response_without_executing(self):
+        store = IdempotencyStore()
+        calls = []
+        
+        def operation():
+            calls.append(1)
+            return {'id': len(calls)}, 201
+        
+        store.execute('key-1', 'fp', operation)
+        (response, status_code), replayed = store.execute('key-1', 'fp', operation)
+        
+        assert len(calls) == 1
+        assert response == {'id': 1}
+        assert status_code == 201
+        assert replayed is True
+    
+    def test_same_key_with_different_body_raises_conflict(self):
+        store = IdempotencyStore()
+        store.execute('key-1', 'fp-a', lambda: ({'id': 1}, 201))
+        
+        with pytest.raises(OrderIdempotencyConflictError) as exc_info:
+            store.execute('key-1', 'fp-b', lambda: ({'id': 2}, 201))
+        
+        assert 'cuerpo de petición diferente' in str(exc_info.value)
+    
+    def test_server_errors_are_not_stored(self):
+        store = IdempotencyStore()
+        responses = [({'error': 'boom'}, 500), ({'id': 1}, 201)]
+        
+        (first, first_status), _ = store.execute('key-1', 'fp', lambda: responses.pop(0))
+        (second, second_status), replayed = store.execute('key-1', 'fp', lambda: responses.pop(0))
+        
+        assert first_status == 500
+        assert second_status == 201
+        assert replayed is False
+    
+    def test_client_errors_are_stored(self):
+        store = IdempotencyStore()
+        calls = []
+        
+        def operation():
+            calls.append(1)
+            return {'error': 'Stock insuficiente'}, 422
+        
+        store.execute('key-1', 'fp', operation)
+        (_, status_code), replayed = store.execute('key-1', 'fp', operation)
+        
+        assert len(calls) == 1
+        assert status_code == 422
+        assert replayed is True
+    
+    def test_exception_in_operation_releases_key(self):
+        store = IdempotencyStore()
+        
+        def failing():
+            raise RuntimeError("fallo")
+        
+        with pytest.raises(RuntimeError):
+            store.execute('key-1', 'fp', failing)
+        
+        (_, status_code), replayed = store.execute('key-1', 'fp', lambda: ({'id': 1}, 201))
+        assert status_code == 201
+        assert replayed is False
+    
+    def test_expired_entries_are_executed_again(self):
+        clock = FakeClock()
+        store = IdempotencyStore(ttl_seconds=10, clock=clock)
+        calls = []
+        
+        def operation():
+            calls.append(1)
+            return {'id': len(calls)}, 201
+        
+        store.execute('key-1', 'fp', operation)
+        clock.now = 11
+        (response, _), replayed = store.execute('key-1', 'fp', operation)
+        
+        assert len(calls) == 2
+        assert response == {'id': 2}
+        assert replayed is False
+    
+    def test_concurrent_duplicates_wait_for_in_flight_request(self):
+        store = IdempotencyStore()
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+        results = []
+        
+        def slow_operation():
+            calls.append(1)
+            started.set()
+            release.wait(5)
+            return {'id': 1}, 201
+        
+        def worker():
+            results.append(store.execute('key-1', 'fp', slow_operation))
+        
+        first = threading.Thread(target=worker)
+        first.start()
+        started.wait(5)
+        
+        waiters = [threading.Thread(target=worker) for _ in range(5)]
+        for thread in waiters:
+            thread.start()
+        release.set()
+        for thread in [first] + waiters:
+            thread.join(5)
+        
+        assert len(calls) == 1
+        assert len(results) == 6
+        assert sum(1 for _, replayed in results if replayed) == 5
+        assert all(response == ({'id': 1}, 201) for response, _ in results)
+    
+    def test_wait_timeout_raises_conflict(self):
+        store = IdempotencyStore(wait_timeout=0.05)
+        release = threading.Event()
+        started = threading.Event()
+        
+        def slow_operation():
+            started.set()
+            release.wait(5)
+            return {'id': 1}, 201
+        
+        thread = threading.Thread(target=store.execute, args=('key-1', 'fp', slow_operation))
+        thread.start()
+        started.wait(5)
+        
+        with pytest.raises(OrderIdempotencyConflictError) as exc_info:
+            store.execute('key-1', 'fp', slow_operation)
+        
+        release.set()
+        thread.join(5)
+        assert 'en curso' in str(exc_info.value)
+    
+    def test_fingerprint_is_stable(self):
+        assert IdempotencyStore.fingerprint(b'{"a": 1}') == IdempotencyStore.fingerprint(b'{"a": 1}')
+        assert IdempotencyStore.fingerprint(b'{"a": 1}') != IdempotencyStore.fingerprint(b'{"a": 2}')
+        assert IdempotencyStore.fingerprint(None) == IdempotencyStore.fingerprint(b'')
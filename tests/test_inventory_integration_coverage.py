@@ -141,3 +141,14 @@ class TestInventoryIntegrationCoverage:
         assert calls[0][1]["json"] == {"operation": "add", "quantity": 2, "reason": "compensation"}
         assert calls[1][0] == ("PUT", "/products/2/stock")
         assert calls[1][1]["json"] == {"operation": "add", "quantity": 1, "reason": "compensation"}
+    
+    def test_compensate_products_stock_continues_after_error(self, inventory_integration, mock_inventory_service):
+        """Test: Un error al compensar un producto no detiene la compensación de los demás"""
+        items = [{'product_id': 1, 'quantity': 2}, {'product_id': 2, 'quantity': 4}]
+        mock_inventory_service._make_request = MagicMock(side_effect=[Exception("Error de red"), None])
+        
+        inventory_integration.compensate_products_stock(items)
+        
+        calls = mock_inventory_service._make_request.call_args_list
+        assert [call[0] for call in calls] == [("PUT", "/products/1/stock"), ("PUT", "/products/2/stock")]
+        assert calls[1][1]["json"] == {"operation": "add", "quantity": 4, "reason": "compensation"}
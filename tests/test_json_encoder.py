@@ -0,0 +1,95 @@
+"""
+Tests para la representación JSON de las respuestas
+"""
+import json
+import uuid
+import pytest
+from datetime import datetime
+from decimal import Decimal
+from flask import Flask
+from flask_restful import Api, Resource
+from app.models.db_models import OrderStatus
+from app.utils import json_encoder
+from app.utils.json_encoder import get_dumps, make_output_json
+
+
+PAYLOAD = {
+    'success': True,
+    'data': {
+        'created_at': datetime(2025, 1, 2, 3, 4, 5, 678900),
+        'client_id': uuid.UUID('123e4567-e89b-12d3-a456-426614174000'),
+        'total_amount': Decimal('10.50'),
+        'status': OrderStatus.EN_PREPARACION,
+        'by_month': {1: 'enero'},
+        'name': 'Ñandú'
+    }
+}
+
+EXPECTED = {
+    'success': True,
+    'data': {
+        'created_at': '2025-01-02T03:04:05.678900',
+        'client_id': '123e4567-e89b-12d3-a456-426614174000',
+        'total_amount': 10.5,
+        'status': OrderStatus.EN_PREPARACION.value,
+        'by_month': {'1': 'enero'},
+        'name': 'Ñandú'
+    }
+}
+
+
+class TestJsonDumps:
+    """Tests para los backends de serialización"""
+    
+    @pytest.mark.parametrize('backend', ['orjson', 'json'])
+    def test_backends_serialize_native_types(self, backend):
+        body = get_dumps(backend)(PAYLOAD)
+        
+        assert isinstance(body, bytes)
+        assert body.endswith(b'\n')
+        assert json.loads(body) == EXPECTED
+    
+    def test_unknown_type_raises_type_error(self):
+        with pytest.raises(TypeError):
+            get_dumps('json')({'value': object()})
+    
+    def test_unknown_backend_falls_back_to_default(self):
+        assert get_dumps('desconocido') is get_dumps()
+    
+    def test_falls_back_to_stdlib_without_orjson(self, monkeypatch):
+        monkeypatch.delitem(json_encoder._BACKENDS, 'orjson')
+        
+        assert get_dumps('orjson') is json_encoder._stdlib_dumps
+
+
+class TestOutputJson:
+    """Tests para la representación registrada en Flask-RESTful"""
+    
+    @pytest.fixture
+    def client(self):
+        class PayloadResource(Resource):
+            def get(self):
+                return PAYLOAD, 201, {'X-Test': 'ok'}
+        
+        app = Flask(__name__)
+        api = Api(app)
+        api.representation('application/json')(make_output_json('orjson'))
+        api.add_resource(PayloadResource, '/payload')
+        return app.test_client()
+    
+    def test_output_json_response(self, client):
+        response = client.get('/payload')
+        
+        assert response.status_code == 201
+        assert response.headers['Content-Type'] == 'application/json'
+        assert response.headers['X-Test'] == 'ok'
+        assert response.get_json() == EXPECTED
+    
+    def test_create_app_registers_representation(self):
+        from app import create_app
+        app = create_app()
+        
+        response = app.test_client().get('/orders/ping')
+        
+        assert response.headers['Content-Type'] == 'application/json'
+        assert response.data.endswith(b'\n')
@@ -0,0 +1,169 @@
+"""
+Tests para el feed incremental de cambios de pedidos
+"""
+import pytest
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+from flask import Flask
+from app.controllers.order_changes_controller import OrderChangesController
+from app.models.order import Order
+from app.models.order_item import OrderItem
+from app.repositories.order_repository import OrderRepository
+from app.services.order_service import OrderService
+from app.exceptions.custom_exceptions import OrderValidationError, OrderBusinessLogicError
+
+CLIENT_ID = '123e4567-e89b-12d3-a456-426614174000'
+
+
+def _order(order_id, updated_at):
+    order = Order(
+        id=order_id,
+        order_number=f"PED-20250101-{order_id:05d}",
+        client_id=CLIENT_ID,
+        total_amount=10.0,
+        updated_at=updated_at
+    )
+    order.items = [OrderItem(product_id=1, quantity=1, order_id=order_id)]
+    return order
+
+
+class TestGetOrderChanges:
+    """Tests para OrderService.get_order_changes"""
+    
+    @pytest.fixture
+    def order_service(self):
+        repository = MagicMock(spec=OrderRepository)
+        with patch('app.services.order_service.InventoryService'), \
+                patch('app.services.order_service.InventoryIntegration'), \
+                patch('app.services.order_service.AuthService'), \
+                patch('app.services.order_service.AuthIntegration'):
+            service = OrderService(repository)
+        service.inventory_service.get_product_by_id.return_value = {'name': 'Producto', 'price': 2.0, 'sku': 'SKU', 'image_url': ''}
+        return service
+    
+    def test_first_page_without_cursor(self, order_service):
+        order_service.order_repository.get_orders_changed_since.return_value = [
+            _order(1, datetime(2025, 1, 1, 8, 0)),
+            _order(2, datetime(2025, 1, 1, 9, 0)),
+            _order(3, datetime(2025, 1, 1, 10, 0))
+        ]
+        
+        changes = order_service.get_order_changes(limit=2, client_id=CLIENT_ID)
+        
+        assert [order.id for order in changes['orders']] == [1, 2]
+        assert changes['has_more'] is True
+        assert changes['orders'][0].items[0].product_name == 'Producto'
+        assert order_service.inventory_service.get_product_by_id.call_count == 1
+        order_service.order_repository.get_orders_changed_since.assert_called_once_with(
+            updated_after=None, after_id=0, updated_until=None, limit=3,
+            client_id=CLIENT_ID, vendor_id=None, assigned_truck=None
+        )
+        assert OrderService._decode_changes_cursor(changes['next_cursor']) == (datetime(2025, 1, 1, 9, 0), 2)
+    
+    def test_next_page_uses_decoded_cursor(self, order_service):
+        cursor = OrderService._encode_changes_cursor(datetime(2025, 1, 1, 9, 0, 0, 123456), 2)
+        order_service.order_repository.get_orders_changed_since.return_value = []
+        
+        changes = order_service.get_order_changes(cursor=cursor, limit=10, assigned_truck='CAM-001')
+        
+        kwargs = order_service.order_repository.get_orders_changed_since.call_args.kwargs
+        assert (kwargs['updated_after'], kwargs['after_id']) == (datetime(2025, 1, 1, 9, 0, 0, 123456), 2)
+        assert changes == {'orders': [], 'next_cursor': cursor, 'has_more': False}
+    
+    def test_settle_window_sets_upper_bound(self, order_service):
+        order_service.order_repository.get_orders_changed_since.return_value = []
+        
+        before = datetime.utcnow()
+        order_service.get_order_changes(client_id=CLIENT_ID, settle_seconds=2)
+        
+        updated_until = order_service.order_repository.get_orders_changed_since.call_args.kwargs['updated_until']
+        assert (before - updated_until).total_seconds() == pytest.approx(2, abs=1)
+    
+    @pytest.mark.parametrize('cursor', ['zzz', 'bm8tc2VwYXJhZG9y', 'MjAyNS0wMS0wMXxhYmM'])
+    def test_invalid_cursor(self, order_service, cursor):
+        with pytest.raises(OrderValidationError, match="El cursor no es válido"):
+            order_service.get_order_changes(cursor=cursor, client_id=CLIENT_ID)
+        
+        order_service.order_repository.get_orders_changed_since.assert_not_called()
+    
+    def test_repository_errors_are_wrapped(self, order_service):
+        order_service.order_repository.get_orders_changed_since.side_effect = Exception("Error de conexión")
+        
+        with pytest.raises(OrderBusinessLogicError, match="Error al obtener cambios de pedidos"):
+            order_service.get_order_changes(client_id=CLIENT_ID)
+
+
+class TestGetOrdersChangedSince:
+    """Tests para OrderRepository.get_orders_changed_since"""
+    
+    def test_loads_items_for_returned_orders(self):
+        session = MagicMock()
+        row = SimpleNamespace(
+            id=7, order_number='PED-20250101-00007', client_id=CLIENT_ID, vendor_id=None, status='Recibido',
+            total_amount=10.0, scheduled_delivery_date=None, assigned_truck=None,
+            created_at=datetime(2025, 1, 1), updated_at=datetime(2025, 1, 2)
+        )
+        session.execute.side_effect = [[row], [SimpleNamespace(id=1, order_id=7, product_id=3, quantity=2)]]
+        
+        with patch('app.repositories.order_repository.OrderDB', new=SimpleNamespace(__table__=MagicMock())), \
+                patch('app.repositories.order_repository.OrderItemDB', new=SimpleNamespace(__table__=MagicMock())), \
+                patch('sqlalchemy.tuple_') as tuple_:
+            tuple_.return_value.__gt__.return_value = MagicMock()
+            orders = OrderRepository(session).get_orders_changed_since(
+                updated_after=datetime(2025, 1, 1), after_id=3, limit=5, client_id=CLIENT_ID
+            )
+        
+        assert [order.id for order in orders] == [7]
+        assert orders[0].items[0].product_id == 3
+        assert session.execute.call_count == 2
+
+
+class TestOrderChangesController:
+    """Tests para OrderChangesController"""
+    
+    @pytest.fixture
+    def app(self):
+        return Flask(__name__)
+    
+    @pytest.fixture
+    def controller(self):
+        controller = OrderChangesController()
+        controller.order_service = MagicMock()
+        controller.order_service.get_order_changes.return_value = {
+            'orders': [_order(1, datetime(2025, 1, 2))], 'next_cursor': 'abc', 'has_more': False
+        }
+        return controller
+    
+    def test_returns_changes_page(self, app, controller):
+        with app.test_request_context(f'/orders/changes?client_id={CLIENT_ID}&cursor=xyz&limit=50'):
+            body, status = controller.get()
+        
+        assert status == 200
+        assert body['data']['next_cursor'] == 'abc'
+        assert body['data']['orders'][0]['updated_at'] == '2025-01-02T00:00:00'
+        controller.order_service.get_order_changes.assert_called_once_with(
+            cursor='xyz', limit=50, client_id=CLIENT_ID, vendor_id=None, assigned_truck=None, settle_seconds=2.0
+        )
+    
+    @pytest.mark.parametrize('query,detail', [
+        ('', 'Debe proporcionar solo uno de client_id, vendor_id o assigned_truck'),
+        (f'client_id={CLIENT_ID}&assigned_truck=CAM-001', 'Debe proporcionar solo uno de client_id, vendor_id o assigned_truck'),
+        ('vendor_id=abc', 'El vendor_id debe ser un UUID válido'),
+        ('assigned_truck=CAM-001&limit=0', "El parámetro 'limit' debe estar entre 1 y 500")
+    ])
+    def test_validation_errors(self, app, controller, query, detail):
+        with app.test_request_context(f'/orders/changes?{query}'):
+            body, status = controller.get()
+        
+        assert status == 400
+        assert body['details'] == detail
+        controller.order_service.get_order_changes.assert_not_called()
+    
+    def test_invalid_cursor_returns_400(self, app, controller):
+        controller.order_service.get_order_changes.side_effect = OrderValidationError("El cursor no es válido")
+        
+        with app.test_request_context('/orders/changes?assigned_truck=CAM-001&cursor=zzz'):
+            body, status = controller.get()
+        
+        assert status == 400
@@ -5,6 +5,7 @@ import pytest
 from unittest.mock import MagicMock, patch
 from app import create_app
 from app.controllers.order_controller import OrderController
+from app.models.order import Order
 from app.exceptions.custom_exceptions import OrderValidationError, OrderBusinessLogicError
 
 
@@ -113,8 +114,7 @@ class TestOrderControllerFinal:
                     mock_repo_class.return_value = mock_repo
                     
                     mock_service = MagicMock()
-                    mock_order = MagicMock()
-                    mock_order.to_dict.return_value = {"id": 1, "order_number": "PED-001"}
+                    mock_order = Order(order_number="PED-20250101-00001", id=1)
                     mock_service.get_orders_by_client.return_value = [mock_order]
                     mock_service._enrich_order_items_with_product_info.return_value = mock_order
                     mock_service_class.return_value = mock_service
@@ -148,8 +148,7 @@ class TestOrderControllerFinal:
                     mock_repo_class.return_value = mock_repo
                     
                     mock_service = MagicMock()
-                    mock_order = MagicMock()
-                    mock_order.to_dict.return_value = {"id": 2, "order_number": "PED-002"}
+                    mock_order = Order(order_number="PED-20250101-00002", id=2)
                     mock_service.get_orders_by_vendor.return_value = [mock_order]
                     mock_service._enrich_order_items_with_product_info.return_value = mock_order
                     mock_service_class.return_value = mock_service
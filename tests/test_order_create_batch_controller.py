@@ -0,0 +1,96 @@
+"""
+Tests para el controlador de creación masiva de pedidos
+"""
+from unittest.mock import Mock, patch
+from flask import Flask
+from app.controllers.order_create_controller import OrderCreateBatchController
+from app.exceptions.custom_exceptions import OrderBusinessLogicError
+
+
+class TestOrderCreateBatchController:
+    """Tests para OrderCreateBatchController"""
+    
+    def setup_method(self):
+        """Configuración inicial para cada test"""
+        self.app = Flask(__name__)
+        self.app.config['TESTING'] = True
+        self.mock_order_service = Mock()
+        self.controller = OrderCreateBatchController()
+        self.controller.order_service = self.mock_order_service
+        self.order_data = {
+            'client_id': '123e4567-e89b-12d3-a456-426614174000',
+            'total_amount': 150.0,
+            'scheduled_delivery_date': '2099-12-25T10:00:00Z',
+            'items': [{'product_id': 1, 'quantity': 2}]
+        }
+    
+    def test_post_success_with_partial_failures(self):
+        mock_order = Mock()
+        mock_order.to_dict.return_value = {'id': 1, 'order_number': 'PED-20991225-00001'}
+        self.mock_order_service.create_orders_batch.return_value = [
+            {'index': 0, 'success': True, 'order': mock_order},
+            {'index': 1, 'success': False, 'error': 'El pedido debe tener al menos un item'}
+        ]
+        
+        with self.app.test_request_context(json={'orders': [self.order_data, {}]}):
+            response, status_code = self.controller.post()
+        
+        assert status_code == 201
+        assert response['success'] is True
+        assert response['data']['summary'] == {'total': 2, 'created': 1, 'failed': 1}
+        assert response['data']['results'][0]['data']['order_number'] == 'PED-20991225-00001'
+        assert response['data']['results'][1]['error'] == 'El pedido debe tener al menos un item'
+    
+    def test_post_all_invalid_returns_422_with_results(self):
+        self.mock_order_service.create_orders_batch.return_value = [
+            {'index': 0, 'success': False, 'error': 'El total_amount es obligatorio'}
+        ]
+        
+        with self.app.test_request_context(json={'orders': [{}]}):
+            response, status_code = self.controller.post()
+        
+        assert status_code == 422
+        assert response['success'] is False
+        assert response['data']['summary']['created'] == 0
+    
+    def test_post_missing_orders(self):
+        for body in [{}, {'orders': []}, {'orders': 'x'}]:
+            with self.app.test_request_context(json=body):
+                response, status_code = self.controller.post()
+            
+            assert status_code == 422
+            assert 'orders' in response['details'] or 'JSON' in response['details']
+        
+        self.mock_order_service.create_orders_batch.assert_not_called()
+    
+    def test_post_batch_too_large(self):
+        with patch.dict('os.environ', {'ORDER_BATCH_MAX_SIZE': '2'}):
+            import importlib
+            import app.config.settings
+            importlib.reload(app.config.settings)
+            with patch('app.controllers.order_create_controller.get_config', app.config.settings.get_config):
+                with self.app.test_request_context(json={'orders': [self.order_data] * 3}):
+                    response, status_code = self.controller.post()
+        importlib.reload(app.config.settings)
+        
+        assert status_code == 422
+        assert 'más de 2 pedidos' in response['details']
+        self.mock_order_service.create_orders_batch.assert_not_called()
+    
+    def test_post_business_logic_error(self):
+        self.mock_order_service.create_orders_batch.side_effect = OrderBusinessLogicError("Stock insuficiente")
+        
+        with self.app.test_request_context(json={'orders': [self.order_data]}):
+            response, status_code = self.controller.post()
+        
+        assert status_code == 422
+        assert 'Stock insuficiente' in response['details']
+    
+    def test_post_generic_error(self):
+        self.mock_order_service.create_orders_batch.side_effect = Exception("Error inesperado")
+        
+        with self.app.test_request_context(json={'orders': [self.order_data]}):
+            response, status_code = self.controller.post()
+        
+        assert status_code == 500
+        assert 'Error interno del servidor' in response['error']
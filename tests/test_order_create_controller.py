@@ -6,6 +6,7 @@ from unittest.mock import Mock, patch
 from flask import Flask
 from app.controllers.order_create_controller import OrderCreateController
 from app.exceptions.custom_exceptions import OrderValidationError, OrderBusinessLogicError
+from app.schemas.order_schemas import load_create_order_command
 
 
 class TestOrderCreateController:
@@ -54,7 +55,7 @@ class TestOrderCreateController:
         assert response['success'] is True
         assert response['message'] == 'Pedido creado exitosamente'
         assert 'data' in response
-        self.mock_order_service.create_order.assert_called_once_with(order_data)
+        self.mock_order_service.create_order.assert_called_once_with(load_create_order_command(order_data))
     
     def test_post_missing_json(self):
         """Test de error cuando no se proporciona JSON"""
@@ -111,7 +112,7 @@ class TestOrderCreateController:
         assert response['success'] is True
         assert response['data']['client_id'] == '123e4567-e89b-12d3-a456-426614174000'
         assert response['data']['vendor_id'] is None
-        self.mock_order_service.create_order.assert_called_once_with(order_data)
+        self.mock_order_service.create_order.assert_called_once_with(load_create_order_command(order_data))
     
     def test_post_only_vendor_id(self):
         """Test de creación exitosa con solo vendor_id"""
@@ -142,7 +143,7 @@ class TestOrderCreateController:
         assert response['success'] is True
         assert response['data']['client_id'] is None
         assert response['data']['vendor_id'] == '456e7890-e89b-12d3-a456-426614174001'
-        self.mock_order_service.create_order.assert_called_once_with(order_data)
+        self.mock_order_service.create_order.assert_called_once_with(load_create_order_command(order_data))
     
     def test_post_missing_items(self):
         """Test de error cuando faltan items"""
@@ -358,3 +359,84 @@ class TestOrderCreateController:
         assert status_code == 500
         assert response['success'] is False
         assert 'Error interno del servidor' in response['error']
+
+
+class TestOrderCreateControllerIdempotency:
+    """Tests para el soporte de Idempotency-Key en OrderCreateController"""
+    
+    def setup_method(self):
+        """Configuración inicial para cada test"""
+        from app.utils.idempotency import idempotency_store
+        idempotency_store.clear()
+        self.app = Flask(__name__)
+        self.app.config['TESTING'] = True
+        self.mock_order_service = Mock()
+        self.controller = OrderCreateController()
+        self.controller.order_service = self.mock_order_service
+        self.order_data = {
+            'client_id': '123e4567-e89b-12d3-a456-426614174000',
+            'total_amount': 150.0,
+            'scheduled_delivery_date': '2099-12-25T10:00:00Z',
+            'items': [{'product_id': 1, 'quantity': 2}]
+        }
+        mock_order = Mock()
+        mock_order.to_dict.return_value = {'id': 1, 'order_number': 'PED-20991225-00001'}
+        self.mock_order_service.create_order.return_value = mock_order
+    
+    def test_post_with_key_replays_stored_response(self):
+        """Test: La segunda petición con la misma llave no vuelve a crear el pedido"""
+        headers = {'Idempotency-Key': 'abc-123'}
+        
+        with self.app.test_request_context(json=self.order_data, headers=headers):
+            first_response, first_status, first_headers = self.controller.post()
+        with self.app.test_request_context(json=self.order_data, headers=headers):
+            second_response, second_status, second_headers = self.controller.post()
+        
+        assert first_status == 201
+        assert second_status == 201
+        assert first_headers['Idempotent-Replayed'] == 'false'
+        assert second_headers['Idempotent-Replayed'] == 'true'
+        assert second_response == first_response
+        self.mock_order_service.create_order.assert_called_once()
+    
+    def test_post_with_key_and_different_body_returns_conflict(self):
+        """Test: Reutilizar la llave con otro cuerpo retorna 409"""
+        headers = {'Idempotency-Key': 'abc-123'}
+        
+        with self.app.test_request_context(json=self.order_data, headers=headers):
+            self.controller.post()
+        
+        other_data = dict(self.order_data, total_amount=200.0)
+        with self.app.test_request_context(json=other_data, headers=headers):
+            response, status_code = self.controller.post()
+        
+        assert status_code == 409
+        assert response['success'] is False
+        self.mock_order_service.create_order.assert_called_once()
+    
+    def test_post_with_invalid_key_returns_validation_error(self):
+        """Test: Una llave vacía o demasiado larga es rechazada"""
+        for key in ['   ', 'x' * 256]:
+            with self.app.test_request_context(json=self.order_data, headers={'Idempotency-Key': key}):
+                response, status_code = self.controller.post()
+            
+            assert status_code == 422
+            assert 'Idempotency-Key' in response['details']
+        
+        self.mock_order_service.create_order.assert_not_called()
+    
+    def test_post_with_key_does_not_store_server_errors(self):
+        """Test: Los errores 500 no se guardan y el reintento vuelve a ejecutarse"""
+        headers = {'Idempotency-Key': 'abc-123'}
+        mock_order = self.mock_order_service.create_order.return_value
+        self.mock_order_service.create_order.side_effect = [Exception("Error inesperado"), mock_order]
+        
+        with self.app.test_request_context(json=self.order_data, headers=headers):
+            _, first_status, _ = self.controller.post()
+        with self.app.test_request_context(json=self.order_data, headers=headers):
+            _, second_status, second_headers = self.controller.post()
+        
+        assert first_status == 500
+        assert second_status == 201
+        assert second_headers['Idempotent-Replayed'] == 'false'
+        assert self.mock_order_service.create_order.call_count == 2
@@ -0,0 +1,237 @@
+"""
+Tests para los eventos de cambios de estado de pedidos (hub y stream SSE)
+"""
+import json
+import pytest
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+from flask import Flask
+from app.controllers.order_events_controller import OrderEventsController
+from app.models.order import Order
+from app.repositories.order_repository import OrderRepository
+from app.exceptions.custom_exceptions import OrderEventsUnavailableError
+from app.utils.order_events import (
+    OrderEventHub, build_order_event, emit_order_events, _publish_pending_events, _discard_pending_events
+)
+
+CLIENT_ID = '123e4567-e89b-12d3-a456-426614174000'
+OTHER_CLIENT_ID = '223e4567-e89b-12d3-a456-426614174000'
+
+
+def _event(event_type='updated', client_id=CLIENT_ID, status='Entregado', previous_status='Recibido', **previous):
+    event = {
+        'type': event_type,
+        'order_id': 1,
+        'status': status,
+        'client_id': client_id,
+        'vendor_id': None,
+        'assigned_truck': 'CAM-001'
+    }
+    if event_type == 'updated':
+        event['previous'] = {'status': previous_status, 'client_id': client_id, 'vendor_id': None, 'assigned_truck': 'CAM-001'}
+        event['previous'].update(previous)
+    return event
+
+
+class TestOrderEventHub:
+    """Tests para OrderEventHub"""
+    
+    def test_publish_delivers_only_matching_subscriptions(self):
+        hub = OrderEventHub()
+        mine = hub.subscribe(client_id=CLIENT_ID)
+        other = hub.subscribe(client_id=OTHER_CLIENT_ID)
+        
+        hub.publish(_event())
+        
+        assert mine.get(timeout=0)['status'] == 'Entregado'
+        assert other.get(timeout=0) is None
+    
+    def test_previous_values_match_reassigned_orders(self):
+        hub = OrderEventHub()
+        old_truck = hub.subscribe(assigned_truck='CAM-002')
+        
+        hub.publish(_event(assigned_truck='CAM-002'))
+        
+        assert old_truck.get(timeout=0)['assigned_truck'] == 'CAM-001'
+    
+    def test_resync_reaches_every_subscription(self):
+        hub = OrderEventHub()
+        subscription = hub.subscribe(vendor_id=CLIENT_ID)
+        
+        hub.publish({'type': 'resync'})
+        
+        assert subscription.get(timeout=0) == {'type': 'resync'}
+    
+    def test_subscribe_fails_when_full(self):
+        hub = OrderEventHub(max_subscribers=1)
+        subscription = hub.subscribe(client_id=CLIENT_ID)
+        
+        with pytest.raises(OrderEventsUnavailableError):
+            hub.subscribe(client_id=CLIENT_ID)
+        
+        hub.unsubscribe(subscription)
+        hub.subscribe(client_id=CLIENT_ID)
+        assert hub.subscriber_count == 1
+    
+    def test_full_queue_drops_events(self):
+        hub = OrderEventHub(queue_size=1)
+        subscription = hub.subscribe(client_id=CLIENT_ID)
+        
+        hub.publish(_event())
+        hub.publish(_event())
+        
+        assert subscription.dropped == 1
+    
+    def test_callbacks_receive_all_events_and_errors_are_isolated(self):
+        hub = OrderEventHub()
+        received = []
+        hub.add_callback(MagicMock(side_effect=Exception("Error en callback")))
+        hub.add_callback(received.append)
+        
+        hub.publish(_event(client_id=OTHER_CLIENT_ID))
+        
+        assert len(received) == 1
+    
+    def test_listener_is_started_once(self):
+        hub = OrderEventHub()
+        listener = MagicMock()
+        listener.is_alive.return_value = True
+        hub.listener_factory = MagicMock(return_value=listener)
+        
+        hub.subscribe(client_id=CLIENT_ID)
+        hub.subscribe(client_id=CLIENT_ID)
+        
+        hub.listener_factory.assert_called_once_with(hub)
+        listener.start.assert_called_once()
+
+
+class TestEmitOrderEvents:
+    """Tests para emit_order_events"""
+    
+    def test_non_postgresql_publishes_after_commit(self):
+        session = MagicMock()
+        session.get_bind.return_value.dialect.name = 'sqlite'
+        session.info = {}
+        
+        emit_order_events(session, [_event()])
+        
+        session.execute.assert_not_called()
+        with patch('app.utils.order_events.order_event_hub') as hub:
+            _publish_pending_events(session)
+        hub.publish.assert_called_once()
+        assert session.info == {}
+    
+    def test_rollback_discards_pending_events(self):
+        session = MagicMock()
+        session.get_bind.return_value.dialect.name = 'sqlite'
+        session.info = {}
+        
+        emit_order_events(session, [_event()])
+        _discard_pending_events(session, MagicMock())
+        
+        with patch('app.utils.order_events.order_event_hub') as hub:
+            _publish_pending_events(session)
+        hub.publish.assert_not_called()
+    
+    def test_postgresql_notifies_in_one_statement(self):
+        session = MagicMock()
+        session.get_bind.return_value.dialect.name = 'postgresql'
+        
+        emit_order_events(session, [_event(), _event(status='Cancelado')])
+        
+        session.execute.assert_called_once()
+        params = session.execute.call_args[0][1]
+        assert params['channel'] == 'order_events'
+        assert [json.loads(payload)['status'] for payload in params['payloads']] == ['Entregado', 'Cancelado']
+    
+    def test_build_order_event_serializes_dates(self):
+        order = Order(id=1, order_number='PED-1', client_id=CLIENT_ID, scheduled_delivery_date=datetime(2025, 1, 2))
+        
+        event = build_order_event('updated', order, {'status': 'Recibido', 'scheduled_delivery_date': datetime(2025, 1, 1)})
+        
+        assert event['scheduled_delivery_date'] == '2025-01-02T00:00:00'
+        assert event['previous'] == {'status': 'Recibido', 'scheduled_delivery_date': '2025-01-01T00:00:00'}
+        json.dumps(event)
+
+
+class TestRepositoryEmitsEvents:
+    """Tests para los eventos emitidos por OrderRepository"""
+    
+    def test_update_emits_previous_status(self):
+        session = MagicMock()
+        db_order = SimpleNamespace(
+            id=1, order_number='PED-1', client_id=CLIENT_ID, vendor_id=None, status='Recibido',
+            total_amount=10.0, scheduled_delivery_date=None, assigned_truck=None,
+            created_at=None, updated_at=None
+        )
+        session.query.return_value.filter.return_value.first.return_value = db_order
+        order = Order(id=1, order_number='PED-1', client_id=CLIENT_ID, status='Entregado', total_amount=10.0)
+        
+        with patch('app.repositories.order_repository.OrderDB'), \
+                patch('app.repositories.order_repository.emit_order_events') as emit:
+            OrderRepository(session).update(order)
+        
+        event = emit.call_args[0][1][0]
+        assert event['type'] == 'updated'
+        assert event['status'] == 'Entregado'
+        assert event['previous']['status'] == 'Recibido'
+        session.commit.assert_called_once()
+
+
+class TestOrderEventsController:
+    """Tests para OrderEventsController"""
+    
+    @pytest.fixture
+    def app(self):
+        return Flask(__name__)
+    
+    @pytest.mark.parametrize('query', ['', f'client_id={CLIENT_ID}&assigned_truck=CAM-001', 'vendor_id=no-uuid'])
+    def test_invalid_filters_return_400(self, app, query):
+        with app.test_request_context(f'/orders/events?{query}'):
+            body, status = OrderEventsController().get()
+        
+        assert status == 400
+    
+    def test_full_hub_returns_503(self, app):
+        with app.test_request_context(f'/orders/events?client_id={CLIENT_ID}'), \
+                patch('app.controllers.order_events_controller.order_event_hub') as hub:
+            hub.subscribe.side_effect = OrderEventsUnavailableError("Se alcanzó el máximo de suscripciones a eventos de pedidos")
+            body, status = OrderEventsController().get()
+        
+        assert status == 503
+    
+    def test_returns_event_stream(self, app):
+        with app.test_request_context(f'/orders/events?client_id={CLIENT_ID}'), \
+                patch('app.controllers.order_events_controller.order_event_hub') as hub:
+            response = OrderEventsController().get()
+        
+        assert response.mimetype == 'text/event-stream'
+        assert response.headers['Cache-Control'] == 'no-cache'
+        hub.subscribe.assert_called_once_with(client_id=CLIENT_ID, vendor_id=None, assigned_truck=None)
+    
+    def test_stream_formats_events_and_heartbeats(self):
+        subscription = MagicMock(dropped=0)
+        subscription.get.side_effect = [None, _event(status='Recibido'), _event()]
+        
+        with patch('app.controllers.order_events_controller.order_event_hub') as hub:
+            stream = OrderEventsController._stream(subscription, 15)
+            chunks = [next(stream), next(stream), next(stream)]
+            stream.close()
+        
+        assert chunks[0] == "retry: 5000\n\n"
+        assert chunks[1] == ": keep-alive\n\n"
+        assert chunks[2].startswith("event: order_status\ndata: ")
+        assert json.loads(chunks[2].split('data: ', 1)[1])['status'] == 'Entregado'
+        hub.unsubscribe.assert_called_once_with(subscription)
+    
+    @pytest.mark.parametrize('event, expected', [
+        (_event(), True),
+        (_event(status='Recibido'), False),
+        (_event(status='Recibido', assigned_truck='CAM-002'), True),
+        (_event('created'), True),
+        ({'type': 'resync'}, True),
+        ({'type': 'otro'}, False)
+    ])
+    def test_is_status_event(self, event, expected):
+        assert OrderEventsController._is_status_event(event) is expected
@@ -4,7 +4,7 @@ Tests para los controladores de informes por vendedor
 import pytest
 from unittest.mock import Mock, patch, MagicMock
 from app import create_app
-from app.controllers.order_informes_controller import OrderSellerStatusSummaryController, OrderSellerClientsSummaryController, OrderSellerMonthlyController
+from app.controllers.order_informes_controller import OrderSellerStatusSummaryController, OrderSellerClientsSummaryController, OrderSellerMonthlyController, OrderSellerActiveClientsController, OrderSellersBatchController, OrderSellerDashboardController
 from app.exceptions.custom_exceptions import OrderValidationError, OrderBusinessLogicError
 
 
@@ -508,3 +508,229 @@ class TestOrderSellerMonthlyController:
                         assert status_code == 500
                         assert response['success'] is False
 
+
+class TestOrderSellerActiveClientsController:
+    """Tests para OrderSellerActiveClientsController"""
+    
+    def setup_method(self):
+        self.app = create_app()
+        self.client = self.app.test_client()
+    
+    def test_get_active_clients_success(self):
+        with patch('app.config.database.SessionLocal') as mock_session_local:
+            mock_session_local.return_value = MagicMock()
+            
+            with patch('app.controllers.order_informes_controller.OrderService') as mock_service_class:
+                mock_report_data = {'seller_id': '384091e2-2447-43a6-9dd6-e111ef428eb2', 'summary': {'active_clients': 3}}
+                mock_service = MagicMock()
+                mock_service.get_seller_active_clients.return_value = mock_report_data
+                mock_service_class.return_value = mock_service
+                
+                controller = OrderSellerActiveClientsController()
+                
+                with self.app.test_request_context(
+                    '/orders/informes/seller/active-clients?seller_id=384091e2-2447-43a6-9dd6-e111ef428eb2'
+                    '&start_month=2025-01&end_month=2025-06'
+                ):
+                    response, status_code = controller.get()
+                    
+                    assert status_code == 200
+                    assert response['message'] == "Informe de clientes activos generado exitosamente"
+                    assert response['data'] == mock_report_data
+                    mock_service.get_seller_active_clients.assert_called_once_with(
+                        '384091e2-2447-43a6-9dd6-e111ef428eb2', '2025-01', '2025-06'
+                    )
+    
+    def test_get_active_clients_invalid_uuid(self):
+        with patch('app.config.database.SessionLocal') as mock_session_local:
+            mock_session_local.return_value = MagicMock()
+            
+            with patch('app.controllers.order_informes_controller.OrderService') as mock_service_class:
+                controller = OrderSellerActiveClientsController()
+                
+                with self.app.test_request_context('/orders/informes/seller/active-clients?seller_id=invalid-uuid'):
+                    response, status_code = controller.get()
+                    
+                    assert status_code == 400
+                    mock_service_class.return_value.get_seller_active_clients.assert_not_called()
+    
+    def test_get_active_clients_validation_error(self):
+        with patch('app.config.database.SessionLocal') as mock_session_local:
+            mock_session_local.return_value = MagicMock()
+            
+            with patch('app.controllers.order_informes_controller.OrderService') as mock_service_class:
+                mock_service = MagicMock()
+                mock_service.get_seller_active_clients.side_effect = OrderValidationError("Los meses deben tener formato YYYY-MM")
+                mock_service_class.return_value = mock_service
+                
+                controller = OrderSellerActiveClientsController()
+                
+                with self.app.test_request_context(
+                    '/orders/informes/seller/active-clients?seller_id=384091e2-2447-43a6-9dd6-e111ef428eb2&start_month=2025'
+                ):
+                    response, status_code = controller.get()
+                    
+                    assert status_code == 400
+                    assert "formato YYYY-MM" in response['details']
+
+
+class TestOrderSellersBatchController:
+    """Tests para OrderSellersBatchController"""
+    
+    def setup_method(self):
+        self.app = create_app()
+        self.client = self.app.test_client()
+    
+    def test_get_batch_success(self):
+        with patch('app.config.database.SessionLocal') as mock_session_local:
+            mock_session_local.return_value = MagicMock()
+            
+            with patch('app.controllers.order_informes_controller.OrderService') as mock_service_class:
+                mock_report_data = {'summary': {'sellers': 2}, 'sellers': {}}
+                mock_service = MagicMock()
+                mock_service.get_sellers_batch_informes.return_value = mock_report_data
+                mock_service_class.return_value = mock_service
+                
+                controller = OrderSellersBatchController()
+                
+                with self.app.test_request_context(
+                    '/orders/informes/seller/batch?seller_ids=384091e2-2447-43a6-9dd6-e111ef428eb2,'
+                    '5a1f3c3e-8c2b-4c61-9d0a-6d1b2f9e7a10'
+                ):
+                    response, status_code = controller.get()
+                    
+                    assert status_code == 200
+                    assert response['message'] == "Informes de vendedores generados exitosamente"
+                    assert response['data'] == mock_report_data
+                    mock_service.get_sellers_batch_informes.assert_called_once_with(
+                        ['384091e2-2447-43a6-9dd6-e111ef428eb2', '5a1f3c3e-8c2b-4c61-9d0a-6d1b2f9e7a10']
+                    )
+    
+    def test_get_batch_missing_seller_ids(self):
+        with patch('app.config.database.SessionLocal') as mock_session_local:
+            mock_session_local.return_value = MagicMock()
+            
+            with patch('app.controllers.order_informes_controller.OrderService') as mock_service_class:
+                controller = OrderSellersBatchController()
+                
+                with self.app.test_request_context('/orders/informes/seller/batch'):
+                    response, status_code = controller.get()
+                    
+                    assert status_code == 400
+                    assert "'seller_ids' es obligatorio" in response['details']
+                    mock_service_class.return_value.get_sellers_batch_informes.assert_not_called()
+    
+    def test_get_batch_invalid_uuid(self):
+        with patch('app.config.database.SessionLocal') as mock_session_local:
+            mock_session_local.return_value = MagicMock()
+            
+            with patch('app.controllers.order_informes_controller.OrderService') as mock_service_class:
+                controller = OrderSellersBatchController()
+                
+                with self.app.test_request_context(
+                    '/orders/informes/seller/batch?seller_ids=384091e2-2447-43a6-9dd6-e111ef428eb2,invalid-uuid'
+                ):
+                    response, status_code = controller.get()
+                    
+                    assert status_code == 400
+                    assert "invalid-uuid" in response['details']
+                    mock_service_class.return_value.get_sellers_batch_informes.assert_not_called()
+    
+    def test_get_batch_validation_error(self):
+        with patch('app.config.database.SessionLocal') as mock_session_local:
+            mock_session_local.return_value = MagicMock()
+            
+            with patch('app.controllers.order_informes_controller.OrderService') as mock_service_class:
+                mock_service = MagicMock()
+                mock_service.get_sellers_batch_informes.side_effect = OrderValidationError(
+                    "Se pueden consultar como máximo 50 vendedores"
+                )
+                mock_service_class.return_value = mock_service
+                
+                controller = OrderSellersBatchController()
+                
+                with self.app.test_request_context(
+                    '/orders/informes/seller/batch?seller_ids=384091e2-2447-43a6-9dd6-e111ef428eb2'
+                ):
+                    response, status_code = controller.get()
+                    
+                    assert status_code == 400
+                    assert "máximo 50 vendedores" in response['details']
+
+
+class TestOrderSellerDashboardController:
+    """Tests para OrderSellerDashboardController"""
+    
+    def setup_method(self):
+        self.app = create_app()
+        self.client = self.app.test_client()
+    
+    def test_get_dashboard_success(self):
+        with patch('app.config.database.SessionLocal') as mock_session_local:
+            mock_session_local.return_value = MagicMock()
+            
+            with patch('app.controllers.order_informes_controller.OrderService') as mock_service_class:
+                mock_report_data = {'seller_id': '384091e2-2447-43a6-9dd6-e111ef428eb2', 'assigned_clients': 3}
+                mock_service = MagicMock()
+                mock_service.get_seller_dashboard.return_value = mock_report_data
+                mock_service_class.return_value = mock_service
+                
+                controller = OrderSellerDashboardController()
+                
+                with self.app.test_request_context(
+                    '/orders/informes/seller/dashboard?seller_id=384091e2-2447-43a6-9dd6-e111ef428eb2&per_page=5'
+                ):
+                    response, status_code = controller.get()
+                    
+                    assert status_code == 200
+                    assert response['message'] == "Tablero de vendedor generado exitosamente"
+                    assert response['data'] == mock_report_data
+                    mock_service.get_seller_dashboard.assert_called_once_with('384091e2-2447-43a6-9dd6-e111ef428eb2', 5)
+    
+    def test_get_dashboard_invalid_uuid(self):
+        with patch('app.config.database.SessionLocal') as mock_session_local:
+            mock_session_local.return_value = MagicMock()
+            
+            with patch('app.controllers.order_informes_controller.OrderService') as mock_service_class:
+                controller = OrderSellerDashboardController()
+                
+                with self.app.test_request_context('/orders/informes/seller/dashboard?seller_id=invalid-uuid'):
+                    response, status_code = controller.get()
+                    
+                    assert status_code == 400
+                    mock_service_class.return_value.get_seller_dashboard.assert_not_called()
+    
+    def test_get_dashboard_invalid_per_page(self):
+        with patch('app.config.database.SessionLocal') as mock_session_local:
+            mock_session_local.return_value = MagicMock()
+            
+            with patch('app.controllers.order_informes_controller.OrderService') as mock_service_class:
+                controller = OrderSellerDashboardController()
+                
+                with self.app.test_request_context(
+                    '/orders/informes/seller/dashboard?seller_id=384091e2-2447-43a6-9dd6-e111ef428eb2&per_page=101'
+                ):
+                    response, status_code = controller.get()
+                    
+                    assert status_code == 400
+                    assert "'per_page' debe estar entre 1 y 100" in response['details']
+                    mock_service_class.return_value.get_seller_dashboard.assert_not_called()
+    
+    def test_get_dashboard_business_logic_error(self):
+        with patch('app.config.database.SessionLocal') as mock_session_local:
+            mock_session_local.return_value = MagicMock()
+            
+            with patch('app.controllers.order_informes_controller.OrderService') as mock_service_class:
+                mock_service = MagicMock()
+                mock_service.get_seller_dashboard.side_effect = OrderBusinessLogicError("Error al generar tablero de vendedor")
+                mock_service_class.return_value = mock_service
+                
+                controller = OrderSellerDashboardController()
+                
+                with self.app.test_request_context(
+                    '/orders/informes/seller/dashboard?seller_id=384091e2-2447-43a6-9dd6-e111ef428eb2'
+                ):
+                    response, status_code = controller.get()
+                    
+                    assert status_code == 500
+                    assert response['success'] is False
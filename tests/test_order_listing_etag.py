@@ -0,0 +1,171 @@
+"""
+Tests para las peticiones condicionales (ETag / If-None-Match) de los listados de pedidos
+"""
+import pytest
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+from flask import Flask
+from app.controllers.base_controller import BaseController
+from app.controllers.order_controller import OrderController
+from app.controllers.order_truck_controller import OrderTruckController
+from app.repositories.order_repository import OrderRepository
+from app.services.order_service import OrderService
+from app.exceptions.custom_exceptions import OrderValidationError, OrderBusinessLogicError
+
+CLIENT_ID = '123e4567-e89b-12d3-a456-426614174000'
+
+
+class TestGetListingVersion:
+    """Tests para OrderRepository.get_listing_version"""
+    
+    def test_returns_count_max_updated_at_and_max_id(self):
+        session = MagicMock()
+        session.execute.return_value.one.return_value = SimpleNamespace(
+            order_count=3, max_updated_at=datetime(2025, 1, 2), max_id=42
+        )
+        with patch('app.repositories.order_repository.OrderDB', new=SimpleNamespace(__table__=MagicMock())):
+            version = OrderRepository(session).get_listing_version(client_id=CLIENT_ID)
+        
+        assert version == {'count': 3, 'max_updated_at': datetime(2025, 1, 2), 'max_id': 42}
+        session.execute.assert_called_once()
+
+
+class TestGetListingEtag:
+    """Tests para OrderService.get_listing_etag"""
+    
+    @pytest.fixture
+    def order_service(self):
+        repository = MagicMock(spec=OrderRepository)
+        repository.get_listing_version.return_value = {
+            'count': 3, 'max_updated_at': datetime(2025, 1, 2), 'max_id': 42
+        }
+        with patch('app.services.order_service.InventoryService'), \
+                patch('app.services.order_service.InventoryIntegration'), \
+                patch('app.services.order_service.AuthService'), \
+                patch('app.services.order_service.AuthIntegration'):
+            return OrderService(repository)
+    
+    def test_same_version_gives_same_etag(self, order_service):
+        first = order_service.get_listing_etag(client_id=CLIENT_ID)
+        second = order_service.get_listing_etag(client_id=CLIENT_ID)
+        
+        assert first == second
+        order_service.order_repository.get_listing_version.assert_called_with(
+            client_id=CLIENT_ID, vendor_id=None, assigned_truck=None, scheduled_delivery_date=None
+        )
+        order_service.inventory_service.get_product_by_id.assert_not_called()
+    
+    @pytest.mark.parametrize('version', [
+        {'count': 2, 'max_updated_at': datetime(2025, 1, 2), 'max_id': 42},
+        {'count': 3, 'max_updated_at': datetime(2025, 1, 3), 'max_id': 42},
+        {'count': 3, 'max_updated_at': datetime(2025, 1, 2), 'max_id': 43}
+    ])
+    def test_any_version_change_changes_etag(self, order_service, version):
+        before = order_service.get_listing_etag(client_id=CLIENT_ID)
+        order_service.order_repository.get_listing_version.return_value = version
+        
+        assert order_service.get_listing_etag(client_id=CLIENT_ID) != before
+    
+    def test_variant_and_filters_change_etag(self, order_service):
+        base = order_service.get_listing_etag(assigned_truck='CAM-001')
+        
+        assert order_service.get_listing_etag(assigned_truck='CAM-001', variant='status|') != base
+        assert order_service.get_listing_etag(assigned_truck='CAM-002') != base
+    
+    def test_empty_listing_has_etag(self, order_service):
+        order_service.order_repository.get_listing_version.return_value = {
+            'count': 0, 'max_updated_at': None, 'max_id': None
+        }
+        
+        assert order_service.get_listing_etag(client_id=CLIENT_ID)
+    
+    def test_errors_are_wrapped(self, order_service):
+        order_service.order_repository.get_listing_version.side_effect = ValueError("Invalid isoformat string: 'x'")
+        with pytest.raises(OrderValidationError):
+            order_service.get_listing_etag(scheduled_delivery_date='x')
+        
+        order_service.order_repository.get_listing_version.side_effect = Exception("Error de conexión")
+        with pytest.raises(OrderBusinessLogicError):
+            order_service.get_listing_etag(client_id=CLIENT_ID)
+
+
+class TestNotModifiedResponse:
+    """Tests para BaseController.not_modified_response"""
+    
+    @pytest.fixture
+    def app(self):
+        app = Flask(__name__)
+        
+        @app.route('/listado')
+        def listado():
+            not_modified = BaseController().not_modified_response('abc')
+            if not_modified is not None:
+                return not_modified
+            return {'success': True}
+        
+        return app
+    
+    def test_adds_weak_etag_to_ok_response(self, app):
+        response = app.test_client().get('/listado')
+        
+        assert response.status_code == 200
+        assert response.headers['ETag'] == 'W/"abc"'
+    
+    @pytest.mark.parametrize('if_none_match', ['W/"abc"', '"abc"', '"otro", W/"abc"', '*'])
+    def test_matching_if_none_match_returns_304(self, app, if_none_match):
+        response = app.test_client().get('/listado', headers={'If-None-Match': if_none_match})
+        
+        assert response.status_code == 304
+        assert response.data == b''
+        assert response.headers['ETag'] == 'W/"abc"'
+    
+    def test_stale_if_none_match_returns_200(self, app):
+        response = app.test_client().get('/listado', headers={'If-None-Match': 'W/"viejo"'})
+        
+        assert response.status_code == 200
+
+
+class TestListingControllersConditionalGet:
+    """Tests para el 304 de los controladores de listado"""
+    
+    @pytest.fixture
+    def app(self):
+        return Flask(__name__)
+    
+    def _controller(self, controller_class):
+        controller = controller_class()
+        controller.order_service = MagicMock()
+        controller.order_service.get_listing_etag.return_value = 'v1'
+        return controller
+    
+    def test_orders_listing_returns_304_without_reading_orders(self, app):
+        controller = self._controller(OrderController)
+        
+        with app.test_request_context(f'/orders?client_id={CLIENT_ID}&fields=status', headers={'If-None-Match': 'W/"v1"'}):
+            response = controller.get()
+        
+        assert response.status_code == 304
+        controller.order_service.get_listing_etag.assert_called_once_with(
+            client_id=CLIENT_ID, vendor_id=None, variant='status|'
+        )
+        controller.order_service.iter_order_projections.assert_not_called()
+        controller.order_service.get_orders_by_client.assert_not_called()
+    
+    def test_truck_listing_returns_304_without_reading_orders(self, app):
+        controller = self._controller(OrderTruckController)
+        
+        with app.test_request_context('/orders/by-truck?assigned_truck=CAM-001', headers={'If-None-Match': 'W/"v1"'}):
+            response = controller.get()
+        
+        assert response.status_code == 304
+        controller.order_service.get_orders_by_truck_and_date.assert_not_called()
+    
+    def test_truck_listing_invalid_date_returns_400(self, app):
+        controller = self._controller(OrderTruckController)
+        controller.order_service.get_listing_etag.side_effect = OrderValidationError("Invalid isoformat string: 'x'")
+        
+        with app.test_request_context('/orders/by-truck?scheduled_delivery_date=x'):
+            body, status = controller.get()
+        
+        assert status == 400
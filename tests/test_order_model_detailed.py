@@ -227,22 +227,35 @@ class TestOrderModelExtended:
     
     def test_generate_order_number(self):
         """Test: Generación de número de pedido"""
-        order_number = Order.generate_order_number()
+        order_number = Order.generate_order_number(42)
         
         assert order_number.startswith("PED-")
+        assert order_number.endswith("-00042")
         assert len(order_number) == 18
         assert order_number.count("-") == 2
     
     def test_generate_order_number_format(self):
         """Test: Formato de número de pedido generado"""
-        order_number = Order.generate_order_number()
+        order_number = Order.generate_order_number(12345, datetime(2024, 3, 7))
         
+        assert order_number == "PED-20240307-12345"
         parts = order_number.split("-")
         assert len(parts) == 3
         assert parts[0] == "PED"
         assert len(parts[1]) == 8
         assert len(parts[2]) == 5
     
+    def test_generate_order_number_keeps_full_sequence(self):
+        """Test: El sufijo conserva el valor completo de la secuencia y el número es válido"""
+        order = Order(
+            order_number=Order.generate_order_number(1234567, datetime(2024, 3, 7)),
+            client_id="6ba7b815-9dad-11d1-80b4-00c04fd430c8"
+        )
+        
+        assert order.order_number == "PED-20240307-1234567"
+        assert len(order.order_number) <= 20
+        order.validate()
+    
     def test_validate_success(self):
         """Test: Validación exitosa"""
         order = Order(
@@ -0,0 +1,263 @@
+"""
+Tests para la asignación hi/lo de números de pedido
+"""
+import threading
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+from app.repositories.order_number_allocator import OrderNumberAllocator
+from app.repositories.order_repository import OrderRepository
+from app.services.order_service import OrderService
+from app.exceptions.custom_exceptions import OrderBusinessLogicError, OrderNumberConflictError
+from app.models.order import Order
+
+
+class FakeDatabaseSequence:
+    """Simula una secuencia de base de datos con INCREMENT BY block_size"""
+    
+    def __init__(self, block_size: int):
+        self.block_size = block_size
+        self.calls = 0
+        self._current = 1 - block_size
+        self._lock = threading.Lock()
+    
+    def nextval(self) -> int:
+        with self._lock:
+            self.calls += 1
+            self._current += self.block_size
+            return self._current
+
+
+class FakeSequenceSession:
+    """Sesión mínima para next_order_sequences: cada execute reserva un bloque de la secuencia"""
+    
+    def __init__(self, sequence: FakeDatabaseSequence):
+        self.sequence = sequence
+    
+    def get_bind(self):
+        return SimpleNamespace(dialect=SimpleNamespace(supports_sequences=True))
+    
+    def execute(self, statement):
+        return SimpleNamespace(scalar=self.sequence.nextval)
+
+
+class WorkerAllocators:
+    """Un OrderNumberAllocator por worker simulado; cada hilo usa el de su worker"""
+    
+    def __init__(self, workers: int, block_size: int):
+        self.workers = [OrderNumberAllocator(block_size) for _ in range(workers)]
+        self.current = threading.local()
+    
+    def next_values(self, count, fetch_block):
+        return self.workers[self.current.worker].next_values(count, fetch_block)
+
+
+class TestOrderNumberAllocator:
+    """Tests para OrderNumberAllocator"""
+    
+    def test_values_within_block_do_not_hit_database(self):
+        sequence = FakeDatabaseSequence(100)
+        allocator = OrderNumberAllocator(100)
+        
+        values = [allocator.next_values(1, sequence.nextval)[0] for _ in range(100)]
+        
+        assert values == list(range(1, 101))
+        assert sequence.calls == 1
+    
+    def test_new_block_is_fetched_when_exhausted(self):
+        sequence = FakeDatabaseSequence(10)
+        allocator = OrderNumberAllocator(10)
+        
+        values = allocator.next_values(25, sequence.nextval)
+        
+        assert values == list(range(1, 26))
+        assert sequence.calls == 3
+    
+    def test_workers_get_disjoint_blocks(self):
+        sequence = FakeDatabaseSequence(10)
+        worker_a = OrderNumberAllocator(10)
+        worker_b = OrderNumberAllocator(10)
+        
+        values_a = worker_a.next_values(3, sequence.nextval)
+        values_b = worker_b.next_values(3, sequence.nextval)
+        values_a += worker_a.next_values(3, sequence.nextval)
+        
+        assert values_a == [1, 2, 3, 4, 5, 6]
+        assert values_b == [11, 12, 13]
+    
+    def test_blocks_never_move_backwards(self):
+        allocator = OrderNumberAllocator(10)
+        allocator.next_values(10, lambda: 1)
+        
+        values = allocator.next_values(2, lambda: 5)
+        
+        assert values == [11, 12]
+    
+    def test_reset_discards_current_block(self):
+        sequence = FakeDatabaseSequence(10)
+        allocator = OrderNumberAllocator(10)
+        allocator.next_values(1, sequence.nextval)
+        
+        allocator.reset()
+        
+        assert allocator.next_values(1, sequence.nextval) == [11]
+    
+    def test_invalid_block_size(self):
+        with pytest.raises(ValueError):
+            OrderNumberAllocator(0)
+
+
+class TestOrderRepositoryNextOrderSequences:
+    """Tests para OrderRepository.next_order_sequences"""
+    
+    def test_next_order_sequences_uses_database_sequence(self):
+        mock_session = MagicMock()
+        mock_session.get_bind.return_value.dialect.supports_sequences = True
+        mock_session.execute.return_value.scalar.return_value = 501
+        allocator = OrderNumberAllocator(100)
+        
+        with patch('app.repositories.order_repository.order_number_allocator', allocator):
+            repository = OrderRepository(mock_session)
+            first = repository.next_order_sequences(2)
+            second = repository.next_order_sequences(3)
+        
+        assert first == [501, 502]
+        assert second == [503, 504, 505]
+        mock_session.execute.assert_called_once()
+    
+    def test_next_order_sequences_without_sequence_support(self):
+        mock_session = MagicMock()
+        mock_session.get_bind.return_value.dialect.supports_sequences = False
+        mock_session.query.return_value.scalar.return_value = 41
+        allocator = OrderNumberAllocator(100)
+        
+        with patch('app.repositories.order_repository.order_number_allocator', allocator):
+            with patch('app.repositories.order_repository.OrderDB'):
+                values = OrderRepository(mock_session).next_order_sequences(1)
+        
+        assert values == [42]
+        mock_session.execute.assert_not_called()
+
+
+class TestOrderNumberConflicts:
+    """Reintentos cuando el número de pedido asignado ya existe"""
+    
+    @pytest.fixture
+    def order_data(self):
+        return {
+            'client_id': '123e4567-e89b-12d3-a456-426614174000',
+            'total_amount': 150.0,
+            'scheduled_delivery_date': (datetime.utcnow() + timedelta(days=30)).strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'items': [{'product_id': 1, 'quantity': 2}]
+        }
+    
+    @pytest.fixture
+    def order_service(self):
+        repository = MagicMock(spec=OrderRepository)
+        repository.next_order_sequences.side_effect = [[100001], [100101], [100201]]
+        with patch('app.services.order_service.InventoryService'), \
+             patch('app.services.order_service.InventoryIntegration'):
+            return OrderService(repository)
+    
+    def test_repository_reports_order_number_conflict_and_discards_block(self):
+        mock_session = MagicMock()
+        mock_session.commit.side_effect = Exception("UNIQUE constraint failed: orders.order_number")
+        allocator = OrderNumberAllocator(100)
+        allocator.next_values(1, lambda: 501)
+        
+        with patch('app.repositories.order_repository.order_number_allocator', allocator), \
+             patch.object(OrderRepository, '_insert_orders'):
+            with pytest.raises(OrderNumberConflictError):
+                OrderRepository(mock_session).create(Order(order_number='PED-20240101-00501', client_id='c'))
+        
+        mock_session.rollback.assert_called_once()
+        assert allocator.next_values(1, lambda: 601) == [601]
+    
+    def test_repository_other_errors_are_not_conflicts(self):
+        mock_session = MagicMock()
+        mock_session.commit.side_effect = Exception("connection lost")
+        
+        with patch.object(OrderRepository, '_insert_orders'), pytest.raises(Exception) as exc_info:
+            OrderRepository(mock_session).create(Order(order_number='PED-20240101-00501', client_id='c'))
+        
+        assert not isinstance(exc_info.value, OrderNumberConflictError)
+        assert "Error al crear pedido" in str(exc_info.value)
+    
+    def test_create_order_retries_with_a_new_number(self, order_service, order_data):
+        repository = order_service.order_repository
+        outcomes = [OrderNumberConflictError("duplicado")]
+        
+        def create(order):
+            if outcomes:
+                raise outcomes.pop()
+            return order
+        
+        repository.create.side_effect = create
+        
+        order_service.create_order(order_data)
+        
+        retried_order = repository.create.call_args_list[1][0][0]
+        assert retried_order.order_number.endswith('-100101')
+        order_service.inventory_integration.compensate_products_stock.assert_not_called()
+    
+    def test_create_order_restores_stock_when_conflicts_persist(self, order_service, order_data):
+        order_service.order_repository.create.side_effect = OrderNumberConflictError("duplicado")
+        
+        with pytest.raises(OrderBusinessLogicError) as exc_info:
+            order_service.create_order(order_data)
+        
+        assert "número de pedido único" in str(exc_info.value)
+        assert order_service.order_repository.create.call_count == OrderService.ORDER_NUMBER_ATTEMPTS
+        order_service.inventory_integration.compensate_products_stock.assert_called_once_with(
+            [{'product_id': 1, 'quantity': 2}]
+        )
+    
+    def test_create_order_restores_stock_on_repository_error(self, order_service, order_data):
+        order_service.order_repository.create.side_effect = Exception("Error de base de datos")
+        
+        with pytest.raises(OrderBusinessLogicError):
+            order_service.create_order(order_data)
+        
+        order_service.inventory_integration.compensate_products_stock.assert_called_once()
+
+
+class TestConcurrentOrderCreation:
+    """Creación de pedidos en paralelo desde varios workers con la secuencia compartida"""
+    
+    def test_concurrent_creation_has_no_collisions(self):
+        """Miles de pedidos creados en paralelo desde varios workers no repiten número"""
+        block_size = 50
+        sequence = FakeDatabaseSequence(block_size)
+        allocators = WorkerAllocators(4, block_size)
+        created = []
+        order_data = {
+            'client_id': '123e4567-e89b-12d3-a456-426614174000',
+            'vendor_id': '456e7890-e89b-12d3-a456-426614174001',
+            'total_amount': 150.0,
+            'scheduled_delivery_date': (datetime.utcnow() + timedelta(days=30)).strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'items': [{'product_id': 1, 'quantity': 2}]
+        }
+        
+        def create_order(index):
+            # Cada petición tiene su sesión, repositorio y servicio, como en auto_close_session
+            allocators.current.worker = index % len(allocators.workers)
+            service = OrderService(OrderRepository(FakeSequenceSession(sequence)))
+            return service.create_order(dict(order_data)).order_number
+        
+        def record_created(repository, order):
+            created.append(order)
+            return order
+        
+        with patch('app.repositories.order_repository.order_number_allocator', allocators), \
+             patch.object(OrderRepository, 'create', autospec=True, side_effect=record_created), \
+             patch('app.services.order_service.InventoryService'), \
+             patch('app.services.order_service.InventoryIntegration'):
+            with ThreadPoolExecutor(max_workers=32) as executor:
+                order_numbers = list(executor.map(create_order, range(5000)))
+        
+        assert len(created) == 5000
+        assert len(set(order_numbers)) == 5000
+        assert {order.order_number for order in created} == set(order_numbers)
+        assert sequence.calls <= 5000 // block_size + len(allocators.workers)
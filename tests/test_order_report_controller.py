@@ -1,11 +1,11 @@
 """
-Tests para OrderMonthlyReportController
+Tests para OrderMonthlyReportController y OrderTimeSeriesReportController
 """
 import pytest
 from unittest.mock import Mock, patch, MagicMock
 from datetime import datetime
 from app import create_app
-from app.controllers.order_report_controller import OrderMonthlyReportController
+from app.controllers.order_report_controller import OrderMonthlyReportController, OrderTimeSeriesReportController
 from app.exceptions.custom_exceptions import OrderValidationError, OrderBusinessLogicError
 
 
@@ -384,3 +384,75 @@ class TestOrderMonthlyReportController:
                         assert response['success'] is True
                         assert "No hay pedidos en el último año" in response['message']
 
+
+class TestOrderTimeSeriesReportController:
+    """Tests para OrderTimeSeriesReportController"""
+    
+    def setup_method(self):
+        self.app = create_app()
+    
+    def test_get_time_series_passes_filters(self):
+        with patch('app.config.database.SessionLocal') as mock_session_local:
+            mock_session_local.return_value = MagicMock()
+            
+            with patch('app.controllers.order_report_controller.OrderService') as mock_service_class:
+                mock_service = MagicMock()
+                mock_service.get_orders_time_series.return_value = {'summary': {'total_orders': 4}, 'buckets': []}
+                mock_service_class.return_value = mock_service
+                
+                controller = OrderTimeSeriesReportController()
+                
+                with self.app.test_request_context(
+                    '/orders/reports/time-series?start_date=2025-01-01&end_date=2025-03-31&granularity=week'
+                    '&client_ids=client-1,client-2&status=Entregado&assigned_truck=CAM-001'
+                ):
+                    response, status_code = controller.get()
+                    
+                    assert status_code == 200
+                    assert response['message'] == "Serie de pedidos generada exitosamente"
+                    mock_service.get_orders_time_series.assert_called_once_with(
+                        start_date='2025-01-01',
+                        end_date='2025-03-31',
+                        granularity='week',
+                        client_ids=['client-1', 'client-2'],
+                        statuses=['Entregado'],
+                        assigned_truck='CAM-001'
+                    )
+    
+    def test_get_time_series_defaults_and_empty_message(self):
+        with patch('app.config.database.SessionLocal') as mock_session_local:
+            mock_session_local.return_value = MagicMock()
+            
+            with patch('app.controllers.order_report_controller.OrderService') as mock_service_class:
+                mock_service = MagicMock()
+                mock_service.get_orders_time_series.return_value = {'summary': {'total_orders': 0}, 'buckets': []}
+                mock_service_class.return_value = mock_service
+                
+                controller = OrderTimeSeriesReportController()
+                
+                with self.app.test_request_context('/orders/reports/time-series'):
+                    response, status_code = controller.get()
+                    
+                    assert status_code == 200
+                    assert response['message'] == "No hay pedidos en el período"
+                    mock_service.get_orders_time_series.assert_called_once_with(
+                        start_date=None, end_date=None, granularity='month',
+                        client_ids=None, statuses=None, assigned_truck=None
+                    )
+    
+    def test_get_time_series_validation_error(self):
+        with patch('app.config.database.SessionLocal') as mock_session_local:
+            mock_session_local.return_value = MagicMock()
+            
+            with patch('app.controllers.order_report_controller.OrderService') as mock_service_class:
+                mock_service = MagicMock()
+                mock_service.get_orders_time_series.side_effect = OrderValidationError("Granularidad no válida: year")
+                mock_service_class.return_value = mock_service
+                
+                controller = OrderTimeSeriesReportController()
+                
+                with self.app.test_request_context('/orders/reports/time-series?granularity=year'):
+                    response, status_code = controller.get()
+                    
+                    assert status_code == 400
+                    assert "Granularidad no válida" in response['details']
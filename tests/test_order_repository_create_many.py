@@ -0,0 +1,79 @@
+"""
+Tests para el método create_many del OrderRepository
+"""
+import pytest
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+from app.repositories.order_repository import OrderRepository
+from app.models.order import Order
+from app.models.order_item import OrderItem
+
+
+class TestOrderRepositoryCreateMany:
+    """Tests para create_many"""
+    
+    @pytest.fixture
+    def mock_session(self):
+        return MagicMock()
+    
+    @pytest.fixture
+    def order_repository(self, mock_session):
+        with patch('app.repositories.order_repository.OrderDB'), patch('app.repositories.order_repository.OrderItemDB'):
+            yield OrderRepository(mock_session)
+    
+    def _order(self, number, product_ids):
+        order = Order(
+            order_number=number,
+            client_id="550e8400-e29b-41d4-a716-446655440000",
+            total_amount=100.0,
+            assigned_truck="CAM-001"
+        )
+        order.items = [OrderItem(product_id=product_id, quantity=1) for product_id in product_ids]
+        return order
+    
+    def test_create_many_uses_two_statements_and_maps_returned_rows(self, order_repository, mock_session):
+        created_at = datetime(2024, 1, 1)
+        order_result = MagicMock()
+        order_result.all.return_value = [
+            SimpleNamespace(id=11, order_number="PED-20240101-00002", created_at=created_at, updated_at=created_at),
+            SimpleNamespace(id=10, order_number="PED-20240101-00001", created_at=created_at, updated_at=created_at)
+        ]
+        item_result = MagicMock()
+        item_result.all.return_value = [
+            SimpleNamespace(id=102, order_id=11),
+            SimpleNamespace(id=101, order_id=10),
+            SimpleNamespace(id=100, order_id=10)
+        ]
+        mock_session.execute.side_effect = [order_result, item_result]
+        orders = [self._order("PED-20240101-00001", [1, 2]), self._order("PED-20240101-00002", [3])]
+        
+        result = order_repository.create_many(orders)
+        
+        assert mock_session.execute.call_count == 2
+        mock_session.commit.assert_called_once()
+        mock_session.add.assert_not_called()
+        mock_session.refresh.assert_not_called()
+        assert [order.id for order in result] == [10, 11]
+        assert [item.id for item in result[0].items] == [100, 101]
+        assert [item.order_id for item in result[0].items] == [10, 10]
+        assert result[1].items[0].id == 102
+        assert result[1].items[0].order_id == 11
+        order_params = mock_session.execute.call_args_list[0][0][1]
+        assert [params['order_number'] for params in order_params] == ["PED-20240101-00001", "PED-20240101-00002"]
+        item_params = mock_session.execute.call_args_list[1][0][1]
+        assert [params['order_id'] for params in item_params] == [10, 10, 11]
+    
+    def test_create_many_empty_list(self, order_repository, mock_session):
+        assert order_repository.create_many([]) == []
+        mock_session.execute.assert_not_called()
+        mock_session.commit.assert_not_called()
+    
+    def test_create_many_rolls_back_on_error(self, order_repository, mock_session):
+        mock_session.execute.side_effect = Exception("Database error")
+        
+        with pytest.raises(Exception) as exc_info:
+            order_repository.create_many([self._order("PED-20240101-00001", [1])])
+        
+        assert "Error al crear lote de pedidos" in str(exc_info.value)
+        mock_session.rollback.assert_called_once()
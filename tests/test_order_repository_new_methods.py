@@ -1,6 +1,9 @@
 """
 Tests para los nuevos métodos del OrderRepository
 """
+import os
+import subprocess
+import sys
 import pytest
 from unittest.mock import MagicMock, Mock, patch
 from datetime import datetime, date
@@ -9,6 +12,22 @@ from app.models.order import Order, OrderStatus
 from app.models.order_item import OrderItem
 from sqlalchemy.exc import SQLAlchemyError
 
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Se ejecuta en otro proceso: conftest reemplaza sqlalchemy por un mock en este
+COMPILE_POSTGRESQL_CREATE = """
+from unittest.mock import MagicMock
+from sqlalchemy.dialects import postgresql
+from app.models.order import Order
+from app.models.order_item import OrderItem
+from app.repositories.order_repository import OrderRepository
+session = MagicMock()
+order = Order(order_number='PED-20250101-00001', client_id='123e4567-e89b-12d3-a456-426614174000', total_amount=20.0)
+order.items = [OrderItem(product_id=1, quantity=2), OrderItem(product_id=2, quantity=1)]
+OrderRepository(session)._insert_order_with_items(order)
+print(session.execute.call_args[0][0].compile(dialect=postgresql.dialect()))
+"""
+
 
 class TestOrderRepositoryNewMethods:
     """Tests para los nuevos métodos del OrderRepository"""
@@ -22,8 +41,6 @@ class TestOrderRepositoryNewMethods:
         return OrderRepository(mock_session)
     
     def test_create_with_items(self, order_repository, mock_session):
-        from app.models.db_models import OrderDB, OrderItemDB
-        
         order = Order(
             order_number="PED-001",
             client_id="client-1",
@@ -38,38 +55,79 @@ class TestOrderRepositoryNewMethods:
             OrderItem(product_id="prod-2", quantity=3)
         ]
         
-        mock_db_order = MagicMock()
-        mock_db_order.id = 1
-        mock_db_order.order_number = "PED-001"
-        mock_db_order.client_id = "client-1"
-        mock_db_order.vendor_id = "vendor-1"
-        mock_db_order.status = OrderStatus.RECIBIDO
-        mock_db_order.total_amount = 200.0
-        mock_db_order.scheduled_delivery_date = date(2024, 12, 25)
-        mock_db_order.assigned_truck = "TRUCK-001"
-        mock_db_order.created_at = datetime(2024, 12, 25)
-        mock_db_order.updated_at = datetime(2024, 12, 25)
-        mock_db_order.items = []
-        
-        mock_session.add = MagicMock()
-        mock_session.flush = MagicMock()
-        mock_session.commit = MagicMock()
-        mock_session.refresh = MagicMock()
-        
-        with patch('app.repositories.order_repository.OrderDB', return_value=mock_db_order):
-            with patch('app.repositories.order_repository.OrderItemDB') as mock_item_db:
-                with patch.object(order_repository, '_db_to_model_with_items') as mock_convert:
-                    mock_convert.return_value = order
-                    
-                    result = order_repository.create(order)
-                    
-                    assert result == order
-                    assert mock_session.add.call_count == 3
-                    mock_session.flush.assert_called_once()
-                    mock_session.commit.assert_called_once()
+        order_result = MagicMock()
+        order_result.all.return_value = [
+            MagicMock(id=1, order_number="PED-001", created_at=datetime(2024, 12, 25), updated_at=datetime(2024, 12, 25))
+        ]
+        item_result = MagicMock()
+        item_result.all.return_value = [MagicMock(id=10, order_id=1), MagicMock(id=11, order_id=1)]
+        mock_session.execute.side_effect = [order_result, item_result]
+        
+        with patch('app.repositories.order_repository.OrderDB'):
+            with patch('app.repositories.order_repository.OrderItemDB'):
+                result = order_repository.create(order)
+        
+        assert result == order
+        assert mock_session.execute.call_count == 2
+        assert [item.id for item in result.items] == [10, 11]
+        assert [item.order_id for item in result.items] == [1, 1]
+        mock_session.add.assert_not_called()
+        mock_session.flush.assert_not_called()
+        mock_session.commit.assert_called_once()
+    
+    def test_create_with_items_single_statement_on_postgresql(self, order_repository, mock_session):
+        order = Order(
+            order_number="PED-001",
+            client_id="client-1",
+            total_amount=200.0,
+            assigned_truck="TRUCK-001"
+        )
+        order.items = [
+            OrderItem(product_id=1, quantity=2),
+            OrderItem(product_id=2, quantity=3)
+        ]
+        mock_session.get_bind.return_value.dialect.name = 'postgresql'
+        mock_session.execute.return_value.all.return_value = [
+            MagicMock(id=7, item_id=70),
+            MagicMock(id=7, item_id=71)
+        ]
+        
+        with patch('app.repositories.order_repository.OrderDB'):
+            with patch('app.repositories.order_repository.OrderItemDB'):
+                result = order_repository.create(order)
+        
+        mock_session.execute.assert_called_once()
+        mock_session.commit.assert_called_once()
+        mock_session.refresh.assert_not_called()
+        assert result.id == 7
+        assert [item.id for item in result.items] == [70, 71]
+        assert [item.order_id for item in result.items] == [7, 7]
+        assert result.created_at is not None
+    
+    def test_create_statement_compiles_for_postgresql(self):
+        """Test: El pedido, sus items, el NOTIFY y los rollups van en una sola sentencia de PostgreSQL"""
+        result = subprocess.run(
+            [sys.executable, '-c', COMPILE_POSTGRESQL_CREATE],
+            cwd=PROJECT_ROOT,
+            env={**os.environ, 'PYTHONPATH': PROJECT_ROOT},
+            capture_output=True,
+            text=True,
+            timeout=60
+        )
+        
+        assert result.returncode == 0, result.stderr
+        sql = result.stdout
+        assert sql.startswith('WITH new_order AS')
+        assert 'INSERT INTO orders' in sql and 'RETURNING orders.id' in sql
+        assert 'INSERT INTO order_items' in sql and 'RETURNING order_items.id' in sql
+        assert 'pg_notify(' in sql
+        for table_name in ('order_monthly_stats', 'client_daily_stats', 'product_daily_stats', 'client_monthly_stats'):
+            assert f'INSERT INTO {table_name}' in sql
+        assert sql.count('ON CONFLICT') == 4
+        assert sql.count('SELECT new_order.id, new_items.id AS item_id') == 1
     
-    @patch('app.repositories.order_repository.OrderDB')
-    def test_get_orders_status_summary_by_client_ids_success(self, mock_order_db, order_repository, mock_session):
+    @patch('app.repositories.order_repository.ClientDailyStatsDB')
+    def test_get_orders_status_summary_by_client_ids_success(self, mock_client_daily_stats_db, order_repository, mock_session):
         client_ids = ['client-1', 'client-2']
         
         mock_result1 = Mock()
@@ -102,8 +160,8 @@ class TestOrderRepositoryNewMethods:
         assert result == []
         mock_session.query.assert_not_called()
     
-    @patch('app.repositories.order_repository.OrderDB')
-    def test_get_orders_status_summary_by_client_ids_with_none_values(self, mock_order_db, order_repository, mock_session):
+    @patch('app.repositories.order_repository.ClientDailyStatsDB')
+    def test_get_orders_status_summary_by_client_ids_with_none_values(self, mock_client_daily_stats_db, order_repository, mock_session):
         client_ids = ['client-1']
         
         mock_result = Mock()
@@ -141,8 +199,8 @@ class TestOrderRepositoryNewMethods:
         with pytest.raises(Exception, match="Error al obtener resumen mensual"):
             order_repository.get_orders_monthly_summary_by_client_ids(['client-1'], datetime(2024, 1, 1), datetime(2024, 12, 31))
     
-    @patch('app.repositories.order_repository.OrderDB')
-    def test_get_clients_summary_by_client_ids_success(self, mock_order_db, order_repository, mock_session):
+    @patch('app.repositories.order_repository.ClientDailyStatsDB')
+    def test_get_clients_summary_by_client_ids_success(self, mock_client_daily_stats_db, order_repository, mock_session):
         client_ids = ['client-1', 'client-2']
         
         mock_total_result = Mock()
@@ -189,8 +247,8 @@ class TestOrderRepositoryNewMethods:
         assert total == 0
         mock_session.query.assert_not_called()
     
-    @patch('app.repositories.order_repository.OrderDB')
-    def test_get_clients_summary_by_client_ids_with_none_values(self, mock_order_db, order_repository, mock_session):
+    @patch('app.repositories.order_repository.ClientDailyStatsDB')
+    def test_get_clients_summary_by_client_ids_with_none_values(self, mock_client_daily_stats_db, order_repository, mock_session):
         client_ids = ['client-1']
         
         mock_total_query = MagicMock()
@@ -0,0 +1,353 @@
+"""
+Tests para las tablas rollup de pedidos
+"""
+import pytest
+from datetime import date, datetime
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+from flask import Flask
+from app.commands import register_commands
+from app.models.order import Order
+from app.models.order_item import OrderItem
+from app.repositories.order_repository import OrderRepository
+from app.repositories.order_rollups import (
+    order_monthly_rollup, client_daily_rollup, product_daily_rollup, client_monthly_rollup, order_rollup_deltas, order_update_rollup_deltas, stage_rollup_deltas,
+    RollupTable, backfill_new_rollups, rebuild_rollup, _apply_pending_rollups, _discard_pending_rollups, _PENDING_ROLLUPS_KEY
+)
+
+CLIENT_ID = '123e4567-e89b-12d3-a456-426614174000'
+
+
+def _order(status='Recibido', total_amount=10.0, created_at=datetime(2025, 3, 15)):
+    return Order(order_number='PED-1', client_id=CLIENT_ID, status=status, total_amount=total_amount, created_at=created_at)
+
+
+def _previous(status='Recibido', client_id=CLIENT_ID, total_amount=10.0):
+    return {'status': status, 'client_id': client_id, 'total_amount': total_amount}
+
+
+def _session(dialect='sqlite'):
+    session = MagicMock()
+    session.get_bind.return_value.dialect.name = dialect
+    session.info = {}
+    return session
+
+
+class TestMonthlyRollupDeltas:
+    """Tests para los deltas del rollup mensual"""
+    
+    def test_created_order_adds_one_to_its_month_and_status(self):
+        assert order_rollup_deltas(_order(), 1)['monthly'] == [
+            {'year': 2025, 'month': 3, 'status': 'Recibido', 'orders_count': 1, 'total_amount': 10.0}
+        ]
+    
+    def test_order_without_created_at_has_no_deltas(self):
+        order = SimpleNamespace(client_id=CLIENT_ID, status='Recibido', total_amount=10.0, created_at=None)
+        
+        assert order_rollup_deltas(order, -1) == {
+            'monthly': [], 'client_daily': [], 'product_daily': [], 'client_monthly': []
+        }
+    
+    def test_status_change_moves_order_between_rows(self):
+        deltas = order_update_rollup_deltas(_order(status='Entregado', total_amount=12.0), _previous())
+        
+        assert sorted(order_monthly_rollup.merge(deltas['monthly']), key=lambda row: row['status']) == [
+            {'year': 2025, 'month': 3, 'status': 'Entregado', 'orders_count': 1, 'total_amount': 12.0},
+            {'year': 2025, 'month': 3, 'status': 'Recibido', 'orders_count': -1, 'total_amount': -10.0}
+        ]
+    
+    def test_unchanged_update_merges_to_nothing(self):
+        deltas = order_update_rollup_deltas(_order(), _previous())
+        
+        assert order_monthly_rollup.merge(deltas['monthly']) == []
+        assert client_daily_rollup.merge(deltas['client_daily']) == []
+    
+    def test_merge_sums_rows_with_same_key(self):
+        deltas = order_rollup_deltas(_order(total_amount=1.5), 1)['monthly'] + order_rollup_deltas(_order(total_amount=2.0), 1)['monthly']
+        
+        assert order_monthly_rollup.merge(deltas) == [
+            {'year': 2025, 'month': 3, 'status': 'Recibido', 'orders_count': 2, 'total_amount': 3.5}
+        ]
+
+
+class TestClientDailyRollupDeltas:
+    """Tests para los deltas del rollup diario por cliente"""
+    
+    def test_created_order_adds_one_to_its_client_day_and_status(self):
+        assert order_rollup_deltas(_order(created_at=datetime(2025, 3, 15, 23, 59)), 1)['client_daily'] == [
+            {'client_id': CLIENT_ID, 'day': date(2025, 3, 15), 'status': 'Recibido', 'orders_count': 1, 'total_amount': 10.0}
+        ]
+    
+    def test_order_without_client_has_no_deltas(self):
+        order = SimpleNamespace(client_id=None, status='Recibido', total_amount=10.0, created_at=datetime(2025, 3, 15))
+        
+        assert order_rollup_deltas(order, 1)['client_daily'] == []
+    
+    def test_client_change_moves_order_between_clients(self):
+        deltas = order_update_rollup_deltas(_order(), _previous(client_id='otro-cliente'))
+        
+        assert sorted(
+            (row['client_id'], row['orders_count'], row['total_amount'])
+            for row in client_daily_rollup.merge(deltas['client_daily'])
+        ) == [(CLIENT_ID, 1, 10.0), ('otro-cliente', -1, -10.0)]
+        assert order_monthly_rollup.merge(deltas['monthly']) == []
+
+
+class TestProductDailyRollupDeltas:
+    """Tests para los deltas del rollup diario por producto"""
+    
+    def test_created_order_adds_its_items(self):
+        order = _order()
+        order.items = [OrderItem(product_id=1, quantity=2), OrderItem(product_id=1, quantity=3), OrderItem(product_id=2, quantity=1)]
+        
+        assert sorted(
+            (row['product_id'], row['quantity_sold'])
+            for row in product_daily_rollup.merge(order_rollup_deltas(order, 1)['product_daily'])
+        ) == [(1, 5), (2, 1)]
+    
+    def test_updates_do_not_touch_product_sales(self):
+        order = _order(status='Entregado')
+        order.items = [OrderItem(product_id=1, quantity=2)]
+        
+        assert 'product_daily' not in order_update_rollup_deltas(order, _previous())
+
+
+class TestClientMonthlyRollupDeltas:
+    """Tests para los deltas del rollup mensual por cliente"""
+    
+    def test_created_order_adds_one_to_its_client_and_month(self):
+        assert order_rollup_deltas(_order(), 1)['client_monthly'] == [
+            {'client_id': CLIENT_ID, 'year': 2025, 'month': 3, 'orders_count': 1}
+        ]
+    
+    def test_client_change_moves_order_between_clients(self):
+        deltas = order_update_rollup_deltas(_order(), _previous(client_id='otro-cliente'))
+        
+        assert sorted(
+            (row['client_id'], row['orders_count'])
+            for row in client_monthly_rollup.merge(deltas['client_monthly'])
+        ) == [(CLIENT_ID, 1), ('otro-cliente', -1)]
+    
+    def test_status_change_merges_to_nothing(self):
+        deltas = order_update_rollup_deltas(_order(status='Entregado'), _previous())
+        
+        assert client_monthly_rollup.merge(deltas['client_monthly']) == []
+
+
+class TestRollupTable:
+    """Tests para la clase base de los rollups"""
+    
+    def test_rollup_must_define_deltas_and_rebuild_select(self):
+        class IncompleteRollup(RollupTable):
+            def deltas(self, order, sign):
+                return []
+        
+        with pytest.raises(TypeError):
+            IncompleteRollup('incompleto', MagicMock(), 'incompleto', ('id',), ('orders_count',))
+
+
+class TestStagedRollups:
+    """Tests para la aplicación de deltas antes del commit"""
+    
+    def test_staged_deltas_are_applied_in_one_upsert(self):
+        session = _session()
+        stage_rollup_deltas(session, order_rollup_deltas(_order(), 1))
+        stage_rollup_deltas(session, order_rollup_deltas(_order(), 1))
+        
+        with patch.object(order_monthly_rollup, 'upsert_statement') as monthly_upsert, \
+                patch.object(client_daily_rollup, 'upsert_statement') as client_daily_upsert:
+            _apply_pending_rollups(session)
+        
+        rows, dialect_name = monthly_upsert.call_args[0]
+        assert rows[0]['orders_count'] == 2
+        assert dialect_name == 'sqlite'
+        assert client_daily_upsert.call_args[0][0][0]['orders_count'] == 2
+        assert session.execute.call_count == 3
+        assert _PENDING_ROLLUPS_KEY not in session.info
+    
+    def test_postgresql_applies_all_rollups_in_one_statement(self):
+        session = _session('postgresql')
+        stage_rollup_deltas(session, order_rollup_deltas(_order(), 1))
+        ctes = [MagicMock(), MagicMock(), MagicMock()]
+        
+        with patch('app.repositories.order_rollups.rollup_upsert_ctes', return_value=ctes) as upsert_ctes:
+            _apply_pending_rollups(session)
+        
+        assert upsert_ctes.call_args[0][0]['monthly'][0]['orders_count'] == 1
+        session.execute.assert_called_once()
+        assert _PENDING_ROLLUPS_KEY not in session.info
+    
+    def test_rollback_discards_staged_deltas(self):
+        session = _session()
+        stage_rollup_deltas(session, order_rollup_deltas(_order(), 1))
+        
+        _discard_pending_rollups(session, MagicMock())
+        _apply_pending_rollups(session)
+        
+        session.execute.assert_not_called()
+    
+    def test_other_dialects_update_then_insert(self):
+        session = _session('mysql')
+        session.execute.return_value.rowcount = 0
+        
+        order_monthly_rollup.apply(session, order_rollup_deltas(_order(), 1)['monthly'])
+        
+        assert session.execute.call_count == 2
+
+
+class TestRepositoryMaintainsRollups:
+    """Tests para el mantenimiento de rollups en OrderRepository"""
+    
+    @pytest.fixture
+    def db_order(self):
+        return SimpleNamespace(
+            id=1, order_number='PED-1', client_id=CLIENT_ID, vendor_id=None, status='Recibido',
+            total_amount=10.0, scheduled_delivery_date=None, assigned_truck=None,
+            created_at=datetime(2025, 3, 15), updated_at=None
+        )
+    
+    def test_update_stages_status_change(self, db_order):
+        session = _session()
+        session.query.return_value.filter.return_value.first.return_value = db_order
+        order = Order(id=1, order_number='PED-1', client_id=CLIENT_ID, status='Entregado', total_amount=10.0)
+        
+        with patch('app.repositories.order_repository.OrderDB'):
+            OrderRepository(session).update(order)
+        
+        staged = order_monthly_rollup.merge(session.info[_PENDING_ROLLUPS_KEY]['monthly'])
+        assert {(row['status'], row['orders_count']) for row in staged} == {('Recibido', -1), ('Entregado', 1)}
+    
+    def test_delete_stages_negative_delta(self, db_order):
+        session = _session()
+        session.query.return_value.filter.return_value.first.return_value = db_order
+        
+        with patch('app.repositories.order_repository.OrderDB'), \
+                patch('app.repositories.order_repository.OrderItemDB'):
+            OrderRepository(session).delete(1)
+        
+        assert session.info[_PENDING_ROLLUPS_KEY]['monthly'][0]['orders_count'] == -1
+    
+    def test_get_monthly_summary_reads_rollup(self):
+        session = MagicMock()
+        query = session.query.return_value.filter.return_value.group_by.return_value.having.return_value.order_by.return_value
+        query.all.return_value = [SimpleNamespace(year=2025, month=3, orders_count=4, total_amount=40.004)]
+        
+        with patch('app.repositories.order_repository.OrderMonthlyStatsDB') as stats_model, \
+                patch('sqlalchemy.func') as func:
+            month_index = stats_model.year.__mul__.return_value.__add__.return_value
+            month_index.__ge__.return_value = MagicMock()
+            month_index.__le__.return_value = MagicMock()
+            func.sum.return_value.__gt__.return_value = MagicMock()
+            result = OrderRepository(session).get_monthly_summary(datetime(2024, 4, 1), datetime(2025, 3, 31))
+        
+        assert result == [{'year': 2025, 'month': 3, 'orders_count': 4, 'total_amount': 40.0}]
+    
+    def test_get_top_products_sold_filters_window(self):
+        session = MagicMock()
+        query = session.query.return_value.filter.return_value.group_by.return_value.order_by.return_value
+        query.limit.return_value.all.return_value = [SimpleNamespace(product_id=1, total_sold=7)]
+        
+        with patch('app.repositories.order_repository.ProductDailyStatsDB') as stats_model:
+            stats_model.day.__ge__.return_value = MagicMock()
+            result = OrderRepository(session).get_top_products_sold(limit=5, since=date(2025, 3, 1))
+        
+        stats_model.day.__ge__.assert_called_once_with(date(2025, 3, 1))
+        query.limit.assert_called_once_with(5)
+        assert result == [{'product_id': 1, 'total_sold': 7}]
+    
+    def test_get_orders_monthly_summary_by_client_ids_filters_whole_days(self):
+        session = MagicMock()
+        query = session.query.return_value.filter.return_value.group_by.return_value.order_by.return_value
+        query.all.return_value = [SimpleNamespace(year=2025.0, month=3.0, orders_count=2, total_amount=20.0)]
+        
+        with patch('app.repositories.order_repository.ClientDailyStatsDB') as stats_model:
+            result = OrderRepository(session).get_orders_monthly_summary_by_client_ids(
+                [CLIENT_ID], datetime(2024, 4, 1), datetime(2025, 3, 31, 18, 30)
+            )
+        
+        stats_model.day.between.assert_called_once_with(date(2024, 4, 1), date(2025, 3, 31))
+        assert result == [{'year': 2025, 'month': 3, 'orders_count': 2, 'total_amount': 20.0}]
+    
+    def test_get_clients_summary_by_client_ids_averages_from_totals(self):
+        session = MagicMock()
+        session.query.return_value.filter.return_value.scalar.return_value = 1
+        query = session.query.return_value.filter.return_value.group_by.return_value.order_by.return_value
+        query.offset.return_value.limit.return_value.all.return_value = [
+            SimpleNamespace(client_id=CLIENT_ID, orders_count=4, total_amount=50.0)
+        ]
+        
+        with patch('app.repositories.order_repository.ClientDailyStatsDB'):
+            clients, total = OrderRepository(session).get_clients_summary_by_client_ids([CLIENT_ID], 10, 0)
+        
+        assert total == 1
+        assert clients == [{'client_id': CLIENT_ID, 'orders_count': 4, 'total_amount': 50.0, 'average_order_amount': 12.5}]
+
+
+class TestRebuildRollups:
+    """Tests para la reconstrucción de rollups"""
+    
+    def test_rebuild_locks_orders_on_postgresql_and_resets_caches(self):
+        session = _session('postgresql')
+        session.execute.return_value.scalar.return_value = 12
+        
+        with patch('app.models.db_models.OrderDB'), \
+                patch('sqlalchemy.text') as text, \
+                patch('app.repositories.order_rollups.emit_order_events') as emit:
+            rows = rebuild_rollup(session, order_monthly_rollup)
+        
+        assert rows == 12
+        text.assert_called_once_with("LOCK TABLE orders IN SHARE MODE")
+        assert session.execute.call_args_list[0][0][0] is text.return_value
+        assert emit.call_args[0][1][0]['type'] == 'cache_reset'
+    
+    def test_rebuild_command(self):
+        app = Flask(__name__)
+        register_commands(app)
+        session = MagicMock()
+        
+        with patch('app.config.database.SessionLocal', return_value=session), \
+                patch('app.repositories.order_rollups.rebuild_rollup', return_value=12) as rebuild:
+            result = app.test_cli_runner().invoke(args=['rollups', 'rebuild'])
+        
+        assert result.exit_code == 0
+        assert "Rollup 'monthly' reconstruido: 12 filas" in result.output
+        assert "Rollup 'client_daily' reconstruido: 12 filas" in result.output
+        assert [call[0][1] for call in rebuild.call_args_list] == [
+            order_monthly_rollup, client_daily_rollup, product_daily_rollup, client_monthly_rollup
+        ]
+        assert session.commit.call_count == 4
+        session.close.assert_called_once()
+    
+    def test_rebuild_command_rejects_unknown_rollup(self):
+        app = Flask(__name__)
+        register_commands(app)
+        
+        result = app.test_cli_runner().invoke(args=['rollups', 'rebuild', '--rollup', 'otro'])
+        
+        assert result.exit_code != 0
+        assert 'Rollups desconocidos: otro' in result.output
+    
+    def test_backfill_rebuilds_only_new_rollup_tables(self):
+        sessions = [MagicMock(), MagicMock()]
+        existing_tables = {'orders', 'order_items', 'order_monthly_stats', 'product_daily_stats'}
+        
+        with patch('app.repositories.order_rollups.rebuild_rollup', return_value=3) as rebuild:
+            rebuilt = backfill_new_rollups(MagicMock(side_effect=sessions), existing_tables)
+        
+        assert rebuilt == ['client_daily', 'client_monthly']
+        assert [call[0][1] for call in rebuild.call_args_list] == [client_daily_rollup, client_monthly_rollup]
+        for session in sessions:
+            session.commit.assert_called_once()
+            session.close.assert_called_once()
+    
+    def test_backfill_failure_is_rolled_back_and_skipped(self):
+        failing, working = MagicMock(), MagicMock()
+        existing_tables = {'orders', 'order_monthly_stats', 'product_daily_stats'}
+        
+        with patch('app.repositories.order_rollups.rebuild_rollup', side_effect=[Exception("duplicate key"), 5]):
+            rebuilt = backfill_new_rollups(MagicMock(side_effect=[failing, working]), existing_tables)
+        
+        assert rebuilt == ['client_monthly']
+        failing.rollback.assert_called_once()
+        failing.commit.assert_not_called()
+        failing.close.assert_called_once()
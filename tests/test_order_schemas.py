@@ -0,0 +1,115 @@
+"""
+Tests para CreateOrderSchema y load_create_order_command
+"""
+import pytest
+from datetime import datetime, timedelta
+from app.schemas.order_schemas import CreateOrderCommand, OrderItemCommand, load_create_order_command
+from app.exceptions.custom_exceptions import OrderValidationError
+
+
+class TestLoadCreateOrderCommand:
+    """Tests para la validación en una sola pasada del cuerpo de creación de pedidos"""
+    
+    @pytest.fixture
+    def valid_payload(self):
+        return {
+            'client_id': '123e4567-e89b-12d3-a456-426614174000',
+            'vendor_id': '',
+            'total_amount': 150.0,
+            'scheduled_delivery_date': '2099-12-25T10:00:00Z',
+            'items': [{'product_id': 1, 'quantity': 2}, {'product_id': 2, 'quantity': 1}],
+            'campo_desconocido': 'se ignora'
+        }
+    
+    def test_load_valid_payload_returns_typed_command(self, valid_payload):
+        command = load_create_order_command(valid_payload)
+        
+        assert isinstance(command, CreateOrderCommand)
+        assert command.client_id == valid_payload['client_id']
+        assert command.vendor_id is None
+        assert command.total_amount == 150.0
+        assert isinstance(command.scheduled_delivery_date, datetime)
+        assert command.scheduled_delivery_date.tzinfo is not None
+        assert command.items == [OrderItemCommand(1, 2), OrderItemCommand(2, 1)]
+        assert command.inventory_items() == [
+            {'product_id': 1, 'quantity': 2},
+            {'product_id': 2, 'quantity': 1}
+        ]
+    
+    def test_command_uses_slots(self, valid_payload):
+        command = load_create_order_command(valid_payload)
+        
+        assert not hasattr(command, '__dict__')
+        assert not hasattr(command.items[0], '__dict__')
+    
+    @pytest.mark.parametrize('changes, expected', [
+        ({'client_id': None}, 'Debe proporcionar al menos client_id o vendor_id'),
+        ({'client_id': 'no-es-uuid'}, 'El client_id debe ser un UUID válido'),
+        ({'vendor_id': 123}, 'El vendor_id debe ser un UUID válido'),
+        ({'items': None}, 'El pedido debe tener al menos un item'),
+        ({'items': []}, 'El pedido debe tener al menos un item'),
+        ({'items': 'no-es-lista'}, 'El pedido debe tener al menos un item'),
+        ({'total_amount': 0}, 'El total_amount es obligatorio'),
+        ({'total_amount': '150'}, 'El total_amount debe ser un número mayor a 0'),
+        ({'total_amount': True}, 'El total_amount debe ser un número mayor a 0'),
+        ({'scheduled_delivery_date': None}, 'El scheduled_delivery_date es obligatorio'),
+        ({'scheduled_delivery_date': 'mañana'}, 'El scheduled_delivery_date debe tener formato ISO 8601 válido'),
+        ({'scheduled_delivery_date': '2020-01-01T10:00:00Z'}, 'La fecha de entrega no puede ser en el pasado'),
+        ({'items': [{'quantity': 2}]}, 'Cada item debe tener un product_id (item 1)'),
+        ({'items': [{'product_id': 1, 'quantity': 1}, {'product_id': 2, 'quantity': 0}]},
+         "Cada item debe tener una cantidad válida mayor a 0 en 'quantity' (item 2)"),
+        ({'items': [{'product_id': 1, 'quantity': '2'}]}, "Cada item debe tener una cantidad válida mayor a 0 en 'quantity' (item 1)"),
+        ({'items': ['no-es-objeto']}, 'Cada item debe ser un objeto JSON (item 1)'),
+    ])
+    def test_load_invalid_payload_raises_first_error(self, valid_payload, changes, expected):
+        valid_payload.update(changes)
+        
+        with pytest.raises(OrderValidationError) as exc_info:
+            load_create_order_command(valid_payload)
+        
+        assert str(exc_info.value).startswith(expected)
+    
+    def test_previous_item_inputs_are_still_accepted(self, valid_payload):
+        valid_payload['items'] = [{'product_id': 1, 'quantity': 2.0}, {'product_id': '7', 'quantity': 1.5}]
+        
+        command = load_create_order_command(valid_payload)
+        
+        assert command.items == [OrderItemCommand(1, 2), OrderItemCommand('7', 1.5)]
+        assert isinstance(command.items[0].quantity, int)
+    
+    def test_item_errors_come_after_field_errors(self, valid_payload):
+        valid_payload['items'] = [{'quantity': 2}]
+        valid_payload['total_amount'] = -1
+        
+        with pytest.raises(OrderValidationError) as exc_info:
+            load_create_order_command(valid_payload)
+        
+        assert str(exc_info.value) == 'El total_amount debe ser un número mayor a 0'
+    
+    def test_missing_fields_are_reported_in_legacy_order(self):
+        with pytest.raises(OrderValidationError) as exc_info:
+            load_create_order_command({'client_id': '123e4567-e89b-12d3-a456-426614174000', 'items': []})
+        
+        assert str(exc_info.value) == 'El pedido debe tener al menos un item'
+    
+    def test_missing_items_message_mentions_field(self, valid_payload):
+        del valid_payload['items']
+        
+        with pytest.raises(OrderValidationError) as exc_info:
+            load_create_order_command(valid_payload)
+        
+        assert "'items'" in str(exc_info.value)
+    
+    @pytest.mark.parametrize('body', [None, [], ['pedido'], 'pedido'])
+    def test_non_object_body_is_rejected(self, body):
+        with pytest.raises(OrderValidationError) as exc_info:
+            load_create_order_command(body)
+        
+        assert 'Se requiere un cuerpo JSON' in str(exc_info.value)
+    
+    def test_naive_future_date_is_accepted(self, valid_payload):
+        valid_payload['scheduled_delivery_date'] = (datetime.now() + timedelta(days=1)).isoformat()
+        
+        command = load_create_order_command(valid_payload)
+        
+        assert command.scheduled_delivery_date.tzinfo is None
@@ -0,0 +1,62 @@
+"""
+Tests para los modelos compactos y serialize_orders
+"""
+import pytest
+from datetime import datetime
+from app.models.order import Order, serialize_orders
+from app.models.order_item import OrderItem
+
+
+class TestSlottedModels:
+    """Tests para los modelos de dominio con __slots__"""
+    
+    def test_order_has_no_instance_dict(self):
+        order = Order(order_number="PED-20250101-00001")
+        
+        assert not hasattr(order, '__dict__')
+        with pytest.raises(AttributeError):
+            order.campo_desconocido = 'valor'
+    
+    def test_order_item_has_no_instance_dict(self):
+        item = OrderItem(product_id=1, quantity=2)
+        
+        assert not hasattr(item, '__dict__')
+        with pytest.raises(AttributeError):
+            item.campo_desconocido = 'valor'
+
+
+class TestSerializeOrders:
+    """Tests para serialize_orders"""
+    
+    def _build_order(self, order_id, scheduled_delivery_date, items=2):
+        order = Order(
+            id=order_id,
+            order_number=f"PED-20250101-{order_id:05d}",
+            client_id='123e4567-e89b-12d3-a456-426614174000',
+            status='En Preparación',
+            total_amount=10.5 * order_id,
+            scheduled_delivery_date=scheduled_delivery_date,
+            assigned_truck='CAM-001',
+            created_at=datetime(2025, 1, 1, 8, 0, order_id),
+            updated_at=datetime(2025, 1, 1, 9, 0, order_id)
+        )
+        for product_id in range(1, items + 1):
+            item = OrderItem(id=order_id * 10 + product_id, product_id=product_id, quantity=product_id, order_id=order_id)
+            item.product_name = f"Producto {product_id}"
+            item.unit_price = 2.5
+            order.items.append(item)
+        return order
+    
+    def test_serialize_orders_matches_to_dict(self):
+        shared_date = datetime(2025, 12, 25, 10, 0)
+        orders = [
+            self._build_order(1, shared_date),
+            self._build_order(2, shared_date, items=0),
+            self._build_order(3, None),
+            self._build_order(4, datetime(2025, 12, 26, 10, 0), items=3)
+        ]
+        
+        assert serialize_orders(orders) == [order.to_dict() for order in orders]
+    
+    def test_serialize_orders_empty_list(self):
+        assert serialize_orders([]) == []
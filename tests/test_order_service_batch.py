@@ -0,0 +1,153 @@
+"""
+Tests para el método create_orders_batch del OrderService
+"""
+import pytest
+from unittest.mock import MagicMock, patch
+from app.services.order_service import OrderService
+from app.repositories.order_repository import OrderRepository
+from app.exceptions.custom_exceptions import OrderBusinessLogicError, OrderNumberConflictError
+
+
+class TestOrderServiceCreateOrdersBatch:
+    """Tests para create_orders_batch"""
+    
+    @pytest.fixture
+    def mock_order_repository(self):
+        repository = MagicMock(spec=OrderRepository)
+        repository.create_many.side_effect = lambda orders: orders
+        repository.next_order_sequences.side_effect = lambda count=1: list(range(1, count + 1))
+        return repository
+    
+    @pytest.fixture
+    def mock_inventory_integration(self):
+        return MagicMock()
+    
+    @pytest.fixture
+    def order_service(self, mock_order_repository, mock_inventory_integration):
+        with patch('app.services.order_service.InventoryService'):
+            with patch('app.services.order_service.InventoryIntegration'):
+                with patch('app.services.order_service.AuthService'):
+                    with patch('app.services.order_service.AuthIntegration'):
+                        service = OrderService(mock_order_repository)
+                        service.inventory_integration = mock_inventory_integration
+                        return service
+    
+    def _order_data(self, items, client_id='123e4567-e89b-12d3-a456-426614174000'):
+        return {
+            'client_id': client_id,
+            'total_amount': 100.0,
+            'scheduled_delivery_date': '2099-12-25T10:00:00Z',
+            'items': items
+        }
+    
+    def test_create_orders_batch_aggregates_stock_per_product(self, order_service, mock_inventory_integration, mock_order_repository):
+        orders_data = [
+            self._order_data([{'product_id': 1, 'quantity': 2}, {'product_id': 2, 'quantity': 1}]),
+            self._order_data([{'product_id': 1, 'quantity': 3}]),
+            self._order_data([{'product_id': 2, 'quantity': 4}, {'product_id': 3, 'quantity': 5}])
+        ]
+        
+        results = order_service.create_orders_batch(orders_data)
+        
+        expected_items = [
+            {'product_id': 1, 'quantity': 5},
+            {'product_id': 2, 'quantity': 5},
+            {'product_id': 3, 'quantity': 5}
+        ]
+        mock_inventory_integration.verify_products_availability.assert_called_once_with(expected_items)
+        mock_inventory_integration.update_products_stock_with_compensation.assert_called_once_with(expected_items)
+        mock_order_repository.create_many.assert_called_once()
+        assert all(result['success'] for result in results)
+        assert [result['index'] for result in results] == [0, 1, 2]
+    
+    def test_create_orders_batch_assigns_distinct_order_numbers(self, order_service):
+        orders_data = [self._order_data([{'product_id': 1, 'quantity': 1}]) for _ in range(20)]
+        
+        results = order_service.create_orders_batch(orders_data)
+        
+        order_numbers = [result['order'].order_number for result in results]
+        assert len(set(order_numbers)) == 20
+    
+    def test_create_orders_batch_reports_invalid_orders_per_index(self, order_service, mock_inventory_integration, mock_order_repository):
+        orders_data = [
+            self._order_data([{'product_id': 1, 'quantity': 2}]),
+            self._order_data([]),
+            'no es un pedido',
+            self._order_data([{'product_id': 2, 'quantity': 1}], client_id='no-es-uuid')
+        ]
+        
+        results = order_service.create_orders_batch(orders_data)
+        
+        assert results[0]['success'] is True
+        assert results[1] == {'index': 1, 'success': False, 'error': 'El pedido debe tener al menos un item'}
+        assert results[2]['success'] is False
+        assert results[3]['success'] is False
+        assert 'UUID' in results[3]['error']
+        mock_inventory_integration.verify_products_availability.assert_called_once_with([{'product_id': 1, 'quantity': 2}])
+        created = mock_order_repository.create_many.call_args[0][0]
+        assert len(created) == 1
+    
+    def test_create_orders_batch_all_invalid_skips_inventory_and_db(self, order_service, mock_inventory_integration, mock_order_repository):
+        results = order_service.create_orders_batch([self._order_data([]), {}])
+        
+        assert not any(result['success'] for result in results)
+        mock_inventory_integration.verify_products_availability.assert_not_called()
+        mock_inventory_integration.update_products_stock_with_compensation.assert_not_called()
+        mock_order_repository.create_many.assert_not_called()
+    
+    def test_create_orders_batch_insufficient_stock_fails_batch(self, order_service, mock_inventory_integration, mock_order_repository):
+        mock_inventory_integration.verify_products_availability.side_effect = OrderBusinessLogicError("Stock insuficiente")
+        
+        with pytest.raises(OrderBusinessLogicError) as exc_info:
+            order_service.create_orders_batch([self._order_data([{'product_id': 1, 'quantity': 2}])])
+        
+        assert "Stock insuficiente" in str(exc_info.value)
+        mock_inventory_integration.update_products_stock_with_compensation.assert_not_called()
+        mock_order_repository.create_many.assert_not_called()
+    
+    def test_create_orders_batch_repository_error(self, order_service, mock_order_repository):
+        mock_order_repository.create_many.side_effect = Exception("Error de base de datos")
+        
+        with pytest.raises(OrderBusinessLogicError) as exc_info:
+            order_service.create_orders_batch([self._order_data([{'product_id': 1, 'quantity': 2}])])
+        
+        assert "Error inesperado al crear lote de pedidos" in str(exc_info.value)
+    
+    def test_create_orders_batch_repository_error_restores_stock(self, order_service, mock_inventory_integration, mock_order_repository):
+        mock_order_repository.create_many.side_effect = Exception("Error de base de datos")
+        orders_data = [
+            self._order_data([{'product_id': 1, 'quantity': 2}]),
+            self._order_data([{'product_id': 1, 'quantity': 3}, {'product_id': 2, 'quantity': 1}])
+        ]
+        
+        with pytest.raises(OrderBusinessLogicError):
+            order_service.create_orders_batch(orders_data)
+        
+        mock_inventory_integration.compensate_products_stock.assert_called_once_with([
+            {'product_id': 1, 'quantity': 5},
+            {'product_id': 2, 'quantity': 1}
+        ])
+    
+    def test_create_orders_batch_renumbers_orders_on_conflict(self, order_service, mock_inventory_integration, mock_order_repository):
+        outcomes = [OrderNumberConflictError("duplicado")]
+        
+        def create_many(orders):
+            if outcomes:
+                raise outcomes.pop()
+            return orders
+        
+        mock_order_repository.create_many.side_effect = create_many
+        mock_order_repository.next_order_sequences.side_effect = [[1, 2], [101, 102]]
+        
+        results = order_service.create_orders_batch([
+            self._order_data([{'product_id': 1, 'quantity': 2}]),
+            self._order_data([{'product_id': 2, 'quantity': 1}])
+        ])
+        
+        assert [result['order'].order_number[-5:] for result in results] == ['00101', '00102']
+        mock_inventory_integration.compensate_products_stock.assert_not_called()
+    
+    def test_create_orders_batch_success_does_not_restore_stock(self, order_service, mock_inventory_integration):
+        order_service.create_orders_batch([self._order_data([{'product_id': 1, 'quantity': 2}])])
+        
+        mock_inventory_integration.compensate_products_stock.assert_not_called()
@@ -7,6 +7,7 @@ from datetime import datetime, timedelta
 from app.services.order_service import OrderService
 from app.repositories.order_repository import OrderRepository
 from app.exceptions.custom_exceptions import OrderValidationError, OrderBusinessLogicError
+from app.schemas.order_schemas import CreateOrderCommand, OrderItemCommand
 
 
 class TestOrderServiceCoverage:
@@ -15,7 +16,9 @@ class TestOrderServiceCoverage:
     @pytest.fixture
     def mock_order_repository(self):
         """Mock del OrderRepository"""
-        return MagicMock(spec=OrderRepository)
+        repository = MagicMock(spec=OrderRepository)
+        repository.next_order_sequences.return_value = [1]
+        return repository
     
     @pytest.fixture
     def mock_inventory_service(self):
@@ -69,6 +72,28 @@ class TestOrderServiceCoverage:
         mock_inventory_integration.update_products_stock_with_compensation.assert_called_once()
         mock_order_repository.create.assert_called_once()
     
+    def test_create_order_from_command_skips_revalidation(self, order_service, mock_order_repository, mock_inventory_integration):
+        """Test: Un comando ya validado se usa directamente sin volver a validar el pedido"""
+        command = CreateOrderCommand(
+            client_id='123e4567-e89b-12d3-a456-426614174000',
+            vendor_id=None,
+            total_amount=150.0,
+            scheduled_delivery_date=datetime.now() + timedelta(days=1),
+            items=[OrderItemCommand(product_id=1, quantity=2)]
+        )
+        mock_order_repository.create.side_effect = lambda order: order
+        
+        with patch('app.services.order_service.load_create_order_command') as mock_load, \
+                patch('app.services.order_service.Order.validate') as mock_validate:
+            result = order_service.create_order(command)
+        
+        mock_load.assert_not_called()
+        mock_validate.assert_not_called()
+        mock_inventory_integration.verify_products_availability.assert_called_once_with([{'product_id': 1, 'quantity': 2}])
+        assert result.client_id == command.client_id
+        assert result.scheduled_delivery_date == command.scheduled_delivery_date
+        assert [(item.product_id, item.quantity) for item in result.items] == [(1, 2)]
+    
     def test_create_order_missing_client_and_vendor(self, order_service):
         """Test: Error cuando faltan client_id y vendor_id"""
         order_data = {
@@ -4,10 +4,27 @@ Incluye tests con mocks completos y tests que ejecutan código real
 """
 import pytest
 from unittest.mock import MagicMock, Mock, patch
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from app.services.order_service import OrderService
 from app.repositories.order_repository import OrderRepository
 from app.exceptions.custom_exceptions import OrderBusinessLogicError
+from app.utils.time_buckets import iter_buckets
+
+
+def _time_buckets(monthly_data):
+    """Simula get_order_time_buckets: todos los meses del rango, con cero los que no tienen pedidos"""
+    by_month = {date(item['year'], item['month'], 1): item for item in monthly_data}
+    
+    def get_order_time_buckets(start_date, end_date, granularity, **filters):
+        return [
+            {
+                'bucket_start': start,
+                'orders_count': by_month[start]['orders_count'] if start in by_month else 0,
+                'total_amount': by_month[start]['total_amount'] if start in by_month else 0.0
+            }
+            for start in iter_buckets(start_date, end_date, granularity)
+        ]
+    return get_order_time_buckets
 
 
 class TestOrderServiceMonthlyReport:
@@ -218,7 +235,7 @@ class TestOrderServiceMonthlyReportReal:
             {'year': 2025, 'month': 2, 'orders_count': 3, 'total_amount': 800.75},
             {'year': 2025, 'month': 10, 'orders_count': 8, 'total_amount': 4000.0}
         ]
-        mock_order_repository.get_monthly_summary.return_value = mock_monthly_data
+        mock_order_repository.get_order_time_buckets.side_effect = _time_buckets(mock_monthly_data)
 
         result = order_service.get_monthly_report()
 
@@ -242,11 +259,11 @@ class TestOrderServiceMonthlyReportReal:
             assert 'orders_count' in month_data
             assert 'total_amount' in month_data
         
-        mock_order_repository.get_monthly_summary.assert_called_once()
+        mock_order_repository.get_order_time_buckets.assert_called_once()
     
     def test_real_get_monthly_report_without_data(self, order_service, mock_order_repository):
         """Test: Ejecutar código real sin datos"""
-        mock_order_repository.get_monthly_summary.return_value = []
+        mock_order_repository.get_order_time_buckets.side_effect = _time_buckets([])
 
         result = order_service.get_monthly_report()
 
@@ -268,7 +285,7 @@ class TestOrderServiceMonthlyReportReal:
         mock_monthly_data = [
             {'year': current_year, 'month': current_month, 'orders_count': 5, 'total_amount': 2000.0}
         ]
-        mock_order_repository.get_monthly_summary.return_value = mock_monthly_data
+        mock_order_repository.get_order_time_buckets.side_effect = _time_buckets(mock_monthly_data)
 
         result = order_service.get_monthly_report()
 
@@ -286,7 +303,7 @@ class TestOrderServiceMonthlyReportReal:
             {'year': current_year - 1, 'month': 12, 'orders_count': 5, 'total_amount': 1000.0},
             {'year': current_year, 'month': 1, 'orders_count': 8, 'total_amount': 1500.0}
         ]
-        mock_order_repository.get_monthly_summary.return_value = mock_monthly_data
+        mock_order_repository.get_order_time_buckets.side_effect = _time_buckets(mock_monthly_data)
 
         result = order_service.get_monthly_report()
 
@@ -300,7 +317,7 @@ class TestOrderServiceMonthlyReportReal:
     
     def test_real_get_monthly_report_spanish_month_names(self, order_service, mock_order_repository):
         """Test: Verificar nombres de meses en español (código real)"""
-        mock_order_repository.get_monthly_summary.return_value = []
+        mock_order_repository.get_order_time_buckets.side_effect = _time_buckets([])
 
         result = order_service.get_monthly_report()
 
@@ -318,7 +335,7 @@ class TestOrderServiceMonthlyReportReal:
             {'year': 2025, 'month': 2, 'orders_count': 5, 'total_amount': 1000.0},
             {'year': 2025, 'month': 3, 'orders_count': 15, 'total_amount': 3000.0}
         ]
-        mock_order_repository.get_monthly_summary.return_value = mock_monthly_data
+        mock_order_repository.get_order_time_buckets.side_effect = _time_buckets(mock_monthly_data)
 
         result = order_service.get_monthly_report()
 
@@ -330,7 +347,7 @@ class TestOrderServiceMonthlyReportReal:
     
     def test_real_get_monthly_report_repository_exception(self, order_service, mock_order_repository):
         """Test: Manejar excepción del repositorio (código real)"""
-        mock_order_repository.get_monthly_summary.side_effect = Exception("Database error")
+        mock_order_repository.get_order_time_buckets.side_effect = Exception("Database error")
 
         with pytest.raises(OrderBusinessLogicError) as exc_info:
             order_service.get_monthly_report()
@@ -340,7 +357,7 @@ class TestOrderServiceMonthlyReportReal:
     def test_real_get_monthly_report_chronological_order(self, order_service, mock_order_repository):
         """Test: Verificar orden cronológico (código real)"""
 
-        mock_order_repository.get_monthly_summary.return_value = []
+        mock_order_repository.get_order_time_buckets.side_effect = _time_buckets([])
 
         result = order_service.get_monthly_report()
 
@@ -356,7 +373,7 @@ class TestOrderServiceMonthlyReportReal:
     def test_real_get_monthly_report_label_format(self, order_service, mock_order_repository):
         """Test: Verificar formato de labels (código real)"""
 
-        mock_order_repository.get_monthly_summary.return_value = []
+        mock_order_repository.get_order_time_buckets.side_effect = _time_buckets([])
 
         result = order_service.get_monthly_report()
 
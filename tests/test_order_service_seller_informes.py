@@ -3,11 +3,28 @@ Tests para los métodos de informes por vendedor del OrderService
 """
 import pytest
 from unittest.mock import MagicMock, patch
-from datetime import datetime
+from datetime import date, datetime
 from app.services.order_service import OrderService
 from app.repositories.order_repository import OrderRepository
 from app.exceptions.custom_exceptions import OrderBusinessLogicError
 from app.models.db_models import OrderStatus
+from app.utils.time_buckets import iter_buckets
+
+
+def _time_buckets(monthly_data):
+    """Simula get_order_time_buckets: todos los meses del rango, con cero los que no tienen pedidos"""
+    by_month = {date(item['year'], item['month'], 1): item for item in monthly_data}
+    
+    def get_order_time_buckets(start_date, end_date, granularity, **filters):
+        return [
+            {
+                'bucket_start': start,
+                'orders_count': by_month[start]['orders_count'] if start in by_month else 0,
+                'total_amount': by_month[start]['total_amount'] if start in by_month else 0.0
+            }
+            for start in iter_buckets(start_date, end_date, granularity)
+        ]
+    return get_order_time_buckets
 
 
 class TestOrderServiceSellerStatusSummary:
@@ -641,7 +658,7 @@ class TestOrderServiceSellerMonthlyReportReal:
         mock_monthly_data = [
             {'year': current_year, 'month': current_month, 'orders_count': 5, 'total_amount': 2000.0}
         ]
-        mock_order_repository.get_orders_monthly_summary_by_client_ids.return_value = mock_monthly_data
+        mock_order_repository.get_order_time_buckets.side_effect = _time_buckets(mock_monthly_data)
         
         result = order_service.get_seller_monthly_report('seller-123')
         
@@ -658,10 +675,11 @@ class TestOrderServiceSellerMonthlyReportReal:
         assert first_month['orders_count'] == 5
         
         mock_auth_integration.get_assigned_clients.assert_called_once_with('seller-123')
-        assert mock_order_repository.get_orders_monthly_summary_by_client_ids.called
+        assert mock_order_repository.get_order_time_buckets.called
     
     def test_real_get_seller_monthly_report_without_clients(self, order_service, mock_order_repository, mock_auth_integration):
         mock_auth_integration.get_assigned_clients.return_value = []
+        mock_order_repository.get_order_time_buckets.side_effect = _time_buckets([])
         
         result = order_service.get_seller_monthly_report('seller-123')
         
@@ -676,11 +694,11 @@ class TestOrderServiceSellerMonthlyReportReal:
             assert month_data['total_amount'] == 0.0
         
         mock_auth_integration.get_assigned_clients.assert_called_once_with('seller-123')
-        mock_order_repository.get_orders_monthly_summary_by_client_ids.assert_not_called()
+        assert mock_order_repository.get_order_time_buckets.call_args.kwargs['client_ids'] == []
     
     def test_real_get_seller_monthly_report_all_months_present(self, order_service, mock_order_repository, mock_auth_integration):
         mock_auth_integration.get_assigned_clients.return_value = ['client-1']
-        mock_order_repository.get_orders_monthly_summary_by_client_ids.return_value = []
+        mock_order_repository.get_order_time_buckets.side_effect = _time_buckets([])
         
         result = order_service.get_seller_monthly_report('seller-123')
         
@@ -697,7 +715,7 @@ class TestOrderServiceSellerMonthlyReportReal:
     
     def test_real_get_seller_monthly_report_ordered_from_current(self, order_service, mock_order_repository, mock_auth_integration):
         mock_auth_integration.get_assigned_clients.return_value = ['client-1']
-        mock_order_repository.get_orders_monthly_summary_by_client_ids.return_value = []
+        mock_order_repository.get_order_time_buckets.side_effect = _time_buckets([])
         
         result = order_service.get_seller_monthly_report('seller-123')
         
@@ -717,7 +735,7 @@ class TestOrderServiceSellerMonthlyReportReal:
     
     def test_real_get_seller_monthly_report_spanish_month_names(self, order_service, mock_order_repository, mock_auth_integration):
         mock_auth_integration.get_assigned_clients.return_value = ['client-1']
-        mock_order_repository.get_orders_monthly_summary_by_client_ids.return_value = []
+        mock_order_repository.get_order_time_buckets.side_effect = _time_buckets([])
         
         result = order_service.get_seller_monthly_report('seller-123')
         
@@ -732,7 +750,7 @@ class TestOrderServiceSellerMonthlyReportReal:
     
     def test_real_get_seller_monthly_report_label_format(self, order_service, mock_order_repository, mock_auth_integration):
         mock_auth_integration.get_assigned_clients.return_value = ['client-1']
-        mock_order_repository.get_orders_monthly_summary_by_client_ids.return_value = []
+        mock_order_repository.get_order_time_buckets.side_effect = _time_buckets([])
         
         result = order_service.get_seller_monthly_report('seller-123')
         
@@ -744,7 +762,7 @@ class TestOrderServiceSellerMonthlyReportReal:
     
     def test_real_get_seller_monthly_report_repository_exception(self, order_service, mock_order_repository, mock_auth_integration):
         mock_auth_integration.get_assigned_clients.return_value = ['client-1']
-        mock_order_repository.get_orders_monthly_summary_by_client_ids.side_effect = Exception("Database error")
+        mock_order_repository.get_order_time_buckets.side_effect = Exception("Database error")
         
         with pytest.raises(OrderBusinessLogicError) as exc_info:
             order_service.get_seller_monthly_report('seller-123')
@@ -770,7 +788,7 @@ class TestOrderServiceSellerMonthlyReportReal:
             {'year': current_year, 'month': current_month, 'orders_count': 5, 'total_amount': 2000.0},
             {'year': current_year, 'month': current_month - 1 if current_month > 1 else 12, 'orders_count': 3, 'total_amount': 1500.0}
         ]
-        mock_order_repository.get_orders_monthly_summary_by_client_ids.return_value = mock_monthly_data
+        mock_order_repository.get_order_time_buckets.side_effect = _time_buckets(mock_monthly_data)
         
         result = order_service.get_seller_monthly_report('seller-123')
         
@@ -146,8 +146,9 @@ class TestOrderServiceTopClientsReportReal:
     
     @pytest.fixture
     def mock_order_repository(self):
-        """Mock del OrderRepository"""
+        """Mock del OrderRepository (sin instantánea calculada: consulta directa)"""
         mock_repo = MagicMock(spec=OrderRepository)
+        mock_repo.get_top_clients_snapshot.return_value = None
         return mock_repo
     
     @pytest.fixture
@@ -351,4 +352,33 @@ class TestOrderServiceTopClientsReportReal:
         assert len(result['top_clients']) == 3
         assert result['top_clients'][0]['client_id'] == 'client-1'
         mock_auth_integration.get_client_names.assert_called_once_with(['client-1'])
-
+    
+    def test_real_get_top_clients_report_from_snapshot(self, order_service, mock_order_repository, mock_auth_integration):
+        """Test: La instantánea se usa con su período y se informa su antigüedad"""
+        
+        mock_order_repository.get_top_clients_snapshot.return_value = {
+            'window_start': datetime(2025, 1, 10, 8, 0),
+            'window_end': datetime(2025, 4, 10, 8, 0),
+            'refreshed_at': datetime(2025, 4, 10, 8, 0),
+            'top_clients': [{'client_id': 'client-1', 'orders_count': 7}]
+        }
+        mock_auth_integration.get_client_names.return_value = {'client-1': 'Cliente Uno'}
+        
+        with patch('datetime.datetime') as mock_datetime:
+            mock_datetime.now.return_value = datetime(2025, 4, 10, 8, 2, 5)
+            result = order_service.get_top_clients_report()
+        
+        assert result['period'] == {'start_date': '2025-01-10', 'end_date': '2025-04-10', 'months': 3}
+        assert result['snapshot'] == {'refreshed_at': '2025-04-10T08:00:00', 'age_seconds': 125}
+        assert result['top_clients'] == [{'client_id': 'client-1', 'orders_count': 7, 'client_name': 'Cliente Uno'}]
+        mock_order_repository.get_top_clients_last_quarter.assert_not_called()
+    
+    def test_real_get_top_clients_report_without_snapshot_queries_orders(self, order_service, mock_order_repository):
+        """Test: Sin instantánea se consultan los pedidos y snapshot es None"""
+        
+        mock_order_repository.get_top_clients_last_quarter.return_value = []
+        
+        result = order_service.get_top_clients_report()
+        
+        assert result['snapshot'] is None
+        mock_order_repository.get_top_clients_last_quarter.assert_called_once()
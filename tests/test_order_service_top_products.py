@@ -2,10 +2,11 @@
 Tests para el método get_top_products_report del OrderService
 """
 import pytest
+from datetime import date, datetime
 from unittest.mock import MagicMock, patch
 from app.services.order_service import OrderService
 from app.repositories.order_repository import OrderRepository
-from app.exceptions.custom_exceptions import OrderBusinessLogicError
+from app.exceptions.custom_exceptions import OrderBusinessLogicError, OrderValidationError
 
 
 class TestOrderServiceTopProductsReport:
@@ -172,7 +173,7 @@ class TestOrderServiceTopProductsReportReal:
         assert result['top_products'][0]['total_sold'] == 100
         assert result['top_products'][0]['product_name'] == 'Producto Uno'
         
-        mock_order_repository.get_top_products_sold.assert_called_once_with(limit=10)
+        mock_order_repository.get_top_products_sold.assert_called_once_with(limit=10, since=None)
         mock_inventory_integration.get_product_names.assert_called_once_with([1, 2, 3])
     
     def test_real_get_top_products_report_without_data(self, order_service, mock_order_repository):
@@ -276,3 +277,20 @@ class TestOrderServiceTopProductsReportReal:
         
         assert result['top_products'][0]['product_name'] == 'Producto no disponible'
 
+    
+    def test_real_get_top_products_report_window_filters_from_first_day(self, order_service, mock_order_repository, mock_inventory_integration):
+        mock_order_repository.get_top_products_sold.return_value = []
+        
+        with patch('app.services.order_service.datetime') as mock_datetime:
+            mock_datetime.utcnow.return_value = datetime(2025, 3, 30, 12, 0)
+            result = order_service.get_top_products_report('30d')
+        
+        mock_order_repository.get_top_products_sold.assert_called_once_with(limit=10, since=date(2025, 3, 1))
+        assert result['window'] == '30d'
+        assert result['period'] == {'start_date': '2025-03-01', 'end_date': '2025-03-30'}
+    
+    def test_real_get_top_products_report_invalid_window(self, order_service, mock_order_repository):
+        with pytest.raises(OrderValidationError, match="Ventana no válida: 7d"):
+            order_service.get_top_products_report('7d')
+        
+        mock_order_repository.get_top_products_sold.assert_not_called()
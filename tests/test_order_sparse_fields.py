@@ -0,0 +1,180 @@
+"""
+Tests para los listados de pedidos con fields= e include=items
+"""
+import pytest
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+from flask import Flask
+from app.controllers.order_controller import OrderController
+from app.controllers.order_truck_controller import OrderTruckController
+from app.models.order_item import OrderItem
+from app.repositories.order_repository import OrderRepository
+from app.services.order_service import OrderService
+from app.exceptions.custom_exceptions import OrderValidationError, OrderBusinessLogicError
+
+
+class TestServiceIterOrderProjections:
+    """Tests para OrderService.iter_order_projections"""
+    
+    @pytest.fixture
+    def order_service(self):
+        repository = MagicMock(spec=OrderRepository)
+        with patch('app.services.order_service.InventoryService'), \
+                patch('app.services.order_service.InventoryIntegration'), \
+                patch('app.services.order_service.AuthService'), \
+                patch('app.services.order_service.AuthIntegration'):
+            service = OrderService(repository)
+        service.inventory_service.get_product_by_id.side_effect = lambda product_id: {
+            'name': f'Producto {product_id}', 'price': 2.0, 'sku': f'SKU-{product_id}', 'image_url': ''
+        }
+        return service
+    
+    def test_projects_fields_without_loading_items(self, order_service):
+        def chunks(fields, **kwargs):
+            yield [{'order_number': 'PED-1', 'scheduled_delivery_date': datetime(2099, 1, 1, 10, 0)}]
+            yield [{'order_number': 'PED-2', 'scheduled_delivery_date': None}]
+        order_service.order_repository.iter_order_projections.side_effect = chunks
+        
+        result = list(order_service.iter_order_projections(['order_number', 'scheduled_delivery_date'], client_id='c1'))
+        
+        assert result == [
+            [{'order_number': 'PED-1', 'scheduled_delivery_date': '2099-01-01T10:00:00'}],
+            [{'order_number': 'PED-2', 'scheduled_delivery_date': None}]
+        ]
+        order_service.order_repository.iter_order_projections.assert_called_once_with(
+            ['order_number', 'scheduled_delivery_date'], include_items=False, client_id='c1', vendor_id=None,
+            assigned_truck=None, scheduled_delivery_date=None, chunk_size=500
+        )
+        order_service.inventory_service.get_product_by_id.assert_not_called()
+    
+    def test_include_items_enriches_each_product_once(self, order_service):
+        def chunks(fields, **kwargs):
+            yield [
+                {'id': 1, 'items': [OrderItem(product_id=1, quantity=2, order_id=1)]},
+                {'id': 2, 'items': [OrderItem(product_id=1, quantity=1, order_id=2), OrderItem(product_id=2, quantity=1, order_id=2)]}
+            ]
+        order_service.order_repository.iter_order_projections.side_effect = chunks
+        
+        result = list(order_service.iter_order_projections(['id'], ['items'], assigned_truck='CAM-001'))
+        
+        assert result[0][1]['items'][1]['product_name'] == 'Producto 2'
+        assert result[0][0]['items'][0]['unit_price'] == 2.0
+        assert order_service.inventory_service.get_product_by_id.call_count == 2
+        assert order_service.order_repository.iter_order_projections.call_args.kwargs['include_items'] is True
+    
+    @pytest.mark.parametrize('fields,include,message', [
+        (['order_number', 'password'], None, 'Campos no válidos en fields: password'),
+        ([], None, 'Campos no válidos en fields: (vacío)'),
+        (['order_number'], ['client'], 'Valores no válidos en include: client')
+    ])
+    def test_invalid_fields_or_include(self, order_service, fields, include, message):
+        with pytest.raises(OrderValidationError) as exc_info:
+            next(order_service.iter_order_projections(fields, include))
+        
+        assert message in str(exc_info.value)
+        order_service.order_repository.iter_order_projections.assert_not_called()
+    
+    def test_repository_errors_are_wrapped(self, order_service):
+        def chunks(fields, **kwargs):
+            raise Exception("Error de conexión")
+            yield []
+        order_service.order_repository.iter_order_projections.side_effect = chunks
+        
+        with pytest.raises(OrderBusinessLogicError) as exc_info:
+            list(order_service.iter_order_projections(['status']))
+        
+        assert "Error al obtener pedidos" in str(exc_info.value)
+
+
+class TestRepositoryIterOrderProjections:
+    """Tests para OrderRepository.iter_order_projections"""
+    
+    @pytest.fixture
+    def mock_session(self):
+        return MagicMock()
+    
+    @pytest.fixture
+    def order_repository(self, mock_session):
+        with patch('app.repositories.order_repository.OrderDB', new=SimpleNamespace(__table__=MagicMock())), \
+                patch('app.repositories.order_repository.OrderItemDB', new=SimpleNamespace(__table__=MagicMock())):
+            yield OrderRepository(mock_session)
+    
+    def _result(self, *partitions):
+        result = MagicMock()
+        result.partitions.return_value = iter([
+            [SimpleNamespace(_mapping=mapping) for mapping in rows] for rows in partitions
+        ])
+        return result
+    
+    def test_projection_without_items_runs_single_query(self, order_repository, mock_session):
+        result = self._result([{'id': 1, 'status': 'Recibido'}, {'id': 2, 'status': 'Entregado'}])
+        mock_session.execute.return_value = result
+        
+        chunks = list(order_repository.iter_order_projections(['status'], client_id='c1'))
+        
+        assert chunks == [[{'status': 'Recibido'}, {'status': 'Entregado'}]]
+        assert mock_session.execute.call_count == 1
+        result.close.assert_called_once()
+    
+    def test_projection_with_items_loads_items_per_chunk(self, order_repository, mock_session):
+        mock_session.execute.side_effect = [
+            self._result([{'id': 1, 'status': 'Recibido'}], [{'id': 2, 'status': 'Recibido'}]),
+            [SimpleNamespace(id=10, order_id=1, product_id=5, quantity=2)],
+            []
+        ]
+        
+        chunks = list(order_repository.iter_order_projections(['id', 'status'], include_items=True, chunk_size=1))
+        
+        assert chunks[0][0]['id'] == 1
+        assert [(item.id, item.product_id) for item in chunks[0][0]['items']] == [(10, 5)]
+        assert chunks[1][0]['items'] == []
+        assert mock_session.execute.call_count == 3
+
+
+class TestControllersFieldsParameter:
+    """Tests para el parámetro fields en los controladores de listado"""
+    
+    @pytest.fixture
+    def app(self):
+        return Flask(__name__)
+    
+    def _controller(self, controller_class):
+        controller = controller_class()
+        controller.order_service = MagicMock()
+        controller.order_service.iter_order_projections.return_value = (chunk for chunk in [[{'status': 'Recibido'}]])
+        return controller
+    
+    def test_orders_listing_uses_projection(self, app):
+        controller = self._controller(OrderController)
+        
+        with app.test_request_context('/orders?vendor_id=123e4567-e89b-12d3-a456-426614174001&fields=status,total_amount&include=items'):
+            body, status = controller.get()
+        
+        assert status == 200
+        assert body['data'] == [{'status': 'Recibido'}]
+        controller.order_service.iter_order_projections.assert_called_once_with(
+            ['status', 'total_amount'], ['items'], client_id=None, vendor_id='123e4567-e89b-12d3-a456-426614174001', chunk_size=500
+        )
+        controller.order_service.get_orders_by_vendor_id.assert_not_called()
+    
+    def test_truck_listing_streams_projection(self, app):
+        controller = self._controller(OrderTruckController)
+        
+        with app.test_request_context('/orders/by-truck?assigned_truck=CAM-001&fields=status&stream=true'):
+            response = controller.get()
+            body = b''.join(response.response)
+        
+        assert response.is_streamed
+        assert b'"data":[{"status":"Recibido"}]' in body
+        assert controller.order_service.iter_order_projections.call_args.args == (['status'], None)
+    
+    def test_invalid_fields_returns_400(self, app):
+        controller = OrderTruckController()
+        controller.order_service = MagicMock()
+        controller.order_service.iter_order_projections.side_effect = OrderValidationError("Campos no válidos en fields: x")
+        
+        with app.test_request_context('/orders/by-truck?assigned_truck=CAM-001&fields=x'):
+            body, status = controller.get()
+        
+        assert status == 400
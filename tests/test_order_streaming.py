@@ -0,0 +1,214 @@
+"""
+Tests para los listados de pedidos en streaming
+"""
+import json
+import pytest
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+from flask import Flask, Response
+from app.config.database import auto_close_session
+from app.models.order import Order, serialize_orders
+from app.models.order_item import OrderItem
+from app.repositories.order_repository import OrderRepository
+from app.services.order_service import OrderService
+from app.exceptions.custom_exceptions import OrderBusinessLogicError
+from app.utils.json_stream import stream_list_response
+
+
+def _order(order_id, product_ids=(1,)):
+    order = Order(
+        id=order_id,
+        order_number=f"PED-20250101-{order_id:05d}",
+        client_id='123e4567-e89b-12d3-a456-426614174000',
+        total_amount=10.0,
+        scheduled_delivery_date=datetime(2099, 1, 1),
+        assigned_truck='CAM-001',
+        created_at=datetime(2025, 1, 1),
+        updated_at=datetime(2025, 1, 1)
+    )
+    order.items = [OrderItem(product_id=product_id, quantity=1, order_id=order_id) for product_id in product_ids]
+    return order
+
+
+class TestStreamListResponse:
+    """Tests para stream_list_response"""
+    
+    @pytest.fixture
+    def app(self):
+        return Flask(__name__)
+    
+    def _body(self, app, response):
+        with app.test_request_context():
+            return b''.join(response.response)
+    
+    def test_streams_same_envelope_as_success_response(self, app):
+        chunks = [[_order(1), _order(2)], [_order(3)]]
+        
+        def generate():
+            yield from chunks
+        
+        with app.test_request_context():
+            response = stream_list_response(generate(), "Pedidos obtenidos", "Sin pedidos", serialize_orders)
+        
+        assert response.is_streamed
+        assert response.mimetype == 'application/json'
+        assert json.loads(self._body(app, response)) == {
+            'success': True,
+            'message': 'Pedidos obtenidos',
+            'data': serialize_orders(chunks[0] + chunks[1])
+        }
+    
+    def test_empty_listing_uses_empty_message(self, app):
+        with app.test_request_context():
+            response = stream_list_response((chunk for chunk in []), "Pedidos", "Sin pedidos", serialize_orders)
+        
+        assert json.loads(self._body(app, response)) == {'success': True, 'message': 'Sin pedidos', 'data': []}
+    
+    def test_error_in_first_chunk_is_raised_before_streaming(self, app):
+        closed = []
+        
+        def generate():
+            try:
+                raise OrderBusinessLogicError("Error de base de datos")
+                yield []
+            finally:
+                closed.append(True)
+        
+        with app.test_request_context():
+            with pytest.raises(OrderBusinessLogicError):
+                stream_list_response(generate(), "Pedidos", "Sin pedidos", serialize_orders)
+        
+        assert closed == [True]
+    
+    def test_closing_response_closes_chunks(self, app):
+        closed = []
+        
+        def generate():
+            try:
+                yield [_order(1)]
+                yield [_order(2)]
+            finally:
+                closed.append(True)
+        
+        with app.test_request_context():
+            response = stream_list_response(generate(), "Pedidos", "Sin pedidos", serialize_orders)
+            body = iter(response.response)
+            next(body)
+            response.close()
+        
+        assert closed == [True]
+
+
+class TestIterEnrichedOrders:
+    """Tests para OrderService.iter_enriched_orders"""
+    
+    @pytest.fixture
+    def order_service(self):
+        repository = MagicMock(spec=OrderRepository)
+        with patch('app.services.order_service.InventoryService'), \
+                patch('app.services.order_service.InventoryIntegration'), \
+                patch('app.services.order_service.AuthService'), \
+                patch('app.services.order_service.AuthIntegration'):
+            service = OrderService(repository)
+        service.inventory_service.get_product_by_id.side_effect = lambda product_id: {
+            'name': f'Producto {product_id}', 'price': 2.0, 'sku': f'SKU-{product_id}', 'image_url': ''
+        }
+        return service
+    
+    def test_enriches_each_product_once_per_listing(self, order_service):
+        def chunks(**kwargs):
+            yield [_order(1, (1, 2)), _order(2, (1,))]
+            yield [_order(3, (2, 3))]
+        order_service.order_repository.iter_orders_with_items.side_effect = chunks
+        
+        result = list(order_service.iter_enriched_orders(client_id='c1', chunk_size=2))
+        
+        assert [len(chunk) for chunk in result] == [2, 1]
+        assert result[1][0].items[1].product_name == 'Producto 3'
+        assert order_service.inventory_service.get_product_by_id.call_count == 3
+        order_service.order_repository.iter_orders_with_items.assert_called_once_with(
+            client_id='c1', vendor_id=None, assigned_truck=None, scheduled_delivery_date=None, chunk_size=2
+        )
+    
+    def test_repository_errors_are_wrapped(self, order_service):
+        def chunks(**kwargs):
+            raise Exception("Error de conexión")
+            yield []
+        order_service.order_repository.iter_orders_with_items.side_effect = chunks
+        
+        with pytest.raises(OrderBusinessLogicError) as exc_info:
+            list(order_service.iter_enriched_orders(client_id='c1'))
+        
+        assert "Error al obtener pedidos" in str(exc_info.value)
+
+
+class TestIterOrdersWithItems:
+    """Tests para OrderRepository.iter_orders_with_items"""
+    
+    @pytest.fixture
+    def mock_session(self):
+        return MagicMock()
+    
+    @pytest.fixture
+    def order_repository(self, mock_session):
+        with patch('app.repositories.order_repository.OrderDB', new=SimpleNamespace(__table__=MagicMock())), \
+                patch('app.repositories.order_repository.OrderItemDB', new=SimpleNamespace(__table__=MagicMock())):
+            yield OrderRepository(mock_session)
+    
+    def _order_row(self, order_id):
+        return SimpleNamespace(
+            id=order_id, order_number=f"PED-20250101-{order_id:05d}", client_id='c1', vendor_id=None,
+            status='En Preparación', total_amount=10.0, scheduled_delivery_date=datetime(2099, 1, 1),
+            assigned_truck='CAM-001', created_at=datetime(2025, 1, 1), updated_at=datetime(2025, 1, 1)
+        )
+    
+    def test_yields_chunks_with_items_loaded_per_chunk(self, order_repository, mock_session):
+        orders_result = MagicMock()
+        orders_result.partitions.return_value = iter([
+            [self._order_row(1), self._order_row(2)],
+            [self._order_row(3)]
+        ])
+        mock_session.execute.side_effect = [
+            orders_result,
+            [SimpleNamespace(id=10, order_id=1, product_id=5, quantity=2), SimpleNamespace(id=11, order_id=2, product_id=6, quantity=1)],
+            [SimpleNamespace(id=12, order_id=3, product_id=5, quantity=3)]
+        ]
+        
+        chunks = list(order_repository.iter_orders_with_items(client_id='c1', chunk_size=2))
+        
+        assert [[order.id for order in chunk] for chunk in chunks] == [[1, 2], [3]]
+        assert [(item.id, item.product_id) for item in chunks[0][0].items] == [(10, 5)]
+        assert chunks[1][0].items[0].quantity == 3
+        assert mock_session.execute.call_count == 3
+        orders_result.close.assert_called_once()
+
+
+class TestAutoCloseSessionStreaming:
+    """Tests para el cierre diferido de sesión en respuestas en streaming"""
+    
+    class _Controller:
+        @auto_close_session
+        def get(self, response):
+            return response
+    
+    def test_streamed_response_defers_session_close(self):
+        session = MagicMock()
+        response = Response(iter([b'{}']), mimetype='application/json')
+        
+        with patch('app.config.database.SessionLocal', return_value=session), \
+                patch('app.services.order_service.OrderService'):
+            result = self._Controller().get(response)
+        
+        session.close.assert_not_called()
+        result.close()
+        session.close.assert_called_once()
+    
+    def test_regular_response_closes_session_immediately(self):
+        session = MagicMock()
+        
+        with patch('app.config.database.SessionLocal', return_value=session), \
+                patch('app.services.order_service.OrderService'):
+            self._Controller().get(({'success': True}, 200))
+        
+        session.close.assert_called_once()
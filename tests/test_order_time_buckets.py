@@ -0,0 +1,155 @@
+"""
+Tests para la agregación de pedidos por intervalos de tiempo
+"""
+import pytest
+from datetime import date, datetime
+from unittest.mock import MagicMock, patch
+from app.exceptions.custom_exceptions import OrderBusinessLogicError, OrderValidationError
+from app.repositories.order_repository import OrderRepository
+from app.repositories.order_time_buckets import BucketSource, order_time_buckets
+from app.services.order_service import OrderService
+from app.utils.time_buckets import bucket_label, bucket_start, iter_buckets
+
+
+class TestTimeBuckets:
+    """Tests para los intervalos de time_buckets"""
+    
+    def test_bucket_start_matches_date_trunc(self):
+        value = datetime(2025, 8, 14, 17, 30)
+        
+        assert bucket_start(value, 'day') == date(2025, 8, 14)
+        assert bucket_start(value, 'week') == date(2025, 8, 11)
+        assert bucket_start(value, 'month') == date(2025, 8, 1)
+        assert bucket_start(value, 'quarter') == date(2025, 7, 1)
+    
+    def test_iter_buckets_covers_range_across_years(self):
+        assert iter_buckets(date(2024, 11, 20), date(2025, 2, 3), 'month') == [
+            date(2024, 11, 1), date(2024, 12, 1), date(2025, 1, 1), date(2025, 2, 1)
+        ]
+        assert iter_buckets(date(2024, 12, 31), date(2025, 4, 1), 'quarter') == [
+            date(2024, 10, 1), date(2025, 1, 1), date(2025, 4, 1)
+        ]
+        assert iter_buckets(date(2024, 12, 30), date(2025, 1, 12), 'week') == [
+            date(2024, 12, 30), date(2025, 1, 6)
+        ]
+    
+    def test_labels(self):
+        assert bucket_label(date(2025, 1, 15), 'day') == '2025-01-15'
+        assert bucket_label(date(2024, 12, 30), 'week') == 'S01-2025'
+        assert bucket_label(date(2025, 1, 1), 'month') == 'ene-2025'
+        assert bucket_label(date(2025, 10, 1), 'quarter') == 'T4-2025'
+    
+    def test_invalid_granularity(self):
+        with pytest.raises(ValueError):
+            bucket_start(date(2025, 1, 1), 'year')
+
+
+class TestOrderTimeBucketsQuery:
+    """Tests para order_time_buckets fuera de PostgreSQL"""
+    
+    def test_groups_rows_into_buckets_and_fills_gaps(self):
+        session = MagicMock()
+        session.execute.return_value.all.return_value = [
+            (date(2025, 1, 6), 2, 20.0),
+            (date(2025, 1, 8), 1, 5.5),
+            (date(2025, 1, 22), 3, 30.0)
+        ]
+        source = BucketSource('orders', keys=(), day=None, orders_count=None, total_amount=None, filters=[],
+                              row_day=lambda row: row[0])
+        
+        with patch('app.repositories.order_time_buckets.bucket_source', return_value=source):
+            buckets = order_time_buckets(session, 'sqlite', datetime(2025, 1, 1), datetime(2025, 1, 31), 'week')
+        
+        assert [(bucket['bucket_start'], bucket['orders_count'], bucket['total_amount']) for bucket in buckets] == [
+            (date(2024, 12, 30), 0, 0.0),
+            (date(2025, 1, 6), 3, 25.5),
+            (date(2025, 1, 13), 0, 0.0),
+            (date(2025, 1, 20), 3, 30.0),
+            (date(2025, 1, 27), 0, 0.0)
+        ]
+    
+    def test_postgresql_reads_gap_filled_rows(self):
+        session = MagicMock()
+        session.execute.return_value.all.return_value = [
+            MagicMock(bucket=datetime(2025, 1, 1), orders_count=0, total_amount=0),
+            MagicMock(bucket=datetime(2025, 2, 1), orders_count=4, total_amount=12.345)
+        ]
+        
+        with patch('app.repositories.order_time_buckets.bucket_source'), \
+                patch('app.repositories.order_time_buckets.time_buckets_statement') as statement:
+            buckets = order_time_buckets(session, 'postgresql', datetime(2025, 1, 1), datetime(2025, 2, 10), 'month')
+        
+        session.execute.assert_called_once_with(statement.return_value)
+        assert buckets == [
+            {'bucket_start': date(2025, 1, 1), 'orders_count': 0, 'total_amount': 0.0},
+            {'bucket_start': date(2025, 2, 1), 'orders_count': 4, 'total_amount': 12.35}
+        ]
+    
+    def test_empty_client_list_does_not_query(self):
+        session = MagicMock()
+        
+        buckets = OrderRepository(session).get_order_time_buckets(
+            datetime(2025, 1, 1), datetime(2025, 3, 1), 'month', client_ids=[]
+        )
+        
+        assert [bucket['orders_count'] for bucket in buckets] == [0, 0, 0]
+        session.execute.assert_not_called()
+
+
+class TestOrderServiceTimeSeries:
+    """Tests para OrderService.get_orders_time_series"""
+    
+    @pytest.fixture
+    def mock_order_repository(self):
+        return MagicMock(spec=OrderRepository)
+    
+    @pytest.fixture
+    def order_service(self, mock_order_repository):
+        with patch('app.services.order_service.InventoryService'), \
+                patch('app.services.order_service.InventoryIntegration'), \
+                patch('app.services.order_service.AuthService'), \
+                patch('app.services.order_service.AuthIntegration'):
+            return OrderService(mock_order_repository)
+    
+    def test_quarterly_series_with_filters(self, order_service, mock_order_repository):
+        mock_order_repository.get_order_time_buckets.return_value = [
+            {'bucket_start': date(2025, 1, 1), 'orders_count': 3, 'total_amount': 150.0},
+            {'bucket_start': date(2025, 4, 1), 'orders_count': 0, 'total_amount': 0.0}
+        ]
+        
+        result = order_service.get_orders_time_series(
+            '2025-02-01', '2025-05-31', 'quarter', client_ids=['client-1'], statuses=['Entregado'], assigned_truck='CAM-001'
+        )
+        
+        mock_order_repository.get_order_time_buckets.assert_called_once_with(
+            datetime(2025, 2, 1), datetime(2025, 5, 31, 23, 59, 59, 999999), 'quarter',
+            client_ids=['client-1'], statuses=['Entregado'], assigned_truck='CAM-001'
+        )
+        assert result['period'] == {'start_date': '2025-02-01', 'end_date': '2025-05-31'}
+        assert result['summary'] == {'total_orders': 3, 'total_amount': 150.0, 'buckets_with_data': 1}
+        assert result['buckets'][0] == {
+            'start_date': '2025-01-01', 'year': 2025, 'quarter': 1, 'label': 'T1-2025',
+            'orders_count': 3, 'total_amount': 150.0
+        }
+    
+    @pytest.mark.parametrize('kwargs, message', [
+        ({'granularity': 'year'}, "Granularidad no válida"),
+        ({'statuses': ['Perdido']}, "Estados no válidos: Perdido"),
+        ({'start_date': '2025-13-01'}, "formato YYYY-MM-DD"),
+        ({'start_date': '2025-03-01', 'end_date': '2025-01-01'}, "fecha inicial no puede ser posterior"),
+        ({'start_date': '2020-01-01', 'end_date': '2025-01-01', 'granularity': 'day'}, "máximo de 1000 intervalos")
+    ])
+    def test_validation_errors(self, order_service, mock_order_repository, kwargs, message):
+        with pytest.raises(OrderValidationError) as exc_info:
+            order_service.get_orders_time_series(**kwargs)
+        
+        assert message in str(exc_info.value)
+        mock_order_repository.get_order_time_buckets.assert_not_called()
+    
+    def test_repository_errors(self, order_service, mock_order_repository):
+        mock_order_repository.get_order_time_buckets.side_effect = Exception("Database error")
+        
+        with pytest.raises(OrderBusinessLogicError) as exc_info:
+            order_service.get_orders_time_series()
+        
+        assert "Error al generar serie de pedidos" in str(exc_info.value)
@@ -272,3 +272,21 @@ class TestOrderTopClientsController:
                         assert "Error de validación" in response['error']
                         assert "Error de validación en reporte" in response['details']
 
+    
+    def test_get_top_clients_passes_mode(self):
+        """Test: El modo se pasa al servicio"""
+        with patch('app.config.database.SessionLocal') as mock_session_local:
+            mock_session_local.return_value = MagicMock()
+            
+            with patch('app.controllers.order_report_controller.OrderService') as mock_service_class:
+                mock_service = MagicMock()
+                mock_service.get_top_clients_report.return_value = {'mode': 'approx', 'top_clients': []}
+                mock_service_class.return_value = mock_service
+                
+                controller = OrderTopClientsController()
+                
+                with self.app.test_request_context('/orders/reports/top-clients?mode=approx'):
+                    response, status_code = controller.get()
+                    
+                    assert status_code == 200
+                    mock_service.get_top_clients_report.assert_called_once_with(mode='approx')
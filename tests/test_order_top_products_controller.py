@@ -237,3 +237,37 @@ class TestOrderTopProductsController:
                         assert "Error de validación" in response['error']
                         assert "Error de validación en reporte" in response['details']
 
+    
+    def test_get_top_products_passes_window(self):
+        with patch('app.config.database.SessionLocal') as mock_session_local:
+            mock_session_local.return_value = MagicMock()
+            
+            with patch('app.controllers.order_report_controller.OrderService') as mock_service_class:
+                mock_service = MagicMock()
+                mock_service.get_top_products_report.return_value = {'window': '90d', 'top_products': []}
+                mock_service_class.return_value = mock_service
+                
+                controller = OrderTopProductsController()
+                
+                with self.app.test_request_context('/orders/reports/top-products?window=90d'):
+                    response, status_code = controller.get()
+                    
+                    assert status_code == 200
+                    mock_service.get_top_products_report.assert_called_once_with('90d', mode='exact')
+    
+    def test_get_top_products_passes_mode(self):
+        with patch('app.config.database.SessionLocal') as mock_session_local:
+            mock_session_local.return_value = MagicMock()
+            
+            with patch('app.controllers.order_report_controller.OrderService') as mock_service_class:
+                mock_service = MagicMock()
+                mock_service.get_top_products_report.return_value = {'mode': 'approx', 'top_products': []}
+                mock_service_class.return_value = mock_service
+                
+                controller = OrderTopProductsController()
+                
+                with self.app.test_request_context('/orders/reports/top-products?window=30d&mode=approx'):
+                    response, status_code = controller.get()
+                    
+                    assert status_code == 200
+                    mock_service.get_top_products_report.assert_called_once_with('30d', mode='approx')
@@ -0,0 +1,192 @@
+"""
+Tests para el cache de resultados de consultas del repositorio
+"""
+import threading
+import time
+import pytest
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+from app.repositories.order_repository import OrderRepository
+from app.utils.cache_invalidation import client_tag, report_month_tag
+from app.utils.query_cache import QueryCacheRegion, cached_query, month_tags, normalize_cache_arg, query_cache
+
+CLIENT_ID = '123e4567-e89b-12d3-a456-426614174000'
+
+
+class _Repository:
+    """Repositorio mínimo con un método cacheado"""
+    
+    region = QueryCacheRegion()
+    
+    def __init__(self):
+        self.loader = MagicMock(side_effect=lambda client_ids, since=None: [{'clients': list(client_ids)}])
+    
+    @cached_query(entities=lambda client_ids, since=None: [client_tag(client_id) for client_id in client_ids], region=region)
+    def summary(self, client_ids, since=None):
+        return self.loader(client_ids, since)
+
+
+class TestQueryCacheRegion:
+    """Tests para QueryCacheRegion y cached_query"""
+    
+    @pytest.fixture(autouse=True)
+    def reset_region(self):
+        _Repository.region.reset()
+    
+    def test_identical_calls_hit_cache_across_instances(self):
+        first, second = _Repository(), _Repository()
+        
+        assert first.summary([CLIENT_ID]) == second.summary(client_ids=[CLIENT_ID])
+        
+        first.loader.assert_called_once()
+        second.loader.assert_not_called()
+        stats = _Repository.region.stats()['_Repository.summary']
+        assert (stats['hits'], stats['misses'], stats['hit_rate']) == (1, 1, 0.5)
+    
+    def test_returned_value_is_a_copy(self):
+        repository = _Repository()
+        repository.summary([CLIENT_ID])[0]['clients'].append('otro')
+        
+        assert repository.summary([CLIENT_ID]) == [{'clients': [CLIENT_ID]}]
+    
+    def test_entity_version_bump_forces_reload(self):
+        repository = _Repository()
+        repository.summary([CLIENT_ID])
+        
+        _Repository.region.invalidate_tags([client_tag('otro-cliente')])
+        repository.summary([CLIENT_ID])
+        assert repository.loader.call_count == 1
+        
+        _Repository.region.invalidate_tags([client_tag(CLIENT_ID)])
+        repository.summary([CLIENT_ID])
+        assert repository.loader.call_count == 2
+    
+    def test_datetimes_are_truncated_to_the_minute(self):
+        repository = _Repository()
+        
+        repository.summary([CLIENT_ID], since=datetime(2025, 1, 1, 10, 5, 1))
+        repository.summary([CLIENT_ID], since=datetime(2025, 1, 1, 10, 5, 59))
+        repository.summary([CLIENT_ID], since=datetime(2025, 1, 1, 10, 6, 0))
+        
+        assert repository.loader.call_count == 2
+    
+    def test_expired_result_is_reloaded(self):
+        repository = _Repository()
+        with patch('app.utils.query_cache.time.monotonic', return_value=1000.0):
+            repository.summary([CLIENT_ID])
+        with patch('app.utils.query_cache.time.monotonic', return_value=1061.0):
+            repository.summary([CLIENT_ID])
+        
+        assert repository.loader.call_count == 2
+    
+    def test_clear_during_load_discards_result(self):
+        repository = _Repository()
+        
+        def loader(client_ids, since):
+            _Repository.region.clear()
+            return []
+        repository.loader.side_effect = loader
+        repository.summary([CLIENT_ID])
+        repository.loader.side_effect = None
+        repository.summary([CLIENT_ID])
+        
+        assert repository.loader.call_count == 2
+    
+    def test_concurrent_misses_run_a_single_query(self):
+        region = QueryCacheRegion()
+        started, release = threading.Event(), threading.Event()
+        loader = MagicMock()
+        
+        def slow_query():
+            loader()
+            started.set()
+            release.wait(5)
+            return [1]
+        
+        results = []
+        leader = threading.Thread(target=lambda: results.append(region.get_or_load('m', (), (), slow_query)))
+        leader.start()
+        started.wait(5)
+        follower = threading.Thread(target=lambda: results.append(region.get_or_load('m', (), (), slow_query)))
+        follower.start()
+        for _ in range(500):
+            if region.stats()['m']['coalesced']:
+                break
+            time.sleep(0.01)
+        release.set()
+        leader.join(5)
+        follower.join(5)
+        
+        assert results == [[1], [1]]
+        loader.assert_called_once()
+    
+    def test_load_errors_are_not_cached(self):
+        region = QueryCacheRegion()
+        
+        with pytest.raises(Exception, match="Error de conexión"):
+            region.get_or_load('m', (), (), MagicMock(side_effect=Exception("Error de conexión")))
+        
+        assert region.get_or_load('m', (), (), lambda: 'ok') == 'ok'
+    
+    def test_disabled_region_always_queries(self):
+        region = QueryCacheRegion(enabled=False)
+        loader = MagicMock(return_value=1)
+        
+        region.get_or_load('m', (), (), loader)
+        region.get_or_load('m', (), (), loader)
+        
+        assert loader.call_count == 2
+        assert region.stats() == {}
+    
+    def test_max_entries_discards_oldest(self):
+        region = QueryCacheRegion(max_entries=2)
+        for name in ('a', 'b', 'c'):
+            region.get_or_load(name, (), (), lambda: name)
+        loader = MagicMock(return_value='a')
+        
+        region.get_or_load('a', (), (), loader)
+        
+        loader.assert_called_once()
+
+
+class TestKeyHelpers:
+    """Tests para normalize_cache_arg y month_tags"""
+    
+    def test_normalize_cache_arg(self):
+        assert normalize_cache_arg({'ids': ['b', 'a'], 'tags': {'y', 'x'}}) == (('ids', ('b', 'a')), ('tags', ('x', 'y')))
+        assert normalize_cache_arg(datetime(2025, 1, 1, 10, 5, 30, 123)) == datetime(2025, 1, 1, 10, 5)
+    
+    def test_month_tags_cover_range_across_years(self):
+        assert list(month_tags(datetime(2024, 11, 15), datetime(2025, 2, 1))) == [
+            report_month_tag(2024, 11), report_month_tag(2024, 12), report_month_tag(2025, 1), report_month_tag(2025, 2)
+        ]
+
+
+class TestOrderRepositoryCachedQueries:
+    """Tests para los métodos cacheados de OrderRepository"""
+    
+    def test_top_products_runs_query_once(self):
+        session = MagicMock()
+        session.query.return_value.filter.return_value.group_by.return_value.order_by.return_value.limit.return_value.all.return_value = [
+            MagicMock(product_id=1, total_sold=5)
+        ]
+        
+        with patch('app.repositories.order_repository.ProductDailyStatsDB'):
+            first = OrderRepository(session).get_top_products_sold(limit=10)
+            second = OrderRepository(MagicMock()).get_top_products_sold(limit=10)
+        
+        assert first == second == [{'product_id': 1, 'total_sold': 5}]
+        assert session.query.call_count == 1
+    
+    def test_status_summary_is_invalidated_by_client_writes(self):
+        session = MagicMock()
+        session.query.return_value.filter.return_value.group_by.return_value.all.return_value = []
+        repository = OrderRepository(session)
+        
+        with patch('app.repositories.order_repository.ClientDailyStatsDB'):
+            repository.get_orders_status_summary_by_client_ids([CLIENT_ID])
+            query_cache.invalidate_tags([client_tag(CLIENT_ID)])
+            repository.get_orders_status_summary_by_client_ids([CLIENT_ID])
+        
+        assert session.query.call_count == 2
+        assert query_cache.stats()['OrderRepository.get_orders_status_summary_by_client_ids']['misses'] == 2
@@ -0,0 +1,82 @@
+"""
+Tests para el cache de reportes armados de OrderService
+"""
+import pytest
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+from app.exceptions.custom_exceptions import OrderValidationError
+from app.repositories.order_repository import OrderRepository
+from app.services.order_service import OrderService
+from app.utils.cache_invalidation import cache_invalidation_bus
+from app.utils.query_cache import report_cache
+
+
+class TestOrderServiceReportCache:
+    """Tests para los reportes cacheados en report_cache"""
+    
+    @pytest.fixture
+    def mock_order_repository(self):
+        mock_repo = MagicMock(spec=OrderRepository)
+        mock_repo.get_top_products_sold.return_value = [{'product_id': 1, 'total_sold': 5}]
+        mock_repo.get_top_clients_snapshot.return_value = None
+        mock_repo.get_top_clients_last_quarter.return_value = [{'client_id': 'client-1', 'orders_count': 3}]
+        return mock_repo
+    
+    @pytest.fixture
+    def order_service(self, mock_order_repository):
+        with patch('app.services.order_service.InventoryService'), \
+                patch('app.services.order_service.InventoryIntegration') as mock_integration_class, \
+                patch('app.services.order_service.AuthService'), \
+                patch('app.services.order_service.AuthIntegration') as mock_auth_integration_class:
+            mock_integration_class.return_value.get_product_names.return_value = {1: 'Producto Uno'}
+            mock_auth_integration_class.return_value.get_client_names.return_value = {'client-1': 'Cliente Uno'}
+            yield OrderService(mock_order_repository)
+    
+    def test_second_call_is_served_from_cache(self, order_service, mock_order_repository):
+        first = order_service.get_top_products_report()
+        second = OrderService(mock_order_repository).get_top_products_report()
+        
+        assert first == second
+        assert 'generated_at' in first
+        mock_order_repository.get_top_products_sold.assert_called_once()
+    
+    def test_windows_are_cached_separately(self, order_service, mock_order_repository):
+        order_service.get_top_products_report(window='30d')
+        order_service.get_top_products_report()
+        order_service.get_top_products_report(window='30d')
+        
+        assert mock_order_repository.get_top_products_sold.call_count == 2
+    
+    def test_order_writes_invalidate_reports(self, order_service, mock_order_repository):
+        order_service.get_top_clients_report()
+        
+        cache_invalidation_bus.handle_event({'type': 'created', 'client_id': 'client-9'})
+        order_service.get_top_clients_report()
+        
+        assert mock_order_repository.get_top_clients_last_quarter.call_count == 2
+    
+    def test_validation_errors_are_not_cached(self, order_service, mock_order_repository):
+        for _ in range(2):
+            with pytest.raises(OrderValidationError):
+                order_service.get_top_products_report(window='7d')
+        
+        mock_order_repository.get_top_products_sold.assert_not_called()
+        assert report_cache.stats()['OrderService.get_top_products_report']['misses'] == 2
+    
+    def test_snapshot_age_is_computed_on_each_call(self, order_service, mock_order_repository):
+        mock_order_repository.get_top_clients_snapshot.return_value = {
+            'window_start': datetime(2025, 1, 10, 8, 0),
+            'window_end': datetime(2025, 4, 10, 8, 0),
+            'refreshed_at': datetime(2025, 4, 10, 8, 0),
+            'top_clients': [{'client_id': 'client-1', 'orders_count': 7}]
+        }
+        
+        with patch('datetime.datetime') as mock_datetime:
+            mock_datetime.now.return_value = datetime(2025, 4, 10, 8, 1, 0)
+            first = order_service.get_top_clients_report()
+            mock_datetime.now.return_value = datetime(2025, 4, 10, 8, 3, 0)
+            second = order_service.get_top_clients_report()
+        
+        assert first['snapshot']['age_seconds'] == 60
+        assert second['snapshot']['age_seconds'] == 180
+        mock_order_repository.get_top_clients_snapshot.assert_called_once()
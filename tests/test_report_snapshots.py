@@ -0,0 +1,154 @@
+"""
+Tests para las instantáneas de reportes y su recálculo con elección de líder
+"""
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+from flask import Flask
+from app.commands import register_commands
+from app.repositories.order_repository import OrderRepository
+from app.repositories.report_snapshots import (
+    SnapshotRefresher, SnapshotScheduler, SNAPSHOT_REFRESH_LOCK_KEY
+)
+
+
+def _engine(leader):
+    engine = MagicMock()
+    connection = engine.raw_connection.return_value
+    cursor = connection.dbapi_connection.cursor.return_value.__enter__.return_value
+    cursor.fetchone.return_value = (leader,)
+    return engine, connection, cursor
+
+
+class TestSnapshotRefresher:
+    """Tests para SnapshotRefresher"""
+    
+    def test_leader_refreshes_and_releases_lock_connection(self):
+        engine, connection, cursor = _engine(True)
+        refresher = SnapshotRefresher(engine, MagicMock(), interval=60)
+        
+        with patch.object(refresher, 'refresh_once', side_effect=refresher.stop) as refresh_once:
+            refresher.run()
+        
+        cursor.execute.assert_called_once_with("SELECT pg_try_advisory_lock(%s)", (SNAPSHOT_REFRESH_LOCK_KEY,))
+        refresh_once.assert_called_once()
+        connection.invalidate.assert_called_once()
+    
+    def test_other_workers_do_not_refresh(self):
+        engine, connection, cursor = _engine(False)
+        refresher = SnapshotRefresher(engine, MagicMock(), interval=60)
+        cursor.fetchone.side_effect = lambda: refresher.stop() or (False,)
+        
+        with patch.object(refresher, 'refresh_once') as refresh_once:
+            refresher.run()
+        
+        refresh_once.assert_not_called()
+        connection.invalidate.assert_called_once()
+    
+    def test_refresh_once_commits_in_own_session(self):
+        session = MagicMock()
+        refresher = SnapshotRefresher(MagicMock(), MagicMock(return_value=session), interval=60)
+        
+        with patch('app.repositories.report_snapshots.refresh_top_clients_snapshot', return_value=3) as refresh:
+            refresher.refresh_once()
+        
+        refresh.assert_called_once_with(session)
+        session.commit.assert_called_once()
+        session.close.assert_called_once()
+    
+    def test_refresh_errors_roll_back_and_keep_leadership(self):
+        session = MagicMock()
+        refresher = SnapshotRefresher(MagicMock(), MagicMock(return_value=session), interval=60)
+        
+        with patch('app.repositories.report_snapshots.refresh_top_clients_snapshot', side_effect=Exception("Error de conexión")):
+            refresher.refresh_once()
+        
+        session.rollback.assert_called_once()
+        session.commit.assert_not_called()
+        session.close.assert_called_once()
+
+
+class TestSnapshotScheduler:
+    """Tests para SnapshotScheduler"""
+    
+    def test_starts_a_single_refresher(self):
+        scheduler = SnapshotScheduler()
+        refresher = MagicMock()
+        refresher.is_alive.return_value = True
+        scheduler.refresher_factory = MagicMock(return_value=refresher)
+        
+        scheduler.ensure_running()
+        scheduler.ensure_running()
+        
+        scheduler.refresher_factory.assert_called_once()
+        refresher.start.assert_called_once()
+    
+    def test_without_factory_does_nothing(self):
+        scheduler = SnapshotScheduler()
+        
+        scheduler.ensure_running()
+        
+        assert scheduler._refresher is None
+    
+    def test_restarts_a_dead_refresher(self):
+        scheduler = SnapshotScheduler()
+        dead = MagicMock()
+        dead.is_alive.return_value = False
+        scheduler.refresher_factory = MagicMock(side_effect=[dead, MagicMock()])
+        
+        scheduler.ensure_running()
+        scheduler.ensure_running()
+        
+        assert scheduler.refresher_factory.call_count == 2
+    
+    def test_fork_does_not_start_the_refresher(self):
+        scheduler = SnapshotScheduler()
+        scheduler.refresher_factory = MagicMock()
+        scheduler._refresher = MagicMock()
+        
+        scheduler._reset_after_fork()
+        
+        assert scheduler._refresher is None
+        scheduler.refresher_factory.assert_not_called()
+
+
+class TestTopClientsSnapshotRepository:
+    """Tests para OrderRepository.get_top_clients_snapshot"""
+    
+    def test_returns_none_when_not_refreshed(self):
+        session = MagicMock()
+        session.query.return_value.filter.return_value.first.return_value = None
+        
+        with patch('app.repositories.order_repository.ReportSnapshotDB'):
+            assert OrderRepository(session).get_top_clients_snapshot() is None
+    
+    def test_returns_period_and_top_clients(self):
+        session = MagicMock()
+        refreshed_at = datetime(2025, 4, 10, 8, 0)
+        session.query.return_value.filter.return_value.first.return_value = SimpleNamespace(
+            window_start=datetime(2025, 1, 10, 8, 0), window_end=refreshed_at, refreshed_at=refreshed_at
+        )
+        session.query.return_value.order_by.return_value.limit.return_value.all.return_value = [
+            SimpleNamespace(client_id='client-1', orders_count=7)
+        ]
+        
+        with patch('app.repositories.order_repository.ReportSnapshotDB'), \
+                patch('app.repositories.order_repository.ClientQuarterStatsDB'):
+            snapshot = OrderRepository(session).get_top_clients_snapshot(limit=5)
+        
+        assert snapshot['refreshed_at'] == refreshed_at
+        assert snapshot['top_clients'] == [{'client_id': 'client-1', 'orders_count': 7}]
+        session.query.return_value.order_by.return_value.limit.assert_called_once_with(5)
+    
+    def test_refresh_command(self):
+        app = Flask(__name__)
+        register_commands(app)
+        session = MagicMock()
+        
+        with patch('app.config.database.SessionLocal', return_value=session), \
+                patch('app.repositories.report_snapshots.refresh_top_clients_snapshot', return_value=4):
+            result = app.test_cli_runner().invoke(args=['snapshots', 'refresh'])
+        
+        assert result.exit_code == 0
+        assert "Instantánea 'top_clients_quarter' recalculada: 4 clientes" in result.output
+        session.commit.assert_called_once()
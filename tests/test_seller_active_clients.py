@@ -0,0 +1,114 @@
+"""
+Tests para los clientes activos por vendedor
+"""
+import pytest
+from datetime import date
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+from app.exceptions.custom_exceptions import OrderBusinessLogicError, OrderValidationError
+from app.repositories.order_repository import OrderRepository
+from app.services.order_service import OrderService
+
+
+class TestOrderRepositoryActiveClients:
+    """Tests para OrderRepository.get_active_clients_by_month"""
+    
+    def test_counts_per_month_and_range(self):
+        session = MagicMock()
+        session.query.return_value.filter.return_value.group_by.return_value.all.return_value = [
+            SimpleNamespace(year=2025, month=3, active_clients=2),
+            SimpleNamespace(year=2025, month=4, active_clients=1)
+        ]
+        session.query.return_value.filter.return_value.scalar.return_value = 2
+        
+        with patch('app.repositories.order_repository.ClientMonthlyStatsDB'):
+            result = OrderRepository(session).get_active_clients_by_month(
+                ['client-1', 'client-2'], date(2025, 3, 1), date(2025, 4, 1)
+            )
+        
+        assert result == {'monthly': {(2025, 3): 2, (2025, 4): 1}, 'total': 2}
+    
+    def test_empty_client_list_does_not_query(self):
+        session = MagicMock()
+        
+        assert OrderRepository(session).get_active_clients_by_month([], date(2025, 3, 1), date(2025, 4, 1)) == {
+            'monthly': {}, 'total': 0
+        }
+        session.query.assert_not_called()
+
+
+class TestOrderServiceSellerActiveClients:
+    """Tests para OrderService.get_seller_active_clients"""
+    
+    @pytest.fixture
+    def mock_order_repository(self):
+        return MagicMock(spec=OrderRepository)
+    
+    @pytest.fixture
+    def mock_auth_integration(self):
+        return MagicMock()
+    
+    @pytest.fixture
+    def order_service(self, mock_order_repository, mock_auth_integration):
+        with patch('app.services.order_service.InventoryService'), \
+                patch('app.services.order_service.InventoryIntegration'), \
+                patch('app.services.order_service.AuthService'), \
+                patch('app.services.order_service.AuthIntegration', return_value=mock_auth_integration):
+            return OrderService(mock_order_repository)
+    
+    def test_monthly_and_range_counts(self, order_service, mock_order_repository, mock_auth_integration):
+        mock_auth_integration.get_assigned_clients.return_value = ['client-1', 'client-2', 'client-3', 'client-4']
+        mock_order_repository.get_active_clients_by_month.return_value = {
+            'monthly': {(2025, 1): 2, (2025, 3): 2},
+            'total': 3
+        }
+        
+        result = order_service.get_seller_active_clients('seller-123', '2025-01', '2025-03')
+        
+        mock_order_repository.get_active_clients_by_month.assert_called_once_with(
+            ['client-1', 'client-2', 'client-3', 'client-4'], date(2025, 1, 1), date(2025, 3, 1)
+        )
+        assert result['period'] == {'start_month': '2025-01', 'end_month': '2025-03', 'months': 3}
+        assert result['summary'] == {'assigned_clients': 4, 'active_clients': 3, 'active_percentage': 75.0}
+        assert [(month['month'], month['month_name'], month['active_clients']) for month in result['monthly_data']] == [
+            (3, 'marzo', 2), (2, 'febrero', 0), (1, 'enero', 2)
+        ]
+    
+    def test_default_period_is_last_twelve_months(self, order_service, mock_order_repository, mock_auth_integration):
+        mock_auth_integration.get_assigned_clients.return_value = ['client-1']
+        mock_order_repository.get_active_clients_by_month.return_value = {'monthly': {}, 'total': 0}
+        
+        result = order_service.get_seller_active_clients('seller-123')
+        
+        assert result['period']['months'] == 12
+        assert result['period']['end_month'] == date.today().strftime('%Y-%m')
+        assert result['summary']['active_clients'] == 0
+    
+    def test_without_clients_does_not_query(self, order_service, mock_order_repository, mock_auth_integration):
+        mock_auth_integration.get_assigned_clients.return_value = []
+        
+        result = order_service.get_seller_active_clients('seller-123', '2025-01', '2025-02')
+        
+        mock_order_repository.get_active_clients_by_month.assert_not_called()
+        assert result['summary'] == {'assigned_clients': 0, 'active_clients': 0, 'active_percentage': 0.0}
+    
+    @pytest.mark.parametrize('start_month, end_month, message', [
+        ('2025-13', None, "formato YYYY-MM"),
+        ('2025-03', '2025-01', "mes inicial no puede ser posterior"),
+        ('2020-01', '2025-01', "máximo de 36 meses")
+    ])
+    def test_validation_errors(self, order_service, mock_auth_integration, start_month, end_month, message):
+        with pytest.raises(OrderValidationError) as exc_info:
+            order_service.get_seller_active_clients('seller-123', start_month, end_month)
+        
+        assert message in str(exc_info.value)
+        mock_auth_integration.get_assigned_clients.assert_not_called()
+    
+    def test_repository_errors(self, order_service, mock_order_repository, mock_auth_integration):
+        mock_auth_integration.get_assigned_clients.return_value = ['client-1']
+        mock_order_repository.get_active_clients_by_month.side_effect = Exception("Database error")
+        
+        with pytest.raises(OrderBusinessLogicError) as exc_info:
+            order_service.get_seller_active_clients('seller-123')
+        
+        assert "Error al generar informe de clientes activos por vendedor" in str(exc_info.value)
@@ -0,0 +1,266 @@
+"""
+Tests para los informes de varios vendedores y el tablero de un vendedor en una sola consulta
+"""
+import pytest
+from datetime import date, datetime
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+from app.exceptions.custom_exceptions import OrderBusinessLogicError, OrderValidationError
+from app.repositories.order_repository import OrderRepository
+from app.repositories.seller_informes import CLIENT_ROWS, MONTH_ROWS, STATUS_ROWS, seller_dashboard, sellers_summary
+from app.services.order_service import OrderService
+
+
+def _row(owner, status, year, month, orders_count, total_amount):
+    return SimpleNamespace(
+        owner=owner, status=status, year=year, month=month, orders_count=orders_count, total_amount=total_amount
+    )
+
+
+class TestSellersSummary:
+    """Tests para seller_informes.sellers_summary"""
+    
+    def test_postgresql_groups_by_seller(self):
+        session = MagicMock()
+        session.execute.return_value.all.return_value = [
+            _row('seller-1', 'Recibido', None, None, 2, 200.0),
+            _row('seller-1', 'Recibido', 2025, 3, 1, 50.0),
+            _row('seller-1', 'Entregado', 2025, 2, 3, 300.0)
+        ]
+        
+        with patch('app.repositories.seller_informes.sellers_summary_statement') as statement:
+            result = sellers_summary(session, 'postgresql', {'seller-1': ['client-1'], 'seller-2': []}, date(2025, 1, 1))
+        
+        statement.assert_called_once()
+        session.execute.assert_called_once()
+        assert result['seller-1'] == {
+            'status_summary': [
+                {'status': 'Recibido', 'count': 3, 'total_amount': 250.0},
+                {'status': 'Entregado', 'count': 3, 'total_amount': 300.0}
+            ],
+            'monthly_summary': [
+                {'year': 2025, 'month': 2, 'orders_count': 3, 'total_amount': 300.0},
+                {'year': 2025, 'month': 3, 'orders_count': 1, 'total_amount': 50.0}
+            ]
+        }
+        assert result['seller-2'] == {'status_summary': [], 'monthly_summary': []}
+    
+    def test_other_engines_fold_shared_clients_into_each_seller(self):
+        session = MagicMock()
+        session.execute.return_value.all.return_value = [
+            _row('client-1', 'Recibido', 2025, 3, 1, 10.0),
+            _row('client-2', 'Recibido', 2025, 3, 2, 20.0)
+        ]
+        
+        with patch('app.repositories.seller_informes.clients_summary_statement') as statement:
+            result = sellers_summary(
+                session, 'sqlite', {'seller-1': ['client-1', 'client-2'], 'seller-2': ['client-2']}, datetime(2025, 1, 1)
+            )
+        
+        assert sorted(statement.call_args[0][0]) == ['client-1', 'client-2']
+        assert statement.call_args[0][1] == date(2025, 1, 1)
+        assert result['seller-1']['status_summary'] == [{'status': 'Recibido', 'count': 3, 'total_amount': 30.0}]
+        assert result['seller-2']['monthly_summary'] == [
+            {'year': 2025, 'month': 3, 'orders_count': 2, 'total_amount': 20.0}
+        ]
+    
+    def test_without_clients_does_not_query(self):
+        session = MagicMock()
+        
+        result = sellers_summary(session, 'postgresql', {'seller-1': []}, date(2025, 1, 1))
+        
+        session.execute.assert_not_called()
+        assert result == {'seller-1': {'status_summary': [], 'monthly_summary': []}}
+    
+    def test_repository_wraps_errors(self):
+        session = MagicMock()
+        
+        with patch('app.repositories.order_repository.sellers_summary', side_effect=Exception("Database error")):
+            with pytest.raises(Exception) as exc_info:
+                OrderRepository(session).get_sellers_informes_summary({'seller-1': ['client-1']}, date(2025, 1, 1))
+        
+        assert "Error al obtener resumen de vendedores" in str(exc_info.value)
+
+
+class TestSellerDashboard:
+    """Tests para seller_informes.seller_dashboard"""
+    
+    @staticmethod
+    def _dashboard_row(grouping_id, orders_count, total_amount, client_id=None, status=None, year=None, month=None,
+                       total_clients=None):
+        return SimpleNamespace(
+            grouping_id=grouping_id, client_id=client_id, status=status, year=year, month=month,
+            orders_count=orders_count, total_amount=total_amount, total_clients=total_clients
+        )
+    
+    @pytest.mark.parametrize('dialect_name, grouping_sets', [('postgresql', True), ('sqlite', False)])
+    def test_splits_rows_by_grouping(self, dialect_name, grouping_sets):
+        session = MagicMock()
+        session.execute.return_value.all.return_value = [
+            self._dashboard_row(CLIENT_ROWS, 3, 300.0, client_id='client-2', total_clients=7),
+            self._dashboard_row(CLIENT_ROWS, 2, 50.0, client_id='client-1', total_clients=7),
+            self._dashboard_row(STATUS_ROWS, 5, 350.0, status='Entregado'),
+            self._dashboard_row(MONTH_ROWS, 4, 250.0),
+            self._dashboard_row(MONTH_ROWS, 1, 100.0, year=2025, month=3),
+            self._dashboard_row(MONTH_ROWS, 0, 0.0, year=2025, month=2)
+        ]
+        
+        with patch('app.repositories.seller_informes.dashboard_statement') as statement:
+            result = seller_dashboard(session, dialect_name, ['client-1', 'client-2', 'client-1'], datetime(2025, 1, 1), 2)
+        
+        statement.assert_called_once_with(['client-1', 'client-2'], date(2025, 1, 1), 2, grouping_sets)
+        session.execute.assert_called_once()
+        assert result == {
+            'status_summary': [{'status': 'Entregado', 'count': 5, 'total_amount': 350.0}],
+            'monthly_summary': [{'year': 2025, 'month': 3, 'orders_count': 1, 'total_amount': 100.0}],
+            'clients': [
+                {'client_id': 'client-2', 'orders_count': 3, 'total_amount': 300.0, 'average_order_amount': 100.0},
+                {'client_id': 'client-1', 'orders_count': 2, 'total_amount': 50.0, 'average_order_amount': 25.0}
+            ],
+            'total_clients': 7
+        }
+    
+    def test_without_clients_does_not_query(self):
+        session = MagicMock()
+        
+        result = seller_dashboard(session, 'postgresql', [], date(2025, 1, 1), 10)
+        
+        session.execute.assert_not_called()
+        assert result == {'status_summary': [], 'monthly_summary': [], 'clients': [], 'total_clients': 0}
+
+
+class TestOrderServiceSellerDashboard:
+    """Tests para OrderService.get_seller_dashboard"""
+    
+    @pytest.fixture
+    def mock_order_repository(self):
+        return MagicMock(spec=OrderRepository)
+    
+    @pytest.fixture
+    def mock_auth_integration(self):
+        return MagicMock()
+    
+    @pytest.fixture
+    def order_service(self, mock_order_repository, mock_auth_integration):
+        with patch('app.services.order_service.InventoryService'), \
+                patch('app.services.order_service.InventoryIntegration'), \
+                patch('app.services.order_service.AuthService'), \
+                patch('app.services.order_service.AuthIntegration', return_value=mock_auth_integration):
+            return OrderService(mock_order_repository)
+    
+    def test_dashboard_uses_one_lookup_and_one_query(self, order_service, mock_order_repository, mock_auth_integration):
+        today = date.today()
+        mock_auth_integration.get_assigned_clients.return_value = ['client-1', 'client-2', 'client-3']
+        mock_auth_integration.get_client_names.return_value = {'client-1': 'Cliente Uno'}
+        mock_order_repository.get_seller_dashboard_summary.return_value = {
+            'status_summary': [{'status': 'Entregado', 'count': 4, 'total_amount': 400.0}],
+            'monthly_summary': [{'year': today.year, 'month': today.month, 'orders_count': 1, 'total_amount': 100.0}],
+            'clients': [
+                {'client_id': 'client-1', 'orders_count': 4, 'total_amount': 400.0, 'average_order_amount': 100.0}
+            ],
+            'total_clients': 3
+        }
+        
+        result = order_service.get_seller_dashboard('seller-123', per_page=1)
+        
+        mock_auth_integration.get_assigned_clients.assert_called_once_with('seller-123')
+        client_ids, start_date, per_page = mock_order_repository.get_seller_dashboard_summary.call_args[0]
+        assert (client_ids, start_date.day, per_page) == (['client-1', 'client-2', 'client-3'], 1, 1)
+        mock_order_repository.get_orders_status_summary_by_client_ids.assert_not_called()
+        mock_order_repository.get_clients_summary_by_client_ids.assert_not_called()
+        assert result['seller_id'] == 'seller-123'
+        assert result['assigned_clients'] == 3
+        assert result['status']['summary'] == {'total_orders': 4, 'total_amount': 400.0}
+        assert result['monthly']['monthly_data'][0]['orders_count'] == 1
+        assert len(result['monthly']['monthly_data']) == 12
+        assert result['clients']['clients'][0]['client_name'] == 'Cliente Uno'
+        assert result['clients']['pagination']['total_pages'] == 3
+        assert result['clients']['pagination']['next_page'] == 2
+    
+    def test_repository_errors(self, order_service, mock_order_repository, mock_auth_integration):
+        mock_auth_integration.get_assigned_clients.return_value = ['client-1']
+        mock_order_repository.get_seller_dashboard_summary.side_effect = Exception("Database error")
+        
+        with pytest.raises(OrderBusinessLogicError) as exc_info:
+            order_service.get_seller_dashboard('seller-123')
+        
+        assert "Error al generar tablero de vendedor" in str(exc_info.value)
+
+
+class TestOrderServiceSellersBatchInformes:
+    """Tests para OrderService.get_sellers_batch_informes"""
+    
+    @pytest.fixture
+    def mock_order_repository(self):
+        return MagicMock(spec=OrderRepository)
+    
+    @pytest.fixture
+    def mock_auth_integration(self):
+        return MagicMock()
+    
+    @pytest.fixture
+    def order_service(self, mock_order_repository, mock_auth_integration):
+        with patch('app.services.order_service.InventoryService'), \
+                patch('app.services.order_service.InventoryIntegration'), \
+                patch('app.services.order_service.AuthService'), \
+                patch('app.services.order_service.AuthIntegration', return_value=mock_auth_integration):
+            return OrderService(mock_order_repository)
+    
+    def test_reports_keyed_by_seller(self, order_service, mock_order_repository, mock_auth_integration):
+        today = date.today()
+        mock_auth_integration.get_assigned_clients_batch.return_value = {
+            'seller-1': ['client-1', 'client-2'], 'seller-2': None
+        }
+        mock_order_repository.get_sellers_informes_summary.return_value = {
+            'seller-1': {
+                'status_summary': [
+                    {'status': 'Recibido', 'count': 1, 'total_amount': 100.0},
+                    {'status': 'Entregado', 'count': 3, 'total_amount': 300.0}
+                ],
+                'monthly_summary': [
+                    {'year': today.year, 'month': today.month, 'orders_count': 2, 'total_amount': 150.0}
+                ]
+            },
+            'seller-2': {'status_summary': [], 'monthly_summary': []}
+        }
+        
+        result = order_service.get_sellers_batch_informes(['seller-1', 'seller-2', 'seller-1'])
+        
+        mock_auth_integration.get_assigned_clients_batch.assert_called_once_with(['seller-1', 'seller-2'])
+        assignments, start_date = mock_order_repository.get_sellers_informes_summary.call_args[0]
+        assert assignments == {'seller-1': ['client-1', 'client-2'], 'seller-2': []}
+        assert start_date.day == 1
+        assert result['period']['months'] == 12
+        assert result['summary'] == {'sellers': 2, 'sellers_without_clients': 1}
+        
+        seller = result['sellers']['seller-1']
+        assert seller['assigned_clients'] == 2
+        assert seller['status']['summary'] == {'total_orders': 4, 'total_amount': 400.0}
+        statuses = {item['status']: item for item in seller['status']['status_summary']}
+        assert statuses['Entregado']['percentage'] == 75.0
+        assert statuses['Devuelto']['count'] == 0
+        assert len(seller['monthly']['monthly_data']) == 12
+        assert seller['monthly']['monthly_data'][0]['month'] == today.month
+        assert seller['monthly']['monthly_data'][0]['orders_count'] == 2
+        assert seller['monthly']['summary'] == {'total_orders': 2, 'total_amount': 150.0}
+        assert result['sellers']['seller-2']['monthly']['summary'] == {'total_orders': 0, 'total_amount': 0.0}
+    
+    @pytest.mark.parametrize('seller_ids, message', [
+        ([], "al menos un vendedor"),
+        ([f"seller-{i}" for i in range(51)], "máximo 50 vendedores")
+    ])
+    def test_validation_errors(self, order_service, mock_auth_integration, seller_ids, message):
+        with pytest.raises(OrderValidationError) as exc_info:
+            order_service.get_sellers_batch_informes(seller_ids)
+        
+        assert message in str(exc_info.value)
+        mock_auth_integration.get_assigned_clients_batch.assert_not_called()
+    
+    def test_repository_errors(self, order_service, mock_order_repository, mock_auth_integration):
+        mock_auth_integration.get_assigned_clients_batch.return_value = {'seller-1': ['client-1']}
+        mock_order_repository.get_sellers_informes_summary.side_effect = Exception("Database error")
+        
+        with pytest.raises(OrderBusinessLogicError) as exc_info:
+            order_service.get_sellers_batch_informes(['seller-1'])
+        
+        assert "Error al generar informes de vendedores" in str(exc_info.value)